@@ -8,10 +8,22 @@ All reference to Connector objects in this subpackage
 __author__ = 'Samir Adrik'
 __email__ = 'samir.adrik@gmail.com'
 
+from .resilience import CircuitBreaker, CircuitOpenError, LatencyBudgetError, ResilientAdapter
+from .response_cache import BoundedFileCache, CachingAdapter
+from .rate_limiter import RateLimiter, RateLimitedAdapter
+from .local_tax_validation import LocalTaxValidation
+from .postal_code_registry import PostalCodeRegistry
+from .skatteetaten_payload import SkatteetatenPayload
+from .http_replay import HttpRecorder, ReplayServer
+from .session_registry import SessionRegistry
+from .portalen_offers import PortalenOffers
 from .finn_ownership import FinnOwnership
 from .finn_community import FinnCommunity
 from .skatteetaten import Skatteetaten
+from .ssb_rate_store import SsbRateStore
 from .ssb_payload import SsbPayload
+from .sifo_cache import SifoCache
+from .local_tax import LocalTax
 from .finn_stat import FinnStat
 from .portalen import Portalen
 from .connector import Connector
@@ -9,6 +9,7 @@ __author__ = 'Samir Adrik'
 __email__ = 'samir.adrik@gmail.com'
 
 from abc import ABC, abstractmethod
+from threading import Lock
 from uuid import uuid4
 from time import time
 
@@ -16,16 +17,21 @@ import datetime
 import json
 import os
 
-from mechanize import Browser
+from source.util import Assertor, LOGGER, RunContext
 
-from source.util import Assertor, LOGGER
+from .session_registry import SessionRegistry
 
 
 class Connector(ABC):
     """
-    Connector superclass
+    Connector superclass. The mechanize Browser is only created on first access of the browser
+    property, with the number of browsers created and the time spent creating them kept in
+    browsers and browser_elapsed
 
     """
+    browsers = 0
+    browser_elapsed = 0.0
+    _browser_lock = Lock()
 
     @staticmethod
     def save_json(file_dict: dict, file_dir: str = "report/json",
@@ -84,11 +90,26 @@ class Connector(ABC):
         """
         LOGGER.info(f"trying to create '{self.__class__.__name__}'")
         super().__init__()
-        self._browser = Browser()
-        self._browser.set_handle_robots(False)
-        self._browser.set_handle_refresh(False)
         self._id = str(uuid4())
 
+    @staticmethod
+    def session(url: str):
+        """
+        method for getting the shared keep-alive HTTP session of the host of a url
+
+        Parameters
+        ----------
+        url         : str
+                      url to request
+
+        Returns
+        -------
+        out         : requests.Session
+                      shared session of the host
+
+        """
+        return SessionRegistry.session(url)
+
     @property
     def id_(self):
         """
@@ -100,7 +121,37 @@ class Connector(ABC):
     @property
     def browser(self):
         """
-        Browser getter
+        Browser getter, the browser is created on first access unless the connector has set
+        it to None
 
         """
+        if "_browser" not in self.__dict__:
+            start = time()
+            from mechanize import Browser  # pylint: disable=import-outside-toplevel
+            browser = Browser()
+            browser.set_handle_robots(False)
+            browser.set_handle_refresh(False)
+            self._browser = browser
+            self.profile_browser(start, time())
         return self._browser
+
+    @classmethod
+    def profile_browser(cls, start: float, end: float):
+        """
+        method for counting a created browser, and adding it to the profiling of the process
+        running in the calling thread, if any
+
+        Parameters
+        ----------
+        start       : float
+                      start of the creation in seconds from epoch
+        end         : float
+                      end of the creation in seconds from epoch
+
+        """
+        with Connector._browser_lock:
+            Connector.browsers += 1
+            Connector.browser_elapsed += (end - start) * 1000
+        context = RunContext.current()
+        if context:
+            context.add_profiling(f"browser ({cls.__name__})", start, end)
@@ -9,6 +9,9 @@ __author__ = 'Samir Adrik'
 __email__ = 'samir.adrik@gmail.com'
 
 import re
+import json
+
+import json_repair
 
 from source.util import Assertor, LOGGER, InvalidDataError, Tracking
 
@@ -20,6 +23,7 @@ class Finn(Connector):
     Connector that extracts housing information from Finn.no given a Finn-code
 
     """
+    remix_context_marker = "window.__remixContext"
 
     @Tracking
     def validate_finn_code(self):
@@ -44,7 +48,7 @@ class Finn(Connector):
         """
         try:
             super().__init__()
-            Assertor.assert_data_types([finn_code], [str])
+            Assertor.assert_data_types([finn_code], [str], boundary=True)
             self._finn_code = finn_code
             self.validate_finn_code()
             self._browser = None
@@ -67,6 +71,82 @@ class Finn(Connector):
         """
         return self._finn_code
 
+    @staticmethod
+    def loads(text: str):
+        """
+        method for parsing JSON, strictly with json.loads first and with json_repair only if
+        the JSON is malformed
+
+        Parameters
+        ----------
+        text        : str
+                      JSON to parse
+
+        Returns
+        -------
+        out         : object
+                      parsed JSON
+
+        """
+        try:
+            return json.loads(text)
+        except ValueError:
+            return json_repair.loads(" ".join(text.split()))
+
+    @classmethod
+    def remix_context(cls, html):
+        """
+        method for extracting the window.__remixContext of a Finn.no page, located directly in
+        the html of the page instead of building a soup tree of the whole page, i.e. the last
+        script starting with the marker, so the marker in strings of the page is skipped
+
+        Parameters
+        ----------
+        html        : bytes, str
+                      html of the page
+
+        Returns
+        -------
+        out         : dict
+                      remix context, empty if not found in the page
+
+        """
+        html = html.decode("utf-8", errors="replace") if isinstance(html, bytes) else html
+        marker = html.rfind(cls.remix_context_marker)
+        while marker != -1:
+            tag = html.rfind("<script", 0, marker)
+            body = html.find(">", tag) + 1 if tag != -1 else -1
+            if 0 < body <= marker and not html[body:marker].strip():
+                break
+            marker = html.rfind(cls.remix_context_marker, 0, marker)
+        if marker == -1:
+            return {}
+        end = html.find("</script>", marker)
+        script = html[html.find("=", marker) + 1:end if end != -1 else len(html)]
+        remix_context = cls.loads(script.strip().rstrip(";"))
+        return dict(remix_context) if isinstance(remix_context, dict) else {}
+
+    @classmethod
+    def loader_data(cls, html, route: str):
+        """
+        method for extracting the loader data of a route in the remix context of a Finn.no page
+
+        Parameters
+        ----------
+        html        : bytes, str
+                      html of the page
+        route       : str
+                      name of the route, e.g. 'routes/prisstatistikk.$adId'
+
+        Returns
+        -------
+        out         : dict
+                      loader data of the route, empty if not found in the page
+
+        """
+        loader_data = cls.remix_context(html).get("state", {}).get("loaderData", {})
+        return loader_data.get(route) or {}
+
     @staticmethod
     def rules():
         """
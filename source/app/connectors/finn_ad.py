@@ -12,18 +12,13 @@ from datetime import datetime
 from http.client import responses
 
 import pytz
-import requests
 from requests.exceptions import ConnectTimeout, ConnectionError as ConnectError
 
-from bs4 import BeautifulSoup
-
-import json_repair
-
 from source.util import LOGGER, TimeOutError, NoConnectionError, \
     InvalidDataError, Assertor, Tracking
 from source.domain import Money, Amount
 
-from .settings import FINN_AD_URL, TIMEOUT
+from .settings import FINN_AD_URL, TIMEOUT, CONNECT_TIMEOUT
 from .finn import Finn
 
 
@@ -43,7 +38,7 @@ class FinnAd(Finn):
                       Finn-code to be search finn-ad information
 
         """
-        Assertor.assert_data_types([finn_code], [str])
+        Assertor.assert_data_types([finn_code], [str], boundary=True)
         super().__init__(finn_code=finn_code)
 
     @Tracking
@@ -60,9 +55,9 @@ class FinnAd(Finn):
         try:
             try:
                 start = time()
-                ad_response = requests.get(
+                ad_response = self.session(FINN_AD_URL).get(
                     FINN_AD_URL + f"{self.finn_code}",
-                    timeout=TIMEOUT)
+                    timeout=(CONNECT_TIMEOUT, TIMEOUT))
                 ad_status_code = ad_response.status_code
                 elapsed = self.elapsed_time(start)
                 LOGGER.info(
@@ -98,36 +93,18 @@ class FinnAd(Finn):
                     f"[{self.__class__.__name__}] Not found! '{self.finn_code}' "
                     f"may be an invalid Finn code")
 
-            ad_soup = BeautifulSoup(response.content, "lxml")
-
             info = {}
             ad_data = None
             meta_data = None
-            script_tag = None
-
-            for script in ad_soup.find_all('script'):
-                if 'window.__remixContext' in script.text:
-                    script_tag = script.text
-
-            if script_tag:
-                cleaned_script = " ".join(script_tag.split()).replace(
-                    'window.__remixContext = ', '')[:-1]
-
-                cleaned_script = dict(json_repair.loads(cleaned_script))
-
-                if 'state' in cleaned_script:
-                    state = cleaned_script['state']
-                    if 'loaderData' in state:
-                        loader_data = state['loaderData']
-                        if 'routes/realestate+/_item+/homes.ad[.html]' in loader_data:
-                            routes = loader_data[
-                                'routes/realestate+/_item+/homes.ad[.html]']
-                            if 'objectData' in routes:
-                                object_data = routes['objectData']
-                                if 'ad' in object_data:
-                                    ad_data = object_data['ad']
-                                if 'meta' in object_data:
-                                    meta_data = object_data['meta']
+
+            routes = self.loader_data(response.content,
+                                      'routes/realestate+/_item+/homes.ad[.html]')
+            if 'objectData' in routes:
+                object_data = routes['objectData']
+                if 'ad' in object_data:
+                    ad_data = object_data['ad']
+                if 'meta' in object_data:
+                    meta_data = object_data['meta']
 
             if ad_data:
 
@@ -13,14 +13,13 @@ import json
 from http.client import responses
 
 from requests.exceptions import ConnectTimeout, ConnectionError as ConnectError
-import requests
 
 from bs4 import BeautifulSoup
 
 from source.util import LOGGER, TimeOutError, NoConnectionError, Assertor, \
     Tracking
 
-from .settings import FINN_COMMUNITY_URL, TIMEOUT
+from .settings import FINN_COMMUNITY_URL, TIMEOUT, CONNECT_TIMEOUT
 from .finn import Finn
 
 
@@ -40,7 +39,7 @@ class FinnCommunity(Finn):
                       Finn-code to search finn statistics for
 
         """
-        Assertor.assert_data_types([finn_code], [str])
+        Assertor.assert_data_types([finn_code], [str], boundary=True)
         super().__init__(finn_code=finn_code)
 
     @Tracking
@@ -57,9 +56,9 @@ class FinnCommunity(Finn):
         try:
             try:
                 start = time()
-                community_stat_response = requests.get(
+                community_stat_response = self.session(FINN_COMMUNITY_URL).get(
                     f"{FINN_COMMUNITY_URL}{self.finn_code}",
-                    timeout=TIMEOUT)
+                    timeout=(CONNECT_TIMEOUT, TIMEOUT))
                 stat_status_code = community_stat_response.status_code
                 elapsed = self.elapsed_time(start)
                 LOGGER.info(
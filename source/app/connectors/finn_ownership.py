@@ -11,18 +11,14 @@ from time import time
 from http.client import responses
 from datetime import datetime
 
-import requests
 from requests.exceptions import ConnectTimeout, ConnectionError as ConnectError
 
-import json_repair
-from bs4 import BeautifulSoup
-
 from source.util import LOGGER, TimeOutError, NoConnectionError, Tracking, \
     InvalidDataError
 
 from source.domain import Money
 
-from .settings import FINN_OWNER_URL, TIMEOUT
+from .settings import FINN_OWNER_URL, TIMEOUT, CONNECT_TIMEOUT
 from .finn import Finn
 
 
@@ -58,9 +54,9 @@ class FinnOwnership(Finn):
         try:
             try:
                 start = time()
-                owner_response = requests.get(
+                owner_response = self.session(FINN_OWNER_URL).get(
                     f"{FINN_OWNER_URL}{self.finn_code}",
-                    timeout=TIMEOUT)
+                    timeout=(CONNECT_TIMEOUT, TIMEOUT))
                 owner_status_code = owner_response.status_code
                 elapsed = self.elapsed_time(start)
                 status_msg = f"HTTP status code -> OWNERSHIP HISTORY: [{owner_status_code}: " \
@@ -104,31 +100,13 @@ class FinnOwnership(Finn):
                     f"may be an invalid Finn code")
                 return {}
 
-            owner_soup = BeautifulSoup(response.content, "lxml")
-
             info = {}
-            script_tag = None
             history_data = None
 
-            for script in owner_soup.find_all('script'):
-                if 'window.__remixContext' in script.text:
-                    script_tag = script.text
-
-            if script_tag:
-                cleaned_script = " ".join(script_tag.split()).replace(
-                    'window.__remixContext = ', '')[:-1]
-
-                cleaned_script = dict(json_repair.loads(cleaned_script))
-
-                if 'state' in cleaned_script:
-                    state = cleaned_script['state']
-                    if 'loaderData' in state:
-                        loader_data = state['loaderData']
-                        if 'routes/realestate+/_common+/ownershiphistory[.html]' in loader_data:
-                            routes = loader_data[
-                                'routes/realestate+/_common+/ownershiphistory[.html]']
-                            if 'historyData' in routes:
-                                history_data = routes['historyData']
+            routes = self.loader_data(response.content,
+                                      'routes/realestate+/_common+/ownershiphistory[.html]')
+            if 'historyData' in routes:
+                history_data = routes['historyData']
 
             if history_data:
                 registration_date = []
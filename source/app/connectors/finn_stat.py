@@ -12,20 +12,18 @@ from time import time
 
 from http.client import responses
 
-import asyncio
-from asyncio import TimeoutError as TError
-from aiohttp import ClientSession, ClientTimeout
+from asyncio import TimeoutError as TError, get_running_loop
 from aiohttp.client_exceptions import ClientConnectionError
 
 from bs4 import BeautifulSoup
 import numpy as np
-import json_repair
 
 from source.util import LOGGER, TimeOutError, NoConnectionError, Assertor, \
     Tracking
 from source.domain import Amount
 
-from .settings import FINN_STAT_URL, TIMEOUT
+from .session_registry import SessionRegistry
+from .settings import FINN_STAT_URL
 from .finn import Finn
 
 
@@ -45,13 +43,15 @@ class FinnStat(Finn):
                       Finn-code to search finn statistics for
 
         """
-        Assertor.assert_data_types([finn_code], [str])
+        Assertor.assert_data_types([finn_code], [str], boundary=True)
         super().__init__(finn_code=finn_code)
 
     @Tracking
     async def stat_response(self):
         """
-        Response from Finn-no housing statistics search
+        Response from Finn-no housing statistics search, served from the shared response cache
+        if cached. The cache is read and written in the default executor, so the disk I/O does
+        not block the shared event loop
 
         Returns
         -------
@@ -62,17 +62,26 @@ class FinnStat(Finn):
         try:
             try:
                 start = time()
-                async with ClientSession(
-                        timeout=ClientTimeout(TIMEOUT)) as session:
-                    async with session.get(
-                            f"{FINN_STAT_URL}{self.finn_code}") as stat_response:
+                url = f"{FINN_STAT_URL}{self.finn_code}"
+                loop = get_running_loop()
+                content, headers = await loop.run_in_executor(
+                    None, SessionRegistry.cached_content, url)
+                if content is not None:
+                    LOGGER.info(f"HTTP cache -> STATISTICS -> elapsed: {self.elapsed_time(start)}")
+                    return content
+                await SessionRegistry.rate_limiter.wait_async(url)
+                async with SessionRegistry.client_session() as session:
+                    async with session.get(url, headers=headers) as stat_response:
                         stat_status_code = stat_response.status
                         elapsed = self.elapsed_time(start)
                         LOGGER.info(
                             f"HTTP status code -> STATISTICS: [{stat_status_code}: "
                             f"{responses[stat_status_code]}] -> elapsed: {elapsed}"
                         )
-                        return await stat_response.content.read()
+                        content = await stat_response.content.read()
+                        return await loop.run_in_executor(
+                            None, SessionRegistry.cache_content, url, stat_status_code,
+                            stat_response.headers, content)
             except TError:
                 raise TimeOutError(
                     "Timeout occurred - please try again later or contact system administrator"
@@ -96,42 +105,22 @@ class FinnStat(Finn):
         LOGGER.info(
             f"trying to retrieve 'housing_stat_information' for -> '{self.finn_code}'"
         )
-        response = asyncio.run(self.stat_response())
+        response = SessionRegistry.run(self.stat_response())
         info = {}
 
         try:
-            stat_soup = BeautifulSoup(response, "lxml")
-
             price_statistics = None
-            script_tag = None
 
             sqm_price = ''
             clicks = ''
             city_area_sqm_price = ''
             municipality_sqm_price = ''
 
-            for script in stat_soup.find_all('script'):
-                if 'window.__remixContext' in script.text:
-                    script_tag = script.text
-
-            if script_tag:
-
-                cleaned_script = " ".join(script_tag.split()).replace(
-                    'window.__remixContext = ', '')[:-1]
-
-                cleaned_script = dict(json_repair.loads(cleaned_script))
-
-                if 'state' in cleaned_script:
-                    state = cleaned_script['state']
-                    if 'loaderData' in state:
-                        loader_data = state['loaderData']
-                        if 'routes/prisstatistikk.$adId' in loader_data:
-                            routes = loader_data['routes/prisstatistikk.$adId']
-                            if 'priceStatistic' in routes:
-                                price_statistic = routes['priceStatistic']
-                                if 'content' in price_statistic:
-                                    price_statistics = price_statistic[
-                                        'content']
+            routes = self.loader_data(response, 'routes/prisstatistikk.$adId')
+            if 'priceStatistic' in routes:
+                price_statistic = routes['priceStatistic']
+                if 'content' in price_statistic:
+                    price_statistics = price_statistic['content']
 
             if price_statistics:
 
@@ -141,8 +130,7 @@ class FinnStat(Finn):
                     'div', attrs={'data-props': True})['data-props']
 
                 decoded_price_json = base64.b64decode(base64_price_json)
-                decoded_price_json_string = json_repair.loads(
-                    decoded_price_json.decode('utf-8'))
+                decoded_price_json_string = self.loads(decoded_price_json.decode('utf-8'))
 
                 if 'response' in decoded_price_json_string:
 
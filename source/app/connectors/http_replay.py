@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module with logic for recording HTTP responses of the connectors, and the local server
+replaying them
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+import json
+from argparse import ArgumentParser
+from base64 import b64decode, b64encode
+from hashlib import sha256
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from random import uniform
+from threading import Lock, Thread
+from time import sleep
+
+from source.util import Assertor, LOGGER
+
+
+class HttpRecorder:
+    """
+    Recorder of HTTP responses keyed by method, url and payload of the request, i.e. one JSON
+    file per request in directory. Connectors record their responses when the env. variable
+    STRESSA_HTTP_RECORD is set to a directory
+
+    """
+
+    # headers describing the transfer of the recorded response, not its content
+    transfer_headers = ("content-encoding", "content-length", "transfer-encoding", "connection",
+                        "keep-alive")
+
+    @staticmethod
+    def key(method: str, url: str, body=None):
+        """
+        method for getting the key of a request
+
+        Parameters
+        ----------
+        method      : str
+                      HTTP method, e.g. 'GET'
+        url         : str
+                      url of the request
+        body        : bytes, str
+                      payload of the request, None if no payload
+
+        Returns
+        -------
+        out         : str
+                      sha256 hex digest of the request
+
+        """
+        Assertor.assert_data_types([method, url], [str, str])
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        return sha256(method.upper().encode() + b" " + url.encode() + b"\n" +
+                      (body or b"")).hexdigest()
+
+    def __init__(self, directory: str):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        directory   : str
+                      directory of the recordings
+
+        """
+        Assertor.assert_data_types([directory], [str])
+        self.directory = directory
+        self._recordings = {}
+        self._lock = Lock()
+
+    def path(self, key: str):
+        """
+        method for getting the path of a recording
+
+        """
+        return os.path.join(self.directory, f"{key}.json")
+
+    def record(self, method: str, url: str, body, status: int, headers: dict, content: bytes):
+        """
+        method for recording the response of a request
+
+        Parameters
+        ----------
+        method      : str
+                      HTTP method of the request
+        url         : str
+                      url of the request
+        body        : bytes, str
+                      payload of the request, None if no payload
+        status      : int
+                      HTTP status code of the response
+        headers     : dict
+                      headers of the response
+        content     : bytes
+                      decoded content of the response
+
+        """
+        key = self.key(method, url, body)
+        recording = {"method": method.upper(), "url": url, "status": status,
+                     "headers": {name: value for name, value in headers.items() if
+                                 name.lower() not in self.transfer_headers},
+                     "content": b64encode(content or b"").decode("ascii")}
+        with self._lock:
+            self._recordings[key] = recording
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.path(key), "w", encoding="utf-8") as recording_file:
+                json.dump(recording, recording_file)
+        except OSError as record_error:
+            LOGGER.warning(f"response of '{url}' not recorded, exited with '{record_error}'")
+
+    def hook(self, response, *args, **kwargs):  # pylint: disable=unused-argument
+        """
+        response hook of a requests Session recording every response
+
+        """
+        request = response.request
+        self.record(request.method, request.url, request.body, response.status_code,
+                    dict(response.headers), response.content)
+
+    def lookup(self, method: str, url: str, body=None):
+        """
+        method for looking up the recorded response of a request
+
+        Parameters
+        ----------
+        method      : str
+                      HTTP method of the request
+        url         : str
+                      url of the request
+        body        : bytes, str
+                      payload of the request, None if no payload
+
+        Returns
+        -------
+        out         : tuple
+                      status, headers and content of the response, None if not recorded
+
+        """
+        key = self.key(method, url, body)
+        with self._lock:
+            recording = self._recordings.get(key)
+        if recording is None:
+            try:
+                with open(self.path(key), encoding="utf-8") as recording_file:
+                    recording = json.load(recording_file)
+            except (OSError, ValueError):
+                return None
+            with self._lock:
+                self._recordings[key] = recording
+        return recording["status"], dict(recording["headers"]), b64decode(recording["content"])
+
+    def recordings(self):
+        """
+        method for getting the method and url of all recordings in the directory
+
+        Returns
+        -------
+        out         : list
+                      sorted list of (method, url)
+
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        recordings = []
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(".json"):
+                try:
+                    with open(os.path.join(self.directory, file_name),
+                              encoding="utf-8") as recording_file:
+                        recording = json.load(recording_file)
+                    recordings.append((recording["method"], recording["url"]))
+                except (OSError, ValueError, KeyError):
+                    continue
+        return sorted(recordings)
+
+
+class ReplayServer:  # pylint: disable=too-many-instance-attributes
+    """
+    Local HTTP server standing in for the services of the connectors, replaying the responses
+    of an HttpRecorder with a configurable latency and jitter. The connectors are pointed at
+    the server with the env. variable STRESSA_REPLAY_URL, i.e. a request for
+    'https://finn.no/realestate/...' is sent to '<url>/finn.no/realestate/...'. Requests
+    without recording are answered with 404 Not Found
+
+    """
+
+    def __init__(self, directory: str, latency: float = 0.0, jitter: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        directory   : str
+                      directory of the recordings
+        latency     : float
+                      seconds added to every response
+        jitter      : float
+                      maximum seconds the latency varies with, uniformly in both directions
+        host        : str
+                      host to listen on
+        port        : int
+                      port to listen on, 0 for any free port
+
+        """
+        Assertor.assert_data_types([directory, latency, jitter, host, port],
+                                   [str, (int, float), (int, float), str, int])
+        if latency < 0 or jitter < 0:
+            raise ValueError(f"latency and jitter must be non-negative, got '{latency}' and "
+                             f"'{jitter}'")
+        self.recorder = HttpRecorder(directory)
+        self.latency = latency
+        self.jitter = jitter
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        self._server = ThreadingHTTPServer((host, port), self.handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        url of the server, i.e. the value of STRESSA_REPLAY_URL
+
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def delay(self):
+        """
+        method for getting the latency of a response
+
+        Returns
+        -------
+        out         : float
+                      seconds to wait before responding
+
+        """
+        return max(self.latency + uniform(-self.jitter, self.jitter), 0.0)
+
+    def replay(self, method: str, path: str, body: bytes):
+        """
+        method for getting the recorded response of a request to the server
+
+        Parameters
+        ----------
+        method      : str
+                      HTTP method of the request
+        path        : str
+                      path of the request, i.e. the recorded url without 'https:/'
+        body        : bytes
+                      payload of the request
+
+        Returns
+        -------
+        out         : tuple
+                      status, headers and content of the response
+
+        """
+        recorded = self.recorder.lookup(method, "https://" + path.lstrip("/"), body or None)
+        with self._lock:
+            if recorded is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if recorded is None:
+            LOGGER.warning(f"no recording of '{method} {path}'")
+            return 404, {"Content-Type": "text/plain"}, f"no recording of '{path}'".encode()
+        return recorded
+
+    def handler(self):
+        """
+        method for getting the request handler class of the server
+
+        """
+        server = self
+
+        class ReplayHandler(BaseHTTPRequestHandler):
+            """
+            Handler replaying the recorded response of every request
+
+            """
+            protocol_version = "HTTP/1.1"
+
+            def respond(self):
+                """
+                method for responding with the recorded response after the latency
+
+                """
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, headers, content = server.replay(self.command, self.path, body)
+                sleep(server.delay())
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = respond
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                """
+                method for logging requests to the server
+
+                """
+                LOGGER.debug(f"replay server -> {format % args}")
+
+        return ReplayHandler
+
+    def start(self):
+        """
+        method for serving in a background thread
+
+        Returns
+        -------
+        out         : str
+                      url of the server
+
+        """
+        if not self._thread:
+            self._thread = Thread(target=self._server.serve_forever, name="stressa-replay",
+                                  kwargs={"poll_interval": 0.05}, daemon=True)
+            self._thread.start()
+            LOGGER.success(f"replay server of '{self.recorder.directory}' serving at "
+                           f"'{self.url}'")
+        return self.url
+
+    def serve_forever(self):
+        """
+        method for serving in the calling thread until interrupted
+
+        """
+        LOGGER.success(f"replay server of '{self.recorder.directory}' serving at '{self.url}'")
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        """
+        method for stopping the server
+
+        """
+        if self._thread:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        """
+        start the server when entering the context
+
+        """
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        """
+        stop the server when leaving the context
+
+        """
+        self.stop()
+
+    def metrics(self):
+        """
+        method for getting the hit/miss counters of the server
+
+        Returns
+        -------
+        out         : dict
+                      dictionary with the hits and misses of the recordings
+
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+if __name__ == "__main__":
+    PARSER = ArgumentParser(description="replay recorded responses of the connectors")
+    PARSER.add_argument("directory", help="directory of the recordings (STRESSA_HTTP_RECORD)")
+    PARSER.add_argument("--host", default="127.0.0.1")
+    PARSER.add_argument("--port", type=int, default=8765)
+    PARSER.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    PARSER.add_argument("--jitter", type=float, default=0.0, help="maximum +/- seconds")
+    ARGS = PARSER.parse_args()
+    ReplayServer(ARGS.directory, ARGS.latency, ARGS.jitter, ARGS.host,
+                 ARGS.port).serve_forever()
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+
+"""
+Implementation of a local tax engine, i.e. an offline alternative to the Skatteetaten tax
+calculator
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+from typing import Union
+from datetime import date
+from math import ceil, floor
+
+from source.util import Assertor, LOGGER, Tracking
+
+from .tax_rates import TAX_RATES, SKATTEKLASSE, SKATTESTED
+
+
+class LocalTax:  # pylint: disable=too-many-instance-attributes
+    """
+    Class that produces estimated total Taxes for a given year without a network round trip,
+    i.e. with the same inputs and the same tax information as Skatteetaten, calculated from
+    the rate tables in tax_rates. Use calculate() directly for sweeps over many inputs. The
+    engine is opt-in (STRESSA_TAX_ENGINE=local) and unvalidated until LocalTaxValidation
+    reports no differences for recorded Skatteetaten responses
+
+    """
+
+    tax_years = tuple(TAX_RATES)
+
+    def __init__(self, age: Union[str, int],
+                 income: Union[str, int, float],
+                 tax_year: Union[str, int] = date.today().year,
+                 interest_income: Union[str, int, float] = 0,
+                 interest_cost: Union[str, int, float] = 0,
+                 value_of_real_estate: Union[str, int, float] = 0,
+                 bank_deposit: Union[str, int, float] = 0,
+                 debt: Union[str, int, float] = 0,
+                 union_fee: Union[str, int, float] = 0,
+                 bsu: Union[str, int, float] = 0,
+                 other_income: Union[str, int, float] = 0,
+                 rental_income: Union[str, int, float] = 0):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        age                 : str, int
+                              age of individual
+        income              : str, int, float
+                              income of individual
+        tax_year            : str, int
+                              tax year to calculate taxes
+        interest_income     : str, int, float
+                              income of interest
+        interest_cost       : str, int, float
+                              cost of income
+        value_of_real_estate: str, int, float
+                              value of real-estate (if any applies)
+        bank_deposit        : str, int, float
+                              value of bank deposit
+        debt                : str, int, float
+                              total debt
+        union_fee           : str, int, float
+                              yearly union fee
+        bsu                 : str, int, float
+                              yearly bsu savings
+        other_income        : str, int, float
+                              other income to be taxed
+        rental_income       : str, int, float
+                              rental income
+
+        """
+        try:
+            Assertor.assert_data_types(
+                [age, income, tax_year, interest_income, interest_cost,
+                 value_of_real_estate, bank_deposit, debt, union_fee, bsu,
+                 other_income, rental_income],
+                [(str, int), (str, int, float), (int, str),
+                 (int, str, float), (int, str, float),
+                 (int, str, float), (int, str, float),
+                 (int, str, float), (int, str, float),
+                 (int, str, float), (int, str, float),
+                 (int, str, float)], boundary=True)
+            Assertor.assert_arguments([str(tax_year)], [{'year': self.tax_years}])
+
+            self.age = str(age)
+            self.income = str(income)
+            self.tax_year = str(date.today().year) if not tax_year else str(tax_year)
+            self.interest_income = str(interest_income or 0)
+            self.interest_cost = str(interest_cost or 0)
+            self.value_of_real_estate = str(value_of_real_estate or 0)
+            self.bank_deposit = str(bank_deposit or 0)
+            self.debt = str(debt or 0)
+            self.union_fee = str(union_fee or 0)
+            self.bsu = str(bsu or 0)
+            self.other_income = str(other_income or 0)
+            self.rental_income = str(rental_income or 0)
+        except Exception as local_tax_exception:
+            LOGGER.exception(local_tax_exception)
+            raise local_tax_exception
+
+    @Tracking
+    def tax_information(self):
+        """
+        method for getting tax dict given information passed to class
+
+        Returns
+        -------
+        out     : dict
+                  tax information given information passed through class, with the same keys
+                  and format as Skatteetaten.tax_information()
+
+        """
+        amounts = {attribute: float(getattr(self, attribute).replace(" ", "")) for attribute in
+                   ["age", "income", "interest_income", "interest_cost",
+                    "value_of_real_estate", "bank_deposit", "debt", "union_fee", "bsu",
+                    "other_income", "rental_income"]}
+        return self.format_tax_information(self.calculate(self.tax_year, **amounts))
+
+    @staticmethod
+    def round_kroner(amount: float):
+        """
+        method for rounding an amount to whole kroner, rounding half up
+
+        """
+        return int(floor(amount + 0.5))
+
+    @staticmethod
+    def bracket_tax(amount: float, brackets: tuple):
+        """
+        method for calculating a progressive tax of an amount
+
+        Parameters
+        ----------
+        amount      : float
+                      amount to tax
+        brackets    : tuple
+                      tuple of (lower limit, rate), in ascending order of lower limit
+
+        Returns
+        -------
+        out         : float
+                      tax of the amount
+
+        """
+        tax = 0.0
+        for i, (lower_limit, rate) in enumerate(brackets):
+            if amount <= lower_limit:
+                break
+            upper_limit = brackets[i + 1][0] if i + 1 < len(brackets) else amount
+            tax += (min(amount, upper_limit) - lower_limit) * rate
+        return tax
+
+    @classmethod
+    def calculate(cls, tax_year: str, age: float, income: float, interest_income: float = 0,
+                  interest_cost: float = 0, value_of_real_estate: float = 0,
+                  bank_deposit: float = 0, debt: float = 0, union_fee: float = 0,
+                  bsu: float = 0, other_income: float = 0, rental_income: float = 0):
+        """
+        method for calculating the taxes of a tax year, without any validation or formatting
+
+        Parameters
+        ----------
+        tax_year            : str
+                              tax year in TAX_RATES
+        age                 : float
+                              age of individual
+        income              : float
+                              income of individual
+        interest_income     : float
+                              income of interest
+        interest_cost       : float
+                              cost of income
+        value_of_real_estate: float
+                              value of real-estate, i.e. the wealth value of the primary home
+        bank_deposit        : float
+                              value of bank deposit
+        debt                : float
+                              total debt
+        union_fee           : float
+                              yearly union fee
+        bsu                 : float
+                              yearly bsu savings
+        other_income        : float
+                              other income to be taxed
+        rental_income       : float
+                              rental income
+
+        Returns
+        -------
+        out                 : dict
+                              tax information by Skatteetaten key, amounts in whole kroner and
+                              taxes as tuples of (grunnlag, beloep)
+
+        """
+        rates = TAX_RATES[tax_year]
+        rnd = cls.round_kroner
+        if tax_year == "2023":
+            # BSU is left out in 2023, just as in the Skatteetaten payload
+            bsu = 0
+
+        # income
+        wage_income = rnd(income) + rnd(other_income)
+        minstefradrag_rates = rates["minstefradrag"]
+        minstefradrag = 0
+        if wage_income > 0:
+            # rounded up to the nearest 10 kr, never above the maximum or the wage income
+            minstefradrag = ceil(max(wage_income * minstefradrag_rates["rate"],
+                                     minstefradrag_rates["min"]) / 10) * 10
+            minstefradrag = min(minstefradrag, minstefradrag_rates["max"], wage_income)
+        union_fee_deduction = min(rnd(union_fee), rates["fagforeningskontingent"])
+        income_sum = wage_income + rnd(interest_income) + rnd(rental_income)
+        deduction_sum = minstefradrag + rnd(interest_cost) + union_fee_deduction
+        ordinary_income = income_sum - deduction_sum
+        income_basis = max(ordinary_income - rates["personfradrag"], 0)
+
+        # income taxes, Oslo is both the municipality and the county
+        income_tax_rates = rates["inntektsskatt"]
+        municipal_tax = rnd(income_basis * (income_tax_rates["kommune"] +
+                                            income_tax_rates["fylkeskommune"]))
+        kommune_tax = rnd(income_basis * income_tax_rates["kommune"])
+        county_tax = rnd(income_basis * income_tax_rates["fylkeskommune"])
+        common_tax = rnd(income_basis * income_tax_rates["fellesskatt"])
+        bracket_tax = rnd(cls.bracket_tax(wage_income, rates["trinnskatt"]))
+
+        social_security_rates = rates["trygdeavgift"]
+        social_security = 0
+        if wage_income > social_security_rates["lower_limit"]:
+            rate = social_security_rates["rate"] if 17 <= age <= 69 else \
+                social_security_rates["low_rate"]
+            social_security = rnd(min(wage_income * rate, (
+                    wage_income - social_security_rates["lower_limit"]) *
+                                      social_security_rates["max_share"]))
+
+        # wealth taxes
+        gross_wealth = rnd(value_of_real_estate) + rnd(bank_deposit)
+        net_wealth = max(gross_wealth - rnd(debt), 0)
+        wealth_tax_rates = rates["formuesskatt"]
+        municipal_wealth_tax = rnd(max(net_wealth - wealth_tax_rates["bunnfradrag"], 0) *
+                                   wealth_tax_rates["kommune"])
+        state_wealth_tax = rnd(cls.bracket_tax(net_wealth, wealth_tax_rates["stat"]))
+
+        # tax credits
+        tax_before_credits = municipal_tax + common_tax + bracket_tax + social_security + \
+            municipal_wealth_tax + state_wealth_tax
+        bsu_rates = rates["bsu"]
+        bsu_credit = 0
+        if age <= bsu_rates["max_age"]:
+            bsu_credit = min(rnd(min(bsu, bsu_rates["max"]) * bsu_rates["rate"]),
+                             municipal_tax + common_tax + bracket_tax + social_security)
+
+        return {
+            "skatteklasse": SKATTEKLASSE,
+            "skatteregnskapskommune": SKATTESTED,
+            "nettoinntekt": ordinary_income,
+            "nettoformue": net_wealth,
+            "beregnetSkattFoerSkattefradrag": ("", tax_before_credits),
+            "sumSkattefradrag": ("", bsu_credit),
+            "beregnetSkatt": ("", tax_before_credits - bsu_credit),
+            "inntektsskattTilKommuneOgFylkeskommune": (income_basis, municipal_tax),
+            "inntektsskattTilKommune": (income_basis, kommune_tax),
+            "inntektsskattTilFylkeskommune": (income_basis, county_tax),
+            "fellesskatt": (income_basis, common_tax),
+            "trinnskatt": (wage_income, bracket_tax),
+            "trygdeavgiftAvLoennsinntekt": (wage_income, social_security),
+            "sumTrygdeavgift": (wage_income, social_security),
+            "formuesskattTilKommune": (net_wealth, municipal_wealth_tax),
+            "formuesskattTilStat": (net_wealth, state_wealth_tax),
+            "personinntektFraLoennsinntekt": wage_income,
+            "samletLoennsinntektMedTrygdeavgiftspliktOgMedTrekkplikt": rnd(income),
+            "minstefradragIInntekt": minstefradrag,
+            "sumMinstefradrag": minstefradrag,
+            "samledeOpptjenteRenterIInnenlandskeBanker": rnd(interest_income),
+            "samledePaaloepteRenterPaaGjeldIInnenlandskeBanker": rnd(interest_cost),
+            "samletSkattepliktigOverskuddFraUtleieAvFastEiendom": rnd(rental_income),
+            "fradragForFagforeningskontingent": union_fee_deduction,
+            "innbetaltBeloepPaaBSUKontoIInntektsaar": rnd(bsu),
+            "sumInntekterIAlminneligInntektFoerFordelingsfradrag": income_sum,
+            "sumFradragIAlminneligInntekt": deduction_sum,
+            "alminneligInntektFoerSaerfradrag": ordinary_income,
+            "alminneligInntektFoerFordelingsfradrag": ordinary_income,
+            "samletGrunnlagForInntektsskattTilKommuneOgFylkeskommuneStatsskattOgFellesskatt":
+                max(ordinary_income, 0),
+            "formuesverdiForPrimaerbolig": rnd(value_of_real_estate),
+            "formuesverdiSomPrimaerbolig": rnd(value_of_real_estate),
+            "samletVerdiFoerVerdsettingsrabattForPrimaerbolig": rnd(value_of_real_estate / 0.25),
+            "samletInnskuddIInnenlandskeBanker": rnd(bank_deposit),
+            "samletVerdiFoerVerdsettingsrabattForAlleFormuesobjekter":
+                rnd(value_of_real_estate / 0.25) + rnd(bank_deposit),
+            # skatteklasse 1, i.e. no spouse
+            "ektefellenesSamledeVerdiFoerVerdsettingsrabattForAlleFormuesobjekter": 0,
+            "bruttoformue": gross_wealth,
+            "gjeldIInnenlandskeBanker": rnd(debt),
+            "samletGjeld": rnd(debt)
+        }
+
+    @staticmethod
+    def money(amount):
+        """
+        method for formatting an amount as Money(str(amount)).value()
+
+        """
+        return "" if amount == "" else f"{amount:,}".replace(",", " ") + " kr"
+
+    @classmethod
+    def format_tax_information(cls, calculation: dict):
+        """
+        method for formatting a calculation in the format of Skatteetaten.tax_information()
+
+        Parameters
+        ----------
+        calculation : dict
+                      calculation from calculate()
+
+        Returns
+        -------
+        out         : dict
+                      tax information with Money formatted amounts
+
+        """
+        tax_info = {}
+        for key, value in calculation.items():
+            if isinstance(value, tuple):
+                tax_info[key] = {"grunnlag": cls.money(value[0]), "beloep": cls.money(value[1])}
+            elif isinstance(value, str):
+                tax_info[key] = value
+            else:
+                tax_info[key] = cls.money(value)
+        return tax_info
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+"""
+Validation harness of the local tax engine against recorded Skatteetaten responses
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+import json
+from decimal import Decimal, InvalidOperation
+
+from source.util import Assertor, LOGGER
+
+from .settings import TAX_RECORDINGS_DIR
+from .skatteetaten import Skatteetaten
+from .local_tax import LocalTax
+
+
+class LocalTaxValidation:
+    """
+    Harness comparing LocalTax with recorded responses of the Skatteetaten tax calculator. A
+    recording is a JSON file with the inputs of Skatteetaten and its response, made with
+    record(). Every amount in the recorded tax information is compared with LocalTax, and
+    amounts differing by more than tolerance kr are reported
+
+    """
+
+    def __init__(self, directory: str = TAX_RECORDINGS_DIR, tolerance: int = 1):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        directory   : str
+                      directory of the recordings
+        tolerance   : int
+                      largest accepted difference in kr
+
+        """
+        Assertor.assert_data_types([directory, tolerance], [str, int])
+        self.directory = directory
+        self.tolerance = tolerance
+
+    def record(self, name: str, **inputs):
+        """
+        method for recording the response of the Skatteetaten tax calculator
+
+        Parameters
+        ----------
+        name        : str
+                      name of the recording
+        inputs      : dict
+                      keyword arguments to Skatteetaten, e.g. age and income
+
+        Returns
+        -------
+        out         : str
+                      path of the recording
+
+        """
+        Assertor.assert_data_types([name], [str])
+        response = Skatteetaten(**inputs).response().json()
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{name}.json")
+        with open(path, "w", encoding="utf-8") as recording_file:
+            json.dump({"inputs": inputs, "response": response}, recording_file,
+                      ensure_ascii=False, indent=2)
+        LOGGER.info(f"recorded Skatteetaten response '{name}' in '{path}'")
+        return path
+
+    def recordings(self):
+        """
+        method for reading the recordings in the directory
+
+        Returns
+        -------
+        out         : dict
+                      recordings by name, in order of name
+
+        """
+        if not os.path.isdir(self.directory):
+            return {}
+        recordings = {}
+        for file_name in sorted(os.listdir(self.directory)):
+            if file_name.endswith(".json"):
+                with open(os.path.join(self.directory, file_name), encoding="utf-8") as file:
+                    recordings[file_name[:-len(".json")]] = json.load(file)
+        return recordings
+
+    @staticmethod
+    def amounts(tax_information: dict):
+        """
+        method for getting the amounts of tax information, i.e. every Money formatted value,
+        taxes flattened into '<key>.grunnlag' and '<key>.beloep'
+
+        Parameters
+        ----------
+        tax_information : dict
+                          tax information from Skatteetaten or LocalTax
+
+        Returns
+        -------
+        out             : dict
+                          amounts as Decimal by key
+
+        """
+        amounts = {}
+        for key, value in tax_information.items():
+            values = {f"{key}.{sub_key}": sub_value for sub_key, sub_value in
+                      value.items()} if isinstance(value, dict) else {key: value}
+            for amount_key, amount in values.items():
+                try:
+                    amounts[amount_key] = Decimal(amount.replace("kr", "").replace(" ", ""))
+                except InvalidOperation:
+                    continue
+        return amounts
+
+    def compare(self, recording: dict):
+        """
+        method for comparing a recording with LocalTax
+
+        Parameters
+        ----------
+        recording   : dict
+                      recording with inputs and response
+
+        Returns
+        -------
+        out         : dict
+                      differences as (recorded, local) by key, local None if not calculated
+
+        """
+        Assertor.assert_data_types([recording], [dict])
+        recorded = self.amounts(Skatteetaten.parse_tax_information(recording["response"]))
+        local = self.amounts(LocalTax(**recording["inputs"]).tax_information())
+        return {key: (amount, local.get(key)) for key, amount in recorded.items() if
+                key not in local or abs(amount - local[key]) > self.tolerance}
+
+    def validate(self):
+        """
+        method for validating LocalTax against all recordings in the directory
+
+        Returns
+        -------
+        out         : dict
+                      differences by name of recording, see compare()
+
+        """
+        differences = {name: self.compare(recording) for name, recording in
+                       self.recordings().items()}
+        failed = [name for name, difference in differences.items() if difference]
+        LOGGER.info(f"local tax validation: {len(differences) - len(failed)} of "
+                    f"{len(differences)} recordings within {self.tolerance} kr")
+        for name in failed:
+            LOGGER.warning(f"local tax validation: '{name}' differs in {differences[name]}")
+        return differences
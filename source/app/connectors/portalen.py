@@ -8,25 +8,32 @@ Implementation of connector against finansportalen.no xml feed
 __author__ = 'Samir Adrik'
 __email__ = 'samir.adrik@gmail.com'
 
-import re
+from io import BytesIO
 from http.client import responses
-import xml.etree.ElementTree as Et
+from threading import Lock
+from time import time
 
-import requests
 from requests.exceptions import ReadTimeout, ConnectionError as ConnectError
 
 from source.util import LOGGER, NoConnectionError, TimeOutError, InvalidDataError, Tracking
 
-from .settings import PORTALEN_URL, PORTALEN_CRED, PORTALEN_ENTRY, TIMEOUT
+from .settings import PORTALEN_URL, PORTALEN_CRED, PORTALEN_OFFERS_TTL, TIMEOUT, \
+    CONNECT_TIMEOUT
+from .portalen_offers import PortalenOffers
 from .connector import Connector
 
 
 class Portalen(Connector):
     """
-    Connector that retrieves information from finansportalen.no mortgage XML feed
+    Connector that retrieves information from finansportalen.no mortgage XML feed. The parsed
+    table of offers is shared by all instances for PORTALEN_OFFERS_TTL seconds
 
     """
 
+    _offers = None
+    _offers_parsed = 0.0
+    _offers_lock = Lock()
+
     def __init__(self):
         """
         Constructor / Instantiate the class
@@ -48,7 +55,8 @@ class Portalen(Connector):
 
         """
         try:
-            response = requests.get(PORTALEN_URL, auth=PORTALEN_CRED, timeout=TIMEOUT)
+            response = self.session(PORTALEN_URL).get(PORTALEN_URL, auth=PORTALEN_CRED,
+                                                      timeout=(CONNECT_TIMEOUT, TIMEOUT))
             status_code = response.status_code
             LOGGER.info(f"HTTP status code -> [{status_code}: {responses[status_code]}]")
             return response
@@ -78,22 +86,46 @@ class Portalen(Connector):
 
         response = self.portalen_response()
         if response:
-            tree = Et.fromstring(response.content.decode("windows-1252")).findall(PORTALEN_ENTRY)
-
-            offers = {}
-            count = 0
-
-            for entries in tree:
-                count += 1
-                offers.update(
-                    {count: {re.sub("{[^>]+}", "", entry.tag): entry.text.strip() for entry in
-                             entries if entry.text}}
-                )
-
+            offers = dict(enumerate(PortalenOffers.entries(BytesIO(response.content)), 1))
             LOGGER.success(f"'{self.mortgage_offers.__name__}' successfully retrieved")
             return offers
         raise InvalidDataError("No 'mortgage_offers' received")
 
+    @Tracking
+    def offers(self):
+        """
+        Retrieve finansportalen.no's boliglån grunndata xml as a table of offers, parsed at
+        most once per PORTALEN_OFFERS_TTL seconds
+
+        Returns
+        -------
+        PortalenOffers
+            table of mortgage offers indexed by bank and rate band
+
+        """
+        with self._offers_lock:
+            if Portalen._offers is None or time() - Portalen._offers_parsed > \
+                    PORTALEN_OFFERS_TTL:
+                LOGGER.info(f"trying to retrieve '{self.offers.__name__}'")
+                response = self.portalen_response()
+                if not response:
+                    raise InvalidDataError("No 'offers' received")
+                Portalen._offers = PortalenOffers.parse(BytesIO(response.content))
+                Portalen._offers_parsed = time()
+                LOGGER.success(f"'{self.offers.__name__}' successfully parsed with "
+                               f"{len(Portalen._offers)} offers")
+            return Portalen._offers
+
+    @classmethod
+    def clear_offers(cls):
+        """
+        method for clearing the cached table of offers
+
+        """
+        with cls._offers_lock:
+            cls._offers = None
+            cls._offers_parsed = 0.0
+
     @Tracking
     def to_json(self, file_dir: str = "report/json/mortgage_offers"):
         """
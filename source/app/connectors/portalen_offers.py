@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module with logic for the columnar table of mortgage offers in the finansportalen.no feed
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+from bisect import bisect_left
+from math import floor
+import xml.etree.ElementTree as Et
+
+from source.util import Assertor, InvalidDataError
+
+from .settings import PORTALEN_ENTRY, PORTALEN_RATE_BAND
+
+
+class PortalenOffers:
+    """
+    Columnar table of the mortgage offers in the finansportalen.no Atom feed, parsed in one
+    streaming pass. Offers are ordered by effective rate, and indexed by bank and by rate band,
+    so queries like the cheapest offers for a loan amount do not rescan the feed. A feed where
+    a required field is missing in every entry, e.g. after the feed renamed it, is rejected
+
+    """
+
+    fields = {"bank": "leverandor_tekst",
+              "product": "produktnavn",
+              "nominal_rate": "nominell_rente_1",
+              "effective_rate": "effektiv_rente_1",
+              "min_amount": "min_belop",
+              "max_amount": "maks_belop"}
+
+    numeric_fields = ("nominal_rate", "effective_rate", "min_amount", "max_amount")
+
+    required_fields = ("bank", "effective_rate")
+
+    @staticmethod
+    def entries(source, encoding: str = "windows-1252"):
+        """
+        method for streaming the entries of the feed, i.e. one dict of the non-empty fields of
+        an entry at a time, without building the tree of the feed
+
+        Parameters
+        ----------
+        source      : file-like object, str
+                      feed as binary file object or path
+        encoding    : str
+                      encoding of the feed
+
+        Returns
+        -------
+        out         : generator
+                      generator of dicts of field name (without namespace) and text
+
+        """
+        local_names = {}
+        for _, element in Et.iterparse(source, events=("end",),
+                                       parser=Et.XMLParser(encoding=encoding)):
+            if element.tag != PORTALEN_ENTRY:
+                continue
+            entry = {}
+            for field in element:
+                if field.text:
+                    name = local_names.get(field.tag)
+                    if name is None:
+                        name = local_names.setdefault(field.tag, field.tag.rpartition("}")[2])
+                    entry[name] = field.text.strip()
+            element.clear()
+            yield entry
+
+    @staticmethod
+    def number(text: str):
+        """
+        method for parsing a number of the feed, e.g. '3,45' or '1 000 000'
+
+        Returns
+        -------
+        out         : float
+                      number, None if missing or invalid
+
+        """
+        try:
+            return float(text.replace("\xa0", "").replace(" ", "").replace("%", "")
+                         .replace(",", "."))
+        except (AttributeError, ValueError):
+            return None
+
+    @classmethod
+    def parse(cls, source, encoding: str = "windows-1252", band_width: float = PORTALEN_RATE_BAND):
+        """
+        method for parsing the feed into a table
+
+        Parameters
+        ----------
+        source      : file-like object, str
+                      feed as binary file object or path
+        encoding    : str
+                      encoding of the feed
+        band_width  : float
+                      width of the rate bands in percentage points
+
+        Returns
+        -------
+        out         : PortalenOffers
+                      table of the offers in the feed
+
+        """
+        return cls(cls.entries(source, encoding), band_width)
+
+    def __init__(self, entries, band_width: float = PORTALEN_RATE_BAND):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        entries     : iterable
+                      dicts of the fields of every entry, see entries()
+        band_width  : float
+                      width of the rate bands in percentage points
+
+        """
+        Assertor.assert_data_types([band_width], [(int, float)])
+        if band_width <= 0:
+            raise ValueError(f"band_width must be positive, got '{band_width}'")
+        self.band_width = band_width
+        self.columns = {column: [] for column in self.fields}
+
+        for entry in entries:
+            for column, name in self.fields.items():
+                value = entry.get(name)
+                self.columns[column].append(self.number(value) if column in
+                                            self.numeric_fields else value)
+        for column in self.required_fields:
+            if len(self) and all(value is None for value in self.columns[column]):
+                raise InvalidDataError(f"no valid '{self.fields[column]}' in any of the "
+                                       f"{len(self)} entries of the feed")
+
+        effective_rates = self.columns["effective_rate"]
+        self.order = sorted(
+            (row for row in range(len(self)) if effective_rates[row] is not None),
+            key=lambda row: (effective_rates[row], self.columns["nominal_rate"][row] or 0))
+        self.by_bank, self.by_band = {}, {}
+        for row in self.order:
+            self.by_bank.setdefault(self.columns["bank"][row], []).append(row)
+            self.by_band.setdefault(self.band(effective_rates[row]), []).append(row)
+        self._sorted_rates = [effective_rates[row] for row in self.order]
+
+    def __len__(self):
+        """
+        number of offers in the table
+
+        """
+        return len(self.columns["bank"])
+
+    def band(self, rate: float):
+        """
+        method for getting the rate band of a rate
+
+        Returns
+        -------
+        out         : float
+                      lower limit of the rate band
+
+        """
+        return round(floor(rate / self.band_width) * self.band_width, 10)
+
+    def row(self, row: int):
+        """
+        method for getting an offer
+
+        Parameters
+        ----------
+        row         : int
+                      row of the offer in the table
+
+        Returns
+        -------
+        out         : dict
+                      offer with a value per column
+
+        """
+        return {column: values[row] for column, values in self.columns.items()}
+
+    def offers_for(self, loan_amount: float, row: int):
+        """
+        method for checking whether an offer is available for a loan amount
+
+        """
+        min_amount, max_amount = self.columns["min_amount"][row], \
+            self.columns["max_amount"][row]
+        return (min_amount is None or min_amount <= loan_amount) and \
+            (max_amount is None or loan_amount <= max_amount)
+
+    def cheapest(self, loan_amount: float, count: int = 10, bank: str = None):
+        """
+        method for getting the cheapest offers available for a loan amount
+
+        Parameters
+        ----------
+        loan_amount : float
+                      amount to borrow
+        count       : int
+                      maximum number of offers
+        bank        : str
+                      only offers of this bank, None for all banks
+
+        Returns
+        -------
+        out         : list
+                      offers ordered by effective rate
+
+        """
+        Assertor.assert_data_types([loan_amount, count, bank],
+                                   [(int, float), int, (str, type(None))])
+        rows = self.order if bank is None else self.by_bank.get(bank, [])
+        offers = []
+        for row in rows:
+            if len(offers) == count:
+                break
+            if self.offers_for(loan_amount, row):
+                offers.append(self.row(row))
+        return offers
+
+    def bank(self, bank: str):
+        """
+        method for getting the offers of a bank
+
+        Parameters
+        ----------
+        bank        : str
+                      name of the bank
+
+        Returns
+        -------
+        out         : list
+                      offers of the bank ordered by effective rate
+
+        """
+        return [self.row(row) for row in self.by_bank.get(bank, [])]
+
+    def rate_band(self, low: float, high: float):
+        """
+        method for getting the offers with an effective rate in [low, high)
+
+        Parameters
+        ----------
+        low         : float
+                      lowest effective rate
+        high        : float
+                      effective rate above the offers
+
+        Returns
+        -------
+        out         : list
+                      offers ordered by effective rate
+
+        """
+        Assertor.assert_data_types([low, high], [(int, float), (int, float)])
+        start, end = bisect_left(self._sorted_rates, low), bisect_left(self._sorted_rates, high)
+        return [self.row(row) for row in self.order[start:end]]
+
+    def banks(self):
+        """
+        method for getting the banks in the table
+
+        Returns
+        -------
+        out         : list
+                      sorted names of the banks with offers with an effective rate
+
+        """
+        return sorted(bank for bank in self.by_bank if bank is not None)
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module with logic for the local registry of Norwegian postal codes
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+import re
+from bisect import bisect_left
+from sys import intern
+from threading import Lock
+
+from source.util import Assertor, LOGGER
+
+from .settings import POSTEN_URL, TIMEOUT, CONNECT_TIMEOUT
+from .connector import Connector
+
+
+class PostalCodeRegistry:
+    """
+    Local registry of postal codes, loaded from a tab separated file and refreshed from the
+    posten.no API in bulk. Postal codes are kept in a sorted index for exact lookup and prefix
+    autocomplete, by postal code or poststed
+
+    """
+
+    columns = ("postnr", "poststed", "kommune", "fylke")
+
+    valid_postal_code = re.compile(r"^[0-9]{4}$")
+
+    @staticmethod
+    def from_posten(postal_code: dict):
+        """
+        method for converting a postal code of the posten.no API to a registry entry
+
+        Parameters
+        ----------
+        postal_code : dict
+                      postal code of a posten.no response
+
+        Returns
+        -------
+        out         : dict
+                      dictionary with postnr, poststed, kommune and fylke
+
+        """
+        Assertor.assert_data_types([postal_code], [dict])
+        return {'postnr': postal_code['postal_code'],
+                'poststed': postal_code['city'],
+                'kommune': postal_code['primary_county'],
+                'fylke': postal_code['primary_municipality']}
+
+    def __init__(self, path: str = None):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        path        : str
+                      path of the tab separated file of the registry, None for memory only
+
+        """
+        Assertor.assert_data_types([path], [(str, type(None))])
+        self.path = path
+        self._places = {}
+        self._codes = []
+        self._poststeder = []
+        self._loaded = False
+        self._lock = Lock()
+
+    def __len__(self):
+        """
+        number of postal codes in the registry
+
+        """
+        self.load()
+        return len(self._places)
+
+    def load(self):
+        """
+        method for loading the registry from disk, once per instance
+
+        """
+        with self._lock:
+            if self._loaded:
+                return
+            if self.path and os.path.isfile(self.path):
+                with open(self.path, encoding="utf-8") as registry_file:
+                    entries = [dict(zip(self.columns, line.rstrip("\n").split("\t"))) for line
+                               in registry_file if line.count("\t") == len(self.columns) - 1]
+                self._index(entries)
+                LOGGER.info(f"loaded {len(self._places)} postal codes from '{self.path}'")
+            self._loaded = True
+
+    def _index(self, entries):
+        """
+        method for adding entries to the index, later entries replace earlier ones
+
+        """
+        for entry in entries:
+            if self.valid_postal_code.match(entry["postnr"]):
+                self._places[entry["postnr"]] = tuple(
+                    intern(str(entry[column])) for column in self.columns[1:])
+        self._codes = sorted(self._places)
+        self._poststeder = sorted((place[0].lower(), code) for code, place in
+                                  self._places.items())
+
+    def entry(self, postal_code: str):
+        """
+        method for getting the entry of a postal code in the index
+
+        """
+        place = self._places.get(postal_code)
+        return None if place is None else dict(zip(self.columns, (postal_code,) + place))
+
+    def get(self, postal_code: str):
+        """
+        method for looking up a postal code
+
+        Parameters
+        ----------
+        postal_code : str
+                      postal code to look up
+
+        Returns
+        -------
+        out         : dict
+                      dictionary with postnr, poststed, kommune and fylke, None if not in the
+                      registry
+
+        """
+        Assertor.assert_data_types([postal_code], [str])
+        self.load()
+        return self.entry(postal_code)
+
+    def complete(self, prefix: str, limit: int = 10):
+        """
+        method for autocompleting a postal code, or a poststed if prefix is not numeric
+
+        Parameters
+        ----------
+        prefix      : str
+                      start of a postal code or poststed
+        limit       : int
+                      maximum number of postal codes
+
+        Returns
+        -------
+        out         : list
+                      entries of the matching postal codes, in order of postal code or
+                      poststed
+
+        """
+        Assertor.assert_data_types([prefix, limit], [str, int])
+        self.load()
+        prefix = prefix.strip()
+        if prefix.isdigit():
+            codes = self._codes[bisect_left(self._codes, prefix):]
+            matches = [code for code in codes[:limit] if code.startswith(prefix)]
+        else:
+            prefix = prefix.lower()
+            poststeder = self._poststeder[bisect_left(self._poststeder, (prefix, "")):]
+            matches = [code for poststed, code in poststeder[:limit] if
+                       poststed.startswith(prefix)]
+        return [self.entry(code) for code in matches]
+
+    def add(self, entries: list):
+        """
+        method for adding entries to the registry, appending them to the file of the registry
+
+        Parameters
+        ----------
+        entries     : list
+                      dictionaries with postnr, poststed, kommune and fylke
+
+        """
+        Assertor.assert_data_types([entries], [list])
+        self.load()
+        with self._lock:
+            self._index(entries)
+            if self.path:
+                try:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                    with open(self.path, "a", encoding="utf-8") as registry_file:
+                        registry_file.writelines(self.line(entry["postnr"]) for entry in
+                                                 entries if entry["postnr"] in self._places)
+                except OSError as persist_error:
+                    LOGGER.warning(f"postal codes not persisted, exited with '{persist_error}'")
+
+    def line(self, postal_code: str):
+        """
+        method for getting the line of a postal code in the file of the registry
+
+        """
+        return "\t".join((postal_code,) + self._places[postal_code]) + "\n"
+
+    def save(self):
+        """
+        method for writing the registry to disk, replacing the previous file atomically
+
+        """
+        with self._lock:
+            lines = [self.line(code) for code in self._codes]
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path + ".tmp", "w", encoding="utf-8") as registry_file:
+            registry_file.writelines(lines)
+        os.replace(self.path + ".tmp", self.path)
+
+    def refresh(self, prefixes: list = None):
+        """
+        method for refreshing the registry in bulk from the posten.no API, i.e. one request
+        per prefix, storing every postal code in the responses
+
+        Parameters
+        ----------
+        prefixes    : list
+                      postal code prefixes to request, default is all two digit prefixes
+
+        Returns
+        -------
+        out         : int
+                      number of postal codes received
+
+        """
+        Assertor.assert_data_types([prefixes], [(list, type(None))])
+        self.load()
+        entries = []
+        for prefix in prefixes or [f"{prefix:02d}" for prefix in range(100)]:
+            response = Connector.session(POSTEN_URL).get(POSTEN_URL + prefix,
+                                                         timeout=(CONNECT_TIMEOUT, TIMEOUT))
+            response.raise_for_status()
+            entries.extend(self.from_posten(postal_code) for postal_code in
+                           response.json().get("postal_codes", []))
+        with self._lock:
+            self._index(entries)
+        if self.path:
+            self.save()
+        LOGGER.success(f"postal code registry refreshed with {len(entries)} postal codes")
+        return len(entries)
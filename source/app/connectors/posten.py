@@ -13,20 +13,23 @@ from time import time
 import re
 from http.client import responses
 from requests.exceptions import ConnectTimeout, ConnectionError as ConnectError
-import requests
 
 from source.util import Assertor, LOGGER, InvalidDataError, NoConnectionError, TimeOutError, \
     Tracking
-from .settings import POSTEN_URL, TIMEOUT
+from .settings import POSTEN_URL, POSTAL_CODE_REGISTRY, TIMEOUT, CONNECT_TIMEOUT
+from .postal_code_registry import PostalCodeRegistry
 from .connector import Connector
 
 
 class Posten(Connector):
     """
-    Posten.no postboks search connector
+    Posten.no postboks search connector. Postal codes are looked up in the local registry
+    first, and only postal codes missing from the registry are requested from posten.no
 
     """
 
+    registry = PostalCodeRegistry(POSTAL_CODE_REGISTRY)
+
     @Tracking
     def validate_postal_code(self):
         """
@@ -51,7 +54,7 @@ class Posten(Connector):
         """
         try:
             super().__init__()
-            Assertor.assert_data_types([postal_code], [str])
+            Assertor.assert_data_types([postal_code], [str], boundary=True)
             self._postal_code = postal_code
             self.validate_postal_code()
             LOGGER.success(
@@ -103,8 +106,8 @@ class Posten(Connector):
         try:
             try:
                 start = time()
-                posten_response = requests.get(POSTEN_URL + f"{self.postal_code}",
-                                               timeout=TIMEOUT)
+                posten_response = self.session(POSTEN_URL).get(
+                    POSTEN_URL + f"{self.postal_code}", timeout=(CONNECT_TIMEOUT, TIMEOUT))
                 posten_status_code = posten_response.status_code
                 elapsed = self.elapsed_time(start)
                 LOGGER.info(
@@ -136,13 +139,10 @@ class Posten(Connector):
         """
         LOGGER.info(f"trying to retrieve 'postal_code_info' for -> '{self.postal_code}'")
 
-        response = self.response().json()['postal_codes'][0]
-        data = {
-            'postnr': response['postal_code'],
-            'poststed': response['city'],
-            'kommune': response['primary_county'],
-            'fylke': response['primary_municipality']
-        }
+        data = self.registry.get(self.postal_code)
+        if data is None:
+            data = PostalCodeRegistry.from_posten(self.response().json()['postal_codes'][0])
+            self.registry.add([data])
         return data
 
     @Tracking
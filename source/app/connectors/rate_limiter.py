@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module with logic for the RateLimiter of requests per host, and the HTTP adapter using it
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import asyncio
+from contextlib import contextmanager
+from threading import Lock
+from time import monotonic, sleep
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+from source.util import Assertor
+
+
+class RateLimiter:
+    """
+    Implementation of a rate limiter of requests per host, i.e. requests to the same host are
+    spread out to at most rate requests per second, while requests to different hosts do not
+    wait for each other. A rate of 0 disables the limiter
+
+    """
+
+    def __init__(self, rate: float):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        rate        : float
+                      maximum number of requests per second per host
+
+        """
+        Assertor.assert_data_types([rate], [(int, float)])
+        if rate < 0:
+            raise ValueError(f"rate must be non-negative, got '{rate}'")
+        self.rate = rate
+        self._next = {}
+        self._lock = Lock()
+
+    def delay(self, url: str):
+        """
+        method for reserving the next free slot of the host of a url
+
+        Parameters
+        ----------
+        url         : str
+                      url to request
+
+        Returns
+        -------
+        out         : float
+                      seconds to wait before the request can be sent
+
+        """
+        Assertor.assert_data_types([url], [str])
+        if not self.rate:
+            return 0.0
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + 1 / self.rate
+        return slot - now
+
+    def wait(self, url: str):
+        """
+        method for waiting until a request to the host of a url is within the rate limit
+
+        Parameters
+        ----------
+        url         : str
+                      url to request
+
+        """
+        delay = self.delay(url)
+        if delay > 0:
+            sleep(delay)
+
+    async def wait_async(self, url: str):
+        """
+        method for waiting, without blocking the event loop, until a request to the host of a
+        url is within the rate limit
+
+        Parameters
+        ----------
+        url         : str
+                      url to request
+
+        """
+        delay = self.delay(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    @contextmanager
+    def limited(self, rate: float):
+        """
+        method for temporarily changing the rate of the limiter
+
+        Parameters
+        ----------
+        rate        : float
+                      maximum number of requests per second per host while in the context
+
+        """
+        Assertor.assert_data_types([rate], [(int, float)])
+        if rate < 0:
+            raise ValueError(f"rate must be non-negative, got '{rate}'")
+        with self._lock:
+            previous, self.rate = self.rate, rate
+            self._next.clear()
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self.rate = previous
+                self._next.clear()
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    HTTP adapter waiting for the rate limit of the host before sending a request over the
+    network, so responses served from a cache are never delayed
+
+    """
+
+    def __init__(self, rate_limiter: RateLimiter, **kwargs):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        rate_limiter    : RateLimiter
+                          rate limiter of the requests
+        kwargs          : dict
+                          keyword arguments to HTTPAdapter, e.g. pool_maxsize
+
+        """
+        Assertor.assert_data_types([rate_limiter], [RateLimiter])
+        super().__init__(**kwargs)
+        self.rate_limiter = rate_limiter
+
+    def send(self, request, *args, **kwargs):  # pylint: disable=arguments-differ
+        """
+        method for sending a request within the rate limit of its host
+
+        """
+        self.rate_limiter.wait(request.url)
+        return super().send(request, *args, **kwargs)
@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module with logic for the CircuitBreaker of hosts, and the HTTP adapter retrying requests
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+from random import uniform
+from threading import Lock
+from time import monotonic, perf_counter, sleep
+from urllib.parse import urlsplit
+
+from requests.exceptions import ConnectionError as ConnectError, ConnectTimeout, Timeout
+
+from source.util import Assertor, LOGGER, METRICS, RunContext
+
+from .settings import ENDPOINT_TIMEOUT, RETRIES, RETRY_BACKOFF, RETRY_BACKOFF_MAX, \
+    RETRY_STATUSES
+from .rate_limiter import RateLimitedAdapter
+
+
+class CircuitOpenError(ConnectError):
+    """
+    Exception raised, without sending the request, when the circuit of a host is open
+
+    """
+
+
+class LatencyBudgetError(ConnectTimeout):
+    """
+    Exception raised, without sending the request, when the latency budget of the running
+    process is spent
+
+    """
+
+
+class CircuitBreaker:
+    """
+    Implementation of a circuit breaker per host, i.e. after failures consecutive failed
+    requests to a host the circuit is opened, and requests to the host fail fast for
+    reset_timeout seconds. One trial request is then let through (half-open), closing the
+    circuit if it succeeds and opening it again if it fails. A failures of 0 disables the
+    breaker
+
+    """
+
+    def __init__(self, failures: int, reset_timeout: float):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        failures        : int
+                          consecutive failures opening the circuit of a host
+        reset_timeout   : float
+                          seconds the circuit is open before a trial request
+
+        """
+        Assertor.assert_data_types([failures, reset_timeout], [int, (int, float)])
+        if failures < 0 or reset_timeout < 0:
+            raise ValueError(f"failures and reset_timeout must be non-negative, got "
+                             f"'{failures}' and '{reset_timeout}'")
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self._hosts = {}
+        self._lock = Lock()
+
+    def state(self, url: str):
+        """
+        method for getting the state of the circuit of the host of a url
+
+        Parameters
+        ----------
+        url         : str
+                      url or host
+
+        Returns
+        -------
+        out         : str
+                      'closed', 'open' or 'half-open'
+
+        """
+        host = urlsplit(url).netloc or url
+        with self._lock:
+            _, opened, trial = self._hosts.get(host, (0, None, False))
+        if opened is None:
+            return "closed"
+        return "half-open" if trial or monotonic() - opened >= self.reset_timeout else "open"
+
+    def allow(self, url: str):
+        """
+        method for checking whether a request to the host of a url may be sent, i.e. the
+        circuit is closed, or it is the trial request of an open circuit
+
+        Parameters
+        ----------
+        url         : str
+                      url to request
+
+        Returns
+        -------
+        out         : bool
+                      True if the request may be sent
+
+        """
+        if not self.failures:
+            return True
+        host = urlsplit(url).netloc
+        with self._lock:
+            failures, opened, trial = self._hosts.get(host, (0, None, False))
+            if opened is None:
+                return True
+            if trial or monotonic() - opened < self.reset_timeout:
+                return False
+            self._hosts[host] = (failures, opened, True)
+            return True
+
+    def success(self, url: str):
+        """
+        method for recording a successful request, closing the circuit of the host
+
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            opened = self._hosts.pop(host, (0, None, False))[1]
+        if opened is not None:
+            METRICS.gauge("stressa_circuit_open", "Open (1) or closed (0) circuit of the hosts",
+                          host=host).set(0)
+
+    def failure(self, url: str):
+        """
+        method for recording a failed request, opening the circuit of the host after failures
+        consecutive failures or a failed trial request
+
+        """
+        if not self.failures:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            failures, opened, trial = self._hosts.get(host, (0, None, False))
+            failures += 1
+            if trial or failures >= self.failures:
+                if opened is None or trial:
+                    LOGGER.warning(f"circuit opened for '{host}' after {failures} failures")
+                opened = monotonic()
+            self._hosts[host] = (failures, opened, False)
+        if opened is not None:
+            METRICS.gauge("stressa_circuit_open", "Open (1) or closed (0) circuit of the hosts",
+                          host=host).set(1)
+
+    def reset(self):
+        """
+        method for closing the circuits of all hosts
+
+        """
+        with self._lock:
+            opened = [host for host, (_, opened_at, _) in self._hosts.items() if
+                      opened_at is not None]
+            self._hosts.clear()
+        for host in opened:
+            METRICS.gauge("stressa_circuit_open", "Open (1) or closed (0) circuit of the hosts",
+                          host=host).set(0)
+
+    def metrics(self):
+        """
+        method for getting the state and consecutive failures of every host with failures
+
+        Returns
+        -------
+        out         : dict
+                      dictionary with host -> (state, failures)
+
+        """
+        with self._lock:
+            hosts = {host: failures for host, (failures, _, _) in self._hosts.items()}
+        return {host: (self.state(host), failures) for host, failures in hosts.items()}
+
+
+class ResilientAdapter(RateLimitedAdapter):
+    """
+    HTTP adapter with a timeout per endpoint, a circuit breaker per host, retries with jittered
+    exponential backoff of idempotent requests, and the latency budget of the process running
+    in the calling thread. Retries and rejected requests are counted in the profiling of the
+    process, and the latency and outcome of every request in the metrics registry (METRICS)
+
+    """
+
+    idempotent_methods = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, rate_limiter, circuit_breaker: CircuitBreaker = None,
+                 retries: int = RETRIES, **kwargs):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        rate_limiter    : RateLimiter
+                          rate limiter of the requests
+        circuit_breaker : CircuitBreaker
+                          circuit breaker of the hosts, None for no breaker
+        retries         : int
+                          maximum number of retries of an idempotent request
+        kwargs          : dict
+                          keyword arguments to HTTPAdapter, e.g. pool_maxsize
+
+        """
+        Assertor.assert_data_types([circuit_breaker, retries],
+                                   [(CircuitBreaker, type(None)), int])
+        super().__init__(rate_limiter, **kwargs)
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(0, 0)
+        self.retries = retries
+
+    @staticmethod
+    def backoff(attempt: int):
+        """
+        method for getting the delay before a retry, i.e. full jitter exponential backoff
+
+        Parameters
+        ----------
+        attempt     : int
+                      number of the retry, starting at 0
+
+        Returns
+        -------
+        out         : float
+                      delay in seconds
+
+        """
+        return uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * 2 ** attempt))
+
+    @staticmethod
+    def endpoint_timeout(url: str):
+        """
+        method for getting the read timeout of the endpoint of a url
+
+        Returns
+        -------
+        out         : float
+                      timeout in seconds, None if the endpoint has no timeout
+
+        """
+        endpoints = [endpoint for endpoint in ENDPOINT_TIMEOUT if url.startswith(endpoint)]
+        return ENDPOINT_TIMEOUT[max(endpoints, key=len)] if endpoints else None
+
+    @staticmethod
+    def context():
+        """
+        method for getting the context of the process running in the calling thread
+
+        """
+        return RunContext.current()
+
+    def timeout(self, request, timeout, context=None):
+        """
+        method for getting the timeout of a request, i.e. the timeout of its endpoint, within
+        the remaining latency budget of the running process
+
+        Parameters
+        ----------
+        request     : requests.PreparedRequest
+                      request to send
+        timeout     : float, tuple
+                      timeout asked for, as seconds or (connect, read)
+        context     : ProcessContext
+                      context of the running process, None if no process is running
+
+        Returns
+        -------
+        out         : tuple
+                      (connect, read) timeout in seconds
+
+        """
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        endpoint_timeout = self.endpoint_timeout(request.url)
+        if endpoint_timeout is not None:
+            read = endpoint_timeout
+            connect = min(connect, read) if connect is not None else read
+        remaining = context.remaining() if context else None
+        if remaining is not None:
+            if remaining <= 0:
+                context.add_http_count("rejected")
+                raise LatencyBudgetError(
+                    f"latency budget of '{context.name}' spent, '{request.url}' not requested",
+                    request=request)
+            connect = min(connect, remaining) if connect is not None else remaining
+            read = min(read, remaining) if read is not None else remaining
+        return connect, read
+
+    def send(self, request, stream=False,  # pylint: disable=arguments-differ
+             timeout=None, verify=True, cert=None, proxies=None):
+        """
+        method for sending a request, retrying failed idempotent requests
+
+        """
+        context = self.context()
+        retries = self.retries if request.method in self.idempotent_methods else 0
+        attempt = 0
+        while True:
+            request_timeout = self.timeout(request, timeout, context)
+            if not self.circuit_breaker.allow(request.url):
+                if context:
+                    context.add_http_count("rejected")
+                raise CircuitOpenError(
+                    f"circuit open for '{urlsplit(request.url).netloc}', "
+                    f"'{request.url}' not requested", request=request)
+
+            response, error = None, None
+            host, start = urlsplit(request.url).netloc, perf_counter()
+            try:
+                response = super().send(request, stream, request_timeout, verify, cert, proxies)
+            except (ConnectError, Timeout) as send_error:
+                error = send_error
+            except BaseException:
+                # any other error still ends a trial request, opening the circuit again
+                self.circuit_breaker.failure(request.url)
+                raise
+            METRICS.histogram("stressa_connector_seconds", "Latency of the HTTP requests",
+                              host=host).observe(perf_counter() - start)
+            METRICS.counter("stressa_connector_requests_total", "HTTP requests by outcome",
+                            host=host, outcome=error.__class__.__name__ if error else
+                            response.status_code).inc()
+            if error is None and response.status_code < 500:
+                self.circuit_breaker.success(request.url)
+            else:
+                self.circuit_breaker.failure(request.url)
+            if error is None and response.status_code not in RETRY_STATUSES:
+                return response
+
+            delay = self.backoff(attempt)
+            remaining = context.remaining() if context else None
+            if attempt >= retries or (remaining is not None and delay >= remaining) or \
+                    self.circuit_breaker.state(request.url) != "closed":
+                if error is not None:
+                    raise error
+                return response
+            if response is not None:
+                response.close()
+            attempt += 1
+            if context:
+                context.add_http_count("retries")
+            LOGGER.warning(f"retrying '{request.url}' in {round(delay, 3)}s (retry {attempt} "
+                           f"of {retries}), failed with '{error or response.status_code}'")
+            sleep(delay)
@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module with logic for the disk-backed HTTP response cache shared by all connectors
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import io
+import os
+import shutil
+import zlib
+from email.utils import formatdate, parsedate_to_datetime
+from threading import Lock, Thread
+from time import time
+
+from cachecontrol import CacheControlAdapter
+from cachecontrol.caches import FileCache
+from cachecontrol.heuristics import BaseHeuristic
+from urllib3 import HTTPResponse
+
+from source.util import Assertor, LOGGER
+
+from .resilience import ResilientAdapter
+
+
+class BoundedFileCache(FileCache):
+    """
+    FileCache bounded in size, i.e. the least recently used responses are evicted when the
+    total size of the cached responses exceeds max_bytes
+
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        directory   : str
+                      directory of the cache
+        max_bytes   : int
+                      maximum total size of the cached responses
+
+        """
+        Assertor.assert_data_types([directory, max_bytes], [str, int])
+        super().__init__(directory)
+        self.max_bytes = max_bytes
+        self._bytes = None
+        self._lock = Lock()
+
+    def get(self, key: str):
+        """
+        method for getting a cached response, marking it as recently used
+
+        Parameters
+        ----------
+        key         : str
+                      key of the response, i.e. the url
+
+        Returns
+        -------
+        out         : bytes
+                      serialized response, None if not cached
+
+        """
+        value = super().get(key)
+        if value is not None:
+            try:
+                os.utime(self._fn(key))
+            except OSError:
+                pass
+        return value
+
+    def set(self, key: str, value: bytes, expires=None):
+        """
+        method for caching a response, evicting the least recently used responses if the cache
+        is full
+
+        Parameters
+        ----------
+        key         : str
+                      key of the response, i.e. the url
+        value       : bytes
+                      serialized response
+        expires     : int
+                      seconds until the response expires, not used as the response has the
+                      expiry in its headers
+
+        """
+        try:
+            previous = os.path.getsize(self._fn(key))
+        except OSError:
+            previous = 0
+        super().set(key, value, expires)
+        with self._lock:
+            self._bytes = self.size() if self._bytes is None else \
+                self._bytes - previous + len(value)
+            if self._bytes > self.max_bytes:
+                self._bytes = self.evict()
+
+    def entries(self):
+        """
+        method for listing the cached responses on disk
+
+        Returns
+        -------
+        out         : list
+                      list of (last used, size, path) of the cached responses
+
+        """
+        entries = []
+        for directory, _, file_names in os.walk(self.directory):
+            for file_name in file_names:
+                if file_name.endswith(".lock"):
+                    continue
+                path = os.path.join(directory, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self):
+        """
+        method for getting the total size of the cached responses on disk
+
+        Returns
+        -------
+        out         : int
+                      total size in bytes
+
+        """
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """
+        method for removing the least recently used responses until the cache is within
+        max_bytes
+
+        Returns
+        -------
+        out         : int
+                      total size of the cache after eviction
+
+        """
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            for file_path in (path, path + ".lock"):
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    pass
+            total -= size
+        return total
+
+    def clear(self):
+        """
+        method for removing all cached responses
+
+        """
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self._bytes = 0
+
+
+class EndpointHeuristic(BaseHeuristic):
+    """
+    Heuristic giving every response of an endpoint the same time to live, regardless of the
+    caching headers of the response. ETag and Last-Modified are kept, so expired responses are
+    revalidated with conditional requests
+
+    """
+
+    def __init__(self, ttl: int):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        ttl         : int
+                      time to live of the responses in seconds
+
+        """
+        Assertor.assert_data_types([ttl], [int])
+        self.ttl = ttl
+
+    def update_headers(self, response):
+        """
+        method for getting the caching headers of a response
+
+        """
+        headers = {"cache-control": f"max-age={self.ttl}"}
+        if "date" not in response.headers:
+            headers["date"] = formatdate(usegmt=True)
+        return headers
+
+    def warning(self, response):
+        """
+        no warning header is added, as the responses are only cached locally
+
+        """
+        return None
+
+
+class CachingAdapter(CacheControlAdapter, ResilientAdapter):
+    """
+    HTTP adapter serving GET requests of an endpoint from a shared response cache. Fresh
+    responses are served from the cache, expired responses are revalidated with conditional
+    requests, and with stale_while_revalidate expired responses are served for that many
+    seconds more while being revalidated in the background. Requests sent over the network
+    are retried and guarded by the circuit breaker of ResilientAdapter
+
+    """
+
+    def __init__(self, rate_limiter, cache: BoundedFileCache, ttl: int,
+                 stale_while_revalidate: int = 0, **kwargs):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        rate_limiter            : RateLimiter
+                                  rate limiter of the requests sent over the network
+        cache                   : BoundedFileCache
+                                  cache of the responses
+        ttl                     : int
+                                  time to live of the responses in seconds
+        stale_while_revalidate  : int
+                                  seconds an expired response may be served while revalidated
+        kwargs                  : dict
+                                  keyword arguments to ResilientAdapter, e.g. circuit_breaker
+
+        """
+        Assertor.assert_data_types([cache, ttl, stale_while_revalidate],
+                                   [BoundedFileCache, int, int])
+        super().__init__(cache=cache, heuristic=EndpointHeuristic(ttl),
+                         rate_limiter=rate_limiter, **kwargs)
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self._revalidating = set()
+        self._revalidating_lock = Lock()
+
+    @staticmethod
+    def age(response):
+        """
+        method for getting the age of a cached response
+
+        Returns
+        -------
+        out         : float
+                      age in seconds, infinite if the response has no date
+
+        """
+        try:
+            return time() - parsedate_to_datetime(response.headers["date"]).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return float("inf")
+
+    def lookup(self, request, **kwargs):
+        """
+        method for looking up the cached response of a request, i.e. a fresh response, or an
+        expired one within stale_while_revalidate which is then revalidated in the background
+
+        Parameters
+        ----------
+        request     : requests.PreparedRequest
+                      request to look up
+        kwargs      : dict
+                      keyword arguments to send() when revalidating, e.g. timeout
+
+        Returns
+        -------
+        out         : urllib3.HTTPResponse
+                      cached response, None if not cached or expired
+
+        """
+        try:
+            cached = self.controller.cached_request(request)
+            if cached:
+                return cached
+            if self.stale_while_revalidate:
+                stale = self.controller._load_from_cache(  # pylint: disable=protected-access
+                    request)
+                if stale is not None and \
+                        self.age(stale) < self.ttl + self.stale_while_revalidate:
+                    self.revalidate(request, **kwargs)
+                    return stale
+        except zlib.error:
+            pass
+        return None
+
+    def revalidate(self, request, **kwargs):
+        """
+        method for revalidating the cached response of a request in a background thread,
+        unless it is already being revalidated
+
+        Parameters
+        ----------
+        request     : requests.PreparedRequest
+                      request to revalidate
+        kwargs      : dict
+                      keyword arguments to send(), e.g. timeout
+
+        """
+        with self._revalidating_lock:
+            if request.url in self._revalidating:
+                return
+            self._revalidating.add(request.url)
+        Thread(target=self._revalidate, args=(request.copy(), kwargs), name="stressa-revalidate",
+               daemon=True).start()
+
+    def _revalidate(self, request, kwargs):
+        """
+        method for sending a conditional request, updating the cache with the response
+
+        """
+        try:
+            super().send(request, **kwargs).content  # pylint: disable=expression-not-assigned
+        except Exception as revalidate_exception:  # pylint: disable=broad-except
+            LOGGER.warning(f"revalidation of '{request.url}' failed with '{revalidate_exception}'")
+        finally:
+            with self._revalidating_lock:
+                self._revalidating.discard(request.url)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None,
+             cacheable_methods=None):  # pylint: disable=arguments-differ
+        """
+        method for sending a request, served from the cache if possible
+
+        """
+        if request.method in (cacheable_methods or self.cacheable_methods):
+            cached = self.lookup(request, timeout=timeout, verify=verify, cert=cert,
+                                 proxies=proxies)
+            if cached is not None:
+                return self.build_response(request, cached, from_cache=True)
+        return super().send(request, stream, timeout, verify, cert, proxies, cacheable_methods)
+
+    def store(self, request, status: int, headers: dict, body: bytes):
+        """
+        method for caching a response received outside of requests, e.g. with aiohttp
+
+        Parameters
+        ----------
+        request     : requests.PreparedRequest
+                      request of the response
+        status      : int
+                      HTTP status code of the response
+        headers     : dict
+                      headers of the response
+        body        : bytes
+                      decoded body of the response
+
+        Returns
+        -------
+        out         : bytes
+                      body of the response, i.e. the cached body if the response is a
+                      304 Not Modified
+
+        """
+        excluded_headers = ("content-encoding", "content-length", "transfer-encoding")
+        response = self.heuristic.apply(HTTPResponse(
+            body=io.BytesIO(body), status=status, preload_content=False, decode_content=False,
+            headers={key: value for key, value in headers.items() if
+                     key.lower() not in excluded_headers}))
+        if status == 304:
+            cached = self.controller.update_cached_response(request, response)
+            return cached.read() if cached is not response else body
+        self.controller.cache_response(request, response, body)
+        return body
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module with logic for the SessionRegistry of HTTP sessions shared by all connectors
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import atexit
+import asyncio
+from contextlib import asynccontextmanager
+from threading import Lock, Thread
+from urllib.parse import urlsplit
+
+import requests
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+from source.util import Assertor
+
+from .settings import TIMEOUT, CONNECT_TIMEOUT, POOL_CONNECTIONS, POOL_MAXSIZE, \
+    KEEP_ALIVE_TIMEOUT, RATE_LIMIT, HTTP_CACHE, HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES, \
+    HTTP_CACHE_TTL, HTTP_CACHE_STALE_WHILE_REVALIDATE, CIRCUIT_BREAKER_FAILURES, \
+    CIRCUIT_BREAKER_RESET, HTTP_RECORD_DIR
+from .resilience import CircuitBreaker, ResilientAdapter
+from .rate_limiter import RateLimiter
+from .response_cache import BoundedFileCache, CachingAdapter
+from .http_replay import HttpRecorder
+
+
+class SessionRegistry:
+    """
+    Registry of keep-alive HTTP sessions shared by all connectors, i.e. one requests Session
+    with pooled connections per host, and one aiohttp ClientSession living on an event loop
+    in a background thread. Connections are reused across requests and threads instead of
+    doing a new TCP and TLS handshake per request. Requests are kept within the rate limit
+    per host of rate_limiter, set with the env. variable STRESSA_RATE_LIMIT. GET requests to
+    the endpoints in HTTP_CACHE_TTL are served from a disk-backed response cache shared by all
+    connectors (turned off with the env. variable STRESSA_HTTP_CACHE=0). Requests sent over
+    the network have a timeout per endpoint, idempotent ones are retried with backoff, and
+    requests to a host that keeps failing fail fast with the circuit_breaker. With the env.
+    variable STRESSA_HTTP_RECORD set to a directory, all responses are recorded by recorder
+
+    """
+
+    _lock = Lock()
+    _sessions = {}
+    _loop = None
+    _client_session = None
+    rate_limiter = RateLimiter(RATE_LIMIT)
+    circuit_breaker = CircuitBreaker(CIRCUIT_BREAKER_FAILURES, CIRCUIT_BREAKER_RESET)
+    cache_enabled = HTTP_CACHE
+    cache = BoundedFileCache(HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES)
+    recorder = HttpRecorder(HTTP_RECORD_DIR) if HTTP_RECORD_DIR else None
+
+    @classmethod
+    def session(cls, url: str):
+        """
+        method for getting the shared session of the host of a url
+
+        Parameters
+        ----------
+        url         : str
+                      url to request
+
+        Returns
+        -------
+        out         : requests.Session
+                      session with a pool of keep-alive connections
+
+        """
+        Assertor.assert_data_types([url], [str])
+        host = urlsplit(url).netloc
+        with cls._lock:
+            if host not in cls._sessions:
+                session = requests.Session()
+                adapter = ResilientAdapter(cls.rate_limiter, cls.circuit_breaker,
+                                           pool_connections=POOL_CONNECTIONS,
+                                           pool_maxsize=POOL_MAXSIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                for endpoint, ttl in HTTP_CACHE_TTL.items():
+                    if cls.cache_enabled and urlsplit(endpoint).netloc == host:
+                        session.mount(endpoint, CachingAdapter(
+                            cls.rate_limiter, cls.cache, ttl,
+                            HTTP_CACHE_STALE_WHILE_REVALIDATE.get(endpoint, 0),
+                            circuit_breaker=cls.circuit_breaker,
+                            pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE))
+                if cls.recorder:
+                    session.hooks["response"].append(cls.recorder.hook)
+                cls._sessions[host] = session
+            return cls._sessions[host]
+
+    @classmethod
+    def caching_adapter(cls, url: str):
+        """
+        method for getting the caching adapter of the endpoint of a url
+
+        Parameters
+        ----------
+        url         : str
+                      url to request
+
+        Returns
+        -------
+        out         : CachingAdapter
+                      adapter of the endpoint, None if responses of the url are not cached
+
+        """
+        adapter = cls.session(url).get_adapter(url)
+        return adapter if isinstance(adapter, CachingAdapter) else None
+
+    @classmethod
+    def cached_content(cls, url: str):
+        """
+        method for getting the cached content of a GET request, for requests not sent with
+        the requests sessions, e.g. with aiohttp
+
+        Parameters
+        ----------
+        url         : str
+                      url to request
+
+        Returns
+        -------
+        out         : tuple
+                      cached content (None if not cached) and conditional headers for
+                      revalidating an expired response
+
+        """
+        adapter = cls.caching_adapter(url)
+        if not adapter:
+            return None, {}
+        request = requests.Request("GET", url).prepare()
+        cached = adapter.lookup(request, timeout=(CONNECT_TIMEOUT, TIMEOUT))
+        if cached is not None:
+            return cached.read(), {}
+        return None, adapter.controller.conditional_headers(request)
+
+    @classmethod
+    def cache_content(cls, url: str, status: int, headers: dict, content: bytes):
+        """
+        method for caching, and recording, the content of a GET request not sent with the
+        requests sessions
+
+        Parameters
+        ----------
+        url         : str
+                      requested url
+        status      : int
+                      HTTP status code of the response
+        headers     : dict
+                      headers of the response
+        content     : bytes
+                      decoded content of the response
+
+        Returns
+        -------
+        out         : bytes
+                      content of the response, i.e. the cached content if the response is a
+                      304 Not Modified
+
+        """
+        adapter = cls.caching_adapter(url)
+        if adapter:
+            content = adapter.store(requests.Request("GET", url).prepare(), status, headers,
+                                    content)
+            status = 200 if status == 304 else status
+        if cls.recorder:
+            cls.recorder.record("GET", url, None, status, dict(headers), content)
+        return content
+
+    @classmethod
+    def run(cls, coroutine):
+        """
+        method for running a coroutine on the event loop of the shared aiohttp session
+
+        Parameters
+        ----------
+        coroutine   : coroutine
+                      coroutine to run
+
+        Returns
+        -------
+        out         : object
+                      result of the coroutine
+
+        """
+        with cls._lock:
+            if not cls._loop:
+                cls._loop = asyncio.new_event_loop()
+                Thread(target=cls._loop.run_forever, name="stressa-http", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coroutine, cls._loop).result()
+
+    @classmethod
+    @asynccontextmanager
+    async def client_session(cls):
+        """
+        method for getting an aiohttp session, i.e. the shared one when running on the event
+        loop of the registry (see run()), otherwise a new one closed after use
+
+        """
+        timeout = ClientTimeout(total=TIMEOUT, connect=CONNECT_TIMEOUT)
+        if asyncio.get_running_loop() is cls._loop:
+            if not cls._client_session or cls._client_session.closed:
+                cls._client_session = ClientSession(
+                    timeout=timeout, connector=TCPConnector(
+                        limit_per_host=POOL_MAXSIZE, keepalive_timeout=KEEP_ALIVE_TIMEOUT))
+            yield cls._client_session
+        else:
+            async with ClientSession(timeout=timeout) as session:
+                yield session
+
+    @classmethod
+    def close(cls):
+        """
+        method for closing all shared sessions, new ones are created on next use
+
+        """
+        with cls._lock:
+            sessions, cls._sessions = cls._sessions, {}
+            loop, client_session = cls._loop, cls._client_session
+            cls._loop = cls._client_session = None
+        for session in sessions.values():
+            session.close()
+        if loop:
+            if client_session:
+                asyncio.run_coroutine_threadsafe(client_session.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+
+
+atexit.register(SessionRegistry.close)
@@ -12,21 +12,86 @@ __email__ = 'samir.adrik@gmail.com'
 
 import os
 
-FINN_AD_URL = "https://finn.no/realestate/homes/ad.html?finnkode="
-FINN_OWNER_URL = "https://finn.no/realestate/ownershiphistory.html?finnkode="
-FINN_STAT_URL = "https://www.finn.no/prisstatistikk/"
-FINN_COMMUNITY_URL = "https://profil.nabolag.no/"
+# origin of all endpoints, i.e. 'https://', or the url of a ReplayServer, e.g.
+# STRESSA_REPLAY_URL=http://127.0.0.1:8765, to replay recorded responses
+HTTP_ORIGIN = os.environ["STRESSA_REPLAY_URL"].rstrip("/") + "/" if os.environ.get(
+    "STRESSA_REPLAY_URL") else "https://"
+HTTP_RECORD_DIR = os.environ.get("STRESSA_HTTP_RECORD")
 
-PORTALEN_URL = "https://www.finansportalen.no/services/feed/v3/bank/boliglan.atom"
+FINN_AD_URL = HTTP_ORIGIN + "finn.no/realestate/homes/ad.html?finnkode="
+FINN_OWNER_URL = HTTP_ORIGIN + "finn.no/realestate/ownershiphistory.html?finnkode="
+FINN_STAT_URL = HTTP_ORIGIN + "www.finn.no/prisstatistikk/"
+FINN_COMMUNITY_URL = HTTP_ORIGIN + "profil.nabolag.no/"
+
+PORTALEN_URL = HTTP_ORIGIN + "www.finansportalen.no/services/feed/v3/bank/boliglan.atom"
 PORTALEN_CRED = tuple(os.environ.get(cred) for cred in ["PORTALEN_USERNAME", "PORTALEN_PASSWORD"])
 PORTALEN_ENTRY = "{http://www.w3.org/2005/Atom}entry"
 
-POSTEN_URL = "https://adressesok.posten.no/api/v1/postal_codes.json?postal_code="
+POSTEN_URL = HTTP_ORIGIN + "adressesok.posten.no/api/v1/postal_codes.json?postal_code="
+POSTAL_CODE_REGISTRY = os.environ.get("STRESSA_POSTAL_CODES",
+                                      os.path.join(os.path.expanduser("~"), ".stressa",
+                                                   "postal_codes.tsv"))
+
+SIFO_URL = HTTP_ORIGIN + "kalkulator.referansebudsjett.no/php/resultat_as_json.php?"
+
+SIFO_CACHE_SIZE = int(os.environ.get("STRESSA_SIFO_CACHE_SIZE", 1024))
+SIFO_CACHE_DIR = os.environ.get("STRESSA_SIFO_CACHE_DIR")
+SIFO_CACHE_TTL = int(os.environ.get("STRESSA_SIFO_CACHE_TTL", 24 * 60 * 60))
+SIFO_CACHE_TTL_PAST_YEARS = int(os.environ.get("STRESSA_SIFO_CACHE_TTL_PAST_YEARS",
+                                               365 * 24 * 60 * 60))
 
-SIFO_URL = "https://kalkulator.referansebudsjett.no/php/resultat_as_json.php?"
+SSB_URL = HTTP_ORIGIN + "data.ssb.no/api/v0/no/table/10748"
+SSB_STORE_PATH = os.environ.get("STRESSA_SSB_STORE",
+                                os.path.join(os.path.expanduser("~"), ".stressa",
+                                             "ssb_10748.parquet"))
 
-SSB_URL = "https://data.ssb.no/api/v0/no/table/10748"
+SKATTEETATEN_URL = HTTP_ORIGIN + "skatteberegning.app.skatteetaten.no/"
 
-SKATTEETATEN_URL = "https://skatteberegning.app.skatteetaten.no/"
+TAX_RECORDINGS_DIR = os.environ.get("STRESSA_TAX_RECORDINGS_DIR",
+                                    os.path.join(os.path.expanduser("~"), ".stressa",
+                                                 "tax_recordings"))
 
 TIMEOUT = 15
+
+CONNECT_TIMEOUT = int(os.environ.get("STRESSA_CONNECT_TIMEOUT", TIMEOUT))
+
+POOL_CONNECTIONS = int(os.environ.get("STRESSA_POOL_CONNECTIONS", 10))
+POOL_MAXSIZE = int(os.environ.get("STRESSA_POOL_MAXSIZE", 10))
+KEEP_ALIVE_TIMEOUT = 30
+
+RATE_LIMIT = float(os.environ.get("STRESSA_RATE_LIMIT", 0))
+
+HTTP_CACHE = os.environ.get("STRESSA_HTTP_CACHE", "1").lower() in ("1", "true", "yes")
+HTTP_CACHE_DIR = os.environ.get("STRESSA_HTTP_CACHE_DIR",
+                                os.path.join(os.path.expanduser("~"), ".stressa", "http_cache"))
+HTTP_CACHE_MAX_BYTES = int(os.environ.get("STRESSA_HTTP_CACHE_MAX_BYTES", 256 * 1024 ** 2))
+
+HTTP_CACHE_TTL = {FINN_AD_URL: 60 * 60,
+                  FINN_OWNER_URL: 24 * 60 * 60,
+                  FINN_STAT_URL: 60 * 60,
+                  FINN_COMMUNITY_URL: 7 * 24 * 60 * 60,
+                  POSTEN_URL: 30 * 24 * 60 * 60,
+                  PORTALEN_URL: 60 * 60}
+HTTP_CACHE_STALE_WHILE_REVALIDATE = {FINN_COMMUNITY_URL: 24 * 60 * 60,
+                                     POSTEN_URL: 7 * 24 * 60 * 60}
+
+ENDPOINT_TIMEOUT = {FINN_AD_URL: 5,
+                    FINN_OWNER_URL: 5,
+                    FINN_STAT_URL: 5,
+                    FINN_COMMUNITY_URL: 5,
+                    POSTEN_URL: 5,
+                    SIFO_URL: 10,
+                    SSB_URL: 10,
+                    PORTALEN_URL: 30}
+
+RETRIES = int(os.environ.get("STRESSA_RETRIES", 2))
+RETRY_BACKOFF = float(os.environ.get("STRESSA_RETRY_BACKOFF", 0.5))
+RETRY_BACKOFF_MAX = 8.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+CIRCUIT_BREAKER_FAILURES = int(os.environ.get("STRESSA_CIRCUIT_BREAKER_FAILURES", 5))
+CIRCUIT_BREAKER_RESET = float(os.environ.get("STRESSA_CIRCUIT_BREAKER_RESET", 30))
+
+PORTALEN_OFFERS_TTL = int(os.environ.get("STRESSA_PORTALEN_OFFERS_TTL",
+                                         HTTP_CACHE_TTL[PORTALEN_URL]))
+PORTALEN_RATE_BAND = 0.5
@@ -10,22 +10,27 @@ __email__ = 'samir.adrik@gmail.com'
 
 from time import time
 from http.client import responses
+from concurrent.futures import ThreadPoolExecutor
 from urllib.error import URLError
-import requests
 
 from source.util import Assertor, LOGGER, NoConnectionError, TimeOutError, Tracking
 from source.domain import Family
 
-from .settings import SIFO_URL, TIMEOUT
+from .settings import SIFO_URL, TIMEOUT, CONNECT_TIMEOUT, POOL_MAXSIZE, SIFO_CACHE_SIZE, \
+    SIFO_CACHE_DIR
+from .sifo_cache import SifoCache
 from .connector import Connector
 
 
 class Sifo(Connector):
     """
-    Class that produces SIFO expenses given family information
+    Class that produces SIFO expenses given family information. Expenses are cached by family
+    composition in cache, persisted to disk if the env. variable STRESSA_SIFO_CACHE_DIR is set
 
     """
 
+    cache = SifoCache(SIFO_CACHE_SIZE, SIFO_CACHE_DIR)
+
     def __init__(self, family: Family):
         """
         Constructor / Instantiate the class
@@ -37,7 +42,7 @@ class Sifo(Connector):
         """
         try:
             super().__init__()
-            Assertor.assert_data_types([family], [Family])
+            Assertor.assert_data_types([family], [Family], boundary=True)
             self._family = family
             LOGGER.success(
                 f"created '{self.__class__.__name__}', with id: [{self.id_}]")
@@ -85,7 +90,8 @@ class Sifo(Connector):
             for key, item in self.family.sifo_properties().items():
                 parsed_sifo_url = f"{parsed_sifo_url}{key}={item}&"
 
-            response = requests.post(url=parsed_sifo_url, timeout=TIMEOUT)
+            response = self.session(SIFO_URL).post(url=parsed_sifo_url,
+                                                   timeout=(CONNECT_TIMEOUT, TIMEOUT))
             status_code = response.status_code
 
             elapsed = self.elapsed_time(start)
@@ -115,15 +121,19 @@ class Sifo(Connector):
         """
         LOGGER.info(f"trying to retrieve '{self.sifo_base_expenses.__name__}'")
 
-        response_json = self.response().json()["utgifter"]
+        properties = self.family.sifo_properties()
+        sifo_expenses = self.cache.get(properties)
+        if sifo_expenses is None:
+            response_json = self.response().json()["utgifter"]
 
-        sifo_expenses = {}
-        sifo_expenses.update(response_json['individspesifikke'])
-        sifo_expenses.update({'sumindivid': response_json['sumindivid']})
-        sifo_expenses.update(response_json['husholdsspesifikke'])
-        sifo_expenses.update({'sumhusholdning': response_json['sumhusholdning']})
-        sifo_expenses.update({'totalt': response_json['totalt']})
-        sifo_expenses = {key: str(val) for key, val in sifo_expenses.items()}
+            sifo_expenses = {}
+            sifo_expenses.update(response_json['individspesifikke'])
+            sifo_expenses.update({'sumindivid': response_json['sumindivid']})
+            sifo_expenses.update(response_json['husholdsspesifikke'])
+            sifo_expenses.update({'sumhusholdning': response_json['sumhusholdning']})
+            sifo_expenses.update({'totalt': response_json['totalt']})
+            sifo_expenses = {key: str(val) for key, val in sifo_expenses.items()}
+            self.cache.set(properties, sifo_expenses)
 
         if include_id:
             sifo_expenses.update({'_id': self.family.id_})
@@ -131,6 +141,41 @@ class Sifo(Connector):
         LOGGER.success(f"'{self.sifo_base_expenses.__name__}' successfully retrieved")
         return sifo_expenses
 
+    @classmethod
+    def batch_base_expenses(cls, families: list, max_workers: int = POOL_MAXSIZE):
+        """
+        get SIFO base expenses of many families, fetching the expenses of every family
+        composition only once
+
+        Parameters
+        ----------
+        families    : list
+                      list of Family objects
+        max_workers : int
+                      maximum number of expenses fetched at the same time
+
+        Returns
+        -------
+        out         : list
+                      list of dictionaries with SIFO expenses, in the order of families
+
+        """
+        Assertor.assert_data_types([families, max_workers], [list, int])
+        Assertor.assert_data_types(families, [Family] * len(families))
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got '{max_workers}'")
+
+        keys = [SifoCache.key(family.sifo_properties()) for family in families]
+        unique_families = dict(zip(keys, families))
+        LOGGER.info(f"trying to retrieve SIFO base expenses of {len(families)} families, "
+                    f"{len(unique_families)} unique compositions")
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_families) or 1),
+                                thread_name_prefix="stressa-sifo") as executor:
+            expenses = dict(zip(unique_families, executor.map(
+                lambda family: cls(family).sifo_base_expenses(), unique_families.values())))
+        return [dict(expenses[key]) for key in keys]
+
     @Tracking
     def to_json(self, file_dir: str):
         """
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module with logic for the cache of SIFO reference budgets by family composition
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+import re
+import json
+from collections import OrderedDict
+from datetime import date
+from hashlib import sha256
+from threading import Lock
+from time import time
+
+from source.util import Assertor, LOGGER
+
+from .settings import SIFO_CACHE_TTL, SIFO_CACHE_TTL_PAST_YEARS
+
+
+class SifoCache:
+    """
+    Implementation of a LRU cache of SIFO expenses keyed by the normalised sifo_properties of a
+    family, i.e. families with the same composition share the same expenses regardless of the
+    order of the family members. Expenses can also be persisted to disk, and expire after
+    SIFO_CACHE_TTL for the current year, or SIFO_CACHE_TTL_PAST_YEARS for earlier years
+
+    """
+
+    member_property = re.compile(r"^(\D+)(\d+)$")
+
+    def __init__(self, max_size: int, directory: str = None):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        max_size    : int
+                      maximum number of expenses in memory, 0 disables the cache
+        directory   : str
+                      directory to persist the expenses in, None for memory only
+
+        """
+        Assertor.assert_data_types([max_size, directory], [int, (str, type(None))])
+        self.max_size = max_size
+        self.directory = directory
+        self._expenses = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def key(cls, properties: dict):
+        """
+        method for getting the cache key of sifo_properties, i.e. the household properties and
+        the sorted properties of every family member
+
+        Parameters
+        ----------
+        properties  : dict
+                      sifo_properties of a Family
+
+        Returns
+        -------
+        out         : str
+                      sha256 hex digest of the normalised properties
+
+        """
+        Assertor.assert_data_types([properties], [dict])
+        household, members = {}, {}
+        for name, value in properties.items():
+            value = str(value).strip().lower()
+            member_property = cls.member_property.match(name)
+            if member_property:
+                members.setdefault(member_property.group(2), {})[
+                    member_property.group(1)] = value
+            else:
+                household[name] = value
+        normalised = [sorted(household.items()),
+                      sorted(sorted(member.items()) for member in members.values())]
+        return sha256(json.dumps(normalised).encode()).hexdigest()
+
+    @staticmethod
+    def ttl(select_year: str):
+        """
+        method for getting the time to live of the expenses of a year
+
+        Parameters
+        ----------
+        select_year : str
+                      year of the SIFO reference budget
+
+        Returns
+        -------
+        out         : int
+                      time to live in seconds
+
+        """
+        try:
+            past_year = int(select_year) < date.today().year
+        except (TypeError, ValueError):
+            past_year = False
+        return SIFO_CACHE_TTL_PAST_YEARS if past_year else SIFO_CACHE_TTL
+
+    def path(self, key: str):
+        """
+        method for getting the path of persisted expenses
+
+        """
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, properties: dict):
+        """
+        method for getting the cached expenses of a family
+
+        Parameters
+        ----------
+        properties  : dict
+                      sifo_properties of the family
+
+        Returns
+        -------
+        out         : dict
+                      copy of the cached expenses, None if not cached or expired
+
+        """
+        if not self.max_size:
+            return None
+        key = self.key(properties)
+        with self._lock:
+            entry = self._expenses.get(key)
+            if entry is not None:
+                self._expenses.move_to_end(key)
+        if entry is None and self.directory:
+            entry = self.load(key)
+        if entry is not None and time() - entry["stored"] > self.ttl(entry["select_year"]):
+            self.remove(key)
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, entry)
+        return dict(entry["expenses"])
+
+    def set(self, properties: dict, expenses: dict):
+        """
+        method for caching the expenses of a family
+
+        Parameters
+        ----------
+        properties  : dict
+                      sifo_properties of the family
+        expenses    : dict
+                      SIFO expenses of the family
+
+        """
+        Assertor.assert_data_types([expenses], [dict])
+        if not self.max_size:
+            return
+        key = self.key(properties)
+        entry = {"select_year": str(properties.get("select_year")), "stored": time(),
+                 "expenses": dict(expenses)}
+        with self._lock:
+            self._store(key, entry)
+        if self.directory:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(self.path(key), "w", encoding="utf-8") as expenses_file:
+                    json.dump(entry, expenses_file)
+            except OSError as persist_error:
+                LOGGER.warning(f"SIFO expenses not persisted, exited with '{persist_error}'")
+
+    def _store(self, key: str, entry: dict):
+        """
+        method for storing an entry in memory, evicting the least recently used entries
+
+        """
+        self._expenses[key] = entry
+        self._expenses.move_to_end(key)
+        while len(self._expenses) > self.max_size:
+            self._expenses.popitem(last=False)
+
+    def load(self, key: str):
+        """
+        method for loading persisted expenses
+
+        Parameters
+        ----------
+        key         : str
+                      cache key of the expenses
+
+        Returns
+        -------
+        out         : dict
+                      entry with select_year, stored and expenses, None if not persisted
+
+        """
+        try:
+            with open(self.path(key), encoding="utf-8") as expenses_file:
+                return json.load(expenses_file)
+        except (OSError, ValueError):
+            return None
+
+    def remove(self, key: str):
+        """
+        method for removing expenses from memory and disk
+
+        """
+        with self._lock:
+            self._expenses.pop(key, None)
+        if self.directory:
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
+
+    def clear(self):
+        """
+        method for clearing the cache in memory and on disk, and its counters
+
+        """
+        with self._lock:
+            self._expenses.clear()
+            self.hits = self.misses = 0
+        if self.directory and os.path.isdir(self.directory):
+            for file_name in os.listdir(self.directory):
+                if file_name.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(self.directory, file_name))
+                    except OSError:
+                        pass
+
+    def metrics(self):
+        """
+        method for getting the size and hit/miss counters of the cache
+
+        Returns
+        -------
+        out         : dict
+                      dictionary with the metrics of the cache
+
+        """
+        with self._lock:
+            return {"size": len(self._expenses), "max_size": self.max_size,
+                    "hits": self.hits, "misses": self.misses}
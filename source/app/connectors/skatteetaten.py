@@ -8,21 +8,19 @@ Implementation of connector against Skatteetaten tax calculator
 __author__ = 'Samir Adrik'
 __email__ = 'samir.adrik@gmail.com'
 
-import os
 from typing import Union
 
 from http.client import responses
 from datetime import date
 
-import json
-import requests
 from requests.exceptions import ConnectTimeout, ConnectionError as ConnectError
 
 from source.util import Assertor, LOGGER, NoConnectionError, TimeOutError, \
     Tracking
 from source.domain import Money
 
-from .settings import SKATTEETATEN_URL, TIMEOUT
+from .settings import SKATTEETATEN_URL, TIMEOUT, CONNECT_TIMEOUT
+from .skatteetaten_payload import SkatteetatenPayload
 from .connector import Connector
 
 
@@ -32,14 +30,7 @@ class Skatteetaten(Connector):  # pylint: disable=too-many-instance-attributes
 
     """
 
-    tax_version_mapping = {
-        '2023': ('skatteberegningsgrunnlag', 'skatteplikt'),
-        '2022': ('skatteberegningsgrunnlagV7', 'skattepliktV9'),
-        '2021': ('skatteberegningsgrunnlagV6', 'skattepliktV8'),
-        '2020': ('skattegrunnlagV6', 'skattepliktV7'),
-        '2019': ('skattegrunnlagV5', 'skattepliktV6'),
-        '2018': ('skattegrunnlagV5', 'skattepliktV5')
-    }
+    tax_version_mapping = SkatteetatenPayload.tax_version_mapping
 
     def __init__(self, age: Union[str, int],
                  income: Union[str, int, float],
@@ -96,7 +87,7 @@ class Skatteetaten(Connector):  # pylint: disable=too-many-instance-attributes
                  (int, str, float), (int, str, float),
                  (int, str, float), (int, str, float),
                  (int, str, float), (int, str, float),
-                 (int, str, float)])
+                 (int, str, float)], boundary=True)
             Assertor.assert_arguments([str(tax_year)],
                                       [{'year': (
                                           '2018', '2019', '2020', '2021',
@@ -133,82 +124,13 @@ class Skatteetaten(Connector):  # pylint: disable=too-many-instance-attributes
     @Tracking
     def payload(self):
         """
-        method for generating payload str
+        method for generating payload str, i.e. filling in the compiled payload template of
+        the tax year
 
         """
-        with open(os.path.dirname(
-                __file__) + '\\payloads\\skatteetaten_payload.json',
-                  encoding='utf-8') as json_file:
-            json_data = json.load(json_file)
-        tax_payload = json.dumps(json_data) \
-            .replace("alderIInntektsaarVerdi", self.age) \
-            .replace("loennsinntektNaturalytelseMvBelop", self.income) \
-            .replace("skatteberegningsgrunnlagVersjon",
-                     self.tax_version_mapping[self.tax_year][0]) \
-            .replace("skattepliktVersjon",
-                     self.tax_version_mapping[self.tax_year][1]) \
-            .replace("opptjenteRenterBelop", self.interest_income) \
-            .replace("paaloepteRenterBelop", self.interest_cost) \
-            .replace("formuesverdiForPrimaerboligBelop",
-                     self.value_of_real_estate) \
-            .replace("innskuddBelop", self.bank_deposit) \
-            .replace("gjeldBelop", self.debt) \
-            .replace("betaltFagforeningskontingentBelop", self.union_fee) \
-            .replace("beloepSpartIBSUIInntektsaarBelop", self.bsu) \
-            .replace("annenArbeidsinntektBeloep", self.other_income) \
-            .replace("nettoinntektVedUtleieAvFastEiendomMvBeloep",
-                     self.rental_income)
-
-        if self.tax_year == "2023":
-
-            tax_payload = json.loads(tax_payload)
-            tax_base_object = []
-
-            value_of_home = 0
-            bsu_value = 0
-
-            for tax_element in tax_payload['skatteberegningsgrunnlag']['skattegrunnlagsobjekt']:
-                tax_element_dict = {}
-
-                technical_name = tax_element['tekniskNavn']
-                amount = tax_element['beloep']
-
-                if technical_name == 'formuesverdiForPrimaerbolig':
-                    value_of_home = amount
-                    tax_element_dict.update({'tekniskNavn': technical_name, 'beloep': int(amount),
-                                             "verdiFoerVerdsettingsrabattForFastEiendom": int(int(
-                                                 amount) / 0.25)})
-                elif technical_name == 'inntektsfradragForFagforeningskontingent':
-                    tax_element_dict.update({'tekniskNavn': technical_name, 'beloep': int(amount)})
-                elif technical_name == 'beloepSpartIBSUIInntektsaar':
-                    bsu_value = amount
-                    tax_element_dict.update({'tekniskNavn': technical_name, 'beloep': amount})
-                else:
-                    tax_element_dict.update({'tekniskNavn': technical_name, 'beloep': amount})
-
-                tax_base_object.append(tax_element_dict)
-
-            if value_of_home == 0 and bsu_value == 0:
-                for element in tax_base_object:
-                    if element['tekniskNavn'] in ['formuesverdiForPrimaerbolig',
-                                                  'beloepSpartIBSUIInntektsaar']:
-                        tax_base_object.remove(element)
-            elif (value_of_home != 0 and bsu_value != 0) or (value_of_home != 0 and bsu_value == 0):
-                for element in tax_base_object:
-                    if element['tekniskNavn'] == 'beloepSpartIBSUIInntektsaar':
-                        tax_base_object.remove(element)
-            elif value_of_home == 0 and bsu_value != 0:
-                for element in tax_base_object:
-                    if element['tekniskNavn'] == 'formuesverdiForPrimaerbolig':
-                        tax_base_object.remove(element)
-
-            tax_payload['skatteberegningsgrunnlag'].update(
-                {'skattegrunnlagsobjekt': tax_base_object})
-
-            tax_payload = json.dumps(tax_payload)
-            tax_payload = tax_payload.replace('skattegrunnlagsobjekt',
-                                              'skatteberegningsgrunnlagsobjekt')
-        return tax_payload
+        return SkatteetatenPayload.fill(
+            self.tax_year, {attribute: getattr(self, attribute) for attribute in
+                            SkatteetatenPayload.placeholders.values()})
 
     @Tracking
     def response(self):
@@ -223,8 +145,8 @@ class Skatteetaten(Connector):  # pylint: disable=too-many-instance-attributes
         """
         try:
             try:
-                response = requests.post(url=self.url, data=self.payload(),
-                                         timeout=TIMEOUT)
+                response = self.session(self.url).post(url=self.url, data=self.payload(),
+                                                       timeout=(CONNECT_TIMEOUT, TIMEOUT))
                 status_code = response.status_code
                 LOGGER.info(
                     f"HTTP status code -> [{status_code}: {responses[status_code]}]")
@@ -251,90 +173,109 @@ class Skatteetaten(Connector):  # pylint: disable=too-many-instance-attributes
         """
 
         try:
-            tax_dict = self.response().json()
-            tax_info = {}
-
-            for keys, values in tax_dict.items():
-                if keys == "hovedperson":
-                    for key, value in values.items():
-                        if any(key == "beregnetSkatt" + version for version in
-                               ['V2', 'V3', 'V4', '']):
-                            for tag, val in value.items():
-                                if tag == "skatteklasse":
-                                    tax_info.update({tag: val})
-                                elif tag == "skatteregnskapskommune":
-                                    tax_info.update({tag: val})
-                                elif tag == "informasjonTilSkattelister":
-                                    tax_info.update(
-                                        {"nettoinntekt": Money(
-                                            str(val["nettoinntekt"])).value()})
+            return self.parse_tax_information(self.response().json())
+        except Exception as skatteetaten_exception:
+            error_msg = f"skatteetaten error, exited with '{str(skatteetaten_exception)}'"
+            LOGGER.exception(error_msg)
+            raise skatteetaten_exception
+
+    @staticmethod
+    def parse_tax_information(tax_dict: dict):
+        """
+        method for parsing the JSON response of the Skatteetaten tax calculator, also used
+        for recorded responses
+
+        Parameters
+        ----------
+        tax_dict    : dict
+                      JSON response of the tax calculator
+
+        Returns
+        -------
+        out         : dict
+                      tax information in the response
+
+        """
+        Assertor.assert_data_types([tax_dict], [dict])
+        tax_info = {}
+
+        for keys, values in tax_dict.items():
+            if keys == "hovedperson":
+                for key, value in values.items():
+                    if any(key == "beregnetSkatt" + version for version in
+                           ['V2', 'V3', 'V4', '']):
+                        for tag, val in value.items():
+                            if tag == "skatteklasse":
+                                tax_info.update({tag: val})
+                            elif tag == "skatteregnskapskommune":
+                                tax_info.update({tag: val})
+                            elif tag == "informasjonTilSkattelister":
+                                tax_info.update(
+                                    {"nettoinntekt": Money(
+                                        str(val["nettoinntekt"])).value()})
+                                tax_info.update(
+                                    {"nettoformue": Money(
+                                        str(val["nettoformue"])).value()})
+                                tax_info.update(
+                                    {"beregnetSkatt": Money(
+                                        str(val["beregnetSkatt"])).value()})
+                            elif tag in ["beregnetSkattFoerSkattefradrag",
+                                         "sumSkattefradrag",
+                                         "beregnetSkatt"]:
+                                if isinstance(val, dict):
                                     tax_info.update(
-                                        {"nettoformue": Money(
-                                            str(val["nettoformue"])).value()})
+                                        {tag: {"grunnlag": Money(
+                                            str(val["grunnlag"])).value(),
+                                               "beloep": Money(
+                                                   str(val["beloep"])).value()}})
+                                else:
+                                    tax_info.update({tag: {"grunnlag": '',
+                                                           "beloep": Money(
+                                                               str(val)).value()}})
+                            elif tag == "skattOgAvgift":
+                                for sub_tag, sub_val in val.items():
+                                    if sub_tag in ["formuesskattTilStat",
+                                                   "inntektsskattTilKommune",
+                                                   "inntektsskattTilFylkeskommune",
+                                                   "inntektsskattTilKommuneOgFylkeskommune",
+                                                   "formuesskattTilKommune",
+                                                   "fellesskatt", "trinnskatt",
+                                                   "trygdeavgiftAvLoennsinntekt",
+                                                   "sumTrygdeavgift"]:
+                                        tax_info.update(
+                                            {sub_tag: {
+                                                "grunnlag": Money(str(sub_val[
+                                                                          "grunnlag"])).value(),
+                                                "beloep": Money(str(sub_val[
+                                                                        "beloep"])).value()}})
+                    elif key == "beregningsgrunnlagV4":
+                        for tag, val in value.items():
+                            if tag == "beregningsgrunnlagsobjekt":
+                                for element in val:
                                     tax_info.update(
-                                        {"beregnetSkatt": Money(
-                                            str(val["beregnetSkatt"])).value()})
-                                elif tag in ["beregnetSkattFoerSkattefradrag",
-                                             "sumSkattefradrag",
-                                             "beregnetSkatt"]:
-                                    if isinstance(val, dict):
+                                        {element["tekniskNavn"]: Money(
+                                            str(element["beloep"])).value()})
+                    elif any(key == "summertSkattegrunnlagForVisning" + version
+                             for version in
+                             ['V4', 'V5', 'V6', 'V7', '']):
+                        for tag, val in value.items():
+                            if tag in ["skattegrunnlagsobjekt",
+                                       "skatteberegningsgrunnlagsobjekt"]:
+                                for element in val:
+                                    if element[
+                                        'tekniskNavn'] == 'nettoinntektVedUtleieAvFastEiendomMv':
+                                        tax_info.update(
+                                            {
+                                                "samletSkattepliktigOverskuddFraUtleieAvFastEiendom": Money(
+                                                    str(element["beloep"])).value()})
+                                    elif element[
+                                        'tekniskNavn'] == 'samletLoennsinntektMedTrygdeavgiftspliktOgMedTrekkplikt':
                                         tax_info.update(
-                                            {tag: {"grunnlag": Money(
-                                                str(val["grunnlag"])).value(),
-                                                   "beloep": Money(
-                                                       str(val["beloep"])).value()}})
+                                            {
+                                                "personinntektFraLoennsinntekt": Money(
+                                                    str(element["beloep"])).value()})
                                     else:
-                                        tax_info.update({tag: {"grunnlag": '',
-                                                               "beloep": Money(
-                                                                   str(val)).value()}})
-                                elif tag == "skattOgAvgift":
-                                    for sub_tag, sub_val in val.items():
-                                        if sub_tag in ["formuesskattTilStat",
-                                                       "inntektsskattTilKommune",
-                                                       "inntektsskattTilFylkeskommune",
-                                                       "inntektsskattTilKommuneOgFylkeskommune",
-                                                       "formuesskattTilKommune",
-                                                       "fellesskatt", "trinnskatt",
-                                                       "trygdeavgiftAvLoennsinntekt",
-                                                       "sumTrygdeavgift"]:
-                                            tax_info.update(
-                                                {sub_tag: {
-                                                    "grunnlag": Money(str(sub_val[
-                                                                              "grunnlag"])).value(),
-                                                    "beloep": Money(str(sub_val[
-                                                                            "beloep"])).value()}})
-                        elif key == "beregningsgrunnlagV4":
-                            for tag, val in value.items():
-                                if tag == "beregningsgrunnlagsobjekt":
-                                    for element in val:
                                         tax_info.update(
                                             {element["tekniskNavn"]: Money(
                                                 str(element["beloep"])).value()})
-                        elif any(key == "summertSkattegrunnlagForVisning" + version
-                                 for version in
-                                 ['V4', 'V5', 'V6', 'V7', '']):
-                            for tag, val in value.items():
-                                if tag in ["skattegrunnlagsobjekt",
-                                           "skatteberegningsgrunnlagsobjekt"]:
-                                    for element in val:
-                                        if element[
-                                            'tekniskNavn'] == 'nettoinntektVedUtleieAvFastEiendomMv':
-                                            tax_info.update(
-                                                {
-                                                    "samletSkattepliktigOverskuddFraUtleieAvFastEiendom": Money(
-                                                        str(element["beloep"])).value()})
-                                        elif element[
-                                            'tekniskNavn'] == 'samletLoennsinntektMedTrygdeavgiftspliktOgMedTrekkplikt':
-                                            tax_info.update(
-                                                {
-                                                    "personinntektFraLoennsinntekt": Money(
-                                                        str(element["beloep"])).value()})
-                                        else:
-                                            tax_info.update(
-                                                {element["tekniskNavn"]: Money(
-                                                    str(element["beloep"])).value()})
-            return tax_info
-        except Exception as skatteetaten_exception:
-            error_msg = f"skatteetaten error, exited with '{str(skatteetaten_exception)}'"
-            LOGGER.exception(error_msg)
-            raise skatteetaten_exception
+        return tax_info
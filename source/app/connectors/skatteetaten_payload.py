@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+
+"""
+Payload templates for the Skatteetaten tax calculator, compiled once per tax year
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+import re
+import json
+from threading import Lock
+
+from source.util import Assertor
+
+
+class PayloadPlaceholder:
+    """
+    Typed placeholder in a payload template, i.e. an attribute of the Skatteetaten connector
+    and a conversion of its value
+
+    """
+
+    def __init__(self, attribute: str, convert=str):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        attribute   : str
+                      name of the attribute with the value of the placeholder
+        convert     : callable
+                      conversion of the value, str values are rendered as JSON strings
+
+        """
+        Assertor.assert_data_types([attribute], [str])
+        self.attribute = attribute
+        self.convert = convert
+
+    def typed(self, convert):
+        """
+        method for getting the placeholder of the same attribute with another conversion
+
+        Parameters
+        ----------
+        convert     : callable
+                      conversion of the value
+
+        Returns
+        -------
+        out         : PayloadPlaceholder
+                      placeholder with the conversion
+
+        """
+        return PayloadPlaceholder(self.attribute, convert)
+
+    def render(self, values: dict):
+        """
+        method for rendering the placeholder as JSON
+
+        Parameters
+        ----------
+        values      : dict
+                      values of the attributes
+
+        Returns
+        -------
+        out         : str
+                      JSON of the converted value
+
+        """
+        value = self.convert(values[self.attribute])
+        return json.dumps(value) if isinstance(value, str) else str(value)
+
+
+class SkatteetatenPayload:
+    """
+    Payload for the Skatteetaten tax calculator. The payload file is read once per process and
+    compiled once per tax year into JSON segments with typed placeholders, so filling in a
+    payload is a single join
+
+    """
+
+    tax_version_mapping = {
+        '2023': ('skatteberegningsgrunnlag', 'skatteplikt'),
+        '2022': ('skatteberegningsgrunnlagV7', 'skattepliktV9'),
+        '2021': ('skatteberegningsgrunnlagV6', 'skattepliktV8'),
+        '2020': ('skattegrunnlagV6', 'skattepliktV7'),
+        '2019': ('skattegrunnlagV5', 'skattepliktV6'),
+        '2018': ('skattegrunnlagV5', 'skattepliktV5')
+    }
+
+    placeholders = {
+        "alderIInntektsaarVerdi": "age",
+        "loennsinntektNaturalytelseMvBelop": "income",
+        "opptjenteRenterBelop": "interest_income",
+        "paaloepteRenterBelop": "interest_cost",
+        "formuesverdiForPrimaerboligBelop": "value_of_real_estate",
+        "innskuddBelop": "bank_deposit",
+        "gjeldBelop": "debt",
+        "betaltFagforeningskontingentBelop": "union_fee",
+        "beloepSpartIBSUIInntektsaarBelop": "bsu",
+        "annenArbeidsinntektBeloep": "other_income",
+        "nettoinntektVedUtleieAvFastEiendomMvBeloep": "rental_income"
+    }
+
+    _payload = {}
+    _templates = {}
+    _lock = Lock()
+
+    @classmethod
+    def payload(cls):
+        """
+        method for getting the payload file, read once per process
+
+        Returns
+        -------
+        out         : dict
+                      payload with placeholders
+
+        """
+        with cls._lock:
+            if not cls._payload:
+                with open(os.path.join(os.path.dirname(__file__), 'payloads',
+                                       'skatteetaten_payload.json'), encoding='utf-8') as json_file:
+                    cls._payload = json.load(json_file)
+            return cls._payload
+
+    @classmethod
+    def template(cls, tax_year: str):
+        """
+        method for getting the compiled template of a tax year
+
+        Parameters
+        ----------
+        tax_year    : str
+                      tax year in tax_version_mapping
+
+        Returns
+        -------
+        out         : list
+                      JSON segments, i.e. str and PayloadPlaceholder
+
+        """
+        Assertor.assert_data_types([tax_year], [str])
+        Assertor.assert_arguments([tax_year], [{'year': tuple(cls.tax_version_mapping)}])
+        if tax_year not in cls._templates:
+            template = cls.compile(tax_year)
+            with cls._lock:
+                cls._templates.setdefault(tax_year, template)
+        return cls._templates[tax_year]
+
+    @classmethod
+    def compile(cls, tax_year: str):
+        """
+        method for compiling the payload of a tax year, i.e. naming the versions of the tax
+        year, replacing the placeholders with typed ones and splitting the JSON into segments
+
+        Parameters
+        ----------
+        tax_year    : str
+                      tax year in tax_version_mapping
+
+        Returns
+        -------
+        out         : list
+                      JSON segments, i.e. str and PayloadPlaceholder
+
+        """
+        tax_base_version, tax_liability_version = cls.tax_version_mapping[tax_year]
+        payload = cls.payload()
+        template = {
+            tax_base_version: cls.typed(payload['skatteberegningsgrunnlagVersjon']),
+            tax_liability_version: cls.typed(payload['skattepliktVersjon'])}
+
+        if tax_year == "2023":
+            tax_base_object = []
+            for tax_element in template[tax_base_version]['skattegrunnlagsobjekt']:
+                technical_name = tax_element['tekniskNavn']
+                amount = tax_element['beloep']
+
+                if technical_name == 'formuesverdiForPrimaerbolig':
+                    tax_base_object.append(
+                        {'tekniskNavn': technical_name, 'beloep': amount.typed(int),
+                         "verdiFoerVerdsettingsrabattForFastEiendom": amount.typed(
+                             lambda value: int(int(value) / 0.25))})
+                elif technical_name == 'inntektsfradragForFagforeningskontingent':
+                    tax_base_object.append({'tekniskNavn': technical_name,
+                                            'beloep': amount.typed(int)})
+                elif technical_name != 'beloepSpartIBSUIInntektsaar':
+                    # BSU is left out whenever the value of the primary home is in the payload
+                    tax_base_object.append({'tekniskNavn': technical_name, 'beloep': amount})
+            template[tax_base_version] = {
+                'skatteberegningsgrunnlagsobjekt' if key == 'skattegrunnlagsobjekt' else key:
+                    tax_base_object if key == 'skattegrunnlagsobjekt' else value
+                for key, value in template[tax_base_version].items()}
+
+        placeholders = []
+
+        def mark(node):
+            if isinstance(node, PayloadPlaceholder):
+                placeholders.append(node)
+                return f"@@{len(placeholders) - 1}@@"
+            if isinstance(node, dict):
+                return {key: mark(value) for key, value in node.items()}
+            if isinstance(node, list):
+                return [mark(value) for value in node]
+            return node
+
+        segments = re.split(r'"@@(\d+)@@"', json.dumps(mark(template)))
+        return [placeholders[int(segment)] if i % 2 else segment for i, segment in
+                enumerate(segments)]
+
+    @classmethod
+    def typed(cls, node):
+        """
+        method for replacing the placeholder strings of a part of the payload with typed
+        placeholders
+
+        Parameters
+        ----------
+        node        : object
+                      part of the payload
+
+        Returns
+        -------
+        out         : object
+                      copy of the part with PayloadPlaceholder
+
+        """
+        if isinstance(node, dict):
+            return {key: cls.typed(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [cls.typed(value) for value in node]
+        if isinstance(node, str) and node in cls.placeholders:
+            return PayloadPlaceholder(cls.placeholders[node])
+        return node
+
+    @classmethod
+    def fill(cls, tax_year: str, values: dict):
+        """
+        method for filling in the template of a tax year
+
+        Parameters
+        ----------
+        tax_year    : str
+                      tax year in tax_version_mapping
+        values      : dict
+                      values of the placeholders, by attribute name, e.g. 'income'
+
+        Returns
+        -------
+        out         : str
+                      JSON payload
+
+        """
+        Assertor.assert_data_types([values], [dict])
+        return "".join(segment if isinstance(segment, str) else segment.render(values) for
+                       segment in cls.template(tax_year))
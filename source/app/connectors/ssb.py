@@ -10,12 +10,11 @@ __email__ = 'samir.adrik@gmail.com'
 
 from http.client import responses
 
-import requests
 from requests.exceptions import ConnectTimeout, ConnectionError as ConnectError
 
 from source.util import Assertor, LOGGER, NoConnectionError, TimeOutError, Tracking
 
-from .settings import SSB_URL, TIMEOUT
+from .settings import SSB_URL, TIMEOUT, CONNECT_TIMEOUT
 from .ssb_payload import SsbPayload
 from .connector import Connector
 
@@ -38,7 +37,7 @@ class Ssb(Connector):
         """
         try:
             super().__init__()
-            Assertor.assert_data_types([payload], [(type(None), SsbPayload)])
+            Assertor.assert_data_types([payload], [(type(None), SsbPayload)], boundary=True)
             self._payload = SsbPayload() if not payload else payload
             self._browser = None
             LOGGER.success(
@@ -75,19 +74,27 @@ class Ssb(Connector):
         self._payload = pay_load
 
     @Tracking
-    def response(self):
+    def response(self, query: dict = None):
         """
         submits and gets response for SSB request
 
+        Parameters
+        ----------
+        query   : dict
+                  query against SSB table nr. 10748, default is the payload
+
         Returns
         -------
         out     : requests.models.Response
                   response with interest rate information
 
         """
+        Assertor.assert_data_types([query], [(type(None), dict)])
         try:
             try:
-                response = requests.post(url=SSB_URL, json=self.payload.payload(), timeout=TIMEOUT)
+                response = self.session(SSB_URL).post(url=SSB_URL,
+                                                      json=query or self.payload.payload(),
+                                                      timeout=(CONNECT_TIMEOUT, TIMEOUT))
                 status_code = response.status_code
                 LOGGER.info(
                     f"HTTP status code -> [{status_code}: {responses[status_code]}]")
@@ -22,6 +22,19 @@ class SsbPayload:
 
     """
 
+    @staticmethod
+    def today():
+        """
+        method for getting the date the SSB dates are relative to
+
+        Returns
+        -------
+        out         : datetime
+                      today
+
+        """
+        return dt.today()
+
     @staticmethod
     def date_str(num: int):
         """
@@ -39,7 +52,7 @@ class SsbPayload:
 
         """
         Assertor.assert_data_types([num], [int])
-        return [(dt.today() - timedelta(days=num)).strftime("%YM%m")]
+        return [(SsbPayload.today() - timedelta(days=num)).strftime("%YM%m")]
 
     @staticmethod
     def updated_table_date():
@@ -53,7 +66,7 @@ class SsbPayload:
                       correct date for table nr. 10748
 
         """
-        return SsbPayload.date_str(90) if dt.today().day < 13 else SsbPayload.date_str(60)
+        return SsbPayload.date_str(90) if SsbPayload.today().day < 13 else SsbPayload.date_str(60)
 
     @staticmethod
     def validate_date(dates: list):
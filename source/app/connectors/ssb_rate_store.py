@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module with logic for the local store of the interest rate history of SSB table nr. 10748
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+from bisect import bisect_right
+from itertools import product
+from threading import Lock
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from source.util import Assertor, LOGGER
+
+from .ssb_payload import SsbPayload
+from .ssb import Ssb
+
+
+class SsbRateStore:  # pylint: disable=too-many-instance-attributes
+    """
+    Local columnar store (Parquet) of the full history of SSB table nr. 10748 for all
+    Rentebinding categories. The store is refreshed incrementally, i.e. only the months newer
+    than the last stored tid are fetched, and rates are looked up in memory
+
+    """
+
+    market_rate = "inntil 3 måneder (flytende rente)"
+
+    schema = pa.schema([("tid", pa.string()), ("rentebinding", pa.string()),
+                        ("label", pa.string()), ("rente", pa.float64())])
+
+    @staticmethod
+    def months_between(start: str, end: str):
+        """
+        method for getting the number of months between two SSB months, e.g. '2023M01'
+
+        Parameters
+        ----------
+        start       : str
+                      first month
+        end         : str
+                      last month
+
+        Returns
+        -------
+        out         : int
+                      number of months from start to end
+
+        """
+        Assertor.assert_data_types([start, end], [str, str])
+        SsbPayload.validate_date([start, end])
+        return (int(end[:4]) - int(start[:4])) * 12 + int(end[5:]) - int(start[5:])
+
+    @staticmethod
+    def parse(response: dict):
+        """
+        method for parsing a json-stat2 response of SSB table nr. 10748
+
+        Parameters
+        ----------
+        response    : dict
+                      json-stat2 response
+
+        Returns
+        -------
+        out         : list
+                      list of (tid, rentebinding, label, rente), rates without value left out
+
+        """
+        Assertor.assert_data_types([response], [dict])
+        dimensions = response["id"]
+        categories = [sorted(response["dimension"][dimension]["category"]["index"].items(),
+                             key=lambda category: category[1]) for dimension in dimensions]
+        labels = response["dimension"]["Rentebinding"]["category"]["label"]
+        tid, rentebinding = dimensions.index("Tid"), dimensions.index("Rentebinding")
+
+        rows = []
+        for codes, value in zip(product(*[[code for code, _ in category] for category in
+                                          categories]), response["value"]):
+            if value is not None:
+                rows.append((codes[tid], codes[rentebinding], labels[codes[rentebinding]],
+                             float(value)))
+        return rows
+
+    def __init__(self, path: str):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        path        : str
+                      path of the Parquet file of the store
+
+        """
+        Assertor.assert_data_types([path], [str])
+        self.path = path
+        self.checked = ""
+        self._rates = {}
+        self._series = {}
+        self._names = {}
+        self._labels = {}
+        self._loaded = False
+        self._lock = Lock()
+        self._refresh_lock = Lock()
+
+    @property
+    def latest_tid(self):
+        """
+        latest stored month
+
+        Returns
+        -------
+        out         : str
+                      latest month, '' if the store is empty
+
+        """
+        self.load()
+        return max((series[-1][0] for series in self._series.values()), default="")
+
+    def load(self):
+        """
+        method for loading the store from disk, once per instance
+
+        """
+        with self._lock:
+            if self._loaded:
+                return
+            if os.path.isfile(self.path):
+                table = pq.read_table(self.path)
+                metadata = table.schema.metadata or {}
+                self.checked = metadata.get(b"checked", b"").decode()
+                columns = table.to_pydict()
+                self._index(zip(columns["tid"], columns["rentebinding"], columns["label"],
+                                columns["rente"]))
+            self._loaded = True
+
+    def _index(self, rows):
+        """
+        method for adding rows to the in-memory lookups
+
+        """
+        for tid, rentebinding, label, rente in rows:
+            self._rates[(rentebinding, tid)] = rente
+            self._names[rentebinding] = label
+            self._labels[label.lower()] = rentebinding
+        series = {}
+        for (rentebinding, tid), rente in self._rates.items():
+            series.setdefault(rentebinding, []).append((tid, rente))
+        self._series = {rentebinding: sorted(rates) for rentebinding, rates in series.items()}
+
+    def save(self):
+        """
+        method for writing the store to disk, replacing the previous file atomically
+
+        """
+        rows = [(tid, rentebinding, self._names[rentebinding], rente) for
+                rentebinding, series in sorted(self._series.items()) for tid, rente in series]
+        table = pa.Table.from_pylist(
+            [dict(zip(self.schema.names, row)) for row in rows],
+            schema=self.schema.with_metadata({"checked": self.checked}))
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        pq.write_table(table, self.path + ".tmp")
+        os.replace(self.path + ".tmp", self.path)
+
+    def query(self, months: int = None):
+        """
+        method for getting the query of all Rentebinding categories
+
+        Parameters
+        ----------
+        months      : int
+                      number of latest months to fetch, None for the full history
+
+        Returns
+        -------
+        out         : dict
+                      query against SSB table nr. 10748
+
+        """
+        query = SsbPayload().payload()
+        for variable in query["query"]:
+            if variable["code"] == "Rentebinding" or \
+                    (variable["code"] == "Tid" and months is None):
+                variable["selection"] = {"filter": "all", "values": ["*"]}
+            elif variable["code"] == "Tid":
+                variable["selection"] = {"filter": "top", "values": [str(months)]}
+        return query
+
+    def refresh(self, tid: str = None):
+        """
+        method for fetching the months newer than the last stored tid, up to and including
+        tid. Nothing is fetched if tid is stored or was already checked
+
+        Parameters
+        ----------
+        tid         : str
+                      newest month to fetch, default is SsbPayload.updated_table_date()
+
+        Returns
+        -------
+        out         : int
+                      number of new rates stored
+
+        """
+        tid = tid or SsbPayload.updated_table_date()[0]
+        with self._refresh_lock:
+            latest_tid = self.latest_tid
+            if tid <= max(latest_tid, self.checked):
+                return 0
+
+            # the latest months published may be newer than tid, so every month since the
+            # last stored tid is fetched
+            months = max(self.months_between(latest_tid, SsbPayload.today().strftime("%YM%m")),
+                         1) if latest_tid else None
+            LOGGER.info(f"refreshing SSB rate store from '{latest_tid or 'start'}' to '{tid}'")
+            rows = self.parse(Ssb().response(self.query(months)).json())
+            with self._lock:
+                size = len(self._rates)
+                self._index(rows)
+                added = len(self._rates) - size
+                self.checked = tid
+                self.save()
+        LOGGER.success(f"SSB rate store refreshed with {added} new rates")
+        return added
+
+    def rate(self, rentebinding: str = market_rate, tid: str = None):
+        """
+        method for looking up a rate
+
+        Parameters
+        ----------
+        rentebinding    : str
+                          Rentebinding code, e.g. '08', or label
+        tid             : str
+                          month of the rate, default is the latest month. The latest stored
+                          rate before tid is used if tid is not stored
+
+        Returns
+        -------
+        out             : float
+                          rate in percent, None if not stored
+
+        """
+        self.load()
+        rentebinding = self._labels.get(str(rentebinding).lower(), rentebinding)
+        series = self._series.get(rentebinding)
+        if not series:
+            return None
+        if tid is None:
+            return series[-1][1]
+        rate = self._rates.get((rentebinding, tid))
+        if rate is None:
+            position = bisect_right(series, (tid, float("inf")))
+            rate = series[position - 1][1] if position else None
+        return rate
+
+    def series(self, rentebinding: str = market_rate):
+        """
+        method for getting the history of a rate
+
+        Parameters
+        ----------
+        rentebinding    : str
+                          Rentebinding code, e.g. '08', or label
+
+        Returns
+        -------
+        out             : list
+                          list of (tid, rate) in order of tid
+
+        """
+        self.load()
+        rentebinding = self._labels.get(str(rentebinding).lower(), rentebinding)
+        return list(self._series.get(rentebinding, []))
+
+    def categories(self):
+        """
+        method for getting the stored Rentebinding categories
+
+        Returns
+        -------
+        out             : dict
+                          Rentebinding code by label
+
+        """
+        self.load()
+        return {label: rentebinding for rentebinding, label in self._names.items()}
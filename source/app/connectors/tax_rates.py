@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+"""
+Norwegian tax rates file
+
+This file contains the rate tables of the local tax engine (LocalTax) per tax year, for a
+person in tax class 1 with Oslo (0301) as place of taxation, i.e. the same tax payer as in the
+Skatteetaten payload. Amounts are in kr and rates are fractions. Brackets are tuples of
+(lower limit, rate), each rate applying to the amount between its lower limit and the next
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+SKATTESTED = "0301"
+
+SKATTEKLASSE = "1"
+
+TAX_RATES = {
+    "2018": {
+        "personfradrag": 55550,
+        "minstefradrag": {"rate": 0.36, "min": 4000, "max": 97610},
+        "fagforeningskontingent": 3850,
+        "inntektsskatt": {"kommune": 0.118, "fylkeskommune": 0.0265, "fellesskatt": 0.0855},
+        "trinnskatt": ((169000, 0.014), (237900, 0.033), (598050, 0.124), (962050, 0.154)),
+        "trygdeavgift": {"rate": 0.082, "low_rate": 0.051, "lower_limit": 54650,
+                         "max_share": 0.25},
+        "formuesskatt": {"bunnfradrag": 1480000, "kommune": 0.007,
+                         "stat": ((1480000, 0.0015),)},
+        "bsu": {"rate": 0.2, "max": 25000, "max_age": 33}
+    },
+    "2019": {
+        "personfradrag": 56550,
+        "minstefradrag": {"rate": 0.45, "min": 4000, "max": 100800},
+        "fagforeningskontingent": 3850,
+        "inntektsskatt": {"kommune": 0.1155, "fylkeskommune": 0.0245, "fellesskatt": 0.08},
+        "trinnskatt": ((174500, 0.019), (245650, 0.042), (617500, 0.132), (964800, 0.162)),
+        "trygdeavgift": {"rate": 0.082, "low_rate": 0.051, "lower_limit": 54650,
+                         "max_share": 0.25},
+        "formuesskatt": {"bunnfradrag": 1500000, "kommune": 0.007,
+                         "stat": ((1500000, 0.0015),)},
+        "bsu": {"rate": 0.2, "max": 25000, "max_age": 33}
+    },
+    "2020": {
+        "personfradrag": 51750,
+        "minstefradrag": {"rate": 0.45, "min": 4000, "max": 104450},
+        "fagforeningskontingent": 5800,
+        "inntektsskatt": {"kommune": 0.111, "fylkeskommune": 0.026, "fellesskatt": 0.083},
+        "trinnskatt": ((180800, 0.019), (254500, 0.042), (639750, 0.132), (999550, 0.162)),
+        "trygdeavgift": {"rate": 0.082, "low_rate": 0.051, "lower_limit": 54650,
+                         "max_share": 0.25},
+        "formuesskatt": {"bunnfradrag": 1500000, "kommune": 0.007,
+                         "stat": ((1500000, 0.0015),)},
+        "bsu": {"rate": 0.2, "max": 25000, "max_age": 33}
+    },
+    "2021": {
+        "personfradrag": 52450,
+        "minstefradrag": {"rate": 0.45, "min": 4000, "max": 106750},
+        "fagforeningskontingent": 5800,
+        "inntektsskatt": {"kommune": 0.1095, "fylkeskommune": 0.0245, "fellesskatt": 0.086},
+        "trinnskatt": ((184800, 0.017), (260100, 0.04), (651250, 0.132), (1021550, 0.162)),
+        "trygdeavgift": {"rate": 0.082, "low_rate": 0.051, "lower_limit": 59650,
+                         "max_share": 0.25},
+        "formuesskatt": {"bunnfradrag": 1500000, "kommune": 0.007,
+                         "stat": ((1500000, 0.0015),)},
+        "bsu": {"rate": 0.2, "max": 25000, "max_age": 33}
+    },
+    "2022": {
+        "personfradrag": 58250,
+        "minstefradrag": {"rate": 0.46, "min": 4000, "max": 109950},
+        "fagforeningskontingent": 7700,
+        "inntektsskatt": {"kommune": 0.1095, "fylkeskommune": 0.026, "fellesskatt": 0.0845},
+        "trinnskatt": ((190350, 0.017), (267900, 0.04), (643800, 0.134), (969200, 0.164),
+                       (2000000, 0.174)),
+        "trygdeavgift": {"rate": 0.08, "low_rate": 0.051, "lower_limit": 64650,
+                         "max_share": 0.25},
+        "formuesskatt": {"bunnfradrag": 1700000, "kommune": 0.007,
+                         "stat": ((1700000, 0.0025), (20000000, 0.004))},
+        "bsu": {"rate": 0.2, "max": 27500, "max_age": 33}
+    },
+    "2023": {
+        "personfradrag": 79600,
+        "minstefradrag": {"rate": 0.46, "min": 4000, "max": 104450},
+        "fagforeningskontingent": 7700,
+        "inntektsskatt": {"kommune": 0.1095, "fylkeskommune": 0.026, "fellesskatt": 0.0845},
+        "trinnskatt": ((198350, 0.017), (279150, 0.04), (642950, 0.136), (926800, 0.166),
+                       (1500000, 0.176)),
+        "trygdeavgift": {"rate": 0.079, "low_rate": 0.051, "lower_limit": 69650,
+                         "max_share": 0.25},
+        "formuesskatt": {"bunnfradrag": 1700000, "kommune": 0.007,
+                         "stat": ((1700000, 0.003), (20000000, 0.004))},
+        "bsu": {"rate": 0.2, "max": 27500, "max_age": 33}
+    }
+}
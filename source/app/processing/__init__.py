@@ -23,5 +23,7 @@ from .sifo_expenses_process import SifoExpensesProcess
 from .finn_shopping_process import FinnShoppingProcess
 from .restructure_process import RestructureProcess
 from .postal_code_process import PostalCodeProcess
+from .process_benchmarks import ProcessBenchmarks
+from .finn_advert_batch import FinnAdvertBatch
 
 from .engine import *
@@ -35,12 +35,15 @@ from .validate_family import ValidateFamily
 from .input_operation import InputOperation
 from .multiplication import Multiplication
 from .rate_of_change import RateOfChange
+from .process_context import ProcessContext
+from .operation_cache import OperationCache
 from .output_signal import OutputSignal
 from .ssb_connector import SsbConnector
 from .fixed_payment import FixedPayment
 from .read_settings import ReadSettings
 from .restructure import Restructure
 from .subtraction import Subtraction
+from .worker_pool import WorkerPool
 from .accumulate import Accumulate
 from .comparison import Comparison
 from .converter import Converter
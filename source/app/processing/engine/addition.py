@@ -20,6 +20,7 @@ class Addition(Operation):
     Operation for addition two signals (assuming one is a factor)
 
     """
+    pure = True
 
     @Tracking
     def __init__(self, factor_1: dict, factor_2: dict, desc: str):
@@ -20,6 +20,7 @@ class Converter(Operation):
     Operation for converter amount to various periodic amounts
 
     """
+    pure = True
     interval_mapping = {"Årlig": 1, "Halvårlig": 2, "Kvartalsvis": 4, "Annenhver måned": 6,
                         "Månedlig": 12, "Semi-månedlig": 24, "Annenhver uke": 26, "Ukentlig": 52}
 
@@ -20,6 +20,7 @@ class Division(Operation):
     Operation for dividing two signals (assuming one is a factor)
 
     """
+    pure = True
 
     @Tracking
     def __init__(self, numerator: dict, denominator: dict, desc: str):
@@ -18,6 +18,7 @@ class FixedStressTest(Operation):
     Operation for stress testing with fixed rate
 
     """
+    pure = True
 
     @Tracking
     def __init__(self, mortgage_data: dict):
@@ -19,6 +19,7 @@ class GenerateFixedPaymentPlan(Operation):
     Operation for generating Fixed Payment Plan
 
     """
+    pure = True
 
     @Tracking
     def __init__(self, interest_rate: Union[str, float], period: Union[str, int],
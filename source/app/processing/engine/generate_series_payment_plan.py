@@ -19,6 +19,7 @@ class GenerateSeriesPaymentPlan(Operation):
     Operation for generating series Payment Plan
 
     """
+    pure = True
 
     @Tracking
     def __init__(self, interest_rate: Union[str, float], period: Union[str, int],
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module with logic for the LazyNode abstract base class
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+from uuid import uuid4
+from abc import ABC, abstractmethod
+
+from pydot import Node
+
+
+class LazyNode(Node, ABC):
+    """
+    Implementation of a Node that is only initialized as a pydot Node when it is added to a
+    graph, i.e. operations and signals in headless processes never pay for the graph
+
+    """
+
+    def __init__(self):  # pylint: disable=super-init-not-called
+        """
+        Constructor / Instantiating class, Node.__init__ is called in graph_node() when the
+        object is added to a graph
+
+        """
+
+    @abstractmethod
+    def node_attributes(self):
+        """
+        abstract method for the attributes (label, shape, style etc.) of the graph node
+
+        Returns
+        -------
+        out         : dict
+                      attributes of the graph node
+
+        """
+
+    def graph_node(self):
+        """
+        method for initializing the object as a pydot Node, only done once
+
+        Returns
+        -------
+        out         : LazyNode
+                      the object itself, ready to be added to a graph
+
+        """
+        if "obj_dict" not in self.__dict__:
+            Node.__init__(self, name=str(uuid4()), **self.node_attributes())
+        return self
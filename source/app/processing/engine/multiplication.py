@@ -20,6 +20,7 @@ class Multiplication(Operation):
     Operation for multiply two signals (assuming one is a factor)
 
     """
+    pure = True
 
     @Tracking
     def __init__(self, factor_1: dict, factor_2: dict, desc: str):
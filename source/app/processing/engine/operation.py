@@ -8,19 +8,33 @@ Module with logic for Operation class used in WorkFlow engine
 __author__ = 'Samir Adrik'
 __email__ = 'samir.adrik@gmail.com'
 
-from uuid import uuid4
 from abc import ABC, abstractmethod
 
-from pydot import Node
-
 from source.util import Assertor
 
+from .settings import OPERATION_CACHE_SIZE, OPERATION_CACHE_MAX_BYTES
+from .operation_cache import OperationCache
+from .lazy_node import LazyNode
+
 
-class Operation(Node, ABC):
+class Operation(LazyNode, ABC):
     """
-    Implementation of the Operation Node
+    Implementation of the Operation Node. Operations declaring themselves pure (pure = True),
+    i.e. whose result only depends on their inputs, have the results of run() memoized in the
+    shared operation cache
 
     """
+    pure = False
+    cache = OperationCache(OPERATION_CACHE_SIZE, OPERATION_CACHE_MAX_BYTES)
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        memoizing the run method of pure subclasses
+
+        """
+        super().__init_subclass__(**kwargs)
+        if cls.pure and "run" in cls.__dict__:
+            cls.run = OperationCache.memoize(cls.__dict__["run"])
 
     @abstractmethod
     def __init__(self, name: str, desc: str, label: str = None):
@@ -35,12 +49,18 @@ class Operation(Node, ABC):
                       description of operation
 
         """
+        super().__init__()
         self.name = name
         Assertor.assert_data_types([name, desc], [str, str])
         self.desc = desc
         self.label = f"\\<{self.name}\\> \\n {self.desc}" if not label else label
-        super().__init__(name=str(uuid4()), style="filled", fillcolor="gray", shape="record",
-                         label=self.label)
+
+    def node_attributes(self):
+        """
+        attributes of the operation in the procedure graph
+
+        """
+        return {"style": "filled", "fillcolor": "gray", "shape": "record", "label": self.label}
 
     @abstractmethod
     def run(self):
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module with logic for the OperationCache shared by all pure operations
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import pickle
+from collections import OrderedDict
+from decimal import Decimal
+from functools import wraps
+from hashlib import sha256
+from threading import Lock
+from types import MethodType
+
+from source.util import Assertor
+
+from .process_context import ProcessContext
+
+
+class OperationCache:
+    """
+    Implementation of a content-addressed LRU cache for the results of pure operations, i.e.
+    operations whose result only depends on their inputs. Results are keyed by a stable hash of
+    the class, the inputs of the operation and the arguments to run(), stored pickled (so every
+    hit gets its own copy) and evicted least recently used first when the cache is full
+
+    """
+
+    graph_attributes = ("name", "desc", "label", "obj_dict")
+
+    def __init__(self, max_size: int, max_bytes: int):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        max_size    : int
+                      maximum number of cached results, 0 disables the cache
+        max_bytes   : int
+                      maximum total size of the pickled cached results
+
+        """
+        Assertor.assert_data_types([max_size, max_bytes], [int, int])
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._results = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def stable_hash(cls, *values):
+        """
+        method for hashing values independent of the interpreter session
+
+        Parameters
+        ----------
+        values      : tuple
+                      values made up of dict, list, tuple, str, bytes, int, float, bool,
+                      Decimal and None
+
+        Returns
+        -------
+        out         : str
+                      sha256 hex digest of the values
+
+        """
+        digest = sha256()
+        for value in values:
+            cls._update(digest, value)
+        return digest.hexdigest()
+
+    @classmethod
+    def _update(cls, digest, value):
+        """
+        method for feeding a value to a digest with its type, raises TypeError for values
+        without a stable representation
+
+        """
+        if isinstance(value, dict):
+            digest.update(f"dict:{len(value)}:".encode())
+            for key, val in value.items():
+                cls._update(digest, key)
+                cls._update(digest, val)
+        elif isinstance(value, (list, tuple)):
+            digest.update(f"{value.__class__.__name__}:{len(value)}:".encode())
+            for val in value:
+                cls._update(digest, val)
+        elif isinstance(value, (str, bytes)):
+            value = value.encode() if isinstance(value, str) else value
+            digest.update(f"{value.__class__.__name__}:{len(value)}:".encode() + value)
+        elif value is None or isinstance(value, (bool, int, float, Decimal)):
+            digest.update(f"{value.__class__.__name__}:{value!r};".encode())
+        else:
+            raise TypeError(f"no stable hash for type '{value.__class__.__name__}'")
+
+    def key(self, operation, args: tuple, kwargs: dict):
+        """
+        method for getting the cache key of a run of an operation
+
+        Parameters
+        ----------
+        operation   : Operation
+                      operation to run
+        args        : tuple
+                      positional arguments to run()
+        kwargs      : dict
+                      keyword arguments to run()
+
+        Returns
+        -------
+        out         : str
+                      cache key, None if the inputs have no stable hash
+
+        """
+        inputs = {name: value for name, value in vars(operation).items() if
+                  name not in self.graph_attributes}
+        try:
+            return self.stable_hash(operation.__class__.__qualname__, inputs, args,
+                                    sorted(kwargs.items()))
+        except TypeError:
+            return None
+
+    def run(self, operation, run, args: tuple, kwargs: dict):
+        """
+        method for getting the result of an operation from the cache, running and caching it
+        if not cached. Hits and misses are counted here and in the context of the running
+        process
+
+        Parameters
+        ----------
+        operation   : Operation
+                      pure operation to run
+        run         : callable
+                      bound run method of the operation
+        args        : tuple
+                      positional arguments to run()
+        kwargs      : dict
+                      keyword arguments to run()
+
+        Returns
+        -------
+        out         : object
+                      result of the operation
+
+        """
+        key = self.key(operation, args, kwargs) if self.max_size else None
+        if key is None:
+            return run(*args, **kwargs)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+        context = ProcessContext.current()
+        if context:
+            context.add_cache_count(hit=cached is not None)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            return pickle.loads(cached)
+
+        result = run(*args, **kwargs)
+        cached = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self.misses += 1
+            if key not in self._results and len(cached) <= self.max_bytes:
+                self._results[key] = cached
+                self._bytes += len(cached)
+                while len(self._results) > self.max_size or self._bytes > self.max_bytes:
+                    self._bytes -= len(self._results.popitem(last=False)[1])
+        return result
+
+    @staticmethod
+    def memoize(run):
+        """
+        method for memoizing the run method of a pure operation class in the cache of the
+        operation
+
+        Parameters
+        ----------
+        run         : callable
+                      (decorated) run method of the class
+
+        Returns
+        -------
+        out         : callable
+                      run method looking up results in the cache
+
+        """
+        @wraps(run)
+        def memoized_run(operation, *args, **kwargs):
+            return operation.cache.run(operation, MethodType(run, operation), args, kwargs)
+
+        return memoized_run
+
+    def clear(self):
+        """
+        method for clearing the cache and its counters
+
+        """
+        with self._lock:
+            self._results.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+
+    def metrics(self):
+        """
+        method for getting the size and hit/miss counters of the cache
+
+        Returns
+        -------
+        out         : dict
+                      dictionary with the metrics of the cache
+
+        """
+        with self._lock:
+            return {"size": len(self._results), "bytes": self._bytes,
+                    "max_size": self.max_size, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses}
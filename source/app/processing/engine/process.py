@@ -9,7 +9,10 @@ __author__ = 'Samir Adrik'
 __email__ = 'samir.adrik@gmail.com'
 
 import os
-from threading import Thread
+import ast
+import inspect
+import textwrap
+from contextlib import contextmanager
 from queue import Queue
 import platform
 
@@ -19,55 +22,59 @@ from abc import ABC, abstractmethod
 
 from pydot import Dot, Edge
 
-from source.util import Assertor, __version__, profiling_config, LOGGER, Debugger, Tracking
+from source.util import Assertor, __version__, LOGGER, Debugger, Tracking
 
+from .settings import HEADLESS, WORKER_POOL_SIZE, LATENCY_BUDGET
+from .process_context import ProcessContext
+from .worker_pool import WorkerPool
 from .signal import Signal
 
 if platform.system() == 'Windows':
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
 
-class Process(Dot, ABC):
+class Process(Dot, ABC):  # pylint: disable=too-many-instance-attributes
     """
     Implementation of Process class, i.e. similar to a Dot graph
 
     """
-    profiling = None
-    elapsed = 0.0
-    start = None
-
-    @classmethod
-    def start_process(cls):
+    # no graph built while running, only when asked for, set globally or per. process class
+    headless = HEADLESS
+    # printing of the procedure graph, e.g. turned off per. process class in batches
+    print_procedure = True
+    # seconds after which the HTTP requests of a run fail fast, 0 for no budget
+    latency_budget = LATENCY_BUDGET
+    # worker pool shared by the parallel methods of all processes
+    worker_pool = WorkerPool(WORKER_POOL_SIZE)
+    # method name -> names of the methods it depends on, for dependencies the signal keys in
+    # the source code do not show, e.g. keys that are not string literals
+    depends_on = {}
+    _signal_keys = {}
+
+    def start_process(self):
         """
-        method for starting logging and profiling of process
+        method for starting logging and profiling of a run of the process, i.e. creating the
+        ProcessContext of the run, which keeps its timing, profiling and exceptions so the same
+        process can run concurrently
 
         """
-        LOGGER.info(f"starting '{cls.__name__}'")
-        cls.start = time()
-        cls.profiling = profiling_config()
+        self._context = ProcessContext(self.__class__.__name__, self.latency_budget)
+        LOGGER.info(f"starting '{self.__class__.__name__}' (run '{self.run_id}')")
 
-    @classmethod
-    def end_process(cls):
+    def end_process(self):
         """
-        method for ending logging and profiling of process
+        method for ending logging and profiling of a run of the process
 
         """
-        digits = 7
-        elapsed = round((time() - cls.start) * 1000, digits)
-        speedup = round(cls.elapsed - elapsed, digits)
-        cls.profiling.add_row(["-----------", "", "", ""])
-        cls.profiling.add_row(["total", "", "", f"{elapsed}ms"])
-        cls.profiling.add_row(["", "", "", ""])
-        cls.profiling.add_row(["speedup", "", "", f"{speedup}ms"])
-        cls.profiling.add_row(
-            ["(total without speedup)", "", "", f"{round(cls.elapsed, digits)}ms"])
-        LOGGER.success(f"ending '{cls.__name__}'")
-        LOGGER.info(f"reporting profiling results -> \n\n profiling: '{cls.__name__}' \n\n" +
-                    f"{str(cls.profiling)}\n")
+        self.context.end()
+        LOGGER.success(f"ending '{self.__class__.__name__}' (run '{self.run_id}')")
+        LOGGER.info(f"reporting profiling results -> \n\n profiling: "
+                    f"'{self.__class__.__name__}' (run '{self.run_id}') \n\n" +
+                    f"{str(self.profiling)}\n")
 
     def run_parallel(self, methods):
         """
-        method for running multiple independent methods in parallel using multi-threading
+        method for running multiple independent methods in parallel in the shared worker pool
 
         Parameters
         ----------
@@ -75,16 +82,368 @@ class Process(Dot, ABC):
                       list of methods to run in parallel
 
         """
-        threads = []
-        for method in methods:
-            thread = Thread(target=method)
-            thread.start()
-            threads.append(thread)
-        for thread in threads:
-            thread.join()
+        self.worker_pool.run_all(methods)
 
         self.threading_exception()
 
+    @classmethod
+    def signal_keys(cls):
+        """
+        method for inferring the signal keys each method in the process reads (get_signal) and
+        writes (add_signal or signal.update), parsed once from the source code of the process
+        and the processes it inherits from, i.e. methods of a subclass override the ones of its
+        parents
+
+        Returns
+        -------
+        out         : dict
+                      dictionary with method name -> (keys read, keys written), None if the
+                      source code is not available, e.g. in frozen builds
+
+        """
+        if cls not in Process._signal_keys:
+            signal_keys = {}
+            try:
+                for klass in reversed(cls.__mro__):
+                    if issubclass(klass, Process) and klass is not Process:
+                        signal_keys.update(cls.parse_signal_keys(klass))
+            except (OSError, TypeError) as source_exception:
+                LOGGER.warning(f"signal keys of '{cls.__name__}' not inferred, running its "
+                               f"methods in order, exited with '{source_exception}'")
+                signal_keys = None
+            Process._signal_keys[cls] = signal_keys
+        return Process._signal_keys[cls]
+
+    @staticmethod
+    def parse_signal_keys(klass: type):
+        """
+        method for parsing the signal keys each method defined in a class reads and writes
+
+        Parameters
+        ----------
+        klass       : type
+                      class to parse
+
+        Returns
+        -------
+        out         : dict
+                      dictionary with method name -> (keys read, keys written)
+
+        """
+        signal_keys = {}
+        for function in ast.walk(ast.parse(textwrap.dedent(inspect.getsource(klass)))):
+            if not isinstance(function, ast.FunctionDef):
+                continue
+            reads, writes = set(), set()
+            for call in ast.walk(function):
+                if Process._is_signal_update(call):
+                    writes.update(key.value for key in call.args[0].keys if
+                                  isinstance(key, ast.Constant) and isinstance(key.value, str))
+                if not Process._is_self_call(call):
+                    continue
+                args = call.args + [keyword.value for keyword in call.keywords if
+                                    keyword.arg == "key"]
+                keys = [arg.value for arg in args if isinstance(arg, ast.Constant) and
+                        isinstance(arg.value, str)]
+                if call.func.attr == "get_signal" and keys:
+                    reads.add(keys[0])
+                elif call.func.attr == "add_signal" and keys:
+                    writes.add(keys[-1])
+            signal_keys[function.name] = (reads, writes)
+        return signal_keys
+
+    @staticmethod
+    def _is_method_call(node: ast.AST):
+        """
+        method for checking if a node of the source code is a call of a method
+
+        """
+        return isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+
+    @staticmethod
+    def _is_signal_update(node: ast.AST):
+        """
+        method for checking if a node of the source code is a call of signal.update() with a
+        dict literal, e.g. self.signal.update({"key": signal})
+
+        """
+        return Process._is_method_call(node) and node.func.attr == "update" and \
+            isinstance(node.func.value, ast.Attribute) and node.func.value.attr == "signal" and \
+            bool(node.args) and isinstance(node.args[0], ast.Dict)
+
+    @staticmethod
+    def _is_self_call(node: ast.AST):
+        """
+        method for checking if a node of the source code is a call of a method of self
+
+        """
+        return Process._is_method_call(node) and isinstance(node.func.value, ast.Name) and \
+            node.func.value.id == "self"
+
+    @staticmethod
+    def method_name(method):
+        """
+        method for getting the name of a (decorated) method
+
+        Parameters
+        ----------
+        method      : callable
+                      method, possibly wrapped by the Profiling, Tracking or Debugger
+                      decorators
+
+        Returns
+        -------
+        out         : str
+                      name of the method
+
+        """
+        while not hasattr(method, "__name__"):
+            method = method.func
+        return method.__name__
+
+    def dependencies(self, methods):
+        """
+        method for inferring the dependencies between methods, i.e. a method depends on the
+        methods writing the signal keys it reads, and on the methods declared in depends_on.
+        Keys not written by any of the methods must already be in the signal. If the signal
+        keys cannot be inferred, every method depends on the method before it
+
+        Parameters
+        ----------
+        methods     : list
+                      list of methods
+
+        Returns
+        -------
+        out         : dict
+                      dictionary with method name -> set of method names it depends on
+
+        """
+        signal_keys = self.signal_keys()
+        names = [self.method_name(method) for method in methods]
+        if signal_keys is None:
+            return {name: set(names[i - 1:i]) for i, name in enumerate(names)}
+        writers = {}
+        for name in names:
+            for key in signal_keys.get(name, (set(), set()))[1]:
+                writers.setdefault(key, set()).add(name)
+        for name in names:
+            missing = sorted(key for key in signal_keys.get(name, (set(), set()))[0] if
+                             key not in writers and key not in self.signal)
+            if missing:
+                raise ValueError(f"'{name}' reads '{missing}', which no step writes, declare "
+                                 f"the dependency in depends_on")
+        dependencies = {name: {writer for key in signal_keys.get(name, (set(), set()))[0]
+                               for writer in writers.get(key, set()) if writer != name} |
+                        {dependency for dependency in self.depends_on.get(name, set()) if
+                         dependency in names and dependency != name}
+                        for name in names}
+
+        remaining = {name: set(deps) for name, deps in dependencies.items()}
+        ready = [name for name, deps in remaining.items() if not deps]
+        while ready:
+            for name in ready:
+                remaining.pop(name)
+            for deps in remaining.values():
+                deps.difference_update(ready)
+            ready = [name for name, deps in remaining.items() if not deps]
+        if remaining:
+            raise ValueError(f"cyclic dependencies between '{sorted(remaining)}'")
+        return dependencies
+
+    def run_scheduled(self, methods):
+        """
+        method for running methods as a dependency graph in the shared worker pool, i.e. every
+        method is started as soon as the signals it reads are added by the methods it depends
+        on. The critical path of the run is reported when all methods are done
+
+        Parameters
+        ----------
+        methods     : list
+                      list of methods to run
+
+        """
+        steps = {self.method_name(method): method for method in methods}
+        dependencies = self.dependencies(methods)
+        dependents = {name: [] for name in steps}
+        for name, deps in dependencies.items():
+            for dep in deps:
+                dependents[dep].append(name)
+        waiting = {name: len(deps) for name, deps in dependencies.items()}
+        finished = Queue()
+        elapsed = {}
+
+        def run_step(name):
+            step_start = time()
+            try:
+                steps[name]()
+            except Exception as step_exception:
+                if step_exception not in self.exception_queue.queue:
+                    self.exception_queue.put(step_exception)
+            finally:
+                finished.put((name, (time() - step_start) * 1000))
+
+        start, running = time(), {}
+        ready = [name for name, count in waiting.items() if not count]
+        while ready or running:
+            if self.exception_queue.empty():
+                for name in ready:
+                    running[name] = self.worker_pool.submit(run_step, name)
+            ready = []
+            if not running:
+                break
+            if finished.empty():
+                for name, future in list(running.items()):
+                    if self.worker_pool.steal(future, run_step, name):
+                        break
+            name, step_elapsed = finished.get()
+            running.pop(name)
+            elapsed[name] = step_elapsed
+            for dependent in dependents[name]:
+                waiting[dependent] -= 1
+                if not waiting[dependent]:
+                    ready.append(dependent)
+
+        self.threading_exception()
+        self._critical_path = self.compute_critical_path(dependencies, elapsed)
+        digits = 7
+        LOGGER.info(f"critical path '{self.__class__.__name__}' -> "
+                    f"{' -> '.join(name for name, _ in self.critical_path)} "
+                    f"({round(sum(ms for _, ms in self.critical_path), digits)}ms of "
+                    f"{round((time() - start) * 1000, digits)}ms)")
+
+    def run_incremental(self, methods, changed_keys, always=None):
+        """
+        method for re-running only the methods downstream of changed signals, keeping the
+        signals of the previous run for the rest. Methods are re-run level by level in the
+        dependency graph, and only if a signal they read has changed. A re-run method whose
+        signals are equal to the ones of the previous run does not trigger its dependents. If
+        the signal keys cannot be inferred, every method is re-run
+
+        Parameters
+        ----------
+        methods         : list
+                          list of methods of the process
+        changed_keys    : set
+                          keys of the signals changed since the previous run
+        always          : list
+                          methods re-run regardless of the changed signals, e.g. methods
+                          reading settings outside the signals
+
+        Returns
+        -------
+        out             : list
+                          names of the re-run methods
+
+        """
+        signal_keys = self.signal_keys()
+        steps = {self.method_name(method): method for method in methods}
+        if signal_keys is None:
+            self.run_scheduled(methods)
+            return list(steps)
+        dependencies = self.dependencies(methods)
+        always = {self.method_name(method) for method in always or []}
+        changed, done, rerun = set(changed_keys), set(), []
+        while len(done) < len(steps):
+            level = [name for name in steps if name not in done and dependencies[name] <= done]
+            selected = [name for name in level if signal_keys[name][0] & changed or
+                        name in always]
+            previous = {key: self.get_signal(key) for name in selected for key in
+                        signal_keys[name][1]}
+            self.run_parallel([steps[name] for name in selected])
+            changed.update(key for key, signal in previous.items() if
+                           self.signal_changed(signal, self.get_signal(key)))
+            done.update(level)
+            rerun.extend(selected)
+        return rerun
+
+    @staticmethod
+    def signal_changed(previous: Signal, signal: Signal):
+        """
+        method for checking if the data of a signal has changed since the previous run
+
+        Parameters
+        ----------
+        previous    : Signal
+                      signal of the previous run, None if not added
+        signal      : Signal
+                      signal of the current run, None if not added
+
+        Returns
+        -------
+        out         : bool
+                      True if the data has changed, or cannot be compared
+
+        """
+        if previous is None or signal is None:
+            return previous is not signal
+        try:
+            return bool(previous.data != signal.data)
+        except ValueError:
+            return True
+
+    @contextmanager
+    def frozen_graph(self):
+        """
+        method for re-running methods without extending the procedure graph, i.e. when the
+        nodes and transitions are the same as in the previous run
+
+        """
+        self._graph_frozen = True
+        try:
+            yield self
+        finally:
+            self._graph_frozen = False
+
+    @staticmethod
+    def compute_critical_path(dependencies: dict, elapsed: dict):
+        """
+        method for computing the critical path, i.e. the chain of dependent methods with the
+        longest total elapsed time
+
+        Parameters
+        ----------
+        dependencies    : dict
+                          dictionary with method name -> set of method names it depends on
+        elapsed         : dict
+                          dictionary with method name -> elapsed time in ms
+
+        Returns
+        -------
+        out             : list
+                          list of (method name, elapsed ms) along the critical path
+
+        """
+        longest, previous = {}, {}
+
+        def path_length(name):
+            if name not in longest:
+                deps = [dep for dep in dependencies[name] if dep in elapsed]
+                previous[name] = max(deps, key=path_length) if deps else None
+                longest[name] = elapsed[name] + (path_length(previous[name]) if deps else 0)
+            return longest[name]
+
+        name = max(elapsed, key=path_length) if elapsed else None
+        critical_path = []
+        while name:
+            critical_path.insert(0, (name, elapsed[name]))
+            name = previous[name]
+        return critical_path
+
+    @property
+    def critical_path(self):
+        """
+        critical path getter
+
+        Returns
+        -------
+        out         : list
+                      list of (method name, elapsed ms) along the critical path of the last
+                      scheduled run
+
+        """
+        return self._critical_path
+
     def threading_exception(self):
         """
         Method for retrieving any exceptions caused by any parallel running threads
@@ -94,9 +453,10 @@ class Process(Dot, ABC):
             raise self.exception_queue.get()
 
     @abstractmethod
-    def __init__(self, name: str):
+    def __init__(self, name: str):  # pylint: disable=super-init-not-called
         """
-        Constructor / Instantiating class
+        Constructor / Instantiating class, Dot.__init__ is called in build_graph(), right away
+        or, in headless mode, when the procedure graph is asked for
 
         Parameters
         ----------
@@ -105,10 +465,17 @@ class Process(Dot, ABC):
 
         """
         Assertor.assert_data_types([name], [str])
-        super().__init__(name, graph_type="digraph", labelloc="t", labeljust="left",
-                         label=f"{name} - Stressa v.{__version__}")
+        self._graph_name = name
+        self._graph_built = False
+        self._graph_nodes = []
+        self._graph_edges = []
         self._signal = {}
-        self._exception_queue = Queue()
+        if "_context" not in self.__dict__:
+            self._context = ProcessContext(name, self.latency_budget)
+        self._critical_path = []
+        self._graph_frozen = False
+        if not self.headless:
+            self.build_graph()
 
     @abstractmethod
     def input_operation(self, data: object):
@@ -151,6 +518,45 @@ class Process(Dot, ABC):
         Assertor.assert_data_types([new_signal], [dict])
         self._signal = new_signal
 
+    @property
+    def context(self):
+        """
+        context getter
+
+        Returns
+        -------
+        out         : ProcessContext
+                      context of the current run of the process
+
+        """
+        return self._context
+
+    @property
+    def run_id(self):
+        """
+        run_id getter
+
+        Returns
+        -------
+        out         : str
+                      id of the current run of the process
+
+        """
+        return self.context.run_id
+
+    @property
+    def profiling(self):
+        """
+        profiling getter
+
+        Returns
+        -------
+        out         : PrettyTable
+                      profiling table of the current run of the process
+
+        """
+        return self.context.profiling
+
     @property
     def exception_queue(self):
         """
@@ -159,10 +565,54 @@ class Process(Dot, ABC):
         Returns
         -------
         out         : Queue
-                      active exception_queue in object
+                      active exception_queue in the current run of the process
 
         """
-        return self._exception_queue
+        return self.context.exception_queue
+
+    def build_graph(self):
+        """
+        method for building the procedure graph, i.e. initializing the process as a Dot graph
+        and adding all nodes and transitions recorded while running headless
+
+        """
+        if not self._graph_built:
+            super().__init__(self._graph_name, graph_type="digraph", labelloc="t",
+                             labeljust="left",
+                             label=f"{self._graph_name} - Stressa v.{__version__}")
+            self._graph_built = True
+        for graph_node in self._graph_nodes:
+            super().add_node(graph_node.graph_node())
+        for transition in self._graph_edges:
+            self.add_edge(self.transition(*transition))
+        self._graph_nodes, self._graph_edges = [], []
+
+    def add_node(self, graph_node):
+        """
+        method for adding a node (operation or signal) to the procedure graph, only recorded
+        if the process is running headless and skipped while the graph is frozen
+
+        Parameters
+        ----------
+        graph_node  : LazyNode
+                      node to add
+
+        """
+        if self._graph_frozen:
+            return
+        if self._graph_built:
+            super().add_node(graph_node.graph_node())
+        else:
+            self._graph_nodes.append(graph_node)
+
+    @staticmethod
+    def transition(node_1, node_2, label: str = "default", thread=False):
+        """
+        method for creating the Edge of a transition between nodes
+
+        """
+        color = "blue" if (label == "thread" or thread) else "gray"
+        return Edge(node_1.graph_node(), node_2.graph_node(), color=color, label=label)
 
     @Tracking
     def add_signal(self, signal: Signal, key: str):
@@ -210,16 +660,22 @@ class Process(Dot, ABC):
                       thread boolean
 
         """
-        color = "blue" if (label == "thread" or thread) else "gray"
-        transition = Edge(node_1, node_2, color=color, label=label)
-        self.add_edge(transition)
+        if self._graph_frozen:
+            return
+        if self._graph_built:
+            self.add_edge(self.transition(node_1, node_2, label, thread))
+        else:
+            self._graph_edges.append((node_1, node_2, label, thread))
 
     @Debugger
     def print_pdf(self, output_format='pdf'):
         """
-        method for printing a pdf with the procedure graph
+        method for printing a pdf with the procedure graph, skipped if print_procedure is off
 
         """
+        if not self.print_procedure:
+            return
+        self.build_graph()
         file_name = "".join(
             f"-{char.lower()}" if char.isupper() else char for char in self.__class__.__name__)
         upper_dir = os.path.dirname
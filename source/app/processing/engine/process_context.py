@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module with logic for the ProcessContext of a single run of a process
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+from threading import Lock
+from queue import Queue
+from uuid import uuid4
+from time import time
+
+from source.util import Assertor, Profiling, profiling_config, METRICS, RunContext
+
+from ...connectors import SessionRegistry
+
+
+class ProcessContext:  # pylint: disable=too-many-instance-attributes
+    """
+    Implementation of the execution context of a single run of a process, i.e. the timing,
+    profiling rows, exception queue, run id and latency budget. Every process instance has its
+    own context, so many runs of the same process can run concurrently with correct reports.
+    The timings and counts are also recorded in the metrics registry (METRICS), aggregated
+    over all runs. The active context of a thread is kept in RunContext, shared with the
+    connectors
+
+    """
+
+    def __init__(self, name: str, latency_budget: float = 0.0):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        name            : str
+                          name of the process
+        latency_budget  : float
+                          seconds from the start of the run within which its HTTP requests
+                          must be done, 0 for no budget
+
+        """
+        Assertor.assert_data_types([name, latency_budget], [str, (int, float)])
+        self.name = name
+        self.run_id = uuid4().hex
+        self.start = time()
+        self.deadline = self.start + latency_budget if latency_budget > 0 else None
+        self.elapsed = 0.0
+        self.profiling = profiling_config()
+        self.exception_queue = Queue()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.http_counts = {"retries": 0, "rejected": 0}
+        self._lock = Lock()
+
+    def active(self):
+        """
+        method for making the context the active one in the calling thread while running an
+        operation of the process
+
+        """
+        return RunContext.active(self)
+
+    @staticmethod
+    def current():
+        """
+        method for getting the active context in the calling thread
+
+        Returns
+        -------
+        out         : ProcessContext
+                      active context, None if no process is running in the thread
+
+        """
+        return RunContext.current()
+
+    def add_cache_count(self, hit: bool):
+        """
+        method for counting an operation cache hit or miss in the run
+
+        Parameters
+        ----------
+        hit         : bool
+                      True for a cache hit, False for a miss
+
+        """
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def add_http_count(self, kind: str):
+        """
+        method for counting a retried HTTP request, or a request rejected by the circuit
+        breaker or the latency budget, in the run
+
+        Parameters
+        ----------
+        kind        : str
+                      'retries' or 'rejected'
+
+        """
+        with self._lock:
+            self.http_counts[kind] += 1
+
+    def remaining(self):
+        """
+        method for getting the remaining latency budget of the run
+
+        Returns
+        -------
+        out         : float
+                      remaining seconds, None if the run has no budget
+
+        """
+        return None if self.deadline is None else self.deadline - time()
+
+    def add_profiling(self, operation: str, start: float, end: float):
+        """
+        method for adding the profiling row of an operation to the run
+
+        Parameters
+        ----------
+        operation   : str
+                      name of the operation
+        start       : float
+                      start of the operation in seconds from epoch
+        end         : float
+                      end of the operation in seconds from epoch
+
+        Returns
+        -------
+        out         : float
+                      elapsed time of the operation in ms
+
+        """
+        digits = 7
+        elapsed = round((end - start) * 1000, digits)
+        METRICS.histogram("stressa_operation_seconds", "Latency of the operations of the processes",
+                          process=self.name, operation=operation).observe(end - start)
+        with self._lock:
+            self.elapsed += elapsed
+            self.profiling.add_row([operation, Profiling.local_time(start),
+                                    Profiling.local_time(end), str(elapsed) + "ms"])
+        return elapsed
+
+    def record_metrics(self, seconds: float):
+        """
+        method for recording the latency and counts of the run in the metrics registry
+
+        Parameters
+        ----------
+        seconds     : float
+                      total elapsed time of the run in seconds
+
+        """
+        METRICS.histogram("stressa_process_seconds", "Latency of the runs of the processes",
+                          process=self.name).observe(seconds)
+        cache_help = "Operation cache lookups of the processes"
+        http_help = "HTTP requests of the processes retried or rejected"
+        for name, help_, labels, count in [
+                ("stressa_operation_cache_total", cache_help, {"result": "hit"}, self.cache_hits),
+                ("stressa_operation_cache_total", cache_help, {"result": "miss"},
+                 self.cache_misses),
+                ("stressa_http_events_total", http_help, {"kind": "retry"},
+                 self.http_counts["retries"]),
+                ("stressa_http_events_total", http_help, {"kind": "rejected"},
+                 self.http_counts["rejected"])]:
+            if count:
+                METRICS.counter(name, help_, process=self.name, **labels).inc(count)
+
+    def end(self):
+        """
+        method for ending the run, i.e. adding the total and speedup rows to the profiling
+
+        Returns
+        -------
+        out         : float
+                      total elapsed time of the run in ms
+
+        """
+        digits = 7
+        end = time()
+        elapsed = round((end - self.start) * 1000, digits)
+        speedup = round(self.elapsed - elapsed, digits)
+        self.record_metrics(end - self.start)
+        with self._lock:
+            self.profiling.add_row(["-----------", "", "", ""])
+            self.profiling.add_row(["total", "", "", f"{elapsed}ms"])
+            self.profiling.add_row(["", "", "", ""])
+            self.profiling.add_row(["speedup", "", "", f"{speedup}ms"])
+            self.profiling.add_row(
+                ["(total without speedup)", "", "", f"{round(self.elapsed, digits)}ms"])
+            if self.cache_hits or self.cache_misses:
+                self.profiling.add_row(["", "", "", ""])
+                self.profiling.add_row(["cache hits / misses", "", "",
+                                        f"{self.cache_hits} / {self.cache_misses}"])
+            circuits = {host: metrics for host, metrics in
+                        SessionRegistry.circuit_breaker.metrics().items() if
+                        metrics[0] != "closed"}
+            if any(self.http_counts.values()) or circuits:
+                self.profiling.add_row(["", "", "", ""])
+                self.profiling.add_row(["http retries / rejected", "", "",
+                                        f"{self.http_counts['retries']} / "
+                                        f"{self.http_counts['rejected']}"])
+                for host, (state, failures) in sorted(circuits.items()):
+                    self.profiling.add_row([f"circuit '{host}'", "", "",
+                                            f"{state} ({failures} failures)"])
+        return elapsed
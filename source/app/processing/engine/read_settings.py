@@ -53,15 +53,14 @@ class ReadSettings(Operation):
 
 
         """
-        up = os.path.dirname
-        settings_dir = up(__file__) + '\\tmp'
+        settings_file = os.path.join(os.path.dirname(__file__), 'tmp', 'settings.json')
 
         dept = ''
         equity = ''
         stress = ''
 
-        if os.path.exists(settings_dir):
-            with open(settings_dir + '\\settings.json', 'r', encoding='utf-8') as fp:
+        if os.path.exists(settings_file):
+            with open(settings_file, 'r', encoding='utf-8') as fp:
                 try:
                     settings = json.load(fp)
                     equity = settings['egenkapital_krav']
@@ -18,6 +18,7 @@ class SerialStressTest(Operation):
     Operation for stress testing with serial rate
 
     """
+    pure = True
 
     @Tracking
     def __init__(self, mortgage_data: dict):
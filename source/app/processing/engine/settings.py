@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+"""
+Workflow engine settings file
+
+This file contains constants for running the processes
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+
+# build the procedure graph of the processes only when asked for
+HEADLESS = os.environ.get("STRESSA_HEADLESS", "0").lower() in ("1", "true", "yes")
+
+# size of the worker pool running the parallel methods of all processes
+WORKER_POOL_SIZE = int(os.environ.get("STRESSA_WORKERS", min(32, (os.cpu_count() or 1) + 4)))
+
+OPERATION_CACHE_SIZE = int(os.environ.get("STRESSA_OPERATION_CACHE_SIZE", 1024))
+
+OPERATION_CACHE_MAX_BYTES = int(os.environ.get("STRESSA_OPERATION_CACHE_MAX_BYTES", 64 * 1024 ** 2))
+
+# seconds after which the HTTP requests of a process run fail fast, 0 for no budget
+LATENCY_BUDGET = float(os.environ.get("STRESSA_LATENCY_BUDGET", 0))
+
+BATCH_CONCURRENCY = int(os.environ.get("STRESSA_BATCH_CONCURRENCY", 8))
+
+BATCH_RATE_LIMIT = float(os.environ.get("STRESSA_BATCH_RATE_LIMIT", 5))
+
+# 'local' for the offline LocalTax engine, unvalidated until LocalTaxValidation reports no
+# differences for recorded Skatteetaten responses
+TAX_ENGINE = os.environ.get("STRESSA_TAX_ENGINE", "skatteetaten").lower()
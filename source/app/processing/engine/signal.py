@@ -9,14 +9,13 @@ __author__ = 'Samir Adrik'
 __email__ = 'samir.adrik@gmail.com'
 
 from abc import ABC
-from uuid import uuid4
-
-from pydot import Node
 
 from source.util import Assertor, Tracking
 
+from .lazy_node import LazyNode
+
 
-class Signal(Node, ABC):
+class Signal(LazyNode, ABC):  # pylint: disable=too-many-instance-attributes
     """
     Implementation of the Signal abstract base class
 
@@ -52,21 +51,49 @@ class Signal(Node, ABC):
         """
         Assertor.assert_data_types([data, desc, style, prettify_keys, length],
                                    [object, str, str, bool, int])
+        super().__init__()
         if hasattr(data, "__dict__"):
-            keys = data.__dict__.keys()
-            self.keys = self.prettify_dict_keys(keys, length) if prettify_keys else \
-                self.remove_quotation(list(keys), remove_new_line=True)
+            self._data_keys = list(data.__dict__.keys())
         elif isinstance(data, dict):
-            keys = data.keys()
-            self.keys = self.prettify_dict_keys(keys, length) if prettify_keys else \
-                self.remove_quotation(list(keys), remove_new_line=True)
+            self._data_keys = list(data.keys())
         else:
-            self.keys = "None"
+            self._data_keys = None
+        self._prettify_keys = prettify_keys
+        self._length = length
+        self._style = style
+        self._attrs = attrs
+        self._keys = None
         self.desc = desc
         self.data = data
-        super().__init__(name=str(uuid4()), shape="record", style=style,
-                         label=f"keys\\<{self.keys}\\> \\n {self.desc} \\<type "
-                               f"'{data.__class__.__name__}'\\>", **attrs)
+
+    @property
+    def keys(self):
+        """
+        keys getter, the keys in data formatted for the procedure graph
+
+        Returns
+        -------
+        out             : str
+                          formatted keys, 'None' if data has no keys
+
+        """
+        if self._keys is None:
+            if self._data_keys is None:
+                self._keys = "None"
+            elif self._prettify_keys:
+                self._keys = self.prettify_dict_keys(self._data_keys, self._length)
+            else:
+                self._keys = self.remove_quotation(self._data_keys, remove_new_line=True)
+        return self._keys
+
+    def node_attributes(self):
+        """
+        attributes of the signal in the procedure graph
+
+        """
+        return {"shape": "record", "style": self._style,
+                "label": f"keys\\<{self.keys}\\> \\n {self.desc} \\<type "
+                         f"'{self.data.__class__.__name__}'\\>", **self._attrs}
 
     @Tracking
     def prettify_dict_keys(self, dict_keys, length=15):
@@ -10,17 +10,21 @@ __email__ = 'samir.adrik@gmail.com'
 from source.util import Assertor, Tracking
 from source.domain import TaxForm
 
-from ...connectors import Skatteetaten, SKATTEETATEN_URL
+from ...connectors import Skatteetaten, LocalTax, SKATTEETATEN_URL
 
 from .operation import Operation
+from .settings import TAX_ENGINE
 
 
 class SkatteetatenTaxInfoConnector(Operation):
     """
-    Operation that retrieves Skatteetaten Tax info
+    Operation that retrieves Skatteetaten Tax info, calculated offline with LocalTax when
+    the env. variable STRESSA_TAX_ENGINE is 'local'
 
     """
 
+    tax_engine = LocalTax if TAX_ENGINE == "local" else Skatteetaten
+
     _tax_value_mapping = {
         "alminneligInntektFoerFordelingsfradrag": "alminnelig_inntekt_foer_fordelingsfradrag",
         "alminneligInntektFoerSaerfradrag": "alminnelig_inntekt_foer_saerfradrag",
@@ -85,9 +89,10 @@ class SkatteetatenTaxInfoConnector(Operation):
 
         """
         Assertor.assert_data_types([tax_form], [TaxForm])
+        source = "local tax engine" if self.tax_engine is LocalTax else \
+            f"{SKATTEETATEN_URL}\\{tax_form.tax_year}"
         super().__init__(name=self.__class__.__name__,
-                         desc=f"from: '{SKATTEETATEN_URL}\\{tax_form.tax_year}' \n "
-                              f"id: Skatteetaten Tax Info Connector")
+                         desc=f"from: '{source}' \n id: Skatteetaten Tax Info Connector")
         self.tax_form = tax_form
 
     @Tracking
@@ -101,18 +106,18 @@ class SkatteetatenTaxInfoConnector(Operation):
                       dictionary with tax calculation
 
         """
-        tax_info = Skatteetaten(age=self.tax_form.age,
-                                income=self.tax_form.income,
-                                tax_year=self.tax_form.tax_year,
-                                interest_income=self.tax_form.interest_income,
-                                interest_cost=self.tax_form.interest_cost,
-                                value_of_real_estate=self.tax_form.value_of_real_estate,
-                                bank_deposit=self.tax_form.bank_deposit,
-                                debt=self.tax_form.debt,
-                                union_fee=self.tax_form.union_fee,
-                                bsu=self.tax_form.bsu,
-                                other_income=self.tax_form.other_income,
-                                rental_income=self.tax_form.rental_income)
+        tax_info = self.tax_engine(age=self.tax_form.age,
+                                   income=self.tax_form.income,
+                                   tax_year=self.tax_form.tax_year,
+                                   interest_income=self.tax_form.interest_income,
+                                   interest_cost=self.tax_form.interest_cost,
+                                   value_of_real_estate=self.tax_form.value_of_real_estate,
+                                   bank_deposit=self.tax_form.bank_deposit,
+                                   debt=self.tax_form.debt,
+                                   union_fee=self.tax_form.union_fee,
+                                   bsu=self.tax_form.bsu,
+                                   other_income=self.tax_form.other_income,
+                                   rental_income=self.tax_form.rental_income)
 
         final_tax_info = {}
         for key, value in dict(sorted(tax_info.tax_information().items())).items():
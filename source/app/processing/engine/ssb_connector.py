@@ -7,23 +7,22 @@ Module with logic for the Ssb market interest rates
 __author__ = 'Samir Adrik'
 __email__ = 'samir.adrik@gmail.com'
 
-import os
+from source.util import LOGGER, Tracking
 
-import json
-
-from source.util import Tracking
-
-from ...connectors import SSB_URL, Ssb, SsbPayload
+from ...connectors import SSB_URL, SSB_STORE_PATH, SsbPayload, SsbRateStore
 
 from .operation import Operation
 
 
 class SsbConnector(Operation):
     """
-    Operation that retrieves market interest from ssb
+    Operation that retrieves market interest from ssb, served from the local SsbRateStore
+    which is refreshed with the months published since the last run
 
     """
 
+    store = SsbRateStore(SSB_STORE_PATH)
+
     @Tracking
     def __init__(self):
         """
@@ -33,7 +32,6 @@ class SsbConnector(Operation):
         self.name = self.__class__.__name__
         super().__init__(name=self.name,
                          desc=f"from: '{SSB_URL}' \\n id: Market Interest Rate Connector")
-        self.cache_dir = os.path.dirname(__file__) + "\\tmp\\"
 
     @Tracking
     def run(self):
@@ -46,32 +44,12 @@ class SsbConnector(Operation):
                       dictionary with interest rates information
 
         """
-
-        if os.path.exists(self.cache_dir):
-            with open(self.cache_dir + 'ssb_cache.json', 'r', encoding='utf-8') as read_json_file:
-                cached_request = json.load(read_json_file)
-                read_json_file.close()
-
-            if cached_request:
-                time_of_last_request = cached_request["tid"]
-            else:
-                time_of_last_request = ""
-        else:
-            os.makedirs(self.cache_dir)
-            time_of_last_request = ""
-
-        time_of_curr_request = SsbPayload.updated_table_date()
-
-        if time_of_curr_request != time_of_last_request:
-            ssb_interest_rate = Ssb()
-            market_rate = ssb_interest_rate.ssb_interest_rates()
-            cached_results = {"tid": time_of_curr_request}
-            cached_results.update(market_rate)
-
-            with open(self.cache_dir + 'ssb_cache.json', 'w', encoding='utf-8') as write_json_file:
-                json.dump(cached_results, write_json_file)
-                write_json_file.close()
-        else:
-            market_rate = {"markedsrente": cached_request["markedsrente"]}
-
-        return market_rate
+        tid = SsbPayload.updated_table_date()[0]
+        try:
+            self.store.refresh(tid)
+        except Exception as refresh_exception:  # pylint: disable=broad-except
+            if not self.store.latest_tid:
+                raise refresh_exception
+            LOGGER.warning(f"SSB rate store not refreshed, using rates up to "
+                           f"'{self.store.latest_tid}', exited with '{refresh_exception}'")
+        return {"markedsrente": str(self.store.rate(SsbRateStore.market_rate, tid))}
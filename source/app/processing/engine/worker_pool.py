@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module with logic for the WorkerPool shared by all processes
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from source.util import Assertor
+
+
+class WorkerPool:  # pylint: disable=too-many-instance-attributes
+    """
+    Implementation of a bounded pool of worker threads shared by all processes. Threads are
+    created once and reused. A caller waiting for its tasks runs the ones no worker has started
+    yet itself, so nested processes submitting work from inside a worker never deadlock the
+    pool, even when all workers are busy
+
+    """
+
+    def __init__(self, max_workers: int):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        max_workers : int
+                      maximum number of worker threads
+
+        """
+        Assertor.assert_data_types([max_workers], [int])
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got '{max_workers}'")
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = Lock()
+        self._queued = 0
+        self._active = 0
+        self._peak_queued = 0
+        self._peak_active = 0
+        self._completed = 0
+        self._inline = 0
+
+    @property
+    def executor(self):
+        """
+        executor getter, the worker threads are only started on first use
+
+        Returns
+        -------
+        out         : ThreadPoolExecutor
+                      executor running the submitted tasks
+
+        """
+        with self._lock:
+            if not self._executor:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="stressa-worker")
+            return self._executor
+
+    def _run(self, function, *args):
+        """
+        method for running a task while keeping track of queue depth and active workers
+
+        """
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._peak_active = max(self._peak_active, self._active)
+        try:
+            return function(*args)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+
+    def submit(self, function, *args):
+        """
+        method for submitting a task to the pool
+
+        Parameters
+        ----------
+        function    : callable
+                      task to run
+        args        : tuple
+                      arguments to the task
+
+        Returns
+        -------
+        out         : Future
+                      future of the submitted task
+
+        """
+        executor = self.executor
+        with self._lock:
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+        return executor.submit(self._run, function, *args)
+
+    def steal(self, future, function, *args):
+        """
+        method for running a submitted task in the calling thread if no worker has started it
+
+        Parameters
+        ----------
+        future      : Future
+                      future of the submitted task
+        function    : callable
+                      the submitted task
+        args        : tuple
+                      arguments to the submitted task
+
+        Returns
+        -------
+        out         : bool
+                      True if the task was run in the calling thread, otherwise False
+
+        """
+        if not future.cancel():
+            return False
+        with self._lock:
+            self._queued -= 1
+            self._inline += 1
+        try:
+            function(*args)
+        finally:
+            with self._lock:
+                self._completed += 1
+        return True
+
+    def run_all(self, methods):
+        """
+        method for running all methods in the pool and waiting for them to finish. As with
+        plain threads, exceptions are not raised here, but reported by the methods themselves
+        (i.e. put on the exception queue of the process)
+
+        Parameters
+        ----------
+        methods     : list
+                      list of methods to run
+
+        """
+        futures = [(self.submit(method), method) for method in methods]
+        for future, method in reversed(futures):
+            try:
+                if not self.steal(future, method):
+                    future.exception()
+            except Exception:  # pylint: disable=broad-except
+                pass
+
+    def metrics(self):
+        """
+        method for getting the queue depth and utilisation of the pool
+
+        Returns
+        -------
+        out         : dict
+                      dictionary with the metrics of the pool
+
+        """
+        with self._lock:
+            return {"max_workers": self.max_workers, "queued": self._queued,
+                    "active": self._active, "utilisation": self._active / self.max_workers,
+                    "peak_queued": self._peak_queued, "peak_active": self._peak_active,
+                    "completed": self._completed, "inline": self._inline}
+
+    def shutdown(self):
+        """
+        method for shutting down the worker threads, new ones are started on next use
+
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True)
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module for the batch processing of many Finn adverts
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from time import time
+
+from source.util import Assertor, LOGGER
+
+from ..connectors import Finn, SessionRegistry
+from .engine.settings import BATCH_CONCURRENCY, BATCH_RATE_LIMIT
+from .finn_advert_processing import FinnAdvertProcessing
+
+
+class BatchFinnAdvertProcessing(FinnAdvertProcessing):
+    """
+    FinnAdvertProcessing run in a batch, i.e. headless and without printing the procedure graph
+
+    """
+    headless = True
+    print_procedure = False
+
+
+class FinnAdvertBatch:
+    """
+    Batch of Finn codes processed with FinnAdvertProcessing, i.e. the advert, statistics,
+    ownership and community information of at most max_concurrency adverts are retrieved at
+    the same time, with at most rate_limit requests per second to each host. Results are
+    streamed as each advert completes, and failing adverts are reported without stopping the
+    batch
+
+    """
+
+    def __init__(self, finn_codes, max_concurrency: int = BATCH_CONCURRENCY,
+                 rate_limit: float = BATCH_RATE_LIMIT):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        finn_codes      : list, str
+                          list of Finn codes, or path to a file with one Finn code per line
+        max_concurrency : int
+                          maximum number of adverts processed at the same time
+        rate_limit      : float
+                          maximum number of requests per second per host, 0 for no limit
+
+        """
+        Assertor.assert_data_types([finn_codes, max_concurrency, rate_limit],
+                                   [(list, str), int, (int, float)])
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got '{max_concurrency}'")
+        if rate_limit < 0:
+            raise ValueError(f"rate_limit must be non-negative, got '{rate_limit}'")
+        if isinstance(finn_codes, str):
+            finn_codes = self.read_finn_codes(finn_codes)
+        Assertor.assert_data_types(finn_codes, [str] * len(finn_codes))
+        self.finn_codes = list(dict.fromkeys(code.strip() for code in finn_codes))
+        self.max_concurrency = max_concurrency
+        self.rate_limit = rate_limit
+        self.succeeded = []
+        self.failed = {}
+        self.elapsed = 0.0
+
+    @staticmethod
+    def read_finn_codes(file_path: str):
+        """
+        method for reading Finn codes from a file, skipping blank lines and lines starting
+        with '#'
+
+        Parameters
+        ----------
+        file_path   : str
+                      path to file with one Finn code per line
+
+        Returns
+        -------
+        out         : list
+                      list of Finn codes
+
+        """
+        Assertor.assert_data_types([file_path], [str])
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f"no file with Finn codes at '{file_path}'")
+        with open(file_path, encoding="utf-8") as file:
+            return [line.strip() for line in file if
+                    line.strip() and not line.lstrip().startswith("#")]
+
+    @staticmethod
+    def validate_finn_code(finn_code: str):
+        """
+        method for validating a Finn code with Finn.validate_finn_code
+
+        Parameters
+        ----------
+        finn_code   : str
+                      Finn code to validate
+
+        Returns
+        -------
+        out         : str
+                      error message, None if the Finn code is valid
+
+        """
+        try:
+            Finn(finn_code)
+        except Exception as validate_exception:  # pylint: disable=broad-except
+            return str(validate_exception)
+        return None
+
+    @staticmethod
+    def process(finn_code: str):
+        """
+        method for processing a single Finn code
+
+        Parameters
+        ----------
+        finn_code   : str
+                      Finn code to process
+
+        Returns
+        -------
+        out         : dict
+                      Finn advert information
+
+        """
+        return BatchFinnAdvertProcessing(finn_code).multiplex_info_2
+
+    def result(self, finn_code: str, elapsed: float, info: dict = None, error: str = None):
+        """
+        method for recording the result of a Finn code in the batch
+
+        Parameters
+        ----------
+        finn_code   : str
+                      processed Finn code
+        elapsed     : float
+                      elapsed time of the processing in ms
+        info        : dict
+                      Finn advert information, None if failed
+        error       : str
+                      error message, None if succeeded
+
+        Returns
+        -------
+        out         : dict
+                      dictionary with finn_code, info, error and elapsed (ms)
+
+        """
+        if error is None:
+            self.succeeded.append(finn_code)
+        else:
+            self.failed[finn_code] = error
+            LOGGER.warning(f"batch: '{finn_code}' failed with '{error}'")
+        return {"finn_code": finn_code, "info": info, "error": error, "elapsed": elapsed}
+
+    def run(self):
+        """
+        method for running the batch, yielding the result of every Finn code as soon as it
+        completes, in order of completion. Invalid Finn codes are reported first, without
+        being processed
+
+        Returns
+        -------
+        out         : generator
+                      generator of result dicts, see result()
+
+        """
+        start = time()
+        self.succeeded, self.failed = [], {}
+        LOGGER.info(f"batch: processing {len(self.finn_codes)} Finn codes, max concurrency: "
+                    f"{self.max_concurrency}, rate limit: {self.rate_limit}/s per host")
+
+        valid_finn_codes = []
+        for finn_code in self.finn_codes:
+            error = self.validate_finn_code(finn_code)
+            if error:
+                yield self.result(finn_code, 0.0, error=error)
+            else:
+                valid_finn_codes.append(finn_code)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                      thread_name_prefix="stressa-batch")
+        try:
+            with SessionRegistry.rate_limiter.limited(self.rate_limit):
+                futures = {executor.submit(self.timed, self.process, finn_code): finn_code
+                           for finn_code in valid_finn_codes}
+                for future in as_completed(futures):
+                    finn_code = futures[future]
+                    info, error, elapsed = future.result()
+                    yield self.result(finn_code, elapsed, info=info, error=error)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.elapsed = round((time() - start) * 1000, 7)
+            LOGGER.info(f"batch: {len(self.succeeded)} succeeded, {len(self.failed)} failed "
+                        f"-> elapsed: {self.elapsed}ms")
+
+    @staticmethod
+    def timed(function, finn_code: str):
+        """
+        method for running a function on a Finn code, catching any exception
+
+        Parameters
+        ----------
+        function    : callable
+                      function to run
+        finn_code   : str
+                      Finn code to run the function on
+
+        Returns
+        -------
+        out         : tuple
+                      result of the function (None on failure), error message (None on
+                      success) and elapsed time in ms
+
+        """
+        start = time()
+        try:
+            info, error = function(finn_code), None
+        except Exception as process_exception:  # pylint: disable=broad-except
+            info, error = None, str(process_exception)
+        return info, error, round((time() - start) * 1000, 7)
+
+    def summary(self):
+        """
+        method for getting the summary of the last run of the batch
+
+        Returns
+        -------
+        out         : dict
+                      dictionary with the number of Finn codes, succeeded and failed Finn codes
+                      and the elapsed time in ms
+
+        """
+        return {"total": len(self.finn_codes), "succeeded": list(self.succeeded),
+                "failed": dict(self.failed), "elapsed": self.elapsed}
@@ -47,16 +47,11 @@ class FinnAdvertProcessing(Process):
 
         self._multiplex_info_1 = self.multiplex_1()
 
-        self.run_parallel([self.extract_1, self.extract_2, self.extract_3, self.extract_4])
+        self.run_scheduled([self.extract_1, self.extract_2, self.extract_3, self.extract_4,
+                            self.extract_first_row, self.add_to_dataframe_1,
+                            self.finn_community_process, self.check_newest_date,
+                            self.add_to_dataframe_2, self.rate_of_change_2])
 
-        self.run_parallel([self.extract_first_row, self.add_to_dataframe_1,
-                           self.finn_community_process])
-
-        self.check_newest_date()
-
-        self.run_parallel([self.add_to_dataframe_2])
-
-        self.rate_of_change_2()
         self._multiplex_info_2 = self.multiplex_2()
         self.output_operation()
         self.end_process()
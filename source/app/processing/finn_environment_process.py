@@ -54,7 +54,7 @@ class FinnEnvironmentProcess(Process):
         initial operation of the process
 
         """
-        Assertor.assert_data_types([data], [dict])
+        Assertor.assert_data_types([data], [dict], boundary=True)
         input_operation = InputOperation("Environment Statistics")
         self.add_node(input_operation)
 
@@ -57,7 +57,7 @@ class FinnFamilyDataProcessing(Process):
         initial operation of the process
 
         """
-        Assertor.assert_data_types([data], [dict])
+        Assertor.assert_data_types([data], [dict], boundary=True)
         input_operation = InputOperation("Family Statistics")
         self.add_node(input_operation)
 
@@ -52,7 +52,7 @@ class FinnLeisureProcessing(Process):
         initial operation of the process
 
         """
-        Assertor.assert_data_types([data], [dict])
+        Assertor.assert_data_types([data], [dict], boundary=True)
         input_operation = InputOperation("Leisure Statistics")
         self.add_node(input_operation)
 
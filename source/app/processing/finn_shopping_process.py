@@ -49,7 +49,7 @@ class FinnShoppingProcess(Process):
         initial operation of the process
 
         """
-        Assertor.assert_data_types([data], [dict])
+        Assertor.assert_data_types([data], [dict], boundary=True)
         input_operation = InputOperation("Shopping Statistics")
         self.add_node(input_operation)
 
@@ -8,7 +8,7 @@ Process for analyze mortgage data against requirement from finanstilsynet
 __author__ = 'Samir Adrik'
 __email__ = 'samir.adrik@gmail.com'
 
-from source.util import Assertor, Profiling, Tracking, Debugger
+from source.util import Assertor, Profiling, Tracking, Debugger, LOGGER
 
 from .engine import Process, Signal, InputOperation, ValidateMortgage, \
     OutputSignal, OutputOperation, Extract, Factor, Multiplication, Multiplex, Division, \
@@ -36,38 +36,93 @@ class MortgageAnalysisProcess(Process):
         self.start_process()
         super().__init__(name=__class__.__name__)
         Assertor.assert_data_types([data], [dict])
+        self._data = None
         self.input_operation({"data": data})
         self.validate_mortgage()
 
-        self.run_parallel(
-            [self.fixed_stress_test, self.extract_1, self.serial_stress_test,
-             self.extract_2, self.extract_3, self.read_settings_1, self.factor_1,
-             self.read_settings_2, self.extract_4, self.extract_5, self.extract_6,
-             self.read_settings_3])
+        self.run_scheduled(self._analysis_steps())
 
-        self.run_parallel(
-            [self.multiply_1, self.subtraction_1, self.ssb_connector,
-             self.fixed_mortgage_payment_plan, self.series_mortgage_payment_plan])
+        self._mortgage = self.output_operation()
+        self._data = dict(data)
 
-        self.run_parallel(
-            [self.addition_1, self.extract_7, self.division_1, self.addition_2])
-        self.run_parallel(
-            [self.division_2, self.division_3, self.fixed_payment])
-        self.run_parallel(
-            [self.subtraction_2, self.subtraction_3, self.converter_1, self.converter_2])
+        self.end_process()
 
-        self.run_parallel([self.extract_8, self.extract_9])
+    def _analysis_steps(self):
+        """
+        method for getting the steps of the analysis between validation and output
 
-        self.division_4()
-        self.converter_3()
+        Returns
+        -------
+        out         : list
+                      list of methods
 
-        self.subtraction_4()
+        """
+        return [self.fixed_stress_test, self.extract_1, self.serial_stress_test,
+                self.extract_2, self.extract_3, self.read_settings_1, self.factor_1,
+                self.read_settings_2, self.extract_4, self.extract_5, self.extract_6,
+                self.read_settings_3, self.multiply_1, self.subtraction_1, self.ssb_connector,
+                self.fixed_mortgage_payment_plan, self.series_mortgage_payment_plan,
+                self.addition_1, self.extract_7, self.division_1, self.addition_2,
+                self.division_2, self.division_3, self.fixed_payment, self.subtraction_2,
+                self.subtraction_3, self.converter_1, self.converter_2, self.extract_8,
+                self.extract_9, self.division_4, self.converter_3, self.subtraction_4,
+                self.multiplex]
 
-        self.multiplex()
+    def _settings_steps(self):
+        """
+        method for getting the steps reading the settings, which are read outside the signals
+        and therefore re-run on every update
 
-        self._mortgage = self.output_operation()
+        Returns
+        -------
+        out         : list
+                      list of methods
+
+        """
+        return [self.read_settings_1, self.read_settings_2, self.read_settings_3]
 
+    @Tracking
+    def update(self, data: dict):
+        """
+        method for incrementally re-analyzing the mortgage when some of the information or the
+        settings have changed. The information is re-validated, and only the steps reading a
+        validated signal that changed are re-run, while the signals of the previous run are
+        kept for the rest (e.g. SSB interest rates). As the start date has its own validated
+        signal, a changed start date does not re-run the stress tests, while any change to the
+        loan terms does. The settings are re-read on every update, and if the previous run
+        failed, every step is re-run
+
+        Parameters
+        ----------
+        data        : dict
+                      updated information about mortgage to be analyzed
+
+        Returns
+        -------
+        out         : dict
+                      analyzed mortgage
+
+        """
+        Assertor.assert_data_types([data], [dict])
+        previous, self._data = self._data, None
+        changed_keys = {key for key in set(previous or {}) | set(data) if
+                        (previous or {}).get(key) != data.get(key)}
+
+        self.start_process()
+        LOGGER.info(f"updating '{self.__class__.__name__}' with changed keys "
+                    f"'{sorted(changed_keys)}'")
+        with self.frozen_graph():
+            self.input_operation({"data": data})
+            if previous is None:
+                self.run_scheduled([self.validate_mortgage] + self._analysis_steps())
+            else:
+                self.run_incremental([self.validate_mortgage] + self._analysis_steps(),
+                                     {"input_signal"} if changed_keys else set(),
+                                     self._settings_steps())
+            self._mortgage = self.output_operation()
+        self._data = dict(data)
         self.end_process()
+        return self._mortgage
 
     def mortgage(self):
         """
@@ -93,7 +148,7 @@ class MortgageAnalysisProcess(Process):
                       data sent in to processed
 
         """
-        Assertor.assert_data_types([data], [dict])
+        Assertor.assert_data_types([data], [dict], boundary=True)
         input_operation = InputOperation("Mortgage Data")
         self.add_node(input_operation)
 
@@ -116,13 +171,17 @@ class MortgageAnalysisProcess(Process):
         self.add_transition(input_signal, validate_mortgage_operation)
 
         mortgage = validate_mortgage_operation.run()
-        mortgage_signal = Signal(mortgage, "Validated Mortgage Information",
+        mortgage_signal = Signal({key: value for key, value in mortgage.items() if
+                                  key != "startdato"}, "Validated Mortgage Information",
                                  prettify_keys=True,
                                  length=4)
         self.add_signal(mortgage_signal, "validated_mortgage")
-
         self.add_transition(validate_mortgage_operation, mortgage_signal)
 
+        start_date_signal = Signal({"startdato": mortgage["startdato"]}, "Validated Start Date")
+        self.add_signal(start_date_signal, "validated_start_date")
+        self.add_transition(validate_mortgage_operation, start_date_signal)
+
     @Profiling
     @Debugger
     def ssb_connector(self):
@@ -149,7 +208,8 @@ class MortgageAnalysisProcess(Process):
 
         """
         mortgage_signal = self.get_signal("validated_mortgage")
-        fixed_stress_test_operation = FixedStressTest(mortgage_signal.data)
+        # the stress rate does not depend on the start date
+        fixed_stress_test_operation = FixedStressTest(dict(mortgage_signal.data, startdato=None))
         self.add_node(fixed_stress_test_operation)
         self.add_transition(mortgage_signal, fixed_stress_test_operation,
                             label="thread")
@@ -170,7 +230,9 @@ class MortgageAnalysisProcess(Process):
 
         """
         mortgage_signal = self.get_signal("validated_mortgage")
-        serial_stress_test_operation = SerialStressTest(mortgage_signal.data)
+        # the stress rate does not depend on the start date
+        serial_stress_test_operation = SerialStressTest(dict(mortgage_signal.data,
+                                                             startdato=None))
         self.add_node(serial_stress_test_operation)
         self.add_transition(mortgage_signal, serial_stress_test_operation,
                             label="thread")
@@ -340,11 +402,11 @@ class MortgageAnalysisProcess(Process):
         method for extracting interval
 
         """
-        validated_mortgage = self.get_signal("validated_mortgage")
-        start_date_extract_operation = Extract(validated_mortgage.data,
+        validated_start_date = self.get_signal("validated_start_date")
+        start_date_extract_operation = Extract(validated_start_date.data,
                                                "startdato")
         self.add_node(start_date_extract_operation)
-        self.add_transition(validated_mortgage, start_date_extract_operation,
+        self.add_transition(validated_start_date, start_date_extract_operation,
                             label="thread")
 
         start_date_extract = start_date_extract_operation.run()
@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module for the end-to-end latency benchmarks of the processes against recorded responses
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+import json
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from datetime import datetime
+from tempfile import TemporaryDirectory
+from urllib.parse import urlsplit
+
+from source.util import Assertor, Benchmark, LOGGER
+
+from ..connectors import HttpRecorder, ReplayServer, SessionRegistry, Sifo, SifoCache, \
+    SsbRateStore, SsbPayload, Posten, PostalCodeRegistry, Portalen, HTTP_ORIGIN
+from .engine import Operation, SsbConnector
+from .skatteetaten_tax_processing import SkatteetatenTaxProcessing
+from .mortgage_analysis_process import MortgageAnalysisProcess
+from .finn_advert_processing import FinnAdvertProcessing
+from .finn_community_process import FinnCommunityProcess
+from .sifo_expenses_process import SifoExpensesProcess
+from .restructure_process import RestructureProcess
+
+
+class ProcessBenchmarks:
+    """
+    Benchmarks of the processes run repeatedly against the responses recorded in directory,
+    replayed by a ReplayServer at STRESSA_REPLAY_URL. The input of every process is stored in
+    inputs.json of the directory, recorded together with the responses with record(). The
+    date of the recording is stored in date.txt of the directory, and SsbPayload.today()
+    replaced by it while recording and replaying. The HTTP and SIFO caches are turned off, the
+    SSB rate store, postal code registry and Portalen offers replaced by empty ones in a
+    temporary directory, and all of them together with the operation cache cleared before
+    every run unless warm, so every run requests the replay server
+
+    """
+
+    scenarios = {"MortgageAnalysisProcess": MortgageAnalysisProcess,
+                 "RestructureProcess": RestructureProcess,
+                 "FinnAdvertProcessing": FinnAdvertProcessing,
+                 "FinnCommunityProcess": FinnCommunityProcess,
+                 "SifoExpensesProcess": SifoExpensesProcess,
+                 "SkatteetatenTaxProcessing": SkatteetatenTaxProcessing}
+
+    def __init__(self, directory: str, iterations: int = 20, warmup: int = 1,
+                 latency: float = 0.0, jitter: float = 0.0, warm: bool = False):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        directory   : str
+                      directory of the recorded responses and inputs.json
+        iterations  : int
+                      number of timed runs of every process
+        warmup      : int
+                      number of untimed runs of every process before the timed runs
+        latency     : float
+                      seconds added to every replayed response
+        jitter      : float
+                      maximum seconds the latency varies with
+        warm        : bool
+                      keep the operation cache between runs
+
+        """
+        Assertor.assert_data_types([directory, iterations, warmup, latency, jitter, warm],
+                                   [str, int, int, (int, float), (int, float), bool])
+        self.directory = directory
+        self.iterations = iterations
+        self.warmup = warmup
+        self.latency = latency
+        self.jitter = jitter
+        self.warm = warm
+        self.stores = None
+
+    @property
+    def inputs_path(self):
+        """
+        path of the inputs of the processes
+
+        """
+        return os.path.join(self.directory, "inputs.json")
+
+    def inputs(self):
+        """
+        method for loading the recorded inputs of the processes
+
+        Returns
+        -------
+        out         : dict
+                      input of every process by name
+
+        """
+        if not os.path.isfile(self.inputs_path):
+            return {}
+        with open(self.inputs_path, encoding="utf-8") as inputs_file:
+            return json.load(inputs_file)
+
+    @property
+    def date_path(self):
+        """
+        path of the date of the recording
+
+        """
+        return os.path.join(self.directory, "date.txt")
+
+    def date(self):
+        """
+        method for loading the date of the recording
+
+        Returns
+        -------
+        out         : datetime
+                      date of the recording, None if not recorded
+
+        """
+        if not os.path.isfile(self.date_path):
+            return None
+        with open(self.date_path, encoding="utf-8") as date_file:
+            return datetime.strptime(date_file.read().strip(), "%Y-%m-%d")
+
+    @staticmethod
+    def clear_stores(directory: str):
+        """
+        method for replacing the SSB rate store, postal code registry and Portalen offers by
+        empty ones in directory
+
+        Parameters
+        ----------
+        directory   : str
+                      directory of the stores
+
+        """
+        Assertor.assert_data_types([directory], [str])
+        for file_name in ["ssb_10748.parquet", "postal_codes.tsv"]:
+            if os.path.isfile(os.path.join(directory, file_name)):
+                os.remove(os.path.join(directory, file_name))
+        SsbConnector.store = SsbRateStore(os.path.join(directory, "ssb_10748.parquet"))
+        Posten.registry = PostalCodeRegistry(os.path.join(directory, "postal_codes.tsv"))
+        Portalen.clear_offers()
+
+    @staticmethod
+    @contextmanager
+    def isolated(recorder: HttpRecorder = None, date: datetime = None):
+        """
+        method for running the processes without the HTTP and SIFO caches, with empty stores
+        in a temporary directory, the SSB dates relative to date (if given) instead of today
+        and with the recorder of the responses, restoring them afterwards. Yields the directory
+        of the stores
+
+        """
+        cache_enabled, previous_recorder, sifo_cache = SessionRegistry.cache_enabled, \
+            SessionRegistry.recorder, Sifo.cache
+        ssb_store, registry, today = SsbConnector.store, Posten.registry, SsbPayload.today
+        SessionRegistry.close()
+        SessionRegistry.cache_enabled, SessionRegistry.recorder = False, recorder
+        Sifo.cache = SifoCache(0)
+        if date:
+            SsbPayload.today = staticmethod(lambda: date)
+        try:
+            with TemporaryDirectory(prefix="stressa-benchmarks-") as stores:
+                ProcessBenchmarks.clear_stores(stores)
+                yield stores
+        finally:
+            SessionRegistry.close()
+            SessionRegistry.cache_enabled, SessionRegistry.recorder = cache_enabled, \
+                previous_recorder
+            Sifo.cache = sifo_cache
+            SsbConnector.store, Posten.registry = ssb_store, registry
+            SsbPayload.today = staticmethod(today)
+            Portalen.clear_offers()
+
+    def record(self, inputs: dict):
+        """
+        method for running every process once against the live services, recording the
+        responses and the inputs in directory
+
+        Parameters
+        ----------
+        inputs      : dict
+                      input of every process to benchmark by name
+
+        """
+        Assertor.assert_data_types([inputs], [dict])
+        unknown = set(inputs) - set(self.scenarios)
+        if unknown:
+            raise ValueError(f"no process named '{sorted(unknown)}', expected one of "
+                             f"'{sorted(self.scenarios)}'")
+        date = self.date() or datetime.today().replace(hour=0, minute=0, second=0,
+                                                       microsecond=0)
+        with self.isolated(HttpRecorder(self.directory), date) as stores:
+            for name, data in inputs.items():
+                LOGGER.info(f"recording '{name}'")
+                Operation.cache.clear()
+                self.clear_stores(stores)
+                self.scenarios[name](data)
+        recorded = dict(self.inputs(), **inputs)
+        with open(self.inputs_path, "w", encoding="utf-8") as inputs_file:
+            json.dump(recorded, inputs_file, indent=2, ensure_ascii=False)
+        with open(self.date_path, "w", encoding="utf-8") as date_file:
+            date_file.write(date.strftime("%Y-%m-%d"))
+        LOGGER.success(f"recorded '{sorted(inputs)}' in '{self.directory}'")
+
+    @contextmanager
+    def replay_server(self):
+        """
+        method for serving the recorded responses at STRESSA_REPLAY_URL while benchmarking
+
+        """
+        origin = urlsplit(HTTP_ORIGIN)
+        if origin.scheme != "http" or not origin.port:
+            LOGGER.warning("STRESSA_REPLAY_URL is not set, benchmarking against the live "
+                           "services")
+            yield None
+            return
+        with ReplayServer(self.directory, self.latency, self.jitter, origin.hostname,
+                          origin.port) as server:
+            yield server
+
+    def before(self):
+        """
+        method run before every run of a process, i.e. clearing the operation cache and the
+        stores unless warm
+
+        """
+        if not self.warm:
+            Operation.cache.clear()
+            if self.stores:
+                self.clear_stores(self.stores)
+
+    def run(self, names: list = None):
+        """
+        method for benchmarking the processes
+
+        Parameters
+        ----------
+        names       : list
+                      names of the processes to benchmark, default is every process with a
+                      recorded input
+
+        Returns
+        -------
+        out         : dict
+                      benchmark results by process name, see Benchmark.run()
+
+        """
+        Assertor.assert_data_types([names], [(list, type(None))])
+        inputs = self.inputs()
+        names = [name for name in self.scenarios if name in inputs] if names is None \
+            else names
+        missing = [name for name in names if name not in inputs or name not in self.scenarios]
+        if missing:
+            raise ValueError(f"no recorded input of '{missing}' in '{self.inputs_path}'")
+
+        results = {}
+        with self.isolated(date=self.date()) as stores, self.replay_server() as server:
+            self.stores = stores
+            try:
+                for name in names:
+                    process, data = self.scenarios[name], inputs[name]
+                    results[name] = Benchmark(name, lambda process=process, data=data:
+                                              process(data), self.iterations,
+                                              self.warmup).run(self.before)
+                    LOGGER.info(f"benchmark '{name}' -> {results[name]}")
+            finally:
+                self.stores = None
+            if server and server.misses:
+                LOGGER.warning(f"{server.misses} requests without recording, re-record "
+                               f"'{self.directory}'")
+        return results
+
+    @staticmethod
+    def report(results: dict, baseline: dict = None):
+        """
+        method for formatting benchmark results as a table
+
+        Parameters
+        ----------
+        results     : dict
+                      benchmark results by process name
+        baseline    : dict
+                      baseline results by process name, for the change of p95
+
+        Returns
+        -------
+        out         : str
+                      table of the results
+
+        """
+        baseline = baseline or {}
+        columns = ["mean", "p50", "p95", "p99", "allocated_kib", "peak_rss_mib"]
+        rows = [["process"] + columns + ["p95 vs. baseline"]]
+        for name, result in sorted(results.items()):
+            reference = baseline.get(name, {}).get("p95")
+            change = f"{round((result['p95'] / reference - 1) * 100, 1):+} %" if reference \
+                else ""
+            rows.append([name] + [str(result[column]) for column in columns] + [change])
+        widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+        return "\n".join("  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for
+                         row in rows)
+
+
+if __name__ == "__main__":
+    PARSER = ArgumentParser(description="benchmark the processes against recorded responses, "
+                                        "replayed at STRESSA_REPLAY_URL")
+    PARSER.add_argument("directory", help="directory of the recorded responses and inputs")
+    PARSER.add_argument("--record", metavar="INPUTS",
+                        help="JSON file with the input of every process, record the responses "
+                             "of the live services instead of benchmarking")
+    PARSER.add_argument("--process", action="append", help="process to benchmark, default all")
+    PARSER.add_argument("--iterations", type=int, default=20)
+    PARSER.add_argument("--warmup", type=int, default=1)
+    PARSER.add_argument("--latency", type=float, default=0.0)
+    PARSER.add_argument("--jitter", type=float, default=0.0)
+    PARSER.add_argument("--warm", action="store_true", help="keep the operation cache")
+    PARSER.add_argument("--baseline", help="JSON file of the baseline results")
+    PARSER.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed relative increase of p50/p95/p99, default 0.2")
+    PARSER.add_argument("--update-baseline", action="store_true",
+                        help="store the results as the baseline")
+    ARGS = PARSER.parse_args()
+
+    BENCHMARKS = ProcessBenchmarks(ARGS.directory, ARGS.iterations, ARGS.warmup, ARGS.latency,
+                                   ARGS.jitter, ARGS.warm)
+    if ARGS.record:
+        with open(ARGS.record, encoding="utf-8") as INPUTS_FILE:
+            BENCHMARKS.record(json.load(INPUTS_FILE))
+    else:
+        RESULTS = BENCHMARKS.run(ARGS.process)
+        BASELINE = Benchmark.load_baseline(ARGS.baseline) if ARGS.baseline else {}
+        print(ProcessBenchmarks.report(RESULTS, BASELINE))
+        if ARGS.baseline and ARGS.update_baseline:
+            Benchmark.save_baseline(dict(BASELINE, **RESULTS), ARGS.baseline)
+        else:
+            Benchmark.assert_no_regressions(RESULTS, BASELINE, ARGS.threshold)
@@ -25,6 +25,11 @@ class RestructureProcess(Process):
 
     """
 
+    # steps not reading the validated restructure information, started after the validation
+    depends_on = {name: {"validate_restructure"} for name in
+                  ["read_settings_1", "read_settings_2", "read_settings_3", "factor_1",
+                   "ssb_connector"]}
+
     @Tracking
     def __init__(self, data: dict):
         """
@@ -41,36 +46,32 @@ class RestructureProcess(Process):
         Assertor.assert_data_types([data], [dict])
         self.input_operation({"data": data})
 
-        self.run_parallel(
-            [self.validate_restructure, self.read_settings_1, self.factor_1])
-
-        self.run_parallel(
-            [self.extract_1, self.fixed_stress_test, self.extract_2, self.extract_3, self.extract_4,
-             self.extract_5, self.read_settings_2, self.extract_6, self.extract_7, self.extract_8,
-             self.serial_stress_test, self.subtraction_1, self.read_settings_3])
-
-        self.run_parallel([self.ssb_connector, self.fixed_mortgage_payment_plan,
-                           self.series_mortgage_payment_plan, self.multiply_1])
-
-        self.run_parallel([self.addition_1, self.division_1, self.comparison_1, self.addition_2])
+        self.run_scheduled(self._restructure_steps())
 
-        self.run_parallel(
-            [self.division_2, self.fixed_payment, self.division_3])
-        self.run_parallel(
-            [self.subtraction_2, self.subtraction_3, self.converter_1, self.converter_2])
-
-        self.run_parallel([self.extract_9, self.extract_10])
-
-        self.division_4()
-        self.converter_3()
+        self._restructure = self.output_operation()
 
-        self.subtraction_4()
+        self.end_process()
 
-        self.multiplex()
+    def _restructure_steps(self):
+        """
+        method for getting the steps of the restructuring between input and output
 
-        self._restructure = self.output_operation()
+        Returns
+        -------
+        out         : list
+                      list of methods
 
-        self.end_process()
+        """
+        return [self.validate_restructure, self.read_settings_1, self.factor_1, self.extract_1,
+                self.fixed_stress_test, self.extract_2, self.extract_3, self.extract_4,
+                self.extract_5, self.read_settings_2, self.extract_6, self.extract_7,
+                self.extract_8, self.serial_stress_test, self.subtraction_1,
+                self.read_settings_3, self.ssb_connector, self.fixed_mortgage_payment_plan,
+                self.series_mortgage_payment_plan, self.multiply_1, self.addition_1,
+                self.division_1, self.comparison_1, self.addition_2, self.division_2,
+                self.fixed_payment, self.division_3, self.subtraction_2, self.subtraction_3,
+                self.converter_1, self.converter_2, self.extract_9, self.extract_10,
+                self.division_4, self.converter_3, self.subtraction_4, self.multiplex]
 
     def restructure(self):
         """
@@ -96,7 +97,7 @@ class RestructureProcess(Process):
                       data sent in to processed
 
         """
-        Assertor.assert_data_types([data], [dict])
+        Assertor.assert_data_types([data], [dict], boundary=True)
         input_operation = InputOperation("Restructure Data")
         self.add_node(input_operation)
 
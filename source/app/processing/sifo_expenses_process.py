@@ -81,7 +81,7 @@ class SifoExpensesProcess(Process):
                       data sent in to process
 
         """
-        Assertor.assert_data_types([data], [dict])
+        Assertor.assert_data_types([data], [dict], boundary=True)
         input_operation = InputOperation("SIFO Form Data")
         self.add_node(input_operation)
 
@@ -72,7 +72,7 @@ class SkatteetatenTaxProcessing(Process):
                       data sent in to process
 
         """
-        Assertor.assert_data_types([data], [dict])
+        Assertor.assert_data_types([data], [dict], boundary=True)
         input_operation = InputOperation("Skatteetaten Tax Form Data")
         self.add_node(input_operation)
 
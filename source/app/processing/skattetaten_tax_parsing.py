@@ -66,7 +66,7 @@ class SkatteetatenTaxParsing(Process):
                       data sent in to process
 
         """
-        Assertor.assert_data_types([data], [dict])
+        Assertor.assert_data_types([data], [dict], boundary=True)
         input_operation = InputOperation("Skatteetaten Tax Data")
         self.add_node(input_operation)
 
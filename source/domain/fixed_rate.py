@@ -22,6 +22,8 @@ class FixedRate(Mortgage):
     """
     _interval_mapping = {"Årlig": 1, "Halvårlig": 2, "Kvartalsvis": 4, "Annenhver måned": 6,
                          "Månedlig": 12, "Semi-månedlig": 24, "Annenhver uke": 26, "Ukentlig": 52}
+    _payment_types = Assertor.type_check((float, str), (int, str), (int, str),
+                                         (int, float, str))
 
     @staticmethod
     def periodical_payments(interest_rate: (float, str), interval: (int, str),
@@ -46,8 +48,7 @@ class FixedRate(Mortgage):
                           periodical amount to pay
 
         """
-        Assertor.assert_data_types([interest_rate, interval, period, amount],
-                                   [(float, str), (int, str), (int, str), (int, float, str)])
+        FixedRate._payment_types(interest_rate, interval, period, amount)
 
         if isinstance(interest_rate, str):
             interest_rate = float(interest_rate.replace(" %", "").replace(" ", ""))
@@ -60,9 +61,63 @@ class FixedRate(Mortgage):
         if isinstance(amount, str):
             amount = float(amount.replace(" kr", "").replace(" ", ""))
 
+        return int(round(FixedRate.annuity(interest_rate, interval, period, amount)))
+
+    @staticmethod
+    def annuity(interest_rate, interval, period, amount):
+        """
+        unvalidated numeric core of periodical_payments, works on both scalars and numpy
+        arrays
+
+        Parameters
+        ----------
+        interest_rate   : float, np.ndarray
+                          yearly interest rate
+        interval        : int, np.ndarray
+                          interval for which to pay
+        period          : int, np.ndarray
+                          number of years for the mortgage
+        amount          : int, float, np.ndarray
+                          mortgage amount
+
+        Returns
+        -------
+        out             : float, np.ndarray
+                          unrounded periodical amount to pay
+
+        """
         interest_foot = interest_rate / 100 / interval
-        return int(round((interest_foot / (1 - (1 + interest_foot) ** -(interval * period)))
-                         * amount))
+        return (interest_foot / (1 - (1 + interest_foot) ** -(interval * period))) * amount
+
+    @classmethod
+    def calculate_stress_rates(cls, interval, period, amount, net_liquidity):
+        """
+        method for calculating the max stress rate of many fixed rate mortgages in one call
+
+        Parameters
+        ----------
+        interval        : array_like
+                          number of payments per. year for every mortgage
+        period          : array_like
+                          number of years for every mortgage
+        amount          : array_like
+                          amount for every mortgage
+        net_liquidity   : array_like
+                          monthly net liquidity (betjeningsevne) for every mortgage
+
+        Returns
+        -------
+        out             : np.ndarray
+                          max stress rate in percent for every mortgage, nan if none is
+                          affordable
+
+        """
+        interval, period, amount, net_liquidity = np.broadcast_arrays(
+            np.asarray(interval), np.asarray(period), np.asarray(amount, dtype=float),
+            np.asarray(net_liquidity, dtype=float))
+        return cls.solve_stress_rates(
+            lambda rates: cls.annuity(rates, interval, period, amount),
+            cls.monthly_to_periodical(net_liquidity, interval))
 
     def __init__(self, data: dict):
         """
@@ -146,14 +201,8 @@ class FixedRate(Mortgage):
         method for calculating the max stress rate
 
         """
-        stress_rates = {round(self.periodical_payments(i, self.interval, self.period,
-                                                       self.amount)): round(i, 3) for i in
-                        np.arange(0.01, 50.000, 0.01)}
-
-        net_liquidity = self.net_liquidity if self.interval == 12 else \
-            (self.net_liquidity * 12) / self.interval
-
-        diff_rates = {abs(net_liquidity - liquidity): rates for liquidity, rates in
-                      stress_rates.items() if net_liquidity - liquidity > 0}
-        stress_rate = list(diff_rates.values())[-1]
-        return str(stress_rate) + ' %'
+        amount = float(self.amount.replace(" kr", "").replace(" ", "")) \
+            if isinstance(self.amount, str) else self.amount
+        return self.solve_stress_rate(
+            lambda rate: int(round(self.annuity(rate, self.interval, self.period, amount))),
+            self.monthly_to_periodical(self.net_liquidity, self.interval))
@@ -8,6 +8,8 @@ Mortgage entity class
 __author__ = 'Samir Adrik'
 __email__ = 'samir.adrik@gmail.com'
 
+import numpy as np
+
 from source.util import Assertor
 
 from source.domain.entity import Entity
@@ -23,6 +25,94 @@ class Mortgage(Entity):
                              'lanetype', 'betjeningsevne', 'startdato']
     requirements_restructure = requirements_mortgage + ['belaning']
 
+    stress_rates = np.arange(0.01, 50.000, 0.01)
+
+    @classmethod
+    def solve_stress_rate(cls, payments, net_liquidity: float):
+        """
+        method for finding the highest rate in stress_rates with a rounded periodical payment
+        below the net liquidity. The payments are monotonically increasing in the interest
+        rate, so the grid is bisected instead of evaluated in full
+
+        Parameters
+        ----------
+        payments        : callable
+                          periodical payment as function of the yearly interest rate
+        net_liquidity   : float
+                          net liquidity per. period
+
+        Returns
+        -------
+        out             : str
+                          max stress rate, e.g. '5.29 %'
+
+        """
+        low, high = -1, len(cls.stress_rates)
+        while high - low > 1:
+            mid = (low + high) // 2
+            if round(payments(cls.stress_rates[mid])) < net_liquidity:
+                low = mid
+            else:
+                high = mid
+        if low < 0:
+            raise ValueError(f"no stress rate in '{cls.stress_rates[0]} %' - "
+                             f"'{cls.stress_rates[-1]} %' is affordable with net liquidity "
+                             f"'{net_liquidity}'")
+        return str(round(cls.stress_rates[low], 3)) + ' %'
+
+    @classmethod
+    def solve_stress_rates(cls, payments, net_liquidity: np.ndarray):
+        """
+        vectorized version of solve_stress_rate, bisecting the stress rates for many
+        mortgages at once
+
+        Parameters
+        ----------
+        payments        : callable
+                          periodical payments as function of an array with one yearly
+                          interest rate per. mortgage
+        net_liquidity   : np.ndarray
+                          net liquidity per. period for every mortgage
+
+        Returns
+        -------
+        out             : np.ndarray
+                          max stress rate for every mortgage, nan if no rate is affordable
+
+        """
+        net_liquidity = np.asarray(net_liquidity, dtype=float)
+        low = np.full(net_liquidity.shape, -1)
+        high = np.full(net_liquidity.shape, len(cls.stress_rates))
+        while np.any(high - low > 1):
+            active = high - low > 1
+            mid = (low + high) // 2
+            affordable = np.round(payments(cls.stress_rates[mid])) < net_liquidity
+            low = np.where(active & affordable, mid, low)
+            high = np.where(active & ~affordable, mid, high)
+        return np.where(low >= 0, np.round(cls.stress_rates[low], 3), np.nan)
+
+    @staticmethod
+    def monthly_to_periodical(net_liquidity, interval):
+        """
+        method for converting a monthly net liquidity to net liquidity per. payment interval
+
+        Parameters
+        ----------
+        net_liquidity   : float, np.ndarray
+                          monthly net liquidity
+        interval        : int, np.ndarray
+                          number of payments per. year
+
+        Returns
+        -------
+        out             : float, np.ndarray
+                          net liquidity per. payment interval
+
+        """
+        if isinstance(interval, np.ndarray):
+            return np.where(interval == 12, net_liquidity, (net_liquidity * 12) / interval)
+        return net_liquidity if interval == 12 else (net_liquidity * 12) / interval
+
     def validate_mortgage_information(self, data: dict, restructure=False):
         """
         method for validating mortgage information
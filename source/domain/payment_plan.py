@@ -138,237 +138,194 @@ class PaymentPlan(Entity):
         """
         return self._start_date
 
+    def period_dates(self):
+        """
+        method for producing the payment dates of the mortgage
+
+        """
+        return pd.date_range(start=self.start_date, periods=self.interval * self.period,
+                             freq=self.frequency)
+
     def period_list(self):
         """
         method for producing list of periods
 
         """
-        return [""] + [datetime.strptime(str(date.date()), '%Y-%m-%d').strftime('%d.%m.%Y') for date
-                       in pd.date_range(start=self.start_date, periods=self.interval * self.period,
-                                        freq=self.frequency)]
+        return [""] + list(self.period_dates().strftime('%d.%m.%Y'))
 
-    def fixed_mortgage_plan(self):
+    def fixed_amortization(self):
         """
-        method for creating fixed mortgage plan
+        method for calculating the fixed mortgage plan as integer columns, i.e. the numeric
+        core of fixed_mortgage_plan()
+
+        Returns
+        -------
+        out         : pd.DataFrame
+                      plan with one row per. period, amounts as int64
 
         """
-        df = pd.DataFrame(columns=['Termin', 'Dato', 'T.beløp', 'T.beløp.total', 'Renter',
-                                   'Renter.total', 'Avdrag', 'Avdrag.total', 'Restgjeld'],
-                          dtype='float')
+        periods = self.interval * self.period
+        interest_foot = self.interest_rate / self.interval / 100
+        payment = int(round(FixedRate.periodical_payments(self.interest_rate, self.interval,
+                                                          self.period, self.amount)))
 
-        df["Termin"] = list(range(len(self.period_list())))
-        df["Dato"] = self.period_list()
+        growth = np.array([(1 + interest_foot) ** (i - 1) for i in range(periods + 1)])
+        principal = np.rint((payment - interest_foot * self.amount) * growth).astype(np.int64)
+        principal[0] = 0
+        interest = payment - principal
+        interest[0] = 0
+        principal[periods] = self.amount - principal[:periods].sum()
 
-        df["T.beløp"] = Money(str(int(
-            round(FixedRate.periodical_payments(self.interest_rate, self.interval, self.period,
-                                                self.amount))))).value()
+        return self.amortization(principal, interest)
 
-        df.at[0, "T.beløp"] = "0 kr"
+    def serial_amortization(self):
+        """
+        method for calculating the serial mortgage plan as integer columns, i.e. the numeric
+        core of serial_mortgage_plan()
 
-        df["T.beløp.total"] = [Money(str(value)).value() for value in np.cumsum(list(
-            int(value.replace(" kr", "").replace(" ", "")) if i != 0 else 0 for i, value in
-            enumerate(df["T.beløp"])))]
+        Returns
+        -------
+        out         : pd.DataFrame
+                      plan with one row per. period, amounts as int64
 
-        df["Avdrag"] = [Money(str(round((float(val.replace(" kr", "").replace(" ", "")) - (
-                self.interest_rate / self.interval / 100) * self.amount) *
-                                        ((1 + self.interest_rate / self.interval / 100) ** (
-                                                i - 1))))).value() for i, val in
-                        enumerate(df["T.beløp"])]
+        """
+        periods = self.interval * self.period
+        interest_foot = self.interest_rate / self.interval / 100
 
-        df.at[0, "Avdrag"] = "0 kr"
+        principal = np.full(periods + 1, int(round(self.amount / periods)), dtype=np.int64)
+        principal[0] = 0
+        principal[periods] = self.amount - principal[:periods].sum()
+        interest = np.zeros(periods + 1, dtype=np.int64)
+        interest[1:] = np.rint((self.amount - np.cumsum(principal[:periods])) * interest_foot)
 
-        df["Avdrag.total"] = [Money(str(value)).value() for value in np.cumsum(list(
-            int(value.replace(" kr", "").replace(" ", "")) if i != 0 else 0 for i, value in
-            enumerate(df["Avdrag"])))]
+        return self.amortization(principal, interest)
 
-        df["Renter"] = [Money(str(value)).value() for value in
-                        df["T.beløp"].str.replace(" kr", "").str.replace(" ", "").astype(int) - df[
-                            "Avdrag"].str.replace(" kr", "").str.replace(" ", "").astype(int)]
+    def amortization(self, principal: np.ndarray, interest: np.ndarray):
+        """
+        method for assembling a mortgage plan from the principal and interest per. period
 
-        df["Renter.total"] = [Money(str(value)).value() for value in np.cumsum(list(
-            int(value.replace(" kr", "").replace(" ", "")) if i != 0 else 0 for i, value in
-            enumerate(df["Renter"])))]
+        Parameters
+        ----------
+        principal   : np.ndarray
+                      principal (avdrag) per. period, first period is the start of the plan
+        interest    : np.ndarray
+                      interest (renter) per. period, first period is the start of the plan
 
-        df["Restgjeld"] = [Money(str(value)).value() for value in
-                           -1 * (df["Avdrag.total"].str.replace(" kr", "")
-                                 .str.replace(" ", "").astype(int) - self.amount)]
+        Returns
+        -------
+        out         : pd.DataFrame
+                      plan with one row per. period, amounts as int64
 
-        df.at[self.period * self.interval, "Avdrag"] = df.at[
-            self.period * self.interval - 1, "Restgjeld"]
+        """
+        payment = interest + principal
+        return pd.DataFrame({"Termin": np.arange(len(principal)), "Dato": self.period_list(),
+                             "T.beløp": payment, "T.beløp.total": np.cumsum(payment),
+                             "Renter": interest, "Renter.total": np.cumsum(interest),
+                             "Avdrag": principal, "Avdrag.total": np.cumsum(principal),
+                             "Restgjeld": self.amount - np.cumsum(principal)})
 
-        df["Avdrag.total"] = [Money(str(value)).value() for value in np.cumsum(list(
-            int(value.replace(" kr", "").replace(" ", "")) if i != 0 else 0 for i, value in
-            enumerate(df["Avdrag"])))]
+    @staticmethod
+    def money(values):
+        """
+        method for formatting integer amounts as money, i.e. the presentation step of the
+        mortgage plans. Equivalent to Money(str(value)).value() for every value
 
-        df["Restgjeld"] = [Money(str(value)).value() for value in
-                           -1 * (df["Avdrag.total"].str.replace(" kr", "")
-                                 .str.replace(" ", "").astype(int) - self.amount)]
+        Parameters
+        ----------
+        values      : array_like
+                      integer amounts
 
-        df["T.beløp"] = [Money(str(value)).value() for value in
-                         df["Renter"].str.replace(" kr", "").str.replace(" ", "").astype(int) + df[
-                             "Avdrag"].str.replace(" kr", "").str.replace(" ", "").astype(int)]
+        Returns
+        -------
+        out         : list
+                      amounts formatted as money, e.g. '1 234 kr'
 
-        df["T.beløp.total"] = [Money(str(value)).value() for value in np.cumsum(list(
-            int(value.replace(" kr", "").replace(" ", "")) if i != 0 else 0 for i, value in
-            enumerate(df["T.beløp"])))]
+        """
+        return [f"{value:,}".replace(",", " ") + " kr" for value in np.asarray(values).tolist()]
 
-        start_date = df.at[1, "Dato"]
-        end_date = df.at[self.period * self.interval, "Dato"]
-        total_interest = df.at[self.period * self.interval, "Renter.total"]
-        total_payment = df.at[self.period * self.interval, "T.beløp.total"]
-        total_periods = str(df.at[self.period * self.interval, "Termin"])
-        termin_year = str(self.interval) + f" ({self.interval_name})"
-        years = str(self.period) + ' år'
-        interest = str(self.interest_rate) + ' %'
-        amount = df.at[self.period * self.interval, "Avdrag.total"]
+    def mortgage_plan(self, df: pd.DataFrame, suffix: str):
+        """
+        method for formatting a numeric mortgage plan with summary
+
+        Parameters
+        ----------
+        df          : pd.DataFrame
+                      numeric mortgage plan from fixed_amortization() or serial_amortization()
+        suffix      : str
+                      suffix of the keys in the mortgage plan, i.e. 'annuitet' or 'serie'
+
+        Returns
+        -------
+        out         : dict
+                      mortgage plan with amounts formatted as money
+
+        """
+        last = self.period * self.interval
+        plan = df.copy()
+        for column in plan.columns[2:]:
+            plan[column] = self.money(df[column])
+
+        total_interest = plan.at[last, "Renter.total"]
+        total_payment = plan.at[last, "T.beløp.total"]
+        amount = plan.at[last, "Avdrag.total"]
 
         payment_share = Share(Money(total_payment), Money(total_payment)).value
         interest_share = Share(Money(total_interest), Money(total_payment)).value
         principal_share = Share(Money(amount), Money(total_payment)).value
 
-        return {"nedbetalingsplan_annuitet": df.to_dict(), "start_dato_annuitet": start_date,
-                "slutt_dato_annuitet": end_date, "total_rente_annuitet": total_interest,
-                "total_belop_annuitet": total_payment, "total_termin_annuitet": total_periods,
-                "aar_annuitet": years, "termin_aar_annuitet": termin_year, "laan_annuitet": amount,
-                "rente_annuitet": interest,
-                'nedbetalingsplan_annuitet_overview': self.aggregate_plan(df),
-                'total_belop_andel_annuitet': payment_share,
-                'total_rente_andel_annuitet': interest_share,
-                'laan_andel_annuitet': principal_share}
+        return {f"nedbetalingsplan_{suffix}": plan.to_dict(),
+                f"start_dato_{suffix}": plan.at[1, "Dato"],
+                f"slutt_dato_{suffix}": plan.at[last, "Dato"],
+                f"total_rente_{suffix}": total_interest,
+                f"total_belop_{suffix}": total_payment,
+                f"total_termin_{suffix}": str(plan.at[last, "Termin"]),
+                f"aar_{suffix}": str(self.period) + ' år',
+                f"termin_aar_{suffix}": str(self.interval) + f" ({self.interval_name})",
+                f"laan_{suffix}": amount,
+                f"rente_{suffix}": str(self.interest_rate) + ' %',
+                f"nedbetalingsplan_{suffix}_overview": self.aggregate_plan(df),
+                f"total_belop_andel_{suffix}": payment_share,
+                f"total_rente_andel_{suffix}": interest_share,
+                f"laan_andel_{suffix}": principal_share}
+
+    def fixed_mortgage_plan(self):
+        """
+        method for creating fixed mortgage plan
+
+        """
+        return self.mortgage_plan(self.fixed_amortization(), "annuitet")
 
     def serial_mortgage_plan(self):
         """
         method for creating serial mortgage plan
 
         """
-        df = pd.DataFrame(columns=['Termin', 'Dato', 'T.beløp', 'T.beløp.total', 'Renter',
-                                   'Renter.total', 'Avdrag', 'Avdrag.total', 'Restgjeld'],
-                          dtype='float')
-
-        df["Termin"] = list(range(len(self.period_list())))
-        df["Dato"] = self.period_list()
-
-        df["Avdrag"] = ["0 kr"] + ([Money(
-            str(int(round(self.amount / (self.interval * self.period))))).value()] * (
-                                           len(self.period_list()) - 1))
-
-        df["Avdrag.total"] = [Money(str(value)).value() for value in np.cumsum(list(
-            int(value.replace(" kr", "").replace(" ", "")) if i != 0 else 0 for i, value in
-            enumerate(df["Avdrag"])))]
-
-        df["Restgjeld"] = [Money(str(value)).value() for value in
-                           -1 * (df["Avdrag.total"].str.replace(" kr", "")
-                                 .str.replace(" ", "").astype(int) - self.amount)]
-
-        df.at[self.period * self.interval, "Avdrag"] = df.at[
-            self.period * self.interval - 1, "Restgjeld"]
-
-        df["Avdrag.total"] = [Money(str(value)).value() for value in np.cumsum(list(
-            int(value.replace(" kr", "").replace(" ", "")) if i != 0 else 0 for i, value in
-            enumerate(df["Avdrag"])))]
-
-        df["Restgjeld"] = [Money(str(value)).value() for value in
-                           -1 * (df["Avdrag.total"].str.replace(" kr", "")
-                                 .str.replace(" ", "").astype(int) - self.amount)]
-
-        df["Renter"] = [Money(str(int(round(val)))).value() if i != 0 else "0 kr" for i, val in
-                        enumerate(df["Restgjeld"].shift(1).fillna("0 kr").str.replace(" kr", "") \
-                                  .str.replace(" ", "").astype(int) * (
-                                          self.interest_rate / self.interval / 100))]
-        df["Renter.total"] = [Money(str(value)).value() for value in np.cumsum(list(
-            int(value.replace(" kr", "").replace(" ", "")) if i != 0 else 0 for i, value in
-            enumerate(df["Renter"])))]
-
-        df["T.beløp"] = [Money(str(value)).value() for value in
-                         df["Renter"].str.replace(" kr", "").str.replace(" ", "").astype(int) + df[
-                             "Avdrag"].str.replace(" kr", "").str.replace(" ", "").astype(int)]
-        df["T.beløp.total"] = [Money(str(value)).value() for value in np.cumsum(list(
-            int(value.replace(" kr", "").replace(" ", "")) if i != 0 else 0 for i, value in
-            enumerate(df["T.beløp"])))]
-
-        start_date = df.at[1, "Dato"]
-        end_date = df.at[self.period * self.interval, "Dato"]
-        total_interest = df.at[self.period * self.interval, "Renter.total"]
-        total_payment = df.at[self.period * self.interval, "T.beløp.total"]
-        total_periods = str(df.at[self.period * self.interval, "Termin"])
-        termin_year = str(self.interval) + f" ({self.interval_name})"
-        years = str(self.period) + ' år'
-        interest = str(self.interest_rate) + ' %'
-        amount = df.at[self.period * self.interval, "Avdrag.total"]
+        return self.mortgage_plan(self.serial_amortization(), "serie")
 
-        payment_share = Share(Money(total_payment), Money(total_payment)).value
-        interest_share = Share(Money(total_interest), Money(total_payment)).value
-        principal_share = Share(Money(amount), Money(total_payment)).value
+    def aggregate_plan(self, df: pd.DataFrame):
+        """
+        method for aggregating a numeric mortgage plan per. year
 
-        return {"nedbetalingsplan_serie": df.to_dict(), "start_dato_serie": start_date,
-                "slutt_dato_serie": end_date, "total_rente_serie": total_interest,
-                "total_belop_serie": total_payment, "total_termin_serie": total_periods,
-                "aar_serie": years, "termin_aar_serie": termin_year, "laan_serie": amount,
-                "rente_serie": interest,
-                'nedbetalingsplan_serie_overview': self.aggregate_plan(df),
-                'total_belop_andel_serie': payment_share,
-                'total_rente_andel_serie': interest_share,
-                'laan_andel_serie': principal_share}
+        Parameters
+        ----------
+        df          : pd.DataFrame
+                      numeric mortgage plan from fixed_amortization() or serial_amortization()
 
-    @staticmethod
-    def aggregate_plan(df: pd.DataFrame):
-        """
-        method for aggregating values in a pandas dataframe
-
-        """
-        agg_df = pd.DataFrame()
-
-        agg_df['Termin'] = df.loc[1:, ]['Termin']
-        agg_df['Dato'] = df.loc[1:, ]['Dato']
-
-        agg_df['T.beløp'] = df.loc[1:, ]['T.beløp'].str.replace(" kr", "") \
-            .str.replace(" ", "").astype(int)
-        agg_df['T.beløp.total'] = df.loc[1:, ]['T.beløp.total'].str.replace(" kr", "") \
-            .str.replace(" ", "").astype(int)
-        agg_df['Renter'] = df.loc[1:, ]['Renter'].str.replace(" kr", "") \
-            .str.replace(" ", "").astype(int)
-        agg_df['Renter.total'] = df.loc[1:, ]['Renter.total'].str.replace(" kr", "") \
-            .str.replace(" ", "").astype(int)
-        agg_df['Avdrag'] = df.loc[1:, ]['Avdrag'].str.replace(" kr", "") \
-            .str.replace(" ", "").astype(int)
-        agg_df['Avdrag.total'] = df.loc[1:, ]['Avdrag.total'].str.replace(" kr", "") \
-            .str.replace(" ", "").astype(int)
-        agg_df = agg_df.loc[1:, ].reset_index(drop=True)
-
-        final_df = pd.DataFrame()
-        final_df['T.beløp'] = agg_df.groupby(pd.to_datetime(agg_df['Dato'])
-                                             .dt.year)['T.beløp'].agg(['max'])
-        final_df['T.beløp.total'] = agg_df.groupby(pd.to_datetime(agg_df['Dato'])
-                                                   .dt.year)['T.beløp'].agg(['sum'])
-        final_df['T.beløp.total'] = final_df['T.beløp.total'].cumsum()
-
-        final_df['Renter'] = agg_df.groupby(pd.to_datetime(agg_df['Dato'])
-                                            .dt.year)['Renter'].agg(['max'])
-        final_df['Renter.total'] = agg_df.groupby(pd.to_datetime(agg_df['Dato'])
-                                                  .dt.year)['Renter'].agg(['sum'])
-        final_df['Renter.total'] = final_df['Renter.total'].cumsum()
-
-        final_df['Avdrag'] = agg_df.groupby(pd.to_datetime(agg_df['Dato'])
-                                            .dt.year)['Avdrag'].agg(['max'])
-        final_df['Avdrag.total'] = agg_df.groupby(pd.to_datetime(agg_df['Dato'])
-                                                  .dt.year)['Avdrag'].agg(['sum'])
-        final_df['Avdrag.total'] = final_df['Avdrag.total'].cumsum()
-
-        final_df['År'] = range(0, len(final_df))
-
-        aar = final_df.pop('År')
-        final_df.insert(0, 'År', aar)
-
-        final_df['T.beløp'] = [Money(value).value() for value in final_df['T.beløp'].astype(str)]
-        final_df['T.beløp.total'] = [Money(value).value() for value in
-                                     final_df['T.beløp.total'].astype(str)]
-        final_df['Renter'] = [Money(value).value() for value in final_df['Renter'].astype(str)]
-        final_df['Renter.total'] = [Money(value).value() for value in
-                                    final_df['Renter.total'].astype(str)]
-        final_df['Avdrag'] = [Money(value).value() for value in final_df['Avdrag'].astype(str)]
-        final_df['Avdrag.total'] = [Money(value).value() for value in
-                                    final_df['Avdrag.total'].astype(str)]
-
-        final_df = final_df.reset_index(drop=True)
-
-        return final_df.to_dict()
+        Returns
+        -------
+        out         : dict
+                      yearly mortgage plan with amounts formatted as money
+
+        """
+        yearly = df.loc[1:, ["T.beløp", "Renter", "Avdrag"]].groupby(
+            self.period_dates().to_series().dt.year.to_numpy())
+        maximum = yearly.max()
+        total = yearly.sum().cumsum()
+
+        return pd.DataFrame({"År": np.arange(len(maximum)),
+                             "T.beløp": self.money(maximum["T.beløp"]),
+                             "T.beløp.total": self.money(total["T.beløp"]),
+                             "Renter": self.money(maximum["Renter"]),
+                             "Renter.total": self.money(total["Renter"]),
+                             "Avdrag": self.money(maximum["Avdrag"]),
+                             "Avdrag.total": self.money(total["Avdrag"])}).to_dict()
@@ -22,6 +22,7 @@ class Serial(Mortgage):
     """
     _interval_mapping = {"Årlig": 1, "Halvårlig": 2, "Kvartalsvis": 4, "Annenhver måned": 6,
                          "Månedlig": 12, "Semi-månedlig": 24, "Annenhver uke": 26, "Ukentlig": 52}
+    _payment_types = Assertor.type_check(float, int, int, (int, float))
 
     @staticmethod
     def periodical_payments(interest_rate: float, interval: int, period: int,
@@ -46,11 +47,65 @@ class Serial(Mortgage):
                           periodical amount to pay
 
         """
-        Assertor.assert_data_types([interest_rate, interval, period, amount],
-                                   [float, int, int, (int, float)])
+        Serial._payment_types(interest_rate, interval, period, amount)
+        return Serial.first_payment(interest_rate, interval, period, amount)
+
+    @staticmethod
+    def first_payment(interest_rate, interval, period, amount):
+        """
+        unvalidated numeric core of periodical_payments, works on both scalars and numpy
+        arrays
+
+        Parameters
+        ----------
+        interest_rate   : float, np.ndarray
+                          yearly interest rate
+        interval        : int, np.ndarray
+                          interval for which to pay
+        period          : int, np.ndarray
+                          number of years for the mortgage
+        amount          : int, float, np.ndarray
+                          mortgage amount
+
+        Returns
+        -------
+        out             : float, np.ndarray
+                          first (and largest) periodical amount to pay
+
+        """
         interest_foot = interest_rate / 100 / interval
         return (amount * interest_foot) + (amount / (period * interval))
 
+    @classmethod
+    def calculate_stress_rates(cls, interval, period, amount, net_liquidity):
+        """
+        method for calculating the max stress rate of many serial mortgages in one call
+
+        Parameters
+        ----------
+        interval        : array_like
+                          number of payments per. year for every mortgage
+        period          : array_like
+                          number of years for every mortgage
+        amount          : array_like
+                          amount for every mortgage
+        net_liquidity   : array_like
+                          monthly net liquidity (betjeningsevne) for every mortgage
+
+        Returns
+        -------
+        out             : np.ndarray
+                          max stress rate in percent for every mortgage, nan if none is
+                          affordable
+
+        """
+        interval, period, amount, net_liquidity = np.broadcast_arrays(
+            np.asarray(interval), np.asarray(period), np.asarray(amount, dtype=float),
+            np.asarray(net_liquidity, dtype=float))
+        return cls.solve_stress_rates(
+            lambda rates: cls.first_payment(rates, interval, period, amount),
+            cls.monthly_to_periodical(net_liquidity, interval))
+
     def __init__(self, data: dict):
         """
         Constructor / Instantiate the class
@@ -134,14 +189,6 @@ class Serial(Mortgage):
         method for calculating the max stress rate
 
         """
-        stress_rates = {round(self.periodical_payments(i, self.interval, self.period,
-                                                       self.amount)): round(i, 3) for i in
-                        np.arange(0.01, 50.00, 0.01)}
-
-        net_liquidity = self.net_liquidity if self.interval == 12 else \
-            (self.net_liquidity * 12) / self.interval
-
-        diff_rates = {abs(net_liquidity - liquidity): rates for liquidity, rates in
-                      stress_rates.items() if net_liquidity - liquidity > 0}
-        stress_rate = list(diff_rates.values())[-1]
-        return str(stress_rate) + ' %'
+        return self.solve_stress_rate(
+            lambda rate: self.first_payment(rate, self.interval, self.period, self.amount),
+            self.monthly_to_periodical(self.net_liquidity, self.interval))
@@ -57,6 +57,7 @@ class AnalysisModel(Model):
         self.bar_plot_serie_total = None
         self.bar_plot_annuitet_period = None
         self.bar_plot_serie_period = None
+        self.mortgage_analysis = None
 
     @property
     def analysis_keys(self):
@@ -82,8 +83,11 @@ class AnalysisModel(Model):
 
             self.parent.ui_form.tab_widget_home.setCurrentIndex(1)
 
-            mortgage_analysis_data = MortgageAnalysisProcess(
-                self.data).mortgage()
+            if self.mortgage_analysis:
+                mortgage_analysis_data = self.mortgage_analysis.update(self.data)
+            else:
+                self.mortgage_analysis = MortgageAnalysisProcess(self.data)
+                mortgage_analysis_data = self.mortgage_analysis.mortgage()
 
             self.set_line_edits(line_edit_text='',
                                 line_edits=self.analysis_keys,
@@ -344,4 +348,5 @@ class AnalysisModel(Model):
             self.parent.ui_form.table_view_serie_overview)
 
         self.data = {}
+        self.mortgage_analysis = None
         self.clear_line_edits(self.analysis_keys)
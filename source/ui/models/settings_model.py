@@ -65,10 +65,10 @@ class SettingsModel(Model):
 
         """
         up = os.path.dirname
-        settings_dir = up(up(up(__file__))) + '\\app\\processing\\engine\\tmp'
+        settings_dir = os.path.join(up(up(up(__file__))), 'app', 'processing', 'engine', 'tmp')
 
-        if os.path.exists(settings_dir):
-            with open(settings_dir + '\\settings.json', 'r',
+        if os.path.exists(os.path.join(settings_dir, 'settings.json')):
+            with open(os.path.join(settings_dir, 'settings.json'), 'r',
                       encoding='utf-8') as fp:
                 try:
                     settings = json.load(fp)
@@ -87,13 +87,13 @@ class SettingsModel(Model):
 
         """
         up = os.path.dirname
-        settings_dir = up(up(up(__file__))) + '\\app\\processing\\engine\\tmp'
+        settings_dir = os.path.join(up(up(up(__file__))), 'app', 'processing', 'engine', 'tmp')
 
         if self.data:
             if not os.path.exists(settings_dir):
                 os.makedirs(settings_dir)
 
-            with open(settings_dir + '\\settings.json', 'w',
+            with open(os.path.join(settings_dir, 'settings.json'), 'w',
                       encoding='utf-8') as fp:
                 json.dump(self.data, fp)
 
@@ -13,5 +13,8 @@ from .version import __version__
 from .tracking import Tracking
 from .debugger import Debugger
 from .assertor import Assertor
+from .benchmark import Benchmark
+from .metrics import METRICS, MetricsRegistry, Counter, Gauge, Histogram
+from .run_context import RunContext
 from .exceptions import *
 from .profiling import *
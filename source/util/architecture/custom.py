@@ -12,14 +12,14 @@ from source.util import __version__
 name = "Stressa v." + __version__
 font_size = "16"
 
-icons = os.path.dirname(os.path.abspath(__file__)) + "\\icons\\"
-ssb_logo = icons + "ssb_logo.png"
-finn_logo = icons + "finn_logo.png"
-posten_logo = icons + "posten_logo.png"
-sifo_logo = icons + "sifo_logo.png"
-finansportalen_logo = icons + "finansportalen_logo.png"
-sqlite_logo = icons + "sqlite_logo.png"
-skatteetaten_logo = icons + "skatteetaten_logo.png"
+icons = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons")
+ssb_logo = os.path.join(icons, "ssb_logo.png")
+finn_logo = os.path.join(icons, "finn_logo.png")
+posten_logo = os.path.join(icons, "posten_logo.png")
+sifo_logo = os.path.join(icons, "sifo_logo.png")
+finansportalen_logo = os.path.join(icons, "finansportalen_logo.png")
+sqlite_logo = os.path.join(icons, "sqlite_logo.png")
+skatteetaten_logo = os.path.join(icons, "skatteetaten_logo.png")
 
 
 class Finansportalen(Custom):
@@ -3,7 +3,9 @@
 __author__ = 'Samir Adrik'
 __email__ = 'samir.adrik@gmail.com'
 
+import os
+
 from source.util import __version__
 
-name = "diagrams\\" + "Stressa v." + __version__
+name = os.path.join("diagrams", "Stressa v." + __version__)
 font_size = "16"
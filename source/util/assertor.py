@@ -9,16 +9,116 @@ __author__ = 'Samir Adrik'
 __email__ = 'samir.adrik@gmail.com'
 
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+from .settings import VALIDATION
+
+
+class TypeCheck:
+    """
+    Precompiled type check of the arguments of one call site, see Assertor.type_check()
+
+    """
+
+    __slots__ = ("dtypes", "boundary")
+
+    def __init__(self, dtypes: tuple, boundary: bool = False):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        dtypes      : tuple
+                      types of the arguments, a tuple of types for a union
+        boundary    : bool
+                      check at a boundary of the app, i.e. also with the 'boundary' level
+
+        """
+        self.dtypes = dtypes
+        self.boundary = boundary
+
+    def __call__(self, *args):
+        """
+        Evaluate the type of the arguments. Raises TypeError if not match
+
+        """
+        level = Assertor.level
+        if level == "off" or (level == "boundary" and not self.boundary):
+            return
+        if not all(map(isinstance, args, self.dtypes)):
+            Assertor.raise_type_error(args, self.dtypes)
 
 
 class Assertor(ABC):
     """
-    Class for asserting Python objects
+    Class for asserting Python objects. The type checks depend on the validation level, i.e.
+    'strict' checks all types, 'boundary' only the types at the boundaries of the app (the
+    input of the processes and the connectors) and 'off' none. The level is set with the env.
+    variable STRESSA_VALIDATION, and the checks of values are always run
 
     """
 
+    levels = ("strict", "boundary", "off")
+    level = "strict"
+    _type_checks = {}
+
+    @classmethod
+    def set_level(cls, level: str):
+        """
+        Method for setting the validation level
+
+        Parameters
+        ----------
+        level       : str
+                      'strict', 'boundary' or 'off'
+
+        Returns
+        -------
+        out         : str
+                      previous validation level
+
+        """
+        if level not in cls.levels:
+            raise ValueError(f"only possible values for 'level' are {cls.levels}")
+        previous, Assertor.level = Assertor.level, level
+        return previous
+
+    @classmethod
+    @contextmanager
+    def validation(cls, level: str):
+        """
+        Method for running with a validation level, restoring the previous level afterwards
+
+        Parameters
+        ----------
+        level       : str
+                      'strict', 'boundary' or 'off'
+
+        """
+        previous = cls.set_level(level)
+        try:
+            yield
+        finally:
+            cls.set_level(previous)
+
+    @staticmethod
+    def raise_type_error(arg_list, dtype_list):
+        """
+        Method that raises TypeError for the first object in 'arg_list' not of the type in
+        'dtype_list'
+
+        """
+        for arg, dtype in zip(arg_list, dtype_list):
+            if not isinstance(arg, dtype):
+                if isinstance(dtype, tuple):
+                    dtypes = ", ".join(dt.__name__ for dt in dtype)
+                    raise TypeError(
+                        f"expected type 'Union[{dtypes}]', got '{arg.__class__.__name__}' instead")
+                raise TypeError(
+                    f"expected type '{dtype.__name__}', got '{arg.__class__.__name__}' instead")
+
     @staticmethod
-    def assert_data_types(arg_list: list, dtype_list: list):
+    def assert_data_types(arg_list: list, dtype_list: list, boundary: bool = False):
         """
         Method that evaluates the type of objects in 'arg_list' against 'dtype_list'. Raises
         TypeError if not match.
@@ -29,18 +129,40 @@ class Assertor(ABC):
                       arguments to be evaluated
         dtype_list  : list
                       types of corresponding arguments
+        boundary    : bool
+                      check at a boundary of the app, i.e. also with the 'boundary' level
 
         """
-        for i, arg in enumerate(arg_list):
-            dtype = dtype_list[i]
-            if not isinstance(arg, dtype):
-                try:
-                    raise TypeError(
-                        f"expected type '{dtype.__name__}', got '{arg.__class__.__name__}' instead")
-                except AttributeError:
-                    dtypes = ", ".join(dt.__name__ for dt in dtype)
-                    raise TypeError(
-                        f"expected type 'Union[{dtypes}]', got '{arg.__class__.__name__}' instead")
+        level = Assertor.level
+        if level == "off" or (level == "boundary" and not boundary):
+            return
+        if not all(map(isinstance, arg_list, dtype_list)):
+            Assertor.raise_type_error(arg_list, dtype_list)
+
+    @classmethod
+    def type_check(cls, *dtypes, boundary: bool = False):
+        """
+        Method for getting the precompiled type check of a call site, e.g. a class attribute
+        of a method called in inner loops, avoiding the lists of assert_data_types()
+
+        Parameters
+        ----------
+        dtypes      : type, tuple
+                      types of the arguments, a tuple of types for a union
+        boundary    : bool
+                      check at a boundary of the app, i.e. also with the 'boundary' level
+
+        Returns
+        -------
+        out         : TypeCheck
+                      type check called with the arguments, shared by call sites with the
+                      same types
+
+        """
+        key = (dtypes, boundary)
+        if key not in cls._type_checks:
+            cls._type_checks[key] = TypeCheck(dtypes, boundary)
+        return cls._type_checks[key]
 
     @staticmethod
     def assert_arguments(obj_list: list, possible_list: list):
@@ -89,3 +211,6 @@ class Assertor(ABC):
         Abstract class, so class cannot be instantiated
 
         """
+
+
+Assertor.set_level(VALIDATION)
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module containing utilities for benchmarking, i.e. latency percentiles, allocations and peak
+memory of repeated runs, compared against a stored baseline
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+import json
+import tracemalloc
+from time import perf_counter
+
+import psutil
+
+from .exceptions import BenchmarkRegressionError
+from .assertor import Assertor
+
+
+class Benchmark:
+    """
+    Benchmark of a callable, i.e. the latency percentiles of repeated timed runs, and the
+    memory allocated by one traced run (tracemalloc slows down the run, so it is not timed)
+
+    """
+
+    metrics = ("p50", "p95", "p99")
+
+    @staticmethod
+    def percentile(values: list, percent: float):
+        """
+        method for getting a percentile of values, interpolating between the closest ranks
+
+        Parameters
+        ----------
+        values      : list
+                      values
+        percent     : float
+                      percentile in [0, 100]
+
+        Returns
+        -------
+        out         : float
+                      percentile of the values
+
+        """
+        Assertor.assert_data_types([values, percent], [list, (int, float)])
+        if not values or not 0 <= percent <= 100:
+            raise ValueError(f"expected values and a percent in [0, 100], got '{len(values)}' "
+                             f"values and '{percent}'")
+        ordered = sorted(values)
+        rank = (len(ordered) - 1) * percent / 100
+        lower = int(rank)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+    def __init__(self, name: str, func, iterations: int = 20, warmup: int = 1):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        name        : str
+                      name of the benchmark
+        func        : callable
+                      callable to benchmark, called without arguments
+        iterations  : int
+                      number of timed runs
+        warmup      : int
+                      number of untimed runs before the timed runs
+
+        """
+        Assertor.assert_data_types([name, iterations, warmup], [str, int, int])
+        if not callable(func):
+            raise TypeError(f"expected callable func, got '{func.__class__.__name__}'")
+        if iterations < 1 or warmup < 0:
+            raise ValueError(f"expected positive iterations and non-negative warmup, got "
+                             f"'{iterations}' and '{warmup}'")
+        self.name = name
+        self.func = func
+        self.iterations = iterations
+        self.warmup = warmup
+
+    def run(self, before=None):
+        """
+        method for running the benchmark
+
+        Parameters
+        ----------
+        before      : callable
+                      callable called before every run, e.g. clearing caches, not timed
+
+        Returns
+        -------
+        out         : dict
+                      latency percentiles and mean in ms, memory allocated by one run in KiB
+                      and peak resident memory of the process in MiB
+
+        """
+        process = psutil.Process()
+        for _ in range(self.warmup):
+            if before:
+                before()
+            self.func()
+
+        timings, peak_rss = [], process.memory_info().rss
+        for _ in range(self.iterations):
+            if before:
+                before()
+            start = perf_counter()
+            self.func()
+            timings.append((perf_counter() - start) * 1000)
+            peak_rss = max(peak_rss, process.memory_info().rss)
+
+        if before:
+            before()
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+        try:
+            self.func()
+            allocated = tracemalloc.get_traced_memory()[1] - start_memory
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+
+        digits = 3
+        result = {"iterations": self.iterations,
+                  "mean": round(sum(timings) / len(timings), digits)}
+        result.update({metric: round(self.percentile(timings, float(metric[1:])), digits) for
+                       metric in self.metrics})
+        result.update({"allocated_kib": round(allocated / 1024, digits),
+                       "peak_rss_mib": round(peak_rss / 1024 ** 2, digits)})
+        return result
+
+    @staticmethod
+    def load_baseline(path: str):
+        """
+        method for loading stored benchmark results
+
+        Parameters
+        ----------
+        path        : str
+                      path of the JSON file of the baseline
+
+        Returns
+        -------
+        out         : dict
+                      results by benchmark name, empty if no baseline is stored
+
+        """
+        Assertor.assert_data_types([path], [str])
+        if not os.path.isfile(path):
+            return {}
+        with open(path, encoding="utf-8") as baseline_file:
+            return json.load(baseline_file)
+
+    @staticmethod
+    def save_baseline(results: dict, path: str):
+        """
+        method for storing benchmark results as the baseline
+
+        Parameters
+        ----------
+        results     : dict
+                      results by benchmark name
+        path        : str
+                      path of the JSON file of the baseline
+
+        """
+        Assertor.assert_data_types([results, path], [dict, str])
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+
+    @classmethod
+    def regressions(cls, results: dict, baseline: dict, threshold: float = 0.2):
+        """
+        method for comparing benchmark results against a baseline
+
+        Parameters
+        ----------
+        results     : dict
+                      results by benchmark name
+        baseline    : dict
+                      baseline results by benchmark name, benchmarks without baseline are
+                      not compared
+        threshold   : float
+                      allowed relative increase of every latency percentile, e.g. 0.2 for 20 %
+
+        Returns
+        -------
+        out         : list
+                      description of every regression beyond the threshold
+
+        """
+        Assertor.assert_data_types([results, baseline, threshold], [dict, dict, (int, float)])
+        regressions = []
+        for name, result in sorted(results.items()):
+            for metric in cls.metrics:
+                reference = baseline.get(name, {}).get(metric)
+                if reference and result[metric] > reference * (1 + threshold):
+                    regressions.append(
+                        f"'{name}' {metric} {result[metric]}ms is "
+                        f"{round((result[metric] / reference - 1) * 100, 1)} % above the "
+                        f"baseline {reference}ms")
+        return regressions
+
+    @classmethod
+    def assert_no_regressions(cls, results: dict, baseline: dict, threshold: float = 0.2):
+        """
+        method for raising BenchmarkRegressionError if any result regresses beyond the
+        threshold of the baseline, see regressions()
+
+        """
+        regressions = cls.regressions(results, baseline, threshold)
+        if regressions:
+            raise BenchmarkRegressionError("benchmark regressions: " + "; ".join(regressions))
@@ -13,24 +13,17 @@ from .logging import LOGGER
 
 class Debugger(Tracking):
     """
-    Debugging decorator
+    Debugging decorator, i.e. exceptions are logged and the method returns None. Always
+    enabled, as the callers rely on the exceptions being swallowed
 
     """
 
-    def __call__(self, *args, **kwargs):
+    enabled = True
+
+    @classmethod
+    def handle(cls, instance, func, exception: Exception):
         """
-        private call method
+        method for handling an exception raised by a decorated method
 
         """
-        function = None
-        try:
-            function = self.func(*args, **kwargs)
-            return function
-        except Exception as debugger_exception:
-            if self.func.__name__ == "__init__":
-                msg = f"[{self.type.__name__}] -> '{debugger_exception}'"
-            else:
-                msg = (f"[{self.type.__name__}.{self.func.__name__}] "
-                       f"-> '{debugger_exception}'")
-            LOGGER.debug(msg)
-            return function
+        LOGGER.debug(f"[{cls.name(instance, func)}] -> '{exception}'")
@@ -128,3 +128,14 @@ class TrackingError(Exception):
     def __init__(self, msg: str):
         super().__init__(msg)
         self.msg = msg
+
+
+class BenchmarkRegressionError(Exception):
+    """
+    Exception thrown when a benchmark regresses beyond the threshold of its baseline
+
+    """
+
+    def __init__(self, msg: str):
+        super().__init__(msg)
+        self.msg = msg
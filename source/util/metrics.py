@@ -0,0 +1,607 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module containing the in-process metrics registry, i.e. counters, gauges and latency
+histograms of the operations, connectors and processes, exported in Prometheus text format and
+as JSON lines
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+import json
+import atexit
+from threading import Event, Lock, Thread, local
+from time import time
+
+from prettytable import PrettyTable, NONE
+
+from .settings import METRICS_DIR, METRICS_INTERVAL
+from .logging import LOGGER
+
+
+class Metric:
+    """
+    Base class of a metric series, i.e. a metric name and its labels. Every thread records in
+    its own shard, so recording takes no lock, and the shards are summed when collected
+
+    """
+
+    type = None
+
+    def __init__(self, name: str, labels: tuple):
+        """
+        Constructor / Instantiate the class
+
+        Parameters
+        ----------
+        name        : str
+                      name of the metric
+        labels      : tuple
+                      sorted (label, value) pairs of the series
+
+        """
+        self.name = name
+        self.labels = labels
+        self._shards = []
+        self._local = local()
+
+    def new_shard(self):
+        """
+        method for creating the shard of a thread
+
+        """
+        return [0]
+
+    def shard(self):
+        """
+        method for getting the shard of the calling thread
+
+        """
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = self.new_shard()
+            self._shards.append(shard)
+            return shard
+
+
+class Counter(Metric):
+    """
+    Counter, i.e. a value that only increases, e.g. the number of runs of a process
+
+    """
+
+    type = "counter"
+
+    def inc(self, amount: float = 1):
+        """
+        method for increasing the counter
+
+        """
+        if amount < 0:
+            raise ValueError(f"counter '{self.name}' can only increase, got '{amount}'")
+        self.shard()[0] += amount
+
+    @property
+    def value(self):
+        """
+        value of the counter
+
+        """
+        return sum(shard[0] for shard in list(self._shards))
+
+
+class Gauge(Metric):
+    """
+    Gauge, i.e. a value that goes up and down, e.g. the number of running processes
+
+    """
+
+    type = "gauge"
+
+    def __init__(self, name: str, labels: tuple):
+        """
+        Constructor / Instantiate the class
+
+        """
+        super().__init__(name, labels)
+        self._value = 0
+
+    def set(self, value: float):
+        """
+        method for setting the gauge, resetting the increases and decreases of all threads
+
+        """
+        self._value = value
+        for shard in list(self._shards):
+            shard[0] = 0
+
+    def inc(self, amount: float = 1):
+        """
+        method for increasing the gauge
+
+        """
+        self.shard()[0] += amount
+
+    def dec(self, amount: float = 1):
+        """
+        method for decreasing the gauge
+
+        """
+        self.shard()[0] -= amount
+
+    @property
+    def value(self):
+        """
+        value of the gauge
+
+        """
+        return self._value + sum(shard[0] for shard in list(self._shards))
+
+
+class Histogram(Metric):
+    """
+    Latency histogram with HDR-style log-linear buckets, i.e. the values, in seconds, are
+    counted in buckets of microseconds with a relative width of at most 2 ** (1 - bits), about
+    1.6 %, over any range. Percentiles are read from the buckets, and the buckets are folded
+    into the cumulative buckets of Prometheus when exported
+
+    """
+
+    type = "histogram"
+    bits = 7
+    unit = 1e-6
+    buckets = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+               30.0, 60.0)
+
+    @classmethod
+    def index(cls, units: int):
+        """
+        method for getting the bucket of a value
+
+        Parameters
+        ----------
+        units       : int
+                      non-negative value in units
+
+        Returns
+        -------
+        out         : int
+                      index of the bucket
+
+        """
+        shift = max(units.bit_length() - cls.bits, 0)
+        return (shift << (cls.bits - 1)) + (units >> shift)
+
+    @classmethod
+    def bounds(cls, index: int):
+        """
+        method for getting the range of values of a bucket
+
+        Parameters
+        ----------
+        index       : int
+                      index of the bucket
+
+        Returns
+        -------
+        out         : tuple
+                      lowest value and highest value of the bucket in units
+
+        """
+        if index < 1 << cls.bits:
+            return index, index
+        shift = (index >> (cls.bits - 1)) - 1
+        lower = (index - (shift << (cls.bits - 1))) << shift
+        return lower, lower + (1 << shift) - 1
+
+    def new_shard(self):
+        """
+        method for creating the shard of a thread, i.e. count, sum, min, max and the counts of
+        the buckets
+
+        """
+        return [0, 0.0, None, None, {}]
+
+    def observe(self, value: float):
+        """
+        method for recording a value
+
+        Parameters
+        ----------
+        value       : float
+                      value in seconds, negative values are recorded as 0
+
+        """
+        value = max(value, 0.0)
+        shard = self.shard()
+        shard[0] += 1
+        shard[1] += value
+        if shard[2] is None or value < shard[2]:
+            shard[2] = value
+        if shard[3] is None or value > shard[3]:
+            shard[3] = value
+        index = self.index(int(value / self.unit))
+        counts = shard[4]
+        counts[index] = counts.get(index, 0) + 1
+
+    def snapshot(self):
+        """
+        method for getting the merged shards of all threads
+
+        Returns
+        -------
+        out         : tuple
+                      count, sum, min, max and the counts of the buckets by index
+
+        """
+        count, total, minimum, maximum, counts = 0, 0.0, None, None, {}
+        for shard in list(self._shards):
+            count += shard[0]
+            total += shard[1]
+            if shard[2] is not None and (minimum is None or shard[2] < minimum):
+                minimum = shard[2]
+            if shard[3] is not None and (maximum is None or shard[3] > maximum):
+                maximum = shard[3]
+            for index, bucket_count in shard[4].copy().items():
+                counts[index] = counts.get(index, 0) + bucket_count
+        return count, total, minimum, maximum, counts
+
+    def percentiles(self, percents=(50, 90, 95, 99)):
+        """
+        method for getting percentiles of the recorded values
+
+        Parameters
+        ----------
+        percents    : tuple
+                      percentiles in [0, 100]
+
+        Returns
+        -------
+        out         : dict
+                      value in seconds by percentile, None if nothing is recorded
+
+        """
+        count, _, minimum, maximum, counts = self.snapshot()
+        result = dict.fromkeys(percents)
+        if not count:
+            return result
+        indices = sorted(counts)
+        for percent in percents:
+            rank, seen = max(percent / 100 * count, 1), 0
+            for index in indices:
+                seen += counts[index]
+                if seen >= rank:
+                    value = self.bounds(index)[1] * self.unit
+                    result[percent] = min(max(value, minimum), maximum)
+                    break
+        return result
+
+    def cumulative(self, counts: dict):
+        """
+        method for folding the buckets into the cumulative buckets of Prometheus
+
+        Parameters
+        ----------
+        counts      : dict
+                      counts of the buckets by index
+
+        Returns
+        -------
+        out         : list
+                      (upper bound, count of values at most the bound) of every bucket
+
+        """
+        lowest = sorted((self.bounds(index)[0] * self.unit, bucket_count) for
+                        index, bucket_count in counts.items())
+        cumulative, seen, position = [], 0, 0
+        for bound in self.buckets:
+            while position < len(lowest) and lowest[position][0] <= bound:
+                seen += lowest[position][1]
+                position += 1
+            cumulative.append((bound, seen))
+        return cumulative
+
+
+class MetricsRegistry:
+    """
+    Registry of the metrics of the app, i.e. counters, gauges and histograms by name and
+    labels. The series are created on first use, e.g.
+    METRICS.histogram("stressa_operation_seconds", process="Foo").observe(0.1). The metrics
+    are exported in Prometheus text format and as JSON lines, periodically to a directory when
+    the env. variable STRESSA_METRICS_DIR is set, and rendered as a PrettyTable by table()
+
+    """
+
+    types = {"counter": Counter, "gauge": Gauge, "histogram": Histogram}
+
+    def __init__(self):
+        """
+        Constructor / Instantiate the class
+
+        """
+        self._series = {}
+        self._families = {}
+        self._lock = Lock()
+        self._stop = None
+        self._thread = None
+
+    def metric(self, metric_type: str, name: str, help_: str = "", **labels):
+        """
+        method for getting, or creating, the series of a metric
+
+        Parameters
+        ----------
+        metric_type : str
+                      'counter', 'gauge' or 'histogram'
+        name        : str
+                      name of the metric
+        help_       : str
+                      description of the metric, kept from the first series of the metric
+        labels      : dict
+                      labels of the series
+
+        Returns
+        -------
+        out         : Metric
+                      series of the metric
+
+        """
+        key = (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                family = self._families.setdefault(name, (metric_type, help_))
+                if family[0] != metric_type:
+                    raise ValueError(f"metric '{name}' is a {family[0]}, not a {metric_type}")
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = self.types[metric_type](*key)
+        elif series.type != metric_type:
+            raise ValueError(f"metric '{name}' is a {series.type}, not a {metric_type}")
+        return series
+
+    def counter(self, name: str, help_: str = "", **labels):
+        """
+        method for getting the series of a counter, see metric()
+
+        """
+        return self.metric("counter", name, help_, **labels)
+
+    def gauge(self, name: str, help_: str = "", **labels):
+        """
+        method for getting the series of a gauge, see metric()
+
+        """
+        return self.metric("gauge", name, help_, **labels)
+
+    def histogram(self, name: str, help_: str = "", **labels):
+        """
+        method for getting the series of a histogram, see metric()
+
+        """
+        return self.metric("histogram", name, help_, **labels)
+
+    def series(self):
+        """
+        method for getting all series, sorted by name and labels
+
+        Returns
+        -------
+        out         : list
+                      list of Metric
+
+        """
+        with self._lock:
+            return [self._series[key] for key in sorted(self._series)]
+
+    def clear(self):
+        """
+        method for removing all metrics
+
+        """
+        with self._lock:
+            self._series.clear()
+            self._families.clear()
+
+    @staticmethod
+    def labels(labels, extra: tuple = ()):
+        """
+        method for formatting labels in Prometheus text format
+
+        """
+        labels = tuple(labels) + extra
+        if not labels:
+            return ""
+        escaped = (str(value).replace("\\", r"\\").replace('"', r'\"').replace("\n", r"\n")
+                   for _, value in labels)
+        return "{" + ",".join(f'{label}="{value}"' for (label, _), value in
+                              zip(labels, escaped)) + "}"
+
+    def prometheus(self):
+        """
+        method for exporting the metrics in Prometheus text format
+
+        Returns
+        -------
+        out         : str
+                      metrics in Prometheus text format
+
+        """
+        lines, family = [], None
+        with self._lock:
+            families = dict(self._families)
+        for series in self.series():
+            if series.name != family:
+                family = series.name
+                help_ = families.get(family, (None, ""))[1]
+                if help_:
+                    lines.append(f"# HELP {family} {help_}")
+                lines.append(f"# TYPE {family} {series.type}")
+            if series.type == "histogram":
+                count, total, _, _, counts = series.snapshot()
+                for bound, bucket_count in series.cumulative(counts):
+                    lines.append(f"{family}_bucket"
+                                 f"{self.labels(series.labels, (('le', repr(bound)),))} "
+                                 f"{bucket_count}")
+                lines.append(f"{family}_bucket{self.labels(series.labels, (('le', '+Inf'),))} "
+                             f"{count}")
+                lines.append(f"{family}_sum{self.labels(series.labels)} {total}")
+                lines.append(f"{family}_count{self.labels(series.labels)} {count}")
+            else:
+                lines.append(f"{family}{self.labels(series.labels)} {series.value}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def records(self, timestamp: float = None):
+        """
+        method for exporting the metrics as records, i.e. one dictionary per series
+
+        Parameters
+        ----------
+        timestamp   : float
+                      seconds from epoch of the records, default is now
+
+        Returns
+        -------
+        out         : list
+                      list of dict with timestamp, name, type, labels, and value, or count,
+                      sum, min, max and percentiles of a histogram
+
+        """
+        timestamp = time() if timestamp is None else timestamp
+        records = []
+        for series in self.series():
+            record = {"timestamp": timestamp, "name": series.name, "type": series.type,
+                      "labels": dict(series.labels)}
+            if series.type == "histogram":
+                count, total, minimum, maximum, _ = series.snapshot()
+                record.update({"count": count, "sum": total, "min": minimum, "max": maximum})
+                record.update({f"p{percent}": value for percent, value in
+                               series.percentiles().items()})
+            else:
+                record["value"] = series.value
+            records.append(record)
+        return records
+
+    def json_lines(self, timestamp: float = None):
+        """
+        method for exporting the metrics as JSON lines, see records()
+
+        Returns
+        -------
+        out         : str
+                      one JSON object per line and series
+
+        """
+        return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in
+                       self.records(timestamp))
+
+    def table(self):
+        """
+        method for rendering the metrics as a table, i.e. the value of every counter and gauge,
+        and the count and percentiles in ms of every histogram
+
+        Returns
+        -------
+        out         : PrettyTable
+                      table of the metrics
+
+        """
+        metrics_table = PrettyTable(hrules=NONE, vrules=NONE)
+        metrics_table.field_names = ["metric", "labels", "value", "p50", "p95", "p99", "max"]
+        metrics_table.align = "l"
+        for column in metrics_table.field_names[2:]:
+            metrics_table.align[column] = "r"
+        digits = 3
+        for record in self.records():
+            labels = ", ".join(f"{label}={value}" for label, value in record["labels"].items())
+            if record["type"] == "histogram":
+                metrics_table.add_row(
+                    [record["name"], labels, record["count"]] +
+                    [f"{round(record[key] * 1000, digits)}ms" if record[key] is not None else ""
+                     for key in ("p50", "p95", "p99", "max")])
+            else:
+                metrics_table.add_row([record["name"], labels, record["value"], "", "", "", ""])
+        return metrics_table
+
+    def export(self, directory: str):
+        """
+        method for exporting the metrics to directory, i.e. replacing metrics.prom with the
+        metrics in Prometheus text format, and appending them to metrics.jsonl
+
+        Parameters
+        ----------
+        directory   : str
+                      directory of the exported metrics
+
+        """
+        os.makedirs(directory, exist_ok=True)
+        prometheus_path = os.path.join(directory, "metrics.prom")
+        with open(prometheus_path + ".tmp", "w", encoding="utf-8") as prometheus_file:
+            prometheus_file.write(self.prometheus())
+        os.replace(prometheus_path + ".tmp", prometheus_path)
+        with open(os.path.join(directory, "metrics.jsonl"), "a",
+                  encoding="utf-8") as json_lines_file:
+            json_lines_file.write(self.json_lines())
+
+    def start_export(self, directory: str, interval: float):
+        """
+        method for exporting the metrics to directory every interval seconds in a background
+        thread, and when the app exits
+
+        Parameters
+        ----------
+        directory   : str
+                      directory of the exported metrics
+        interval    : float
+                      seconds between the exports
+
+        """
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got '{interval}'")
+        self.stop_export()
+        self._stop = stop = Event()
+
+        def export_periodically():
+            while not stop.wait(interval):
+                try:
+                    self.export(directory)
+                except OSError as export_error:
+                    LOGGER.warning(f"metrics not exported to '{directory}', exited with "
+                                   f"'{export_error}'")
+
+        self._thread = Thread(target=export_periodically, name="stressa-metrics", daemon=True)
+        self._thread.start()
+        atexit.unregister(self.stop_export)
+        atexit.register(self.stop_export, directory)
+
+    def stop_export(self, directory: str = None):
+        """
+        method for stopping the periodic export
+
+        Parameters
+        ----------
+        directory   : str
+                      directory of a last export, None for no export
+
+        """
+        if self._thread:
+            self._stop.set()
+            self._thread.join()
+            self._thread = self._stop = None
+            atexit.unregister(self.stop_export)
+        if directory:
+            try:
+                self.export(directory)
+            except OSError as export_error:
+                LOGGER.warning(f"metrics not exported to '{directory}', exited with "
+                               f"'{export_error}'")
+
+
+METRICS = MetricsRegistry()
+
+if METRICS_DIR:
+    METRICS.start_export(METRICS_DIR, METRICS_INTERVAL)
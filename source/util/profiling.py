@@ -7,6 +7,7 @@ Module containing utilises for profiling processes
 __author__ = 'Samir Adrik'
 __email__ = 'samir.adrik@gmail.com'
 
+from functools import update_wrapper
 from time import time
 from datetime import datetime
 
@@ -19,13 +20,15 @@ class Profiling:
 
     """
 
-    def __init__(self, func, type_=None):
+    def __init__(self, func, type_=None, obj=None):
         """
         Constructor / Instantiate the class
 
         """
         self.func = func
         self.type = type_
+        self.obj = obj
+        update_wrapper(self, func)
 
     def __get__(self, obj, type_=None):
         """
@@ -33,22 +36,17 @@ class Profiling:
 
         """
         func = self.func.__get__(obj, type_)
-        return self.__class__(func, type_)
+        return self.__class__(func, type_, obj)
 
     def __call__(self, *args, **kwargs):
         """
-        private call method
+        private call method, the profiling row is added to the context of the running process
 
         """
-        digits = 7
         start = time()
-        function = self.func(*args, **kwargs)
-        end = time()
-        elapsed = round((end - start) * 1000, digits)
-        self.type.elapsed += elapsed
-        self.type.profiling.add_row(
-            [self.func.__name__, self.local_time(start), self.local_time(end),
-             str(elapsed) + "ms"])
+        with self.obj.context.active():
+            function = self.func(*args, **kwargs)
+        self.obj.context.add_profiling(self.func.__name__, start, time())
         return function
 
     @staticmethod
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module with logic for the context of the run active in the calling thread
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+from contextlib import contextmanager
+from threading import local
+
+
+class RunContext:
+    """
+    Thread-local stack of the contexts of the runs active in the calling thread, i.e. the
+    ProcessContext of the process running an operation. The connectors look up the context of
+    the run they send requests for here, without importing the processes
+
+    """
+    _active = local()
+
+    @classmethod
+    @contextmanager
+    def active(cls, context):
+        """
+        method for making a context the active one in the calling thread
+
+        Parameters
+        ----------
+        context     : object
+                      context of the run, e.g. a ProcessContext
+
+        """
+        stack = cls._active.__dict__.setdefault("stack", [])
+        stack.append(context)
+        try:
+            yield context
+        finally:
+            stack.pop()
+
+    @classmethod
+    def current(cls):
+        """
+        method for getting the active context in the calling thread
+
+        Returns
+        -------
+        out         : object
+                      active context, None if no run is active in the thread
+
+        """
+        stack = cls._active.__dict__.get("stack")
+        return stack[-1] if stack else None
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+"""
+Infrastructure settings file
+
+This file contains constants for the cross-cutting infrastructure, i.e. the decorators
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+
+# wrap methods decorated with Tracking, i.e. log exceptions and raise them as TrackingError, off
+# in production the methods are left undecorated and exceptions propagate as raised
+TRACKING = os.environ.get("STRESSA_TRACKING", "1").lower() in ("1", "true", "yes")
+
+# type checks of Assertor, i.e. 'strict' (all), 'boundary' (input of processes and connectors)
+# or 'off'
+VALIDATION = os.environ.get("STRESSA_VALIDATION", "strict").lower()
+
+# directory the metrics are exported to every METRICS_INTERVAL seconds, i.e. metrics.prom in
+# Prometheus text format and metrics.jsonl, not exported if not set
+METRICS_DIR = os.environ.get("STRESSA_METRICS_DIR")
+METRICS_INTERVAL = float(os.environ.get("STRESSA_METRICS_INTERVAL", 60))
@@ -7,48 +7,80 @@ Module containing decorator for tracking and logging exceptions
 __author__ = 'Samir Adrik'
 __email__ = 'samir.adrik@gmail.com'
 
-from functools import update_wrapper
+from functools import wraps
 
 from .exceptions import TrackingError
+from .settings import TRACKING
 from .logging import LOGGER
 
 
 class Tracking:
     """
-    Tracking decorator
+    Tracking decorator of methods, i.e. exceptions are logged and raised as TrackingError
+    prefixed with the class and name of the method. The wrapper is a plain function created
+    once when the class is defined, so calls bind as any other method. With the env. variable
+    STRESSA_TRACKING=0 the methods are left undecorated, see enabled
 
     """
 
-    def __init__(self, func, type_=None):
+    # decorate methods, read when the classes are defined
+    enabled = TRACKING
+
+    def __new__(cls, func):
         """
-        Constructor / Instantiate the class
+        Decorate a method
+
+        Parameters
+        ----------
+        func        : function
+                      method to decorate
+
+        Returns
+        -------
+        out         : function
+                      wrapper of the method, the method itself if not enabled
 
         """
-        self.func = func
-        self.type = type_
-        self.argument = True
-        update_wrapper(self, self.func)
+        if not cls.enabled:
+            return func
+        handle = cls.handle
 
-    def __get__(self, obj, type_=None):
+        @wraps(func)
+        def tracked(self, *args, **kwargs):
+            try:
+                return func(self, *args, **kwargs)
+            except Exception as tracking_exception:
+                return handle(self, func, tracking_exception)
+
+        return tracked
+
+    @staticmethod
+    def name(instance, func):
         """
-        private get method
+        method for getting the name of a method in messages, i.e. the class of instance, and
+        the name of the method unless a constructor
 
         """
-        func = self.func.__get__(obj, type_)
-        return self.__class__(func, type_)
+        name = getattr(func, "__name__", func.__class__.__name__)
+        if name == "__init__":
+            return type(instance).__name__
+        return f"{type(instance).__name__}.{name}"
 
-    def __call__(self, *args, **kwargs):
+    @classmethod
+    def handle(cls, instance, func, exception: Exception):
         """
-        private call method
+        method for handling an exception raised by a decorated method
+
+        Parameters
+        ----------
+        instance    : object
+                      instance the method was called on
+        func        : function
+                      decorated method
+        exception   : Exception
+                      exception raised by the method
 
         """
-        try:
-            function = self.func(*args, **kwargs)
-            return function
-        except Exception as tracking_exception:
-            if self.func.__name__ == "__init__":
-                msg = f"[{self.type.__name__}] -> {tracking_exception}"
-            else:
-                msg = f"[{self.type.__name__}.{self.func.__name__}] -> {tracking_exception}"
-            LOGGER.exception(msg)
-            raise TrackingError(msg)
+        msg = f"[{cls.name(instance, func)}] -> {exception}"
+        LOGGER.exception(msg)
+        raise TrackingError(msg)
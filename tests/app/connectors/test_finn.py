@@ -63,3 +63,54 @@ class TestFinn:
 
         """
         assert UUID(str(self.finn.id_))
+
+    @staticmethod
+    def test_remix_context_is_extracted_from_html():
+        """
+        Test that remix_context() and loader_data() extract the remix context of the last
+        script containing it, from both bytes and str
+
+        """
+        html = ('<html><head><script>var a = 1;</script></head><body>'
+                '<script type="text/javascript">window.__remixContext = '
+                '{"state": {"loaderData": {"routes/a": {"b": "æøå"}}}};</script>'
+                '</body></html>')
+
+        for page in [html, html.encode("utf-8")]:
+            assert Finn.remix_context(page) == {
+                "state": {"loaderData": {"routes/a": {"b": "æøå"}}}}
+            assert Finn.loader_data(page, "routes/a") == {"b": "æøå"}
+            assert Finn.loader_data(page, "routes/c") == {}
+
+    @staticmethod
+    def test_remix_context_skips_marker_outside_script_start():
+        """
+        Test that remix_context() only extracts a script starting with the marker, and not the
+        marker in strings of later scripts or in the text of the page
+
+        """
+        html = ('<html><body><script>\n  window.__remixContext = {"state": {}};</script>'
+                '<script>var a = "window.__remixContext = {}";</script>'
+                '<p>window.__remixContext = {"b": 1}</p></body></html>')
+        assert Finn.remix_context(html) == {"state": {}}
+        assert Finn.remix_context('<p>window.__remixContext = {"b": 1}</p>') == {}
+
+    @staticmethod
+    def test_remix_context_not_in_html():
+        """
+        Test that remix_context() and loader_data() are empty for pages without a remix context
+
+        """
+        assert Finn.remix_context("<html><script>var a = 1;</script></html>") == {}
+        assert Finn.loader_data(b"<html></html>", "routes/a") == {}
+
+    @staticmethod
+    def test_loads_repairs_malformed_json():
+        """
+        Test that loads() parses valid JSON strictly and only repairs malformed JSON
+
+        """
+        assert Finn.loads('{"a": [1, 2.5, null]}') == {"a": [1, 2.5, None]}
+        assert Finn.loads('{"a": [1,\n 2,],}') == {"a": [1, 2]}
+        assert Finn.remix_context("<script>window.__remixContext = {'state': {},}\n"
+                                  "</script>") == {"state": {}}
@@ -78,10 +78,10 @@ class TestFinnAd:
         assert self.finn_ad.ad_response().status_code == 200
 
     @staticmethod
-    @mocker.patch("requests.get", mocker.MagicMock(side_effect=ConnectTimeout))
+    @mocker.patch("requests.Session.get", mocker.MagicMock(side_effect=ConnectTimeout))
     def test_response_throws_tracking_error_for_time_out():
         """
-        Test that response method throws TrackingError if requests.get throws ConnectTimeOut
+        Test that response method throws TrackingError if requests.Session.get throws ConnectTimeOut
 
         """
         with pt.raises(TrackingError):
@@ -89,10 +89,10 @@ class TestFinnAd:
             finn_ad.ad_response()
 
     @staticmethod
-    @mocker.patch("requests.get", mocker.MagicMock(side_effect=ConnectError))
+    @mocker.patch("requests.Session.get", mocker.MagicMock(side_effect=ConnectError))
     def test_response_throws_tracking_error_for_no_connection():
         """
-        Test that response method throws TrackingError if requests.get throws ConnectError
+        Test that response method throws TrackingError if requests.Session.get throws ConnectError
 
         """
         with pt.raises(TrackingError):
@@ -79,10 +79,10 @@ class TestFinnOwnership:
         assert self.finn_ownership.ownership_response().status_code == 200
 
     @staticmethod
-    @mock.patch("requests.get", mock.MagicMock(side_effect=ConnectTimeout))
+    @mock.patch("requests.Session.get", mock.MagicMock(side_effect=ConnectTimeout))
     def test_response_throws_tracking_error_for_time_out():
         """
-        Test that response method throws TrackingError if requests.get throws ConnectTimeout
+        Test that response method throws TrackingError if requests.Session.get throws ConnectTimeout
 
         """
         with pt.raises(TrackingError):
@@ -90,10 +90,10 @@ class TestFinnOwnership:
             finn_ownership.ownership_response()
 
     @staticmethod
-    @mock.patch("requests.get", mock.MagicMock(side_effect=ConnectError))
+    @mock.patch("requests.Session.get", mock.MagicMock(side_effect=ConnectError))
     def test_response_throws_tracking_error_no_connection():
         """
-        Test that response method throws TrackingError if requests.get throws ConnectError
+        Test that response method throws TrackingError if requests.Session.get throws ConnectError
 
         """
         with pt.raises(TrackingError):
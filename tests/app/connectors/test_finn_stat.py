@@ -11,6 +11,7 @@ __email__ = 'samir.adrik@gmail.com'
 import json
 import shutil
 import os
+import threading
 
 from uuid import UUID
 
@@ -21,7 +22,7 @@ from aiohttp.client_exceptions import ClientConnectionError
 import pytest as pt
 import mock
 
-from source.app import FinnStat, Connector
+from source.app import FinnStat, Connector, SessionRegistry
 from source.util import TimeOutError, TrackingError, NoConnectionError
 
 
@@ -38,6 +39,18 @@ class TestFinnStat:
         """
         self.finn_stat = FinnStat("144857770")
 
+    @pt.fixture(autouse=True)
+    def no_response_cache(self, monkeypatch):
+        """
+        Fixture making the tests send their requests, instead of being served from the shared
+        response cache
+
+        """
+        monkeypatch.setattr(SessionRegistry, "cache_enabled", False)
+        SessionRegistry.close()
+        yield
+        SessionRegistry.close()
+
     def test_finn_stat_is_instance_of_connector(self):
         """
         Test that FinnStat object is instance and subclass of connector
@@ -83,6 +96,22 @@ class TestFinnStat:
         """
         assert asyncio.run(self.finn_stat.stat_response())
 
+    def test_stat_response_reads_cache_off_the_event_loop(self, monkeypatch):
+        """
+        Test that the response cache is read outside the thread of the shared event loop, so
+        the disk I/O does not block the other requests on the loop
+
+        """
+        threads = []
+
+        def cached_content(url):
+            threads.append(threading.current_thread().name)
+            return url.encode(), {}
+
+        monkeypatch.setattr(SessionRegistry, "cached_content", cached_content)
+        assert SessionRegistry.run(self.finn_stat.stat_response()).endswith(b"144857770")
+        assert threads and "stressa-http" not in threads
+
     @staticmethod
     @mock.patch("aiohttp.ClientSession.get", mock.MagicMock(side_effect=TError))
     def test_response_throws_time_out_error_for_time_out_error():
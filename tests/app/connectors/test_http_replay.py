@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the HttpRecorder and ReplayServer of connector responses
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+from time import monotonic
+
+import pytest as pt
+import requests
+
+from source.app import HttpRecorder, ReplayServer, SessionRegistry, Posten, POSTEN_URL, \
+    SSB_URL
+
+POSTAL_CODE = b'{"postal_codes": [{"postal_code": "0010", "city": "OSLO"}]}'
+
+
+class TestHttpRecorder:
+    """
+    Test cases for the HttpRecorder
+
+    """
+
+    @pt.fixture(autouse=True)
+    def recorder(self, tmp_path):
+        """
+        recorder in a temporary directory
+
+        """
+        self.directory = str(tmp_path)
+        self.recorder = HttpRecorder(self.directory)
+
+    @staticmethod
+    @pt.mark.parametrize("invalid_directory", [None, 1, []])
+    def test_http_recorder_only_accepts_str_directory(invalid_directory):
+        """
+        Test that HttpRecorder raises TypeError for a directory that is not str
+
+        """
+        with pt.raises(TypeError):
+            HttpRecorder(invalid_directory)
+
+    @staticmethod
+    def test_key_of_method_url_and_payload():
+        """
+        Test that requests are keyed by method, url and payload
+
+        """
+        key = HttpRecorder.key("POST", SSB_URL, b'{"query": []}')
+        assert key == HttpRecorder.key("post", SSB_URL, '{"query": []}')
+        assert key != HttpRecorder.key("POST", SSB_URL, b'{"query": [1]}')
+        assert key != HttpRecorder.key("GET", SSB_URL, b'{"query": []}')
+        assert HttpRecorder.key("GET", POSTEN_URL) == HttpRecorder.key("GET", POSTEN_URL, b"")
+
+    def test_recordings_are_persisted(self):
+        """
+        Test that recorded responses, without transfer headers, are looked up by another
+        recorder
+
+        """
+        self.recorder.record("GET", POSTEN_URL + "0010", None, 200,
+                             {"Content-Type": "application/json", "Content-Encoding": "gzip"},
+                             POSTAL_CODE)
+        recorder = HttpRecorder(self.directory)
+        assert recorder.lookup("GET", POSTEN_URL + "0010") == (
+            200, {"Content-Type": "application/json"}, POSTAL_CODE)
+        assert recorder.lookup("GET", POSTEN_URL + "0011") is None
+        assert recorder.recordings() == [("GET", POSTEN_URL + "0010")]
+
+    def test_session_responses_are_recorded_with_hook(self):
+        """
+        Test that the response hook records the responses of a session
+
+        """
+        with ReplayServer(self.directory) as server:
+            HttpRecorder(self.directory).record("GET", "https://example.com/a", None, 200, {},
+                                                b"a")
+            session = requests.Session()
+            recorder = HttpRecorder(os.path.join(self.directory, "recorded"))
+            session.hooks["response"].append(recorder.hook)
+            session.get(server.url + "/example.com/a")
+        status, _, content = recorder.lookup("GET", server.url + "/example.com/a")
+        assert (status, content) == (200, b"a")
+
+
+class TestReplayServer:
+    """
+    Test cases for the ReplayServer
+
+    """
+
+    @pt.fixture(autouse=True)
+    def server(self, tmp_path):
+        """
+        replay server of recordings in a temporary directory
+
+        """
+        self.recorder = HttpRecorder(str(tmp_path))
+        self.recorder.record("GET", "https://adressesok.posten.no/api/v1/postal_codes.json"
+                                    "?postal_code=0010", None, 200,
+                             {"Content-Type": "application/json"}, POSTAL_CODE)
+        self.recorder.record("POST", "https://data.ssb.no/api/v0/no/table/10748",
+                             b'{"query": []}', 200, {}, b"ssb")
+        self.server = ReplayServer(str(tmp_path))
+        self.server.start()
+        yield
+        self.server.stop()
+
+    @staticmethod
+    @pt.mark.parametrize("latency,jitter", [(-1, 0), (0, -1)])
+    def test_replay_server_latency_must_be_non_negative(tmp_path, latency, jitter):
+        """
+        Test that ReplayServer raises ValueError for negative latency or jitter
+
+        """
+        with pt.raises(ValueError):
+            ReplayServer(str(tmp_path), latency, jitter)
+
+    def test_recorded_responses_are_replayed(self):
+        """
+        Test that recorded responses are replayed by method, url and payload, and requests
+        without recording get 404
+
+        """
+        response = requests.get(self.server.url + "/adressesok.posten.no/api/v1/"
+                                                  "postal_codes.json?postal_code=0010")
+        assert response.status_code == 200
+        assert response.json()["postal_codes"][0]["city"] == "OSLO"
+        assert requests.post(self.server.url + "/data.ssb.no/api/v0/no/table/10748",
+                             data=b'{"query": []}').content == b"ssb"
+        assert requests.post(self.server.url + "/data.ssb.no/api/v0/no/table/10748",
+                             data=b'{"query": [1]}').status_code == 404
+        assert self.server.metrics() == {"hits": 2, "misses": 1}
+
+    def test_latency_and_jitter(self):
+        """
+        Test that responses are delayed with the latency, varied within the jitter
+
+        """
+        self.server.latency, self.server.jitter = 0.1, 0.05
+        assert all(0.05 <= self.server.delay() <= 0.15 for _ in range(100))
+        start = monotonic()
+        requests.get(self.server.url + "/adressesok.posten.no/api/v1/postal_codes.json"
+                                       "?postal_code=0010")
+        assert monotonic() - start >= 0.05
+
+    def test_connector_is_pointed_at_server(self, monkeypatch):
+        """
+        Test that a connector requesting a url with the origin of the server gets the
+        recorded response
+
+        """
+        monkeypatch.setattr("source.app.connectors.posten.POSTEN_URL",
+                            self.server.url + "/adressesok.posten.no/api/v1/"
+                                              "postal_codes.json?postal_code=")
+        monkeypatch.setattr(SessionRegistry, "cache_enabled", False)
+        assert Posten("0010").response().json()["postal_codes"][0]["postal_code"] == "0010"
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the LocalTax engine
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import pytest as pt
+
+from source.app import LocalTax, Skatteetaten
+from source.app.connectors.tax_rates import TAX_RATES
+from source.app.processing.engine.skatteetaten_tax_info_connector import \
+    SkatteetatenTaxInfoConnector
+from source.domain import Money
+from source.util import Assertor
+
+
+class TestLocalTax:
+    """
+    Test cases for the LocalTax engine
+
+    """
+
+    def setup_method(self):
+        """
+        Executed before all tests
+
+        """
+        self.local_tax = LocalTax(age=30, income=500000, tax_year=2022)
+
+    @staticmethod
+    @pt.mark.parametrize("invalid_age", [30.0, None, [], ()])
+    def test_local_tax_only_accepts_same_types_as_skatteetaten(invalid_age):
+        """
+        Test that LocalTax raises TypeError for invalid arguments, just as Skatteetaten
+
+        """
+        with pt.raises(TypeError):
+            LocalTax(age=invalid_age, income=500000, tax_year=2022)
+
+    @staticmethod
+    @pt.mark.parametrize("tax_engine", [LocalTax, Skatteetaten])
+    def test_tax_engines_check_types_at_boundary_level(tax_engine):
+        """
+        Test that LocalTax and Skatteetaten check the types of their input with the 'boundary'
+        validation level, as they take the input of the app
+
+        """
+        with Assertor.validation('boundary'), pt.raises(TypeError):
+            tax_engine(age=30.0, income=500000, tax_year=2022)
+
+    @staticmethod
+    def test_local_tax_raises_value_error_for_unknown_tax_year():
+        """
+        Test that LocalTax raises ValueError for tax years without rate tables
+
+        """
+        with pt.raises(ValueError):
+            LocalTax(age=30, income=500000, tax_year=2017)
+
+    @staticmethod
+    def test_rate_tables_cover_the_tax_years_of_skatteetaten():
+        """
+        Test that there are rate tables for every tax year of Skatteetaten
+
+        """
+        assert tuple(TAX_RATES) == tuple(Skatteetaten.tax_version_mapping)[::-1]
+        assert LocalTax.tax_years == tuple(TAX_RATES)
+
+    def test_tax_information_of_wage_income(self):
+        """
+        Test the taxes of a wage income of 500 000 kr in 2022
+
+        """
+        tax_information = self.local_tax.tax_information()
+        assert tax_information["minstefradragIInntekt"] == "109 950 kr"
+        assert tax_information["nettoinntekt"] == "390 050 kr"
+        assert tax_information["trinnskatt"] == {"grunnlag": "500 000 kr",
+                                                 "beloep": "10 602 kr"}
+        assert tax_information["trygdeavgiftAvLoennsinntekt"]["beloep"] == "40 000 kr"
+        assert tax_information["fellesskatt"]["grunnlag"] == "331 800 kr"
+        assert tax_information["beregnetSkatt"] == {"grunnlag": "", "beloep": "123 598 kr"}
+        assert tax_information["samletLoennsinntektMedTrygdeavgiftspliktOgMedTrekkplikt"] == \
+               "500 000 kr"
+        amounts = LocalTax.calculate("2022", 30, 500000)
+        assert abs(amounts["inntektsskattTilKommune"][1] +
+                   amounts["inntektsskattTilFylkeskommune"][1] -
+                   amounts["inntektsskattTilKommuneOgFylkeskommune"][1]) <= 1
+
+    def test_tax_information_uses_money_format(self):
+        """
+        Test that the amounts of the tax information are formatted as Money values
+
+        """
+        for value in LocalTax(age=30, income=-10000, tax_year=2022).tax_information().values():
+            for amount in value.values() if isinstance(value, dict) else [value]:
+                if amount.endswith("kr"):
+                    assert amount == Money(amount).value()
+
+    @staticmethod
+    def test_tax_information_keys_are_mapped_by_tax_info_connector():
+        """
+        Test that LocalTax calculates every amount mapped by SkatteetatenTaxInfoConnector
+
+        """
+        mapping = SkatteetatenTaxInfoConnector._tax_value_mapping  # pylint: disable=W0212
+        assert set(LocalTax(age=30, income=500000, tax_year=2023).tax_information()) == \
+               set(mapping)
+
+    @staticmethod
+    @pt.mark.parametrize("wage_income,minstefradrag", [(0, 0), (3000, 3000), (8000, 4000),
+                                                       (100001, 46010), (10 ** 6, 109950)])
+    def test_minstefradrag(wage_income, minstefradrag):
+        """
+        Test that minstefradrag is rounded up to 10 kr and within its minimum and maximum
+
+        """
+        assert LocalTax.calculate("2022", 30, wage_income)["minstefradragIInntekt"] == \
+               minstefradrag
+
+    @staticmethod
+    @pt.mark.parametrize("age,social_security", [(16, 25500), (30, 40000), (70, 25500)])
+    def test_social_security_is_lower_for_young_and_old(age, social_security):
+        """
+        Test that trygdeavgift has the low rate below 17 and above 69 years
+
+        """
+        assert LocalTax.calculate("2022", age, 500000)["sumTrygdeavgift"][1] == \
+               social_security
+
+    @staticmethod
+    def test_social_security_is_phased_in_above_lower_limit():
+        """
+        Test that trygdeavgift is at most 25 % of the wage income above the lower limit
+
+        """
+        assert LocalTax.calculate("2022", 30, 64650)["sumTrygdeavgift"][1] == 0
+        assert LocalTax.calculate("2022", 30, 70000)["sumTrygdeavgift"][1] == 1338
+
+    @staticmethod
+    def test_wealth_tax():
+        """
+        Test formuesskatt to municipality and state above bunnfradrag in 2023
+
+        """
+        calculation = LocalTax.calculate("2023", 40, 0, value_of_real_estate=1000000,
+                                         bank_deposit=2700000, debt=500000)
+        assert calculation["nettoformue"] == 3200000
+        assert calculation["formuesskattTilKommune"] == (3200000, 10500)
+        assert calculation["formuesskattTilStat"] == (3200000, 4500)
+
+    @staticmethod
+    def test_bsu_credit_only_below_max_age_and_not_in_2023():
+        """
+        Test that BSU gives a 20 % tax credit of at most the yearly maximum, up to 33 years
+        and not in 2023, where the Skatteetaten payload leaves it out
+
+        """
+        assert LocalTax.calculate("2021", 25, 500000, bsu=30000)["sumSkattefradrag"][1] == 5000
+        assert LocalTax.calculate("2021", 34, 500000, bsu=30000)["sumSkattefradrag"][1] == 0
+        assert LocalTax.calculate("2023", 25, 500000, bsu=30000)["sumSkattefradrag"][1] == 0
+
+    @staticmethod
+    def test_beregnet_skatt_is_sum_of_taxes_less_credits():
+        """
+        Test that beregnetSkatt is the sum of all taxes less the tax credits
+
+        """
+        calculation = LocalTax.calculate("2020", 28, 650000, interest_income=1000,
+                                         interest_cost=30000, bank_deposit=2000000,
+                                         union_fee=6000, bsu=25000, rental_income=20000)
+        taxes = ["inntektsskattTilKommuneOgFylkeskommune", "fellesskatt", "trinnskatt",
+                 "sumTrygdeavgift", "formuesskattTilKommune", "formuesskattTilStat"]
+        assert calculation["beregnetSkattFoerSkattefradrag"][1] == \
+               sum(calculation[tax][1] for tax in taxes)
+        assert calculation["beregnetSkatt"][1] == \
+               calculation["beregnetSkattFoerSkattefradrag"][1] - \
+               calculation["sumSkattefradrag"][1]
+        assert calculation["fradragForFagforeningskontingent"] == 5800
+        assert calculation["sumInntekterIAlminneligInntektFoerFordelingsfradrag"] == 671000
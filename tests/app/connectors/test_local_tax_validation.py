@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the LocalTaxValidation harness
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+from decimal import Decimal
+
+import pytest as pt
+
+from source.app import LocalTax, LocalTaxValidation, Skatteetaten
+
+INPUTS = {"age": "30", "income": "500000", "tax_year": "2022", "bank_deposit": "2000000"}
+
+
+def skatteetaten_response(beregnet_skatt: int):
+    """
+    response of the Skatteetaten tax calculator in the format of tax year 2022
+
+    """
+    calculation = LocalTax.calculate("2022", 30, 500000, bank_deposit=2000000)
+    taxes = {tax: {"grunnlag": calculation[tax][0], "beloep": calculation[tax][1]} for tax in
+             ["fellesskatt", "trinnskatt", "trygdeavgiftAvLoennsinntekt",
+              "formuesskattTilStat"]}
+    return {"hovedperson": {
+        "beregnetSkattV4": {
+            "skatteklasse": "1",
+            "skatteregnskapskommune": "0301",
+            "informasjonTilSkattelister": {"nettoinntekt": calculation["nettoinntekt"],
+                                           "nettoformue": calculation["nettoformue"],
+                                           "beregnetSkatt": beregnet_skatt},
+            "beregnetSkatt": beregnet_skatt,
+            "skattOgAvgift": taxes},
+        "summertSkattegrunnlagForVisningV7": {
+            "skattegrunnlagsobjekt": [
+                {"tekniskNavn": "samletLoennsinntektMedTrygdeavgiftspliktOgMedTrekkplikt",
+                 "beloep": 500000},
+                {"tekniskNavn": "samletInnskuddIInnenlandskeBanker", "beloep": 2000000},
+                {"tekniskNavn": "minstefradragIInntekt", "beloep": 109950}]}}}
+
+
+class TestLocalTaxValidation:
+    """
+    Test cases for the LocalTaxValidation harness
+
+    """
+
+    @pt.fixture(autouse=True)
+    def recordings(self, tmp_path, monkeypatch):
+        """
+        harness with a directory of recordings, with the Skatteetaten tax calculator
+        replaced by a recorded response
+
+        """
+        beregnet_skatt = LocalTax.calculate("2022", 30, 500000, bank_deposit=2000000)[
+            "beregnetSkatt"][1]
+
+        class Response:
+            """
+            recorded response
+
+            """
+
+            @staticmethod
+            def json():
+                """
+                JSON of the recorded response
+
+                """
+                return skatteetaten_response(beregnet_skatt)
+
+        monkeypatch.setattr(Skatteetaten, "response", lambda skatteetaten: Response())
+        self.beregnet_skatt = beregnet_skatt
+        self.validation = LocalTaxValidation(str(tmp_path), tolerance=1)
+
+    @staticmethod
+    @pt.mark.parametrize("invalid_tolerance", [1.0, "1", None])
+    def test_local_tax_validation_only_accepts_int_tolerance(invalid_tolerance):
+        """
+        Test that LocalTaxValidation raises TypeError for a tolerance that is not int
+
+        """
+        with pt.raises(TypeError):
+            LocalTaxValidation("recordings", invalid_tolerance)
+
+    def test_record_writes_inputs_and_response(self):
+        """
+        Test that record() writes the inputs and the response of Skatteetaten to a JSON file
+
+        """
+        path = self.validation.record("wage_income", **INPUTS)
+        assert os.path.isfile(path)
+        assert self.validation.recordings() == {
+            "wage_income": {"inputs": INPUTS, "response": skatteetaten_response(
+                self.beregnet_skatt)}}
+
+    @staticmethod
+    def test_recordings_of_missing_directory_is_empty():
+        """
+        Test that there are no recordings if the directory does not exist
+
+        """
+        assert LocalTaxValidation(os.path.join("no", "such", "directory")).recordings() == {}
+
+    def test_amounts_flattens_taxes(self):
+        """
+        Test that amounts() parses Money values and flattens grunnlag and beloep of taxes
+
+        """
+        amounts = self.validation.amounts({"skatteklasse": "1", "nettoinntekt": "1 000 kr",
+                                           "beregnetSkatt": {"grunnlag": "",
+                                                             "beloep": "-12 345 kr"}})
+        assert amounts == {"skatteklasse": Decimal(1), "nettoinntekt": Decimal(1000),
+                           "beregnetSkatt.beloep": Decimal(-12345)}
+
+    def test_validate_accepts_matching_recording(self):
+        """
+        Test that validate() reports no differences for a recording matching LocalTax
+
+        """
+        self.validation.record("wage_income", **INPUTS)
+        assert self.validation.validate() == {"wage_income": {}}
+
+    def test_validate_reports_differences_above_tolerance(self, monkeypatch):
+        """
+        Test that validate() reports amounts differing by more than the tolerance
+
+        """
+        self.validation.record("within_tolerance", **INPUTS)
+        monkeypatch.setattr(Skatteetaten, "response", lambda skatteetaten: type(
+            "Response", (), {"json": staticmethod(
+                lambda: skatteetaten_response(self.beregnet_skatt + 100))}))
+        self.validation.record("above_tolerance", **INPUTS)
+
+        differences = self.validation.validate()
+        assert differences["within_tolerance"] == {}
+        assert differences["above_tolerance"] == {
+            "beregnetSkatt.beloep": (Decimal(self.beregnet_skatt + 100),
+                                     Decimal(self.beregnet_skatt))}
@@ -69,10 +69,11 @@ class TestPortalen:
         assert self.portalen.mortgage_offers().keys().__len__() >= 700
 
     @staticmethod
-    @mock.patch("requests.get", mock.MagicMock(side_effect=ConnectError))
+    @mock.patch("requests.Session.get", mock.MagicMock(side_effect=ConnectError))
     def test_response_throws_tracking_error_for_connection_error():
         """
-        Test that response method throws TrackingError if requests.post throws ConnectionError
+        Test that response method throws TrackingError if requests.Session.get throws
+        ConnectionError
 
         """
         portalen = Portalen()
@@ -80,10 +81,10 @@ class TestPortalen:
             portalen.portalen_response()
 
     @staticmethod
-    @mock.patch("requests.get", mock.MagicMock(side_effect=ReadTimeout))
+    @mock.patch("requests.Session.get", mock.MagicMock(side_effect=ReadTimeout))
     def test_response_throws_tracking_error_for_for_read_timeout():
         """
-        Test that response method throws TrackingError if requests.post throws ReadTimeout
+        Test that response method throws TrackingError if requests.Session.get throws ReadTimeout
 
         """
         portalen = Portalen()
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the PortalenOffers table of mortgage offers
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+from io import BytesIO
+
+import mock
+import pytest as pt
+
+from source.util import TrackingError, InvalidDataError
+from source.app import PortalenOffers, Portalen
+
+OFFERS = [("Sparebank Nord", "Boliglån", "4,10", "4,25", "0", "2000000"),
+          ("Sparebank Nord", "Boliglån Premium", "3,90", "4,02", "2000000", "8000000"),
+          ("Bank Øst", "Grønt lån", "3,95", "4,05", "100000", "5000000"),
+          ("Bank Øst", "Førstehjem", "3,60", "3,70", "500000", "3000000"),
+          ("Bank Vest", "Boliglån", "5,10", "5,30", None, None)]
+
+
+def feed(offers: list = None):
+    """
+    Atom feed with the mortgage offers in windows-1252
+
+    """
+    entries = []
+    for bank, product, nominal, effective, min_amount, max_amount in offers or OFFERS:
+        fields = [("leverandor_tekst", bank), ("produktnavn", product),
+                  ("nominell_rente_1", nominal), ("effektiv_rente_1", effective),
+                  ("min_belop", min_amount), ("maks_belop", max_amount)]
+        entries.append("<entry>" + "".join(f"<f:{name}>{value}</f:{name}>" for name, value in
+                                           fields if value is not None) + "<f:tom/></entry>")
+    return ('<?xml version="1.0" encoding="windows-1252"?>'
+            '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:f="http://finansportalen.no/feed">'
+            '<title>boliglån</title>' + "".join(entries) + "</feed>").encode("windows-1252")
+
+
+class TestPortalenOffers:
+    """
+    Test cases for the PortalenOffers table
+
+    """
+
+    def setup_method(self):
+        """
+        Executed before all tests
+
+        """
+        self.offers = PortalenOffers.parse(BytesIO(feed()))
+
+    @staticmethod
+    def test_entries_are_streamed_without_namespaces():
+        """
+        Test that entries() yields the non-empty fields of every entry without namespaces
+
+        """
+        entries = list(PortalenOffers.entries(BytesIO(feed())))
+        assert len(entries) == len(OFFERS)
+        assert entries[2] == {"leverandor_tekst": "Bank Øst", "produktnavn": "Grønt lån",
+                              "nominell_rente_1": "3,95", "effektiv_rente_1": "4,05",
+                              "min_belop": "100000", "maks_belop": "5000000"}
+
+    @staticmethod
+    @pt.mark.parametrize("text,number", [("3,45", 3.45), ("1 000 000", 1000000.0),
+                                         ("4.1 %", 4.1), ("", None), (None, None),
+                                         ("n/a", None)])
+    def test_number(text, number):
+        """
+        Test that numbers of the feed are parsed, and invalid numbers are None
+
+        """
+        assert PortalenOffers.number(text) == number
+
+    @staticmethod
+    @pt.mark.parametrize("invalid_band_width", [0, -0.5, "0.5"])
+    def test_invalid_band_width(invalid_band_width):
+        """
+        Test that PortalenOffers raises for a band_width that is not a positive number
+
+        """
+        with pt.raises((TypeError, ValueError)):
+            PortalenOffers([], invalid_band_width)
+
+    @staticmethod
+    def test_missing_required_field_raises_invalid_data_error():
+        """
+        Test that PortalenOffers raises InvalidDataError if a required field is missing in
+        every entry, but not for an empty feed or a field missing in some entries
+
+        """
+        with pt.raises(InvalidDataError, match="effektiv_rente_1"):
+            PortalenOffers.parse(BytesIO(feed([offer[:3] + (None,) + offer[4:] for offer in
+                                               OFFERS])))
+        with pt.raises(InvalidDataError, match="leverandor_tekst"):
+            PortalenOffers([{"effektiv_rente_1": "4,1"}])
+        assert len(PortalenOffers([])) == 0
+        assert len(PortalenOffers.parse(BytesIO(feed(OFFERS + [
+            ("Bank Nord", "Boliglån", "4,00", None, None, None)])))) == len(OFFERS) + 1
+
+    def test_columns(self):
+        """
+        Test that the table has a column per field with parsed numbers
+
+        """
+        assert len(self.offers) == len(OFFERS)
+        assert self.offers.columns["bank"] == [offer[0] for offer in OFFERS]
+        assert self.offers.row(3) == {"bank": "Bank Øst", "product": "Førstehjem",
+                                      "nominal_rate": 3.6, "effective_rate": 3.7,
+                                      "min_amount": 500000.0, "max_amount": 3000000.0}
+
+    def test_cheapest_offers_for_loan_amount(self):
+        """
+        Test that cheapest() returns the offers available for the loan amount by effective rate
+
+        """
+        assert [offer["product"] for offer in self.offers.cheapest(2500000)] == \
+               ["Førstehjem", "Boliglån Premium", "Grønt lån", "Boliglån"]
+        assert [offer["product"] for offer in self.offers.cheapest(50000, 1)] == ["Boliglån"]
+        assert [offer["product"] for offer in self.offers.cheapest(4000000, bank="Bank Øst")] \
+               == ["Grønt lån"]
+        assert self.offers.cheapest(4000000, bank="Ukjent bank") == []
+
+    def test_bank_and_rate_band_indexes(self):
+        """
+        Test that offers are indexed by bank and rate band in order of effective rate
+
+        """
+        assert self.offers.banks() == ["Bank Vest", "Bank Øst", "Sparebank Nord"]
+        assert [offer["product"] for offer in self.offers.bank("Sparebank Nord")] == \
+               ["Boliglån Premium", "Boliglån"]
+        assert sorted(self.offers.by_band) == [3.5, 4.0, 5.0]
+        assert [offer["product"] for offer in self.offers.rate_band(4.0, 4.5)] == \
+               ["Boliglån Premium", "Grønt lån", "Boliglån"]
+
+
+class TestPortalenOffersCache:
+    """
+    Test cases for the cached table of offers in the Portalen connector
+
+    """
+
+    @pt.fixture(autouse=True)
+    def clear_offers(self):
+        """
+        clear the cached table of offers before and after every test
+
+        """
+        Portalen.clear_offers()
+        yield
+        Portalen.clear_offers()
+
+    @staticmethod
+    def test_offers_are_parsed_once():
+        """
+        Test that offers() parses the feed once, and shares the table between instances
+
+        """
+        response = mock.MagicMock(content=feed())
+        with mock.patch.object(Portalen, "portalen_response",
+                               return_value=response) as portalen_response:
+            offers = Portalen().offers()
+            assert len(offers) == len(OFFERS)
+            assert Portalen().offers() is offers
+            assert portalen_response.call_count == 1
+
+    @staticmethod
+    def test_offers_are_parsed_again_when_expired():
+        """
+        Test that offers() parses the feed again after PORTALEN_OFFERS_TTL
+
+        """
+        response = mock.MagicMock(content=feed())
+        with mock.patch.object(Portalen, "portalen_response",
+                               return_value=response) as portalen_response:
+            Portalen().offers()
+            with mock.patch("source.app.connectors.portalen.PORTALEN_OFFERS_TTL", -1):
+                response.content = feed(OFFERS[:2])
+                assert len(Portalen().offers()) == 2
+            assert portalen_response.call_count == 2
+
+    @staticmethod
+    def test_mortgage_offers_are_keyed_by_count():
+        """
+        Test that mortgage_offers() keeps the dict of fields by entry count
+
+        """
+        response = mock.MagicMock(content=feed())
+        with mock.patch.object(Portalen, "portalen_response", return_value=response):
+            offers = Portalen().mortgage_offers()
+        assert list(offers) == [1, 2, 3, 4, 5]
+        assert offers[1]["leverandor_tekst"] == "Sparebank Nord"
+
+    @staticmethod
+    def test_offers_raises_for_none_response():
+        """
+        Test that offers() raises TrackingError if the response is None
+
+        """
+        with mock.patch.object(Portalen, "portalen_response", return_value=None):
+            with pt.raises(TrackingError):
+                Portalen().offers()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the PostalCodeRegistry of Norwegian postal codes
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+
+import mock
+import pytest as pt
+
+from source.app import PostalCodeRegistry, Connector
+
+ENTRIES = [{"postnr": "0010", "poststed": "OSLO", "kommune": "OSLO", "fylke": "OSLO"},
+           {"postnr": "0150", "poststed": "OSLO", "kommune": "OSLO", "fylke": "OSLO"},
+           {"postnr": "5003", "poststed": "BERGEN", "kommune": "BERGEN", "fylke": "VESTLAND"},
+           {"postnr": "7010", "poststed": "TRONDHEIM", "kommune": "TRONDHEIM",
+            "fylke": "TRØNDELAG"},
+           {"postnr": "9008", "poststed": "TROMSØ", "kommune": "TROMSØ",
+            "fylke": "TROMS OG FINNMARK"}]
+
+
+def posten_response(entries: list):
+    """
+    posten.no response with the postal codes of entries
+
+    """
+    response = mock.MagicMock()
+    response.json.return_value = {"postal_codes": [
+        {"postal_code": entry["postnr"], "city": entry["poststed"],
+         "primary_county": entry["kommune"], "primary_municipality": entry["fylke"]} for entry
+        in entries]}
+    return response
+
+
+class TestPostalCodeRegistry:
+    """
+    Test cases for the PostalCodeRegistry
+
+    """
+
+    @pt.fixture(autouse=True)
+    def registry(self, tmp_path):
+        """
+        registry in a temporary directory
+
+        """
+        self.path = os.path.join(str(tmp_path), "postal_codes.tsv")
+        self.registry = PostalCodeRegistry(self.path)
+        self.registry.add(ENTRIES)
+
+    @staticmethod
+    @pt.mark.parametrize("invalid_path", [1, 1.0, True, []])
+    def test_registry_only_accepts_str_path(invalid_path):
+        """
+        Test that PostalCodeRegistry raises TypeError for a path that is not str or None
+
+        """
+        with pt.raises(TypeError):
+            PostalCodeRegistry(invalid_path)
+
+    def test_get(self):
+        """
+        Test exact lookup of postal codes in the registry
+
+        """
+        assert len(self.registry) == len(ENTRIES)
+        assert self.registry.get("5003") == ENTRIES[2]
+        assert self.registry.get("5004") is None
+
+    def test_complete_by_postal_code_and_poststed(self):
+        """
+        Test prefix autocomplete by postal code, or by poststed for non-numeric prefixes
+
+        """
+        assert [entry["postnr"] for entry in self.registry.complete("0")] == ["0010", "0150"]
+        assert [entry["postnr"] for entry in self.registry.complete("0", 1)] == ["0010"]
+        assert [entry["postnr"] for entry in self.registry.complete("tr")] == ["9008", "7010"]
+        assert [entry["postnr"] for entry in self.registry.complete("Tromsø")] == ["9008"]
+        assert self.registry.complete("6") == []
+
+    def test_registry_is_persisted(self):
+        """
+        Test that added postal codes are loaded by another registry, later entries replacing
+        earlier ones
+
+        """
+        self.registry.add([dict(ENTRIES[0], poststed="OSLO SENTRUM")])
+        registry = PostalCodeRegistry(self.path)
+        assert len(registry) == len(ENTRIES)
+        assert registry.get("0010")["poststed"] == "OSLO SENTRUM"
+
+    def test_invalid_postal_codes_are_not_added(self):
+        """
+        Test that postal codes that are not four digits are left out
+
+        """
+        self.registry.add([dict(ENTRIES[0], postnr="001"), dict(ENTRIES[0], postnr="abcd")])
+        assert len(self.registry) == len(ENTRIES)
+
+    def test_refresh_requests_every_prefix(self):
+        """
+        Test that refresh() stores the postal codes of every prefix, and rewrites the file
+
+        """
+        registry = PostalCodeRegistry(self.path)
+        session = mock.MagicMock()
+        session.get.side_effect = [posten_response(ENTRIES[:2]),
+                                   posten_response([dict(ENTRIES[2], poststed="BERGEN SENTRUM")])]
+        with mock.patch.object(Connector, "session", return_value=session):
+            assert registry.refresh(["0", "5"]) == 3
+        assert session.get.call_count == 2
+        with open(self.path, encoding="utf-8") as registry_file:
+            assert len(registry_file.readlines()) == len(ENTRIES)
+        assert PostalCodeRegistry(self.path).get("5003")["poststed"] == "BERGEN SENTRUM"
@@ -18,7 +18,16 @@ import pytest as pt
 from requests.exceptions import ConnectTimeout, ConnectionError as ConnectError
 
 from source.util import TrackingError
-from source.app import Posten, Connector
+from source.app import Posten, Connector, PostalCodeRegistry
+
+
+@pt.fixture(autouse=True)
+def empty_registry(monkeypatch):
+    """
+    empty postal code registry in memory, so that postal codes are requested from posten.no
+
+    """
+    monkeypatch.setattr(Posten, "registry", PostalCodeRegistry())
 
 
 class TestPosten:
@@ -98,7 +107,7 @@ class TestPosten:
                            'kommune': 'OSLO', 'fylke': 'OSLO'}
         assert self.posten.postal_code_info() == correct_content
 
-    @mock.patch("requests.get", mock.MagicMock(side_effect=ConnectTimeout))
+    @mock.patch("requests.Session.get", mock.MagicMock(side_effect=ConnectTimeout))
     def test_response_throws_tracking_error_for_read_timeout(self):
         """
         Test that response method throws TrackingError if ConnectTimeout
@@ -107,7 +116,7 @@ class TestPosten:
         with pt.raises(TrackingError):
             self.posten.response()
 
-    @mock.patch("requests.get", mock.MagicMock(side_effect=ConnectError))
+    @mock.patch("requests.Session.get", mock.MagicMock(side_effect=ConnectError))
     def test_response_throws_tracking_error_for_no_connection_error(self):
         """
         Test that response method throws TrackingError if ConnectError
@@ -126,6 +135,22 @@ class TestPosten:
         with pt.raises(TrackingError):
             self.posten.postal_code_info()
 
+    def test_postal_code_info_is_looked_up_in_registry_first(self):
+        """
+        Test that postal_code_info() only requests postal codes missing from the registry, and
+        adds them to the registry
+
+        """
+        response = mock.MagicMock()
+        response.json.return_value = {"postal_codes": [
+            {"postal_code": "0010", "city": "OSLO", "primary_county": "OSLO",
+             "primary_municipality": "OSLO"}]}
+        with mock.patch.object(Posten, "response", return_value=response) as posten_response:
+            assert self.posten.postal_code_info()["poststed"] == "OSLO"
+            assert Posten("0010").postal_code_info() == {'postnr': '0010', 'poststed': 'OSLO',
+                                                         'kommune': 'OSLO', 'fylke': 'OSLO'}
+            assert posten_response.call_count == 1
+
     @mock.patch("source.app.connectors.posten.Posten.postal_code_info",
                 mock.MagicMock(return_value=""))
     def test_to_json(self):
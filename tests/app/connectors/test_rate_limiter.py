@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the RateLimiter class
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import asyncio
+from time import monotonic
+
+import pytest as pt
+
+from source.app import RateLimiter, SessionRegistry, FINN_AD_URL, FINN_OWNER_URL, SSB_URL
+
+
+class TestRateLimiter:
+    """
+    Test cases for the RateLimiter class
+
+    """
+
+    def setup_method(self):
+        """
+        Executed before all tests
+
+        """
+        self.rate_limiter = RateLimiter(100)
+
+    @staticmethod
+    @pt.mark.parametrize("invalid_rate", ["1", None, [], {}])
+    def test_rate_limiter_only_accepts_numbers(invalid_rate):
+        """
+        Test that RateLimiter only accepts int or float for rate
+
+        """
+        with pt.raises(TypeError):
+            RateLimiter(invalid_rate)
+
+    @staticmethod
+    def test_rate_limiter_rate_must_be_non_negative():
+        """
+        Test that RateLimiter raises ValueError for negative rates
+
+        """
+        with pt.raises(ValueError):
+            RateLimiter(-1)
+
+    def test_requests_to_same_host_are_spread_out(self):
+        """
+        Test that requests to the same host are spread out, while requests to other hosts do
+        not wait
+
+        """
+        delays = [self.rate_limiter.delay(FINN_AD_URL) for _ in range(3)]
+        assert delays[0] == 0
+        assert delays[1] == pt.approx(0.01, abs=0.005)
+        assert delays[2] == pt.approx(0.02, abs=0.005)
+        assert self.rate_limiter.delay(FINN_OWNER_URL) == pt.approx(0.03, abs=0.005)
+        assert self.rate_limiter.delay(SSB_URL) == 0
+
+    def test_wait_and_wait_async_keep_the_rate(self):
+        """
+        Test that wait() and wait_async() wait until the request is within the rate limit
+
+        """
+        start = monotonic()
+        for _ in range(3):
+            self.rate_limiter.wait(FINN_AD_URL)
+        asyncio.run(self.rate_limiter.wait_async(FINN_AD_URL))
+        assert monotonic() - start >= 0.029
+
+    def test_limited_changes_rate_temporarily(self):
+        """
+        Test that limited() changes the rate only while in the context, and that a rate of 0
+        disables the limiter
+
+        """
+        with self.rate_limiter.limited(0):
+            assert self.rate_limiter.rate == 0
+            assert [self.rate_limiter.delay(SSB_URL) for _ in range(3)] == [0.0] * 3
+        assert self.rate_limiter.rate == 100
+        assert isinstance(SessionRegistry.rate_limiter, RateLimiter)
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the CircuitBreaker and ResilientAdapter of connectors
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+from io import BytesIO
+from urllib.parse import urlsplit
+
+import mock
+import pytest as pt
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as ConnectError
+
+from source.app import CircuitBreaker, CircuitOpenError, LatencyBudgetError, ResilientAdapter, \
+    RateLimiter, ProcessContext, SessionRegistry, FINN_AD_URL, SSB_URL, TIMEOUT
+from source.util import METRICS
+
+
+def response(status_code: int):
+    """
+    response with a status code
+
+    """
+    http_response = requests.Response()
+    http_response.status_code = status_code
+    http_response.raw = BytesIO(b"")
+    return http_response
+
+
+class TestCircuitBreaker:
+    """
+    Test cases for the CircuitBreaker
+
+    """
+
+    @staticmethod
+    @pt.mark.parametrize("failures,reset_timeout", [("5", 30), (5, None), (5.0, 30)])
+    def test_circuit_breaker_only_accepts_numbers(failures, reset_timeout):
+        """
+        Test that CircuitBreaker raises TypeError for arguments of wrong type
+
+        """
+        with pt.raises(TypeError):
+            CircuitBreaker(failures, reset_timeout)
+
+    @staticmethod
+    def test_circuit_breaker_arguments_must_be_non_negative():
+        """
+        Test that CircuitBreaker raises ValueError for negative arguments
+
+        """
+        with pt.raises(ValueError):
+            CircuitBreaker(-1, 30)
+
+    @staticmethod
+    def test_circuit_opens_after_failures_and_closes_after_trial():
+        """
+        Test that the circuit of a host opens after consecutive failures, lets one trial
+        request through after reset_timeout, and closes when it succeeds
+
+        """
+        breaker = CircuitBreaker(2, 30)
+        with mock.patch("source.app.connectors.resilience.monotonic", return_value=100):
+            breaker.failure(FINN_AD_URL)
+            assert breaker.allow(FINN_AD_URL)
+            breaker.failure(FINN_AD_URL)
+            assert breaker.state(FINN_AD_URL) == "open"
+            assert not breaker.allow(FINN_AD_URL)
+            assert breaker.allow(SSB_URL)
+        with mock.patch("source.app.connectors.resilience.monotonic", return_value=131):
+            assert breaker.allow(FINN_AD_URL)
+            assert not breaker.allow(FINN_AD_URL)
+            assert breaker.metrics() == {"finn.no": ("half-open", 2)}
+            breaker.success(FINN_AD_URL)
+        assert breaker.state(FINN_AD_URL) == "closed"
+
+    @staticmethod
+    def test_failed_trial_opens_circuit_again():
+        """
+        Test that a failed trial request opens the circuit for another reset_timeout
+
+        """
+        breaker = CircuitBreaker(1, 30)
+        with mock.patch("source.app.connectors.resilience.monotonic", return_value=100):
+            breaker.failure(FINN_AD_URL)
+        with mock.patch("source.app.connectors.resilience.monotonic", return_value=131):
+            assert breaker.allow(FINN_AD_URL)
+            breaker.failure(FINN_AD_URL)
+            assert breaker.state(FINN_AD_URL) == "open"
+            assert not breaker.allow(FINN_AD_URL)
+
+    @staticmethod
+    def test_zero_failures_disables_breaker():
+        """
+        Test that a breaker with failures 0 never opens
+
+        """
+        breaker = CircuitBreaker(0, 30)
+        for _ in range(10):
+            breaker.failure(FINN_AD_URL)
+        assert breaker.allow(FINN_AD_URL)
+        assert breaker.state(FINN_AD_URL) == "closed"
+
+
+class TestResilientAdapter:
+    """
+    Test cases for the ResilientAdapter
+
+    """
+
+    @pt.fixture(autouse=True)
+    def session(self):
+        """
+        session with a ResilientAdapter without backoff delays
+
+        """
+        self.breaker = CircuitBreaker(3, 30)
+        self.adapter = ResilientAdapter(RateLimiter(0), self.breaker, retries=2)
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        with mock.patch.object(ResilientAdapter, "backoff", return_value=0):
+            yield
+
+    @staticmethod
+    @pt.mark.parametrize("invalid_retries", ["2", 2.0, None])
+    def test_resilient_adapter_only_accepts_int_retries(invalid_retries):
+        """
+        Test that ResilientAdapter raises TypeError for retries that is not int
+
+        """
+        with pt.raises(TypeError):
+            ResilientAdapter(RateLimiter(0), retries=invalid_retries)
+
+    @staticmethod
+    def test_backoff_is_jittered_and_bounded():
+        """
+        Test that the backoff delay is within the exponential bound
+
+        """
+        for attempt in range(10):
+            assert 0 <= ResilientAdapter.backoff(attempt) <= min(8.0, 0.5 * 2 ** attempt)
+
+    def test_idempotent_requests_are_retried(self):
+        """
+        Test that GET requests are retried after connection errors and retryable statuses,
+        and retries counted in the running process
+
+        """
+        context = ProcessContext("TestProcess")
+        with mock.patch.object(HTTPAdapter, "send", side_effect=[
+                ConnectError("no network"), response(503), response(200)]) as send:
+            with context.active():
+                assert self.session.get(FINN_AD_URL).status_code == 200
+        assert send.call_count == 3
+        assert context.http_counts == {"retries": 2, "rejected": 0}
+        assert self.breaker.state(FINN_AD_URL) == "closed"
+
+    def test_retries_are_limited(self):
+        """
+        Test that the last error is raised, or the last response returned, when retries are
+        spent
+
+        """
+        with mock.patch.object(HTTPAdapter, "send", side_effect=ConnectError("no network")):
+            with pt.raises(ConnectError):
+                self.session.get(FINN_AD_URL)
+        self.breaker.reset()
+        with mock.patch.object(HTTPAdapter, "send",
+                               side_effect=[response(503) for _ in range(3)]) as send:
+            assert self.session.get(FINN_AD_URL).status_code == 503
+        assert send.call_count == 3
+
+    def test_requests_are_recorded_in_metrics(self):
+        """
+        Test that the latency and outcome of every sent request, and the state of the circuit,
+        are recorded in the metrics registry
+
+        """
+        host = urlsplit(FINN_AD_URL).netloc
+        latency = METRICS.histogram("stressa_connector_seconds", host=host)
+        errors = METRICS.counter("stressa_connector_requests_total", host=host,
+                                 outcome="ConnectionError")
+        successes = METRICS.counter("stressa_connector_requests_total", host=host, outcome=200)
+        count, error_count, success_count = latency.snapshot()[0], errors.value, successes.value
+        with mock.patch.object(HTTPAdapter, "send", side_effect=[
+                ConnectError("no network"), response(200)]):
+            self.session.get(FINN_AD_URL)
+
+        assert latency.snapshot()[0] == count + 2
+        assert (errors.value, successes.value) == (error_count + 1, success_count + 1)
+
+        with mock.patch.object(HTTPAdapter, "send", side_effect=ConnectError("no network")):
+            with pt.raises(ConnectError):
+                self.session.get(FINN_AD_URL)
+        assert METRICS.gauge("stressa_circuit_open", host=host).value == 1
+        self.breaker.reset()
+        assert METRICS.gauge("stressa_circuit_open", host=host).value == 0
+
+    def test_post_requests_are_not_retried(self):
+        """
+        Test that requests that are not idempotent are sent once
+
+        """
+        with mock.patch.object(HTTPAdapter, "send", side_effect=ConnectError("no network")) \
+                as send:
+            with pt.raises(ConnectError):
+                self.session.post(FINN_AD_URL)
+        assert send.call_count == 1
+
+    def test_open_circuit_fails_fast(self):
+        """
+        Test that requests to a host with an open circuit are rejected without being sent
+
+        """
+        context = ProcessContext("TestProcess")
+        with mock.patch.object(HTTPAdapter, "send", side_effect=ConnectError("no network")) \
+                as send:
+            with pt.raises(ConnectError):
+                self.session.get(FINN_AD_URL)
+            assert self.breaker.state(FINN_AD_URL) == "open"
+            with context.active():
+                with pt.raises(CircuitOpenError):
+                    self.session.get(FINN_AD_URL)
+        assert send.call_count == 3
+        assert context.http_counts["rejected"] == 1
+
+    def test_trial_request_raising_other_errors_opens_circuit_again(self):
+        """
+        Test that a trial request failing with an error that is not retried, e.g. an invalid
+        header, opens the circuit again instead of leaving it half-open for good
+
+        """
+        with mock.patch("source.app.connectors.resilience.monotonic", return_value=100):
+            for _ in range(3):
+                self.breaker.failure(FINN_AD_URL)
+        with mock.patch("source.app.connectors.resilience.monotonic", return_value=131), \
+                mock.patch.object(HTTPAdapter, "send",
+                                  side_effect=requests.exceptions.InvalidHeader("header")):
+            with pt.raises(requests.exceptions.InvalidHeader):
+                self.session.get(FINN_AD_URL)
+            assert self.breaker.state(FINN_AD_URL) == "open"
+        with mock.patch("source.app.connectors.resilience.monotonic", return_value=162):
+            assert self.breaker.allow(FINN_AD_URL)
+
+    def test_timeout_of_endpoint_and_latency_budget(self):
+        """
+        Test that requests get the timeout of their endpoint, capped by the latency budget,
+        and are rejected when the budget is spent
+
+        """
+        request = requests.Request("GET", FINN_AD_URL + "1").prepare()
+        assert self.adapter.timeout(request, (TIMEOUT, TIMEOUT)) == (5, 5)
+        assert self.adapter.timeout(requests.Request("GET", "https://example.com").prepare(),
+                                    (TIMEOUT, TIMEOUT)) == (TIMEOUT, TIMEOUT)
+
+        context = ProcessContext("TestProcess", 2)
+        connect, read = self.adapter.timeout(request, (TIMEOUT, TIMEOUT), context)
+        assert 1 < connect <= 2 and 1 < read <= 2
+
+        context.deadline -= 2
+        with pt.raises(LatencyBudgetError):
+            self.adapter.timeout(request, (TIMEOUT, TIMEOUT), context)
+        assert context.http_counts["rejected"] == 1
+
+    @staticmethod
+    def test_retries_and_open_circuits_are_profiled(monkeypatch):
+        """
+        Test that retries, rejected requests and open circuits are added to the profiling
+
+        """
+        breaker = CircuitBreaker(1, 30)
+        breaker.failure(FINN_AD_URL)
+        monkeypatch.setattr(SessionRegistry, "circuit_breaker", breaker)
+        context = ProcessContext("TestProcess")
+        context.add_http_count("retries")
+        context.end()
+        profiling = str(context.profiling)
+        assert "http retries / rejected" in profiling
+        assert "circuit 'finn.no'" in profiling and "open (1 failures)" in profiling
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the disk-backed HTTP response cache
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from time import sleep
+
+import mock
+import pytest as pt
+import requests
+
+from source.app import BoundedFileCache, CachingAdapter, RateLimiter, SessionRegistry, \
+    FINN_AD_URL, FINN_STAT_URL, SSB_URL
+
+
+class EndpointHandler(BaseHTTPRequestHandler):
+    """
+    Handler of a local endpoint answering with an ETag and 'no-store', and with 304 Not
+    Modified to conditional requests
+
+    """
+    requests = []
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        answer a GET request
+
+        """
+        self.requests.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+            return
+        body = b"content"
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """
+        no logging of requests
+
+        """
+
+
+class TestResponseCache:
+    """
+    Test cases for BoundedFileCache and CachingAdapter
+
+    """
+
+    def setup_method(self):
+        """
+        Executed before all tests
+
+        """
+        EndpointHandler.requests = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), EndpointHandler)
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/endpoint?code=1"
+
+    def teardown_method(self):
+        """
+        Executed after all tests
+
+        """
+        self.server.shutdown()
+        self.server.server_close()
+
+    def session(self, cache, ttl, stale_while_revalidate=0):
+        """
+        session with a caching adapter mounted for the local endpoint
+
+        """
+        session = requests.Session()
+        adapter = CachingAdapter(RateLimiter(0), cache, ttl, stale_while_revalidate)
+        session.mount(self.url.split("/endpoint")[0], adapter)
+        return session, adapter
+
+    @staticmethod
+    @pt.mark.parametrize("invalid_ttl", [1.0, "1", None])
+    def test_caching_adapter_only_accepts_int_ttl(invalid_ttl, tmp_path):
+        """
+        Test that CachingAdapter only accepts int for ttl and stale_while_revalidate
+
+        """
+        cache = BoundedFileCache(str(tmp_path), 1024)
+        with pt.raises(TypeError):
+            CachingAdapter(RateLimiter(0), cache, invalid_ttl)
+        with pt.raises(TypeError):
+            CachingAdapter(RateLimiter(0), cache, 1, invalid_ttl)
+
+    def test_responses_are_cached_for_ttl_and_revalidated(self, tmp_path):
+        """
+        Test that responses are served from the cache within the time to live, regardless of
+        'no-store', and revalidated with the ETag when expired
+
+        """
+        session, _ = self.session(BoundedFileCache(str(tmp_path / "fresh"), 1024 ** 2), 60)
+        assert not session.get(self.url).from_cache
+        response = session.get(self.url)
+        assert response.from_cache
+        assert response.content == b"content"
+        assert EndpointHandler.requests == [None]
+
+        EndpointHandler.requests = []
+        session, _ = self.session(BoundedFileCache(str(tmp_path / "expired"), 1024 ** 2), 0)
+        session.get(self.url)
+        response = session.get(self.url)
+        assert response.content == b"content"
+        assert EndpointHandler.requests == [None, '"v1"']
+
+    def test_stale_while_revalidate(self, tmp_path):
+        """
+        Test that expired responses are served from the cache within stale_while_revalidate,
+        while revalidated in the background
+
+        """
+        session, _ = self.session(BoundedFileCache(str(tmp_path), 1024 ** 2), 0, 60)
+        session.get(self.url)
+        response = session.get(self.url)
+        assert response.from_cache
+        assert response.content == b"content"
+        for _ in range(50):
+            if len(EndpointHandler.requests) == 2:
+                break
+            sleep(0.01)
+        assert EndpointHandler.requests == [None, '"v1"']
+
+    def test_store_caches_responses_received_outside_requests(self, tmp_path):
+        """
+        Test that store() caches decoded responses, e.g. from aiohttp, and serves the cached
+        content for 304 Not Modified
+
+        """
+        _, adapter = self.session(BoundedFileCache(str(tmp_path), 1024 ** 2), 0)
+        request = requests.Request("GET", self.url).prepare()
+        assert adapter.lookup(request) is None
+        assert adapter.store(request, 200, {"ETag": '"v1"', "Content-Encoding": "gzip"},
+                             b"content") == b"content"
+        assert adapter.controller.conditional_headers(request) == {"If-None-Match": '"v1"'}
+        assert adapter.store(request, 304, {"ETag": '"v1"'}, b"") == b"content"
+
+    @staticmethod
+    def test_bounded_file_cache_evicts_least_recently_used(tmp_path):
+        """
+        Test that the least recently used responses are evicted when the cache is full
+
+        """
+        cache = BoundedFileCache(str(tmp_path), 250)
+        for key in ["a", "b", "c"]:
+            cache.set(key, b"x" * 100)
+            sleep(0.01)
+        assert cache.get("a") is None
+        assert cache.get("b") == cache.get("c") == b"x" * 100
+        assert cache.size() <= 250
+        cache.clear()
+        assert cache.size() == 0
+
+    @staticmethod
+    def test_bounded_file_cache_counts_overwritten_responses_once(tmp_path):
+        """
+        Test that overwriting a cached response, e.g. when revalidating it, does not count its
+        size again, so a cache of one response is never evicted
+
+        """
+        cache = BoundedFileCache(str(tmp_path), 250)
+        cache.set("a", b"x" * 100)
+        with mock.patch.object(BoundedFileCache, "evict") as evict:
+            for _ in range(5):
+                cache.set("a", b"x" * 100)
+        assert not evict.called
+        assert cache.get("a") == b"x" * 100
+
+    @staticmethod
+    def test_session_registry_caches_configured_endpoints():
+        """
+        Test that the shared sessions only cache the configured endpoints
+
+        """
+        try:
+            assert isinstance(SessionRegistry.caching_adapter(FINN_AD_URL + "1"), CachingAdapter)
+            assert isinstance(SessionRegistry.caching_adapter(FINN_STAT_URL), CachingAdapter)
+            assert SessionRegistry.caching_adapter(SSB_URL) is None
+        finally:
+            SessionRegistry.close()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the SessionRegistry class
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import asyncio
+
+import pytest as pt
+from requests import Session
+
+from source.app import SessionRegistry, Connector, POOL_MAXSIZE, FINN_AD_URL, FINN_OWNER_URL, \
+    SSB_URL
+
+
+class TestSessionRegistry:
+    """
+    Test cases for the SessionRegistry class
+
+    """
+
+    @staticmethod
+    def teardown_method():
+        """
+        Executed after all tests
+
+        """
+        SessionRegistry.close()
+
+    @staticmethod
+    @pt.mark.parametrize("invalid_url", [True, 90210, 90210.0, ("test", "test"), {}])
+    def test_session_only_accepts_str(invalid_url):
+        """
+        Test that session() only accepts str for url
+
+        """
+        with pt.raises(TypeError):
+            SessionRegistry.session(invalid_url)
+
+    @staticmethod
+    def test_session_is_shared_per_host():
+        """
+        Test that connectors share one session per host, with a bounded connection pool
+
+        """
+        session = SessionRegistry.session(FINN_AD_URL)
+        assert isinstance(session, Session)
+        assert Connector.session(FINN_OWNER_URL) is session
+        assert SessionRegistry.session(SSB_URL) is not session
+        assert session.get_adapter(FINN_AD_URL)._pool_maxsize == POOL_MAXSIZE
+
+    @staticmethod
+    def test_close_creates_new_sessions_on_next_use():
+        """
+        Test that close() closes the shared sessions, and that new ones are created on next use
+
+        """
+        session = SessionRegistry.session(FINN_AD_URL)
+        SessionRegistry.close()
+        assert SessionRegistry.session(FINN_AD_URL) is not session
+
+    @staticmethod
+    def test_run_shares_client_session_between_coroutines():
+        """
+        Test that coroutines run with run() share one aiohttp session, while coroutines run on
+        other event loops get a new session closed after use
+
+        """
+        async def client_session():
+            async with SessionRegistry.client_session() as session:
+                return session
+
+        shared_session = SessionRegistry.run(client_session())
+        assert SessionRegistry.run(client_session()) is shared_session
+        assert not shared_session.closed
+
+        session = asyncio.run(client_session())
+        assert session is not shared_session
+        assert session.closed
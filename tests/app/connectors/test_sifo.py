@@ -22,7 +22,16 @@ from mechanize import Browser
 
 from source.domain import Female, Family, Male
 from source.util import TrackingError
-from source.app import Connector, Sifo
+from source.app import Connector, Sifo, SifoCache, ProcessContext
+
+
+@pt.fixture(autouse=True)
+def no_sifo_cache(monkeypatch):
+    """
+    disable the SIFO cache, so every test sends its own request
+
+    """
+    monkeypatch.setattr(Sifo, "cache", SifoCache(0))
 
 
 class TestSifo:
@@ -56,6 +65,22 @@ class TestSifo:
         """
         assert isinstance(self.sifo.browser, Browser)
 
+    def test_sifo_creates_browser_lazily(self):
+        """
+        Test that the Browser object of the Sifo connector is only created, counted and
+        profiled on first access
+
+        """
+        browsers = Connector.browsers
+        assert "_browser" not in vars(self.sifo)
+
+        context = ProcessContext("TestProcess")
+        with context.active():
+            browser = self.sifo.browser
+        assert self.sifo.browser is browser
+        assert Connector.browsers == browsers + 1
+        assert "browser (Sifo)" in str(context.profiling)
+
     @staticmethod
     @pt.mark.parametrize("invalid_family", [90210, 90210.0, True, [], (), {}])
     def test_sifo_raises_type_error_if_family_instance_not_passed(invalid_family):
@@ -85,7 +110,7 @@ class TestSifo:
         self.sifo.family = new_family
         assert self.sifo.family == new_family
 
-    @mock.patch("requests.post", mock.MagicMock(side_effect=ConnectTimeout("timed out")))
+    @mock.patch("requests.Session.post", mock.MagicMock(side_effect=ConnectTimeout("timed out")))
     def test_response_throws_time_out_error_for_read_timeout(self):
         """
         Test that response method throws TrackingError if URLError("timed out")
@@ -94,7 +119,7 @@ class TestSifo:
         with pt.raises(TrackingError):
             self.sifo.response()
 
-    @mock.patch("requests.post", mock.MagicMock(side_effect=ConnectError))
+    @mock.patch("requests.Session.post", mock.MagicMock(side_effect=ConnectError))
     def test_response_throws_no_connection_error(self):
         """
         Test that response method throws TrackingError if URLError("")
@@ -165,3 +190,56 @@ class TestSifo:
 
         """
         assert UUID(str(self.sifo.id_))
+
+    @staticmethod
+    def test_sifo_base_expenses_are_cached_by_family_composition(monkeypatch):
+        """
+        Test that sifo_base_expenses() only sends a request for the first of families with
+        the same composition
+
+        """
+        monkeypatch.setattr(Sifo, "cache", SifoCache(10))
+        response = mock.MagicMock()
+        response.json.return_value = {"utgifter": {
+            "individspesifikke": {"mat": 6760}, "sumindivid": 6760,
+            "husholdsspesifikke": {"biler": 2608}, "sumhusholdning": 2608, "totalt": 9368}}
+        with mock.patch.object(Sifo, "response", return_value=response) as sifo_response:
+            first = Sifo(Family([Male(age=45), Female(age=40)], select_year=2021))
+            second = Sifo(Family([Female(age=40), Male(age=45)], select_year=2021))
+            assert first.sifo_base_expenses() == second.sifo_base_expenses() == {
+                "mat": "6760", "sumindivid": "6760", "biler": "2608", "sumhusholdning": "2608",
+                "totalt": "9368"}
+            assert sifo_response.call_count == 1
+        assert "_id" in second.sifo_base_expenses(include_id=True)
+
+    @staticmethod
+    def test_batch_base_expenses_deduplicates_families(monkeypatch):
+        """
+        Test that batch_base_expenses() fetches every family composition once and returns
+        the expenses in the order of the families
+
+        """
+        fetched = []
+
+        def sifo_base_expenses(sifo):
+            fetched.append(sifo.family)
+            return {"totalt": str(len(sifo.family.familie_medlemmer))}
+
+        monkeypatch.setattr(Sifo, "sifo_base_expenses", sifo_base_expenses)
+        families = [Family([Male(age=45)], select_year=2021),
+                    Family([Male(age=45), Female(age=40)], select_year=2021),
+                    Family([Male(age=45)], select_year=2021)]
+        expenses = Sifo.batch_base_expenses(families, max_workers=2)
+        assert expenses == [{"totalt": "1"}, {"totalt": "2"}, {"totalt": "1"}]
+        assert len(fetched) == 2
+        assert expenses[0] is not expenses[2]
+
+    @staticmethod
+    @pt.mark.parametrize("invalid_families", [None, (), [90210]])
+    def test_batch_base_expenses_only_accepts_list_of_families(invalid_families):
+        """
+        Test that batch_base_expenses() raises TypeError if not passed a list of families
+
+        """
+        with pt.raises(TypeError):
+            Sifo.batch_base_expenses(invalid_families)
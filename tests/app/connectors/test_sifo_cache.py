@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the SifoCache of SIFO expenses
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+import json
+from datetime import date
+
+import pytest as pt
+
+from source.domain import Family, Female, Male
+from source.app import SifoCache, SIFO_CACHE_TTL, SIFO_CACHE_TTL_PAST_YEARS
+
+
+class TestSifoCache:
+    """
+    Test cases for the SifoCache
+
+    """
+
+    def setup_method(self):
+        """
+        Executed before all tests
+
+        """
+        self.properties = Family([Male(age=45), Female(age=40)], income=850000,
+                                 fossil_cars=1, select_year=2021).sifo_properties()
+        self.expenses = {"mat": "6760", "totalt": "20688"}
+
+    @staticmethod
+    @pt.mark.parametrize("invalid_max_size", [1.0, "1", None])
+    def test_sifo_cache_only_accepts_int_max_size(invalid_max_size):
+        """
+        Test that SifoCache raises TypeError for a max_size that is not int
+
+        """
+        with pt.raises(TypeError):
+            SifoCache(invalid_max_size)
+
+    def test_key_is_independent_of_member_order(self):
+        """
+        Test that families with the same members in another order have the same key, and
+        families with other compositions have other keys
+
+        """
+        reordered = Family([Female(age=40), Male(age=45)], income=850000, fossil_cars=1,
+                           select_year=2021).sifo_properties()
+        other_year = Family([Male(age=45), Female(age=40)], income=850000, fossil_cars=1,
+                            select_year=2020).sifo_properties()
+        other_members = Family([Male(age=45), Male(age=40)], income=850000, fossil_cars=1,
+                               select_year=2021).sifo_properties()
+        assert SifoCache.key(self.properties) == SifoCache.key(reordered)
+        assert SifoCache.key(self.properties) != SifoCache.key(other_year)
+        assert SifoCache.key(self.properties) != SifoCache.key(other_members)
+
+    def test_get_returns_copy_of_cached_expenses(self):
+        """
+        Test that cached expenses are returned as copies, and hits and misses counted
+
+        """
+        cache = SifoCache(10)
+        assert cache.get(self.properties) is None
+        cache.set(self.properties, self.expenses)
+        expenses = cache.get(self.properties)
+        assert expenses == self.expenses
+        expenses["mat"] = "0"
+        assert cache.get(self.properties) == self.expenses
+        assert cache.metrics() == {"size": 1, "max_size": 10, "hits": 2, "misses": 1}
+
+    def test_max_size_zero_disables_cache(self):
+        """
+        Test that nothing is cached with max_size 0
+
+        """
+        cache = SifoCache(0)
+        cache.set(self.properties, self.expenses)
+        assert cache.get(self.properties) is None
+        assert cache.metrics()["size"] == 0
+
+    def test_least_recently_used_expenses_are_evicted(self):
+        """
+        Test that the least recently used expenses are evicted when the cache is full
+
+        """
+        cache = SifoCache(2)
+        properties = [dict(self.properties, inntekt=str(income)) for income in range(3)]
+        cache.set(properties[0], self.expenses)
+        cache.set(properties[1], self.expenses)
+        cache.get(properties[0])
+        cache.set(properties[2], self.expenses)
+        assert cache.get(properties[0]) == self.expenses
+        assert cache.get(properties[1]) is None
+
+    def test_expenses_are_persisted_to_disk(self, tmp_path):
+        """
+        Test that expenses are persisted to disk and loaded by another cache
+
+        """
+        SifoCache(10, str(tmp_path)).set(self.properties, self.expenses)
+        assert len(os.listdir(tmp_path)) == 1
+        cache = SifoCache(10, str(tmp_path))
+        assert cache.get(self.properties) == self.expenses
+        cache.clear()
+        assert not os.listdir(tmp_path)
+
+    def test_expired_expenses_are_removed(self, tmp_path):
+        """
+        Test that expired expenses are not returned, and removed from disk
+
+        """
+        cache = SifoCache(10, str(tmp_path))
+        cache.set(self.properties, self.expenses)
+        path = cache.path(SifoCache.key(self.properties))
+        with open(path, encoding="utf-8") as expenses_file:
+            entry = json.load(expenses_file)
+        entry["stored"] -= SIFO_CACHE_TTL_PAST_YEARS + 1
+        with open(path, "w", encoding="utf-8") as expenses_file:
+            json.dump(entry, expenses_file)
+
+        assert SifoCache(10, str(tmp_path)).get(self.properties) is None
+        assert not os.path.exists(path)
+
+    @staticmethod
+    def test_ttl_is_longer_for_past_years():
+        """
+        Test that expenses of past years live longer than expenses of the current year
+
+        """
+        assert SifoCache.ttl(str(date.today().year - 1)) == SIFO_CACHE_TTL_PAST_YEARS
+        assert SifoCache.ttl(str(date.today().year)) == SIFO_CACHE_TTL
+        assert SifoCache.ttl("None") == SIFO_CACHE_TTL
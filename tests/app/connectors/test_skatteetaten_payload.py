@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the SkatteetatenPayload templates
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import json
+
+import pytest as pt
+
+from source.app import SkatteetatenPayload, Skatteetaten
+
+
+class TestSkatteetatenPayload:
+    """
+    Test cases for the SkatteetatenPayload templates
+
+    """
+
+    def setup_method(self):
+        """
+        Executed before all tests
+
+        """
+        self.values = {attribute: str(i * 1000) for i, attribute in
+                       enumerate(SkatteetatenPayload.placeholders.values())}
+
+    @staticmethod
+    @pt.mark.parametrize("invalid_tax_year", [2023, 2023.0, None])
+    def test_template_only_accepts_str(invalid_tax_year):
+        """
+        Test that template() only accepts str for tax_year
+
+        """
+        with pt.raises(TypeError):
+            SkatteetatenPayload.template(invalid_tax_year)
+
+    @staticmethod
+    def test_template_raises_value_error_for_unknown_tax_year():
+        """
+        Test that template() raises ValueError for tax years not in tax_version_mapping
+
+        """
+        with pt.raises(ValueError):
+            SkatteetatenPayload.template("2017")
+
+    @staticmethod
+    def test_template_is_compiled_once_per_tax_year():
+        """
+        Test that the payload file is read once, and every template compiled once
+
+        """
+        template = SkatteetatenPayload.template("2022")
+        assert SkatteetatenPayload.template("2022") is template
+        assert SkatteetatenPayload.payload() is SkatteetatenPayload.payload()
+        assert Skatteetaten.tax_version_mapping is SkatteetatenPayload.tax_version_mapping
+
+    @pt.mark.parametrize("tax_year", ["2018", "2019", "2020", "2021", "2022"])
+    def test_fill_names_versions_and_fills_in_values(self, tax_year):
+        """
+        Test that fill() names the versions of the tax year and fills in all values
+
+        """
+        payload = json.loads(SkatteetatenPayload.fill(tax_year, self.values))
+        tax_base_version, tax_liability_version = SkatteetatenPayload.tax_version_mapping[
+            tax_year]
+        assert list(payload) == [tax_base_version, tax_liability_version]
+        amounts = {element["tekniskNavn"]: element["beloep"] for element in
+                   payload[tax_base_version]["skattegrunnlagsobjekt"]}
+        assert amounts["loennsinntektNaturalytelseMv"] == self.values["income"]
+        assert amounts["gjeld"] == self.values["debt"]
+        assert payload[tax_liability_version]["skattesubjekt"]["personligSkattesubjekt"][
+            "alderIInntektsaar"] == self.values["age"]
+
+    def test_fill_2023_has_typed_amounts(self):
+        """
+        Test that fill() for 2023 has int amounts for the primary home and union fee, with the
+        value before the valuation discount, and no BSU
+
+        """
+        payload = json.loads(SkatteetatenPayload.fill("2023", self.values))
+        amounts = {element["tekniskNavn"]: element for element in
+                   payload["skatteberegningsgrunnlag"]["skatteberegningsgrunnlagsobjekt"]}
+        home = amounts["formuesverdiForPrimaerbolig"]
+        assert home["beloep"] == int(self.values["value_of_real_estate"])
+        assert home["verdiFoerVerdsettingsrabattForFastEiendom"] == int(
+            int(self.values["value_of_real_estate"]) / 0.25)
+        assert amounts["inntektsfradragForFagforeningskontingent"]["beloep"] == int(
+            self.values["union_fee"])
+        assert amounts["gjeld"] == {"tekniskNavn": "gjeld", "beloep": self.values["debt"]}
+        assert "beloepSpartIBSUIInntektsaar" not in amounts
+
+    @staticmethod
+    def test_skatteetaten_payload_is_filled_template():
+        """
+        Test that the payload of the Skatteetaten connector is the filled template of its tax
+        year
+
+        """
+        skatteetaten = Skatteetaten(30, 500000, "2021", debt=2000000)
+        payload = json.loads(skatteetaten.payload())
+        amounts = {element["tekniskNavn"]: element["beloep"] for element in
+                   payload["skatteberegningsgrunnlagV6"]["skattegrunnlagsobjekt"]}
+        assert amounts["loennsinntektNaturalytelseMv"] == "500000"
+        assert amounts["gjeld"] == "2000000"
+        assert amounts["innskudd"] == "0"
@@ -72,19 +72,20 @@ class TestSsb:
         self.ssb.payload = payload
         assert self.ssb.payload == payload
 
-    @mock.patch("requests.post", mock.MagicMock(side_effect=ConnectError))
+    @mock.patch("requests.Session.post", mock.MagicMock(side_effect=ConnectError))
     def test_response_throws_tracking_error_for_connect_error(self):
         """
-        Test that response method throws TrackingError if requests.post throws ConnectError
+        Test that response method throws TrackingError if requests.Session.post throws ConnectError
 
         """
         with pt.raises(TrackingError):
             self.ssb.response()
 
-    @mock.patch("requests.post", mock.MagicMock(side_effect=ConnectTimeout))
+    @mock.patch("requests.Session.post", mock.MagicMock(side_effect=ConnectTimeout))
     def test_response_throws_tracking_error_for_readtimeout(self):
         """
-        Test that response method throws TrackingError if requests.post throws ConnectTimeout
+        Test that response method throws TrackingError if requests.Session.post throws
+        ConnectTimeout
 
         """
         with pt.raises(TrackingError):
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the SsbRateStore of SSB interest rates
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+
+import mock
+import pytest as pt
+
+from source.util import TrackingError
+from source.app import SsbRateStore, Ssb
+from source.app.processing.engine.ssb_connector import SsbConnector
+
+LABELS = {"08": "Inntil 3 måneder (flytende rente)", "12": "Over 5 år"}
+
+
+def ssb_response(months: list, rates: dict):
+    """
+    json-stat2 response of SSB table nr. 10748 with one utlanstype, sektor and content
+
+    """
+    return {
+        "id": ["Utlanstype", "Sektor", "Rentebinding", "ContentsCode", "Tid"],
+        "size": [1, 1, len(LABELS), 1, len(months)],
+        "dimension": {
+            "Utlanstype": {"category": {"index": {"70": 0}}},
+            "Sektor": {"category": {"index": {"04b": 0}}},
+            "Rentebinding": {"category": {"index": {code: i for i, code in enumerate(LABELS)},
+                                          "label": LABELS}},
+            "ContentsCode": {"category": {"index": {"Rente": 0}}},
+            "Tid": {"category": {"index": {month: i for i, month in enumerate(months)}}}},
+        "value": [rates.get((code, month)) for code in LABELS for month in months]}
+
+
+class TestSsbRateStore:
+    """
+    Test cases for the SsbRateStore
+
+    """
+
+    @pt.fixture(autouse=True)
+    def store(self, tmp_path):
+        """
+        store in a temporary directory
+
+        """
+        self.path = os.path.join(str(tmp_path), "ssb_10748.parquet")
+        self.store = SsbRateStore(self.path)
+        self.rates = {("08", "2023M01"): 4.5, ("08", "2023M02"): 4.7, ("12", "2023M01"): 5.1,
+                      ("12", "2023M02"): None}
+
+    @staticmethod
+    @pt.mark.parametrize("start,end,months", [("2023M01", "2023M01", 0),
+                                              ("2022M11", "2023M02", 3)])
+    def test_months_between(start, end, months):
+        """
+        Test the number of months between two SSB months
+
+        """
+        assert SsbRateStore.months_between(start, end) == months
+
+    def test_parse_skips_missing_values(self):
+        """
+        Test that parse() returns a row per rate, leaving out rates without value
+
+        """
+        rows = SsbRateStore.parse(ssb_response(["2023M01", "2023M02"], self.rates))
+        assert sorted(rows) == [("2023M01", "08", LABELS["08"], 4.5),
+                                ("2023M01", "12", LABELS["12"], 5.1),
+                                ("2023M02", "08", LABELS["08"], 4.7)]
+
+    def test_query_fetches_all_categories(self):
+        """
+        Test that the query fetches all Rentebinding categories, and all or the latest months
+
+        """
+        selections = {variable["code"]: variable["selection"] for variable in
+                      self.store.query(3)["query"]}
+        assert selections["Rentebinding"] == {"filter": "all", "values": ["*"]}
+        assert selections["Tid"] == {"filter": "top", "values": ["3"]}
+        assert {variable["code"]: variable["selection"] for variable in
+                self.store.query()["query"]}["Tid"] == {"filter": "all", "values": ["*"]}
+
+    def test_refresh_is_incremental(self):
+        """
+        Test that refresh() fetches the full history first, then only newer months, and
+        nothing when tid is already stored or checked
+
+        """
+        response = mock.MagicMock()
+        response.json.return_value = ssb_response(["2023M01", "2023M02"], self.rates)
+        with mock.patch.object(Ssb, "response", return_value=response) as ssb_response_mock:
+            assert self.store.refresh("2023M02") == 3
+            assert ssb_response_mock.call_args[0][0]["query"][3]["selection"]["filter"] == "all"
+            assert self.store.refresh("2023M02") == 0
+            assert ssb_response_mock.call_count == 1
+
+            response.json.return_value = ssb_response(
+                ["2023M02", "2023M03"], {("08", "2023M02"): 4.7, ("08", "2023M03"): 4.9})
+            assert self.store.refresh("2023M03") == 1
+            assert ssb_response_mock.call_args[0][0]["query"][3]["selection"]["filter"] == "top"
+            assert self.store.refresh("2023M03") == 0
+            assert ssb_response_mock.call_count == 2
+
+    def test_store_is_persisted_and_served_from_memory(self):
+        """
+        Test that stored rates are loaded by another store, and looked up by code or label
+
+        """
+        response = mock.MagicMock()
+        response.json.return_value = ssb_response(["2023M01", "2023M02"], self.rates)
+        with mock.patch.object(Ssb, "response", return_value=response):
+            self.store.refresh("2023M02")
+
+        store = SsbRateStore(self.path)
+        assert store.latest_tid == "2023M02"
+        assert store.checked == "2023M02"
+        assert store.rate("08") == 4.7
+        assert store.rate(SsbRateStore.market_rate, "2023M01") == 4.5
+        assert store.rate("12", "2023M02") == 5.1
+        assert store.rate("12", "2022M12") is None
+        assert store.rate("99") is None
+        assert store.series("12") == [("2023M01", 5.1)]
+        assert store.categories() == {label: code for code, label in LABELS.items()}
+
+    def test_ssb_connector_serves_stored_rate_when_refresh_fails(self, monkeypatch):
+        """
+        Test that SsbConnector returns the market rate of the store, also when SSB cannot be
+        reached, but raises if the store is empty
+
+        """
+        monkeypatch.setattr(SsbConnector, "store", self.store)
+        with mock.patch.object(Ssb, "response", side_effect=ConnectionError("no network")):
+            with pt.raises(TrackingError):
+                SsbConnector().run()
+
+            self.store._index(SsbRateStore.parse(  # pylint: disable=protected-access
+                ssb_response(["2023M01", "2023M02"], self.rates)))
+            assert SsbConnector().run() == {"markedsrente": "4.7"}
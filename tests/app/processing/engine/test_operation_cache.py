@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Test module for the OperationCache class
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+from decimal import Decimal
+
+import pandas as pd
+import pytest as pt
+
+from source.app import OperationCache, Operation, ProcessContext, Multiplication, Extract, \
+    GenerateFixedPaymentPlan
+
+
+class TestOperationCache:
+    """
+    Test cases for the OperationCache class
+
+    """
+
+    def setup_method(self):
+        """
+        Executed before all tests
+
+        """
+        self.operation_cache = OperationCache(2, 1024 ** 2)
+
+    @pt.fixture(autouse=True)
+    def operation_cache(self, monkeypatch):
+        """
+        Fixture replacing the shared operation cache with the one of the test
+
+        """
+        monkeypatch.setattr(Operation, "cache", self.operation_cache)
+
+    @staticmethod
+    @pt.mark.parametrize("invalid_size", [1.0, "2", None])
+    def test_operation_cache_only_accepts_int(invalid_size):
+        """
+        Test that OperationCache only accepts int for max_size and max_bytes
+
+        """
+        with pt.raises(TypeError):
+            OperationCache(invalid_size, 1024)
+        with pt.raises(TypeError):
+            OperationCache(1024, invalid_size)
+
+    @staticmethod
+    def test_stable_hash():
+        """
+        Test that stable_hash() is deterministic, and tells apart types and dict order
+
+        """
+        value = {"a": ["1 000 kr", 1, 1.0, True, None, Decimal("1")], "b": ("x", b"y")}
+        assert OperationCache.stable_hash(value) == OperationCache.stable_hash(dict(value))
+        assert OperationCache.stable_hash(1) != OperationCache.stable_hash(True)
+        assert OperationCache.stable_hash("1") != OperationCache.stable_hash(1)
+        assert OperationCache.stable_hash({"a": 1, "b": 2}) != OperationCache.stable_hash(
+            {"b": 2, "a": 1})
+        with pt.raises(TypeError):
+            OperationCache.stable_hash(pd.DataFrame())
+
+    def test_pure_operation_is_memoized(self):
+        """
+        Test that a pure operation is only run once for the same inputs and arguments, and that
+        every hit gets its own copy of the result
+
+        """
+        assert Multiplication.pure
+        result_1 = Multiplication({"a": "1 000 kr"}, {"f": "2"}, "desc").run(money=True)
+        result_2 = Multiplication({"a": "1 000 kr"}, {"f": "2"}, "other desc").run(money=True)
+        result_3 = Multiplication({"a": "1 000 kr"}, {"f": "2"}, "desc").run()
+
+        assert result_1 == result_2 == {"a": "2 000 kr"}
+        assert result_3 == {"a": "2000.0"}
+        assert result_1 is not result_2
+        assert self.operation_cache.metrics()["hits"] == 1
+        assert self.operation_cache.metrics()["misses"] == 2
+
+    def test_impure_operation_and_unhashable_inputs_are_not_memoized(self):
+        """
+        Test that operations not declared pure, and pure operations with inputs without a
+        stable hash, are not cached
+
+        """
+        assert not Extract.pure
+        Extract({"a": "1"}, "a").run()
+        assert self.operation_cache.metrics()["size"] == 0
+        assert self.operation_cache.key(
+            Multiplication({"a": "1 000 kr"}, {"f": pd.Series([2])}, "desc"), (), {}) is None
+
+    def test_least_recently_used_results_are_evicted(self):
+        """
+        Test that the least recently used result is evicted when the cache is full
+
+        """
+        for amount in ["1 kr", "2 kr", "1 kr", "3 kr", "1 kr", "2 kr"]:
+            Multiplication({"a": amount}, {"f": "2"}, "desc").run()
+        assert self.operation_cache.metrics()["size"] == 2
+        assert self.operation_cache.metrics()["hits"] == 2
+        assert self.operation_cache.metrics()["misses"] == 4
+
+    def test_cache_is_bounded_in_memory(self, monkeypatch):
+        """
+        Test that the total size of the cached results is bounded
+
+        """
+        operation_cache = OperationCache(1024, 500)
+        monkeypatch.setattr(Operation, "cache", operation_cache)
+        GenerateFixedPaymentPlan("4.5 %", "10 år", "Årlig", "1 000 000 kr", "01.01.2024").run()
+        for amount in ["1 kr", "2 kr", "3 kr"]:
+            Multiplication({"a": amount}, {"f": "2"}, "desc").run()
+        assert operation_cache.metrics()["size"] == 3
+        assert operation_cache.metrics()["bytes"] <= 500
+
+    def test_hits_and_misses_are_counted_in_profiling(self):
+        """
+        Test that cache hits and misses are counted in the context of the running process and
+        reported in its profiling table
+
+        """
+        context = ProcessContext("TestProcess")
+        with context.active():
+            for _ in range(3):
+                Multiplication({"a": "1 000 kr"}, {"f": "2"}, "desc").run()
+        assert ProcessContext.current() is None
+        context.end()
+        assert (context.cache_hits, context.cache_misses) == (2, 1)
+        assert "2 / 1" in str(context.profiling)
@@ -9,11 +9,139 @@ __email__ = 'samir.adrik@gmail.com'
 
 from abc import ABC
 
+import pandas as pd
 from prettytable import PrettyTable
 from pydot import Dot
 import pytest as pt
 
-from source.app import Process
+from source.app import Process, ProcessContext, Signal, InputOperation, OutputOperation, \
+    Extract
+from source.app.processing.engine import process as process_module
+from source.util import Profiling, Tracking, TrackingError, METRICS
+
+
+class ExtractProcess(Process):
+    """
+    Minimal process used for testing the procedure graph
+
+    """
+
+    def __init__(self, data: dict):
+        self.start_process()
+        super().__init__(name=self.__class__.__name__)
+        self.input_operation(data)
+        extract_operation = Extract(self.get_signal("input_signal").data, "totalt")
+        self.add_node(extract_operation)
+        self.add_transition(self.get_signal("input_signal"), extract_operation)
+        self.add_signal(Signal(extract_operation.run(), "Extracted Total"), "totalt")
+        self.add_transition(extract_operation, self.get_signal("totalt"))
+        self.output_operation()
+        self.end_process()
+
+    @Profiling
+    def input_operation(self, data: object):
+        input_operation = InputOperation("Test Data")
+        self.add_node(input_operation)
+        self.add_signal(Signal(data, "Test Data"), "input_signal")
+        self.add_transition(input_operation, self.get_signal("input_signal"))
+
+    def output_operation(self):
+        output_operation = OutputOperation("Extracted Total")
+        self.add_node(output_operation)
+        self.add_transition(self.get_signal("totalt"), output_operation)
+
+
+class ScheduledProcess(Process):
+    """
+    Minimal process used for testing the dependency graph scheduling
+
+    """
+
+    depends_on = {"log_total": {"extract_total"}}
+
+    def __init__(self, data: dict):
+        super().__init__(name=self.__class__.__name__)
+        self.input_operation(data)
+        self.run_scheduled([self.extract_total, self.extract_ready, self.extract_first])
+        self.output_operation()
+
+    def input_operation(self, data: object):
+        self.add_signal(Signal(data, "Test Data"), "input_signal")
+
+    def extract_first(self):
+        extract_operation = Extract(self.get_signal("klar").data, "klar")
+        self.add_signal(Signal(extract_operation.run(), "Extracted Ready"), "forste")
+
+    def extract_ready(self):
+        extract_operation = Extract(self.get_signal("input_signal").data, "klar")
+        self.add_signal(Signal(extract_operation.run(), "Extracted Ready"), "klar")
+
+    def extract_total(self):
+        extract_operation = Extract(self.get_signal("input_signal").data, "totalt")
+        self.add_signal(Signal(extract_operation.run(), "Extracted Total"), "totalt")
+
+    def output_operation(self):
+        return self.get_signal("forste").data
+
+    def cyclic_1(self):
+        self.add_signal(self.get_signal("cyclic_2"), "cyclic_1")
+
+    def cyclic_2(self):
+        self.add_signal(self.get_signal("cyclic_1"), "cyclic_2")
+
+    def mark_done(self):
+        self.signal.update({"ferdig": Signal({"ferdig": True}, "Done")})
+
+    def read_done(self):
+        return self.get_signal("ferdig").data
+
+    def read_unknown(self):
+        return self.get_signal("ukjent").data
+
+    def log_total(self):
+        return self.signal["totalt"].data
+
+
+class ProfiledScheduledProcess(Process):
+    """
+    Process with profiled and tracked steps, as the processes of the app, used for testing
+    the scheduling of decorated methods
+
+    """
+
+    def __init__(self, data: dict):
+        self.start_process()
+        super().__init__(name=self.__class__.__name__)
+        self.input_operation(data)
+        self.run_scheduled(self.steps())
+        self.end_process()
+
+    def steps(self):
+        return [self.extract_total, self.extract_ready, self.extract_first]
+
+    def input_operation(self, data: object):
+        self.add_signal(Signal(data, "Test Data"), "input_signal")
+
+    @Profiling
+    @Tracking
+    def extract_first(self):
+        extract_operation = Extract(self.get_signal("klar").data, "klar")
+        self.add_signal(Signal(extract_operation.run(), "Extracted Ready"), "forste")
+
+    @Profiling
+    @Tracking
+    def extract_ready(self):
+        extract_operation = Extract(self.get_signal("input_signal").data, "klar")
+        self.add_signal(Signal(extract_operation.run(), "Extracted Ready"), "klar")
+
+    @Profiling
+    @Tracking
+    def extract_total(self):
+        extract_operation = Extract(self.get_signal("input_signal").data, "totalt")
+        self.add_signal(Signal(extract_operation.run(), "Extracted Total"), "totalt")
+
+    def output_operation(self):
+        return self.get_signal("forste").data
 
 
 class TestProcess:
@@ -41,34 +169,272 @@ class TestProcess:
             Process("test_process") # pylint: disable=abstract-class-instantiated
 
     @staticmethod
-    def test_process_class_variables():
+    def test_process_has_no_class_level_profiling_state():
         """
-        Test that Process class variables profiling and start are None
+        Test that Process has no class level timing or profiling state
 
         """
-        assert not Process.profiling
-        assert not Process.start
+        for attribute in ["start", "elapsed"]:
+            assert attribute not in vars(Process)
+        assert isinstance(vars(Process)["profiling"], property)
 
     @staticmethod
-    def test_start_process_class_method():
+    def test_start_process_method():
         """
         Test the Process start_process() method
 
         """
-        Process.start_process()
-        assert isinstance(Process.start, float)
-        assert isinstance(Process.profiling.__class__, PrettyTable.__class__)
+        process = ExtractProcess({"klar": "500 kr", "totalt": "1500 kr"})
+        run_id = process.run_id
+        process.start_process()
+        assert isinstance(process.context, ProcessContext)
+        assert isinstance(process.context.start, float)
+        assert isinstance(process.profiling, PrettyTable)
+        assert process.run_id != run_id
 
     @staticmethod
-    def test_end_process_class_method():
+    def test_end_process_method():
         """
         Test the Process end_process() method
 
         """
-        Process.start_process()
-        start_profiling = str(Process.profiling)
-        Process.end_process()
-        end_profiling = str(Process.profiling)
+        process = ExtractProcess({"klar": "500 kr", "totalt": "1500 kr"})
+        process.start_process()
+        start_profiling = str(process.profiling)
+        process.end_process()
+        end_profiling = str(process.profiling)
 
         assert "total" not in start_profiling
         assert "total" in end_profiling
+
+    @staticmethod
+    def test_runs_are_recorded_in_metrics():
+        """
+        Test that the latency of the runs and operations of a process are recorded in the
+        metrics registry
+
+        """
+        runs = METRICS.histogram("stressa_process_seconds", process="ExtractProcess")
+        operations = METRICS.histogram("stressa_operation_seconds", process="ExtractProcess",
+                                       operation="input_operation")
+        run_count, operation_count = runs.snapshot()[0], operations.snapshot()[0]
+        ExtractProcess({"klar": "500 kr", "totalt": "1500 kr"})
+
+        assert runs.snapshot()[0] == run_count + 1
+        assert operations.snapshot()[0] == operation_count + 1
+        assert 'stressa_process_seconds_count{process="ExtractProcess"}' in \
+            METRICS.prometheus()
+
+    @staticmethod
+    def test_concurrent_runs_have_separate_contexts():
+        """
+        Test that concurrent runs of the same process each get their own context, i.e. run id,
+        profiling rows and elapsed time
+
+        """
+        processes = []
+        Process.worker_pool.run_all(
+            [lambda: processes.append(ExtractProcess({"klar": "500 kr", "totalt": "1500 kr"}))
+             for _ in range(8)])
+
+        assert len(processes) == 8
+        assert len({process.run_id for process in processes}) == 8
+        for process in processes:
+            assert str(process.profiling).count("input_operation") == 1
+            assert len(process.profiling.rows) == len(processes[0].profiling.rows)
+            assert process.context.elapsed >= 0
+
+    @staticmethod
+    def test_process_builds_graph_while_running():
+        """
+        Test that a process not running headless builds the procedure graph while running
+
+        """
+        process = ExtractProcess({"klar": "500 kr", "totalt": "1500 kr"})
+        assert len(process.get_nodes()) == 5
+        assert len(process.get_edges()) == 4
+
+    @staticmethod
+    def test_headless_process_builds_graph_on_demand(monkeypatch):
+        """
+        Test that a headless process only builds the procedure graph on demand, with the same
+        nodes and transitions as when building it while running
+
+        """
+        monkeypatch.setattr(ExtractProcess, "headless", True)
+        process = ExtractProcess({"klar": "500 kr", "totalt": "1500 kr"})
+        assert process.get_signal("totalt").data == {"totalt": "1500 kr"}
+        assert "obj_dict" not in process.__dict__
+        assert "obj_dict" not in process.get_signal("totalt").__dict__
+
+        process.build_graph()
+        assert len(process.get_nodes()) == 5
+        assert len(process.get_edges()) == 4
+        labels = sorted(node.get_label() for node in process.get_nodes())
+        monkeypatch.setattr(ExtractProcess, "headless", False)
+        assert labels == sorted(node.get_label() for node in ExtractProcess(
+            {"klar": "500 kr", "totalt": "1500 kr"}).get_nodes())
+
+    @staticmethod
+    def test_signal_keys_are_inferred_from_source():
+        """
+        Test that the signal keys read and written by each method are inferred from the source
+
+        """
+        signal_keys = ScheduledProcess.signal_keys()
+        assert signal_keys["extract_ready"] == ({"input_signal"}, {"klar"})
+        assert signal_keys["extract_first"] == ({"klar"}, {"forste"})
+
+    @staticmethod
+    def test_run_scheduled_runs_methods_after_their_dependencies():
+        """
+        Test that run_scheduled() runs every method after the methods it depends on, and
+        reports a critical path that follows the dependencies
+
+        """
+        process = ScheduledProcess({"klar": "500 kr", "totalt": "1500 kr"})
+        assert process.dependencies([process.extract_total, process.extract_ready,
+                                     process.extract_first]) == {
+                                         "extract_total": set(), "extract_ready": set(),
+                                         "extract_first": {"extract_ready"}}
+        assert process.get_signal("forste").data == {"klar": "500 kr"}
+        assert process.get_signal("totalt").data == {"totalt": "1500 kr"}
+        assert [name for name, _ in process.critical_path] in [
+            ["extract_total"], ["extract_ready", "extract_first"]]
+
+    @staticmethod
+    def test_run_scheduled_runs_profiled_methods():
+        """
+        Test that run_scheduled() and run_incremental() run methods decorated with Profiling
+        and Tracking, as in the processes of the app, and that errors of the methods are
+        raised as TrackingError naming the method
+
+        """
+        process = ProfiledScheduledProcess({"klar": "500 kr", "totalt": "1500 kr"})
+        assert process.method_name(process.extract_first) == "extract_first"
+        assert process.get_signal("forste").data == {"klar": "500 kr"}
+        assert str(process.profiling).count("extract_first") == 1
+
+        process.start_process()
+        process.input_operation({"klar": "750 kr", "totalt": "1500 kr"})
+        assert sorted(process.run_incremental(process.steps(), {"input_signal"})) == \
+            ["extract_first", "extract_ready", "extract_total"]
+        assert process.get_signal("forste").data == {"klar": "750 kr"}
+
+        with pt.raises(TrackingError, match=r"\[ProfiledScheduledProcess.extract_"):
+            ProfiledScheduledProcess(["klar", "totalt"])
+
+    @staticmethod
+    def test_dependencies_of_signal_updates_and_depends_on():
+        """
+        Test that dependencies() infers keys written with signal.update, and adds the
+        dependencies declared in depends_on
+
+        """
+        process = ScheduledProcess({"klar": "500 kr", "totalt": "1500 kr"})
+        assert ScheduledProcess.signal_keys()["mark_done"] == (set(), {"ferdig"})
+        assert process.dependencies([process.mark_done, process.read_done,
+                                     process.extract_total, process.log_total]) == {
+                                         "mark_done": set(), "read_done": {"mark_done"},
+                                         "extract_total": set(), "log_total": {"extract_total"}}
+
+    @staticmethod
+    def test_dependencies_raises_value_error_for_keys_no_method_writes():
+        """
+        Test that dependencies() raises ValueError if a method reads a key that no method
+        writes and that is not in the signal, but accepts keys already in the signal
+
+        """
+        process = ScheduledProcess({"klar": "500 kr", "totalt": "1500 kr"})
+        with pt.raises(ValueError, match="ukjent"):
+            process.dependencies([process.read_unknown])
+        with pt.raises(ValueError, match="ferdig"):
+            process.dependencies([process.read_done])
+        assert process.dependencies([process.extract_first]) == {"extract_first": set()}
+
+    @staticmethod
+    def test_methods_run_in_order_without_source(monkeypatch):
+        """
+        Test that the methods run in the order given if the source code of the process is not
+        available, e.g. in frozen builds
+
+        """
+        def getsource(obj):
+            raise OSError(f"could not get source code of '{obj}'")
+
+        monkeypatch.setattr(Process, "_signal_keys", {})
+        monkeypatch.setattr(process_module.inspect, "getsource", getsource)
+        process = ScheduledProcess({"klar": "500 kr", "totalt": "1500 kr"})
+        assert ScheduledProcess.signal_keys() is None
+        assert process.get_signal("forste").data == {"klar": "500 kr"}
+        assert process.dependencies([process.extract_total, process.extract_ready,
+                                     process.extract_first]) == {
+                                         "extract_total": set(),
+                                         "extract_ready": {"extract_total"},
+                                         "extract_first": {"extract_ready"}}
+        process.input_operation({"klar": "750 kr", "totalt": "1500 kr"})
+        assert process.run_incremental([process.extract_ready, process.extract_first],
+                                       {"input_signal"}) == ["extract_ready", "extract_first"]
+        assert process.get_signal("forste").data == {"klar": "750 kr"}
+
+    @staticmethod
+    def test_dependencies_raises_value_error_for_cyclic_methods():
+        """
+        Test that dependencies() raises ValueError if the methods depend on each other
+
+        """
+        process = ScheduledProcess({"klar": "500 kr", "totalt": "1500 kr"})
+        with pt.raises(ValueError):
+            process.dependencies([process.cyclic_1, process.cyclic_2])
+
+    @staticmethod
+    def test_compute_critical_path():
+        """
+        Test that compute_critical_path() finds the chain with the longest elapsed time
+
+        """
+        dependencies = {"a": set(), "b": set(), "c": {"a", "b"}, "d": {"a"}}
+        elapsed = {"a": 1.0, "b": 5.0, "c": 2.0, "d": 3.0}
+        assert Process.compute_critical_path(dependencies, elapsed) == [("b", 5.0), ("c", 2.0)]
+        assert not Process.compute_critical_path({}, {})
+
+    @staticmethod
+    def test_run_incremental_only_reruns_methods_downstream_of_changed_signals():
+        """
+        Test that run_incremental() only re-runs the methods reading changed signals, and stops
+        at methods whose signals are unchanged
+
+        """
+        process = ScheduledProcess({"klar": "500 kr", "totalt": "1500 kr"})
+        methods = [process.extract_total, process.extract_ready, process.extract_first]
+        forste = process.get_signal("forste")
+        nodes = len(process.get_nodes())
+
+        with process.frozen_graph():
+            process.input_operation({"klar": "500 kr", "totalt": "2000 kr"})
+            rerun = process.run_incremental(methods, {"input_signal"})
+        assert sorted(rerun) == ["extract_ready", "extract_total"]
+        assert process.get_signal("totalt").data == {"totalt": "2000 kr"}
+        assert process.get_signal("forste") is forste
+        assert len(process.get_nodes()) == nodes
+
+        process.input_operation({"klar": "750 kr", "totalt": "2000 kr"})
+        rerun = process.run_incremental(methods, {"input_signal"})
+        assert sorted(rerun) == ["extract_first", "extract_ready", "extract_total"]
+        assert process.get_signal("forste").data == {"klar": "750 kr"}
+
+    @staticmethod
+    def test_signal_changed():
+        """
+        Test that signal_changed() compares the data of signals, and treats added, removed and
+        incomparable signals as changed
+
+        """
+        signal = Signal({"klar": "500 kr"}, "Test Data")
+        assert not Process.signal_changed(signal, Signal({"klar": "500 kr"}, "Test Data"))
+        assert Process.signal_changed(signal, Signal({"klar": "750 kr"}, "Test Data"))
+        assert Process.signal_changed(None, signal)
+        assert Process.signal_changed(signal, None)
+        assert not Process.signal_changed(None, None)
+        assert Process.signal_changed(Signal(pd.DataFrame({"a": [1, 2]}), "Test Data"),
+                                      Signal(pd.DataFrame({"a": [1, 2]}), "Test Data"))
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Test module for the WorkerPool class
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+from threading import Lock, current_thread
+from time import sleep
+
+import pytest as pt
+
+from source.app import WorkerPool, Process
+
+
+class TestWorkerPool:
+    """
+    Test cases for the WorkerPool class
+
+    """
+
+    def setup_method(self):
+        """
+        Executed before all tests
+
+        """
+        self.worker_pool = WorkerPool(2)
+
+    def teardown_method(self):
+        """
+        Executed after all tests
+
+        """
+        self.worker_pool.shutdown()
+
+    @staticmethod
+    @pt.mark.parametrize("invalid_max_workers", [1.0, "2", None])
+    def test_worker_pool_only_accepts_int(invalid_max_workers):
+        """
+        Test that WorkerPool only accepts int for max_workers
+
+        """
+        with pt.raises(TypeError):
+            WorkerPool(invalid_max_workers)
+
+    @staticmethod
+    def test_worker_pool_must_have_at_least_one_worker():
+        """
+        Test that WorkerPool raises ValueError if max_workers is less than one
+
+        """
+        with pt.raises(ValueError):
+            WorkerPool(0)
+
+    @staticmethod
+    def test_process_shares_one_worker_pool():
+        """
+        Test that all processes share the same worker pool
+
+        """
+        assert isinstance(Process.worker_pool, WorkerPool)
+
+    def test_run_all_reuses_bounded_number_of_threads(self):
+        """
+        Test that run_all() runs all methods using no more than max_workers worker threads
+
+        """
+        lock, threads = Lock(), set()
+
+        def method():
+            sleep(0.001)
+            with lock:
+                threads.add(current_thread().name)
+
+        for _ in range(5):
+            self.worker_pool.run_all([method] * 10)
+
+        workers = {thread for thread in threads if thread.startswith("stressa-worker")}
+        assert len(workers) <= 2
+        assert self.worker_pool.metrics()["completed"] == 50
+        assert self.worker_pool.metrics()["queued"] == 0
+        assert self.worker_pool.metrics()["active"] == 0
+
+    def test_nested_run_all_does_not_deadlock(self):
+        """
+        Test that methods submitting work to the pool from inside a worker do not deadlock,
+        even when all workers are busy
+
+        """
+        results = []
+
+        def inner():
+            results.append(1)
+
+        def outer():
+            self.worker_pool.run_all([inner] * 3)
+
+        self.worker_pool.run_all([outer] * 4)
+        assert len(results) == 12
+        assert self.worker_pool.metrics()["peak_active"] <= 2
+
+    def test_run_all_does_not_raise_exceptions_from_methods(self):
+        """
+        Test that run_all() does not raise exceptions from the methods, like plain threads
+
+        """
+        results = []
+
+        def failing():
+            raise ValueError("failing method")
+
+        self.worker_pool.run_all([failing, lambda: results.append(1), failing])
+        assert results == [1]
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Test module for the FinnAdvertBatch class
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+from threading import Event, Lock
+from time import sleep
+
+import pytest as pt
+from pandas import DataFrame
+
+from source.app import FinnAdvertBatch, FinnAdvertProcessing, SessionRegistry, \
+    FinnAdvertInfoConnector, FinnOwnershipHistoryConnector, FinnStatisticsInfoConnector, \
+    FinnCommunityStatisticsConnector
+from source.app.processing.finn_advert_batch import BatchFinnAdvertProcessing
+
+
+class TestFinnAdvertBatch:
+    """
+    Test cases for the FinnAdvertBatch class
+
+    """
+
+    def setup_method(self):
+        """
+        Executed before all tests
+
+        """
+        self.finn_codes = ["144857770", "144857771", "144857772", "144857770"]
+
+    @staticmethod
+    @pt.mark.parametrize("invalid_finn_codes", [True, 144857770, ("144857770",), {},
+                                                [144857770]])
+    def test_invalid_finn_codes_raises_type_error(invalid_finn_codes):
+        """
+        Test that FinnAdvertBatch raises TypeError for finn_codes that is not a list of str or
+        a path
+
+        """
+        with pt.raises(TypeError):
+            FinnAdvertBatch(invalid_finn_codes)
+
+    def test_invalid_limits_raises_value_error(self):
+        """
+        Test that FinnAdvertBatch raises ValueError for max_concurrency below 1 or negative
+        rate_limit
+
+        """
+        with pt.raises(ValueError):
+            FinnAdvertBatch(self.finn_codes, max_concurrency=0)
+        with pt.raises(ValueError):
+            FinnAdvertBatch(self.finn_codes, rate_limit=-1)
+
+    def test_finn_codes_are_read_from_file(self, tmp_path):
+        """
+        Test that Finn codes are read from a file, skipping blank and comment lines and
+        duplicates
+
+        """
+        file_path = tmp_path / "finn_codes.txt"
+        file_path.write_text("# ads\n144857770\n\n 144857771 \n144857770\n", encoding="utf-8")
+        assert FinnAdvertBatch(str(file_path)).finn_codes == ["144857770", "144857771"]
+        with pt.raises(FileNotFoundError):
+            FinnAdvertBatch(str(tmp_path / "missing.txt"))
+
+    @staticmethod
+    def test_batch_processing_is_headless():
+        """
+        Test that the processes of a batch run headless without printing procedure graphs
+
+        """
+        assert issubclass(BatchFinnAdvertProcessing, FinnAdvertProcessing)
+        assert BatchFinnAdvertProcessing.headless
+        assert not BatchFinnAdvertProcessing.print_procedure
+
+    def test_results_are_streamed_with_partial_failures(self, monkeypatch):
+        """
+        Test that results are yielded as each Finn code completes, that failing and invalid
+        Finn codes are reported without stopping the batch, and that the rate limit only
+        applies while running
+
+        """
+        release = Event()
+
+        def process(finn_code):
+            assert SessionRegistry.rate_limiter.rate == 2
+            if finn_code == "144857771":
+                raise ValueError("no advert")
+            if finn_code == "144857772":
+                release.wait(5)
+            return {"finn_code": finn_code}
+
+        monkeypatch.setattr(FinnAdvertBatch, "process", staticmethod(process))
+        batch = FinnAdvertBatch(self.finn_codes + ["1234"], max_concurrency=3, rate_limit=2)
+        results = batch.run()
+
+        assert next(results)["finn_code"] == "1234"
+        streamed = [next(results), next(results)]
+        assert {result["finn_code"] for result in streamed} == {"144857770", "144857771"}
+        release.set()
+        last = next(results)
+        assert last == {"finn_code": "144857772", "info": {"finn_code": "144857772"},
+                        "error": None, "elapsed": last["elapsed"]}
+        assert list(results) == []
+
+        summary = batch.summary()
+        assert summary["total"] == 4
+        assert sorted(summary["succeeded"]) == ["144857770", "144857772"]
+        assert set(summary["failed"]) == {"144857771", "1234"}
+        assert "no advert" in summary["failed"]["144857771"]
+        assert SessionRegistry.rate_limiter.rate != 2
+
+    def test_concurrency_is_bounded(self, monkeypatch):
+        """
+        Test that no more than max_concurrency Finn codes are processed at the same time
+
+        """
+        lock, active, peak = Lock(), [0], [0]
+
+        def process(finn_code):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            sleep(0.01)
+            with lock:
+                active[0] -= 1
+            return {"finn_code": finn_code}
+
+        monkeypatch.setattr(FinnAdvertBatch, "process", staticmethod(process))
+        finn_codes = [str(144857770 + i) for i in range(12)]
+        results = list(FinnAdvertBatch(finn_codes, max_concurrency=3, rate_limit=0).run())
+        assert len(results) == 12
+        assert all(result["error"] is None for result in results)
+        assert peak[0] <= 3
+
+    @staticmethod
+    def test_batch_processing_runs_inherited_steps_scheduled(monkeypatch):
+        """
+        Test that the inherited steps of BatchFinnAdvertProcessing are scheduled on the signal
+        keys of FinnAdvertProcessing, and that a batch runs the real process end-to-end
+
+        """
+        history = DataFrame({'Tinglyst': {0: '23.01.2019', 1: '23.10.2017'},
+                             'Boligtype': {0: 'Blokkleilighet', 1: 'Blokkleilighet'},
+                             'Seksjonsnummer': {0: '4', 1: '4'},
+                             'Pris': {0: '3\xa0490\xa0000 kr', 1: '2\xa0570\xa0000 kr'}})
+        monkeypatch.setattr(FinnAdvertInfoConnector, "run", lambda self: {
+            "published": "01.06.2020 12:00", "prisantydning": "3 000 000 kr"})
+        monkeypatch.setattr(FinnOwnershipHistoryConnector, "run",
+                            lambda self: {"historikk": history})
+        monkeypatch.setattr(FinnStatisticsInfoConnector, "run", lambda self: {"views": "100"})
+        monkeypatch.setattr(FinnCommunityStatisticsConnector, "run",
+                            lambda self: {"nabolag": None})
+
+        assert BatchFinnAdvertProcessing.signal_keys() == FinnAdvertProcessing.signal_keys()
+        results = list(FinnAdvertBatch(["144857770"], rate_limit=0).run())
+        assert len(results) == 1 and results[0]["error"] is None
+        info = results[0]["info"]
+        assert info["prisantydning"] == "3 000 000 kr"
+        assert info["historikk"]["Pris"][0] == "3 000 000 kr"
+
+        process = BatchFinnAdvertProcessing("144857770")
+        assert process.dependencies([process.extract_3, process.extract_first_row,
+                                     process.add_to_dataframe_1]) == {
+            "extract_3": set(), "extract_first_row": {"extract_3"},
+            "add_to_dataframe_1": {"extract_3"}}
@@ -10,8 +10,6 @@ __email__ = 'samir.adrik@gmail.com'
 import pytest as pt
 import mock
 
-from prettytable import PrettyTable
-
 from source.app import FinnAdvertProcessing, Process, Signal
 from source.util import TrackingError
 
@@ -42,11 +40,11 @@ class TestFinnAdvertProcessing:
     @staticmethod
     def test_class_variables():
         """
-        Test that all the class variables are correct in the object
+        Test that the timing and profiling are kept per run, not as class variables
 
         """
-        assert isinstance(FinnAdvertProcessing.start, float)
-        assert isinstance(FinnAdvertProcessing.profiling.__class__, PrettyTable.__class__)
+        assert not hasattr(FinnAdvertProcessing, "start")
+        assert isinstance(FinnAdvertProcessing.profiling, property)
 
     @staticmethod
     @pt.mark.parametrize('invalid_finn_code', [True, 90210, 90210.0, ('test', 'test'), {}])
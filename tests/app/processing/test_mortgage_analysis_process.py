@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Test module for the MortgageAnalysisProcess process
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import pytest as pt
+
+from source.app import MortgageAnalysisProcess, SsbConnector, ReadSettings
+from source.util import TrackingError
+
+
+class TestMortgageAnalysisProcess:
+    """
+    Test cases for the incremental updates of the MortgageAnalysisProcess
+
+    """
+
+    def setup_method(self):
+        """
+        Executed before all tests
+
+        """
+        self.data = {"personinntekt_total_aar": "750 000 kr", "egenkapital": "200 000 kr",
+                     "intervall": "Månedlig", "laneperiode": "25 år",
+                     "lanetype": "Annuitetslån", "betjeningsevne": "25 000 kr",
+                     "startdato": "01.01.2024"}
+        self.settings = {"egenkapital_krav": "15.0 %", "gjeldsgrad": 5.0, "stresstest": "3.0"}
+
+    @pt.fixture(autouse=True)
+    def offline(self, monkeypatch):
+        """
+        Fixture replacing the SSB interest rates and the settings file
+
+        """
+        monkeypatch.setattr(SsbConnector, "run", lambda self: {"markedsrente": "4.5"})
+        monkeypatch.setattr(ReadSettings, "run",
+                            lambda operation: {"factor": self.settings[operation.setting]})
+        monkeypatch.setattr(MortgageAnalysisProcess, "print_procedure", False)
+
+    def test_update_re_reads_changed_settings(self):
+        """
+        Test that update() with unchanged data re-reads the settings, and that the result
+        equals the one of a new process with the changed settings
+
+        """
+        mortgage_analysis = MortgageAnalysisProcess(dict(self.data))
+        previous = mortgage_analysis.mortgage()
+        assert mortgage_analysis.update(dict(self.data)) == previous
+
+        self.settings["gjeldsgrad"] = 6
+        updated = mortgage_analysis.update(dict(self.data))
+        assert updated != previous
+        assert updated == MortgageAnalysisProcess(dict(self.data)).mortgage()
+
+    def test_update_re_runs_every_step_after_failure(self, monkeypatch):
+        """
+        Test that update() re-runs every step when the previous update failed, instead of
+        returning the result of the run before
+
+        """
+        mortgage_analysis = MortgageAnalysisProcess(dict(self.data))
+        previous = mortgage_analysis.mortgage()
+        data = dict(self.data, egenkapital="400 000 kr")
+
+        def output_operation():
+            raise ValueError("output failed")
+
+        monkeypatch.setattr(mortgage_analysis, "output_operation", output_operation)
+        with pt.raises(TrackingError):
+            mortgage_analysis.update(data)
+        monkeypatch.delattr(mortgage_analysis, "output_operation")
+
+        updated = mortgage_analysis.update(data)
+        assert updated != previous
+        assert updated == MortgageAnalysisProcess(data).mortgage()
+
+    def test_changed_start_date_does_not_re_run_stress_tests(self, monkeypatch):
+        """
+        Test that update() with only a changed start date re-runs the steps of the start date,
+        but not the stress tests, while a changed interval re-runs them
+
+        """
+        mortgage_analysis = MortgageAnalysisProcess(dict(self.data))
+        rerun = []
+        run_incremental = mortgage_analysis.run_incremental
+
+        def recorded_run_incremental(*args):
+            rerun.extend(run_incremental(*args))
+            return rerun
+
+        monkeypatch.setattr(mortgage_analysis, "run_incremental", recorded_run_incremental)
+        data = dict(self.data, startdato="01.02.2024")
+        assert mortgage_analysis.update(data) == MortgageAnalysisProcess(data).mortgage()
+        assert "extract_6" in rerun
+        assert not {"fixed_stress_test", "serial_stress_test", "extract_1"} & set(rerun)
+
+        rerun.clear()
+        mortgage_analysis.update(dict(data, intervall="Årlig"))
+        assert {"fixed_stress_test", "serial_stress_test"} <= set(rerun)
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the ProcessBenchmarks class
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import os
+import json
+import socket
+from datetime import datetime
+
+import pytest as pt
+
+from source.app import ProcessBenchmarks, SessionRegistry, Operation, Sifo, SsbConnector, \
+    SsbPayload, SsbRateStore, Posten, Portalen, HttpRecorder, ReplayServer, \
+    MortgageAnalysisProcess, ReadSettings
+from source.app.connectors import ssb
+from source.app.processing import process_benchmarks
+
+
+class TestProcessBenchmarks:
+    """
+    Test cases for the ProcessBenchmarks class
+
+    """
+
+    @pt.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """
+        Executed before all tests, i.e. benchmarks of a cheap process instead of the processes
+        requesting the services
+
+        """
+        self.runs = []
+        self.directory = str(tmp_path)
+        self.benchmarks = ProcessBenchmarks(self.directory, iterations=3, warmup=1)
+        self.benchmarks.scenarios = {"CheapProcess": self.runs.append}
+
+    def test_invalid_args_raise_type_error(self):
+        """
+        Test that ProcessBenchmarks raises TypeError for invalid arguments
+
+        """
+        with pt.raises(TypeError):
+            ProcessBenchmarks(self.directory, "20")
+
+    def test_record_stores_inputs(self):
+        """
+        Test that record() runs every process once and stores its input
+
+        """
+        self.benchmarks.record({"CheapProcess": {"data": 1}})
+
+        assert self.runs == [{"data": 1}]
+        with open(self.benchmarks.inputs_path, encoding="utf-8") as inputs_file:
+            assert json.load(inputs_file) == {"CheapProcess": {"data": 1}}
+        assert self.benchmarks.inputs() == {"CheapProcess": {"data": 1}}
+
+    def test_record_unknown_process_raises_value_error(self):
+        """
+        Test that record() raises ValueError for a process without scenario
+
+        """
+        with pt.raises(ValueError):
+            self.benchmarks.record({"UnknownProcess": {}})
+
+    def test_run_missing_input_raises_value_error(self):
+        """
+        Test that run() raises ValueError for a process without recorded input
+
+        """
+        with pt.raises(ValueError):
+            self.benchmarks.run(["CheapProcess"])
+
+    def test_run_benchmarks_recorded_processes(self):
+        """
+        Test that run() benchmarks every process with a recorded input, and reports the
+        results
+
+        """
+        self.benchmarks.record({"CheapProcess": "input"})
+        self.runs.clear()
+
+        results = self.benchmarks.run()
+        assert list(results) == ["CheapProcess"]
+        assert results["CheapProcess"]["iterations"] == 3
+        assert self.runs == ["input"] * (1 + 3 + 1)
+
+        assert "CheapProcess" in ProcessBenchmarks.report(results)
+
+    @staticmethod
+    def test_report_compares_p95_with_baseline():
+        """
+        Test that report() shows the change of p95 from the baseline
+
+        """
+        result = {"mean": 1.0, "p50": 1.0, "p95": 1.5, "p99": 2.0, "allocated_kib": 1.0,
+                  "peak_rss_mib": 100.0}
+        report = ProcessBenchmarks.report({"Process": result}, {"Process": {"p95": 1.0}})
+        assert "+50.0 %" in report.splitlines()[1]
+
+    def test_isolated_restores_caches(self):
+        """
+        Test that isolated() turns off the HTTP and SIFO caches, replaces the stores by empty
+        ones in a temporary directory, pins the SSB dates, and restores them afterwards
+
+        """
+        cache_enabled, recorder, sifo_cache = SessionRegistry.cache_enabled, \
+            SessionRegistry.recorder, Sifo.cache
+        ssb_store, registry = SsbConnector.store, Posten.registry
+        with ProcessBenchmarks.isolated(date=datetime(2024, 3, 20)) as stores:
+            assert SessionRegistry.cache_enabled is False
+            assert SessionRegistry.recorder is None
+            assert Sifo.cache is not sifo_cache
+            assert SsbConnector.store.path == os.path.join(stores, "ssb_10748.parquet")
+            assert Posten.registry.path == os.path.join(stores, "postal_codes.tsv")
+            assert Portalen._offers is None  # pylint: disable=protected-access
+            assert SsbPayload.updated_table_date() == ["2024M01"]
+        assert not os.path.exists(stores)
+        assert SessionRegistry.cache_enabled == cache_enabled
+        assert SessionRegistry.recorder is recorder
+        assert Sifo.cache is sifo_cache
+        assert SsbConnector.store is ssb_store
+        assert Posten.registry is registry
+        assert SsbPayload.today().date() == datetime.today().date()
+
+    def test_before_clears_operation_cache_unless_warm(self, monkeypatch):
+        """
+        Test that before() clears the operation cache unless the benchmarks are warm
+
+        """
+        clears = []
+        monkeypatch.setattr(Operation.cache, "clear", lambda: clears.append(True))
+        self.benchmarks.before()
+        ProcessBenchmarks(self.directory, warm=True).before()
+        assert clears == [True]
+
+    def test_run_replays_recorded_responses_to_process(self, monkeypatch):
+        """
+        Test that run() runs a real process against the responses replayed by a ReplayServer,
+        with the SSB dates pinned to the date of the recording and an empty SSB rate store
+        before every run
+
+        """
+        with socket.socket() as free_port:
+            free_port.bind(("127.0.0.1", 0))
+            origin = f"http://127.0.0.1:{free_port.getsockname()[1]}/"
+        monkeypatch.setattr(process_benchmarks, "HTTP_ORIGIN", origin)
+        monkeypatch.setattr(ssb, "SSB_URL", origin + "data.ssb.no/api/v0/no/table/10748")
+        monkeypatch.setattr(MortgageAnalysisProcess, "print_procedure", False)
+        monkeypatch.setattr(ReadSettings, "run", lambda operation: {"factor": {
+            "egenkapital_krav": "15.0 %", "gjeldsgrad": 5.0, "stresstest": "3.0"}[
+                operation.setting]})
+
+        rates = {"version": "2.0", "class": "dataset", "id": ["Rentebinding", "Tid"],
+                 "size": [1, 1], "value": [4.5],
+                 "dimension": {"Rentebinding": {"category": {
+                     "index": {"01": 0}, "label": {"01": SsbRateStore.market_rate}}},
+                     "Tid": {"category": {"index": {"2024M01": 0},
+                                          "label": {"2024M01": "2024M01"}}}}}
+        HttpRecorder(self.directory).record(
+            "POST", "https://data.ssb.no/api/v0/no/table/10748",
+            json.dumps(SsbRateStore(self.directory).query()), 200,
+            {"Content-Type": "application/json"}, json.dumps(rates).encode())
+        with open(os.path.join(self.directory, "date.txt"), "w", encoding="utf-8") as date_file:
+            date_file.write("2024-03-20")
+        data = {"personinntekt_total_aar": "750 000 kr", "egenkapital": "200 000 kr",
+                "intervall": "Månedlig", "laneperiode": "25 år", "lanetype": "Annuitetslån",
+                "betjeningsevne": "25 000 kr", "startdato": "01.01.2024"}
+        with open(self.benchmarks.inputs_path, "w", encoding="utf-8") as inputs_file:
+            json.dump({"MortgageAnalysisProcess": data}, inputs_file)
+
+        replayed, mortgages, replay = [], [], ReplayServer.replay
+
+        def recorded_replay(server, *args):
+            response = replay(server, *args)
+            replayed.append(response[0])
+            return response
+
+        monkeypatch.setattr(ReplayServer, "replay", recorded_replay)
+        ssb_store = SsbConnector.store
+        self.benchmarks.scenarios = {"MortgageAnalysisProcess": lambda data: mortgages.append(
+            MortgageAnalysisProcess(data).mortgage())}
+
+        results = self.benchmarks.run()
+        assert results["MortgageAnalysisProcess"]["iterations"] == 3
+        assert replayed == [200] * len(mortgages) and len(mortgages) == 1 + 3 + 1
+        assert mortgages[0]["krav_stresstest_annuitet"] == "7.5 %"
+        assert all(mortgage == mortgages[0] for mortgage in mortgages)
+        assert SsbConnector.store is ssb_store
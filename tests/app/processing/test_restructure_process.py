@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Test module for the RestructureProcess process
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+from source.app import RestructureProcess, Signal
+
+
+class TestRestructureProcess:
+    """
+    Test cases for the scheduling of the RestructureProcess
+
+    """
+
+    @staticmethod
+    def test_every_step_runs_after_validation():
+        """
+        Test that every step of the restructuring depends on validate_restructure, directly or
+        through the signals it reads, so no step starts before the validation
+
+        """
+        process = RestructureProcess.__new__(RestructureProcess)
+        process.signal = {"input_signal": Signal({"data": {}}, "Restructure Data")}
+        steps = process._restructure_steps()  # pylint: disable=protected-access
+        dependencies = process.dependencies(steps)
+
+        after_validation = {"validate_restructure"}
+        while len(after_validation) < len(dependencies):
+            downstream = {name for name, deps in dependencies.items() if
+                          deps and deps <= after_validation}
+            assert downstream - after_validation, \
+                f"'{sorted(set(dependencies) - after_validation)}' run before validation"
+            after_validation |= downstream
+        assert dependencies["validate_restructure"] == set()
+        assert dependencies["ssb_connector"] == {"validate_restructure"}
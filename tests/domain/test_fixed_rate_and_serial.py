@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the stress rate calculation in the FixedRate and Serial entity classes
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import numpy as np
+import pytest as pt
+
+from source.domain import Entity, Mortgage, FixedRate, Serial
+
+
+def brute_force_stress_rate(mortgage):
+    """
+    reference implementation evaluating every rate in the stress rate grid
+
+    """
+    stress_rates = {round(mortgage.periodical_payments(i, mortgage.interval, mortgage.period,
+                                                       mortgage.amount)): round(i, 3) for i in
+                    np.arange(0.01, 50.000, 0.01)}
+    net_liquidity = mortgage.net_liquidity if mortgage.interval == 12 else \
+        (mortgage.net_liquidity * 12) / mortgage.interval
+    diff_rates = {abs(net_liquidity - liquidity): rates for liquidity, rates in
+                  stress_rates.items() if net_liquidity - liquidity > 0}
+    return str(list(diff_rates.values())[-1]) + ' %'
+
+
+class TestFixedRateAndSerial:
+    """
+    Test class for FixedRate and Serial entity classes
+
+    """
+
+    def setup_method(self):
+        """
+        Executed before all tests
+
+        """
+        self.data = {'personinntekt_total_aar': '750 000 kr', 'egenkapital': '200 000 kr',
+                     'intervall': 'Månedlig', 'laneperiode': '25 år', 'lanetype': 'Annuitetslån',
+                     'betjeningsevne': '25 000 kr', 'startdato': '01.01.2024'}
+
+    def test_fixed_rate_and_serial_are_instances_and_subclasses_of_mortgage(self):
+        """
+        Test that FixedRate and Serial are instances and subclasses of Mortgage and Entity
+
+        """
+        for mortgage in [FixedRate(self.data), Serial(self.data)]:
+            for parent in [Mortgage, Entity]:
+                assert isinstance(mortgage, parent)
+                assert issubclass(mortgage.__class__, parent)
+
+    @pt.mark.parametrize("mortgage_class", [FixedRate, Serial])
+    @pt.mark.parametrize("interval", ["Årlig", "Kvartalsvis", "Månedlig", "Ukentlig"])
+    @pt.mark.parametrize("net_liquidity", ["15 000 kr", "21 345 kr", "25 000 kr", "90 000 kr"])
+    def test_calculate_stress_rate_matches_brute_force(self, mortgage_class, interval,
+                                                       net_liquidity):
+        """
+        Test that calculate_stress_rate() gives the same rate as evaluating the whole grid
+
+        """
+        self.data.update({'intervall': interval, 'betjeningsevne': net_liquidity})
+        mortgage = mortgage_class(self.data)
+        assert mortgage.calculate_stress_rate() == brute_force_stress_rate(mortgage)
+
+    @pt.mark.parametrize("mortgage_class", [FixedRate, Serial])
+    def test_calculate_stress_rate_raises_value_error_if_not_affordable(self, mortgage_class):
+        """
+        Test that calculate_stress_rate() raises ValueError if no rate is affordable
+
+        """
+        self.data.update({'betjeningsevne': '0 kr'})
+        with pt.raises(ValueError):
+            mortgage_class(self.data).calculate_stress_rate()
+
+    @pt.mark.parametrize("mortgage_class", [FixedRate, Serial])
+    def test_calculate_stress_rates_matches_calculate_stress_rate(self, mortgage_class):
+        """
+        Test that the vectorized calculate_stress_rates() matches calculate_stress_rate()
+        for every mortgage, and gives nan if no rate is affordable
+
+        """
+        mortgages = []
+        for interval, net_liquidity in [("Årlig", "20 000 kr"), ("Månedlig", "25 000 kr"),
+                                        ("Ukentlig", "18 000 kr"), ("Halvårlig", "60 000 kr")]:
+            self.data.update({'intervall': interval, 'betjeningsevne': net_liquidity})
+            mortgages.append(mortgage_class(self.data))
+
+        stress_rates = mortgage_class.calculate_stress_rates(
+            [mortgage.interval for mortgage in mortgages] + [12],
+            [mortgage.period for mortgage in mortgages] + [25],
+            [mortgage.amount for mortgage in mortgages] + [3750000.0],
+            [mortgage.net_liquidity for mortgage in mortgages] + [0.0])
+        for mortgage, stress_rate in zip(mortgages, stress_rates):
+            assert mortgage.calculate_stress_rate() == str(stress_rate) + ' %'
+        assert np.isnan(stress_rates[-1])
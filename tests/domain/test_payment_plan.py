@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the PaymentPlan entity class
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import pytest as pt
+
+from source.domain import Entity, PaymentPlan, Money
+
+
+class TestPaymentPlan:
+    """
+    Test class for the PaymentPlan entity class
+
+    """
+
+    def setup_method(self):
+        """
+        Executed before all tests
+
+        """
+        self.payment_plan = PaymentPlan("4.5 %", "Månedlig", "25 år", "3 000 000 kr",
+                                        "01.01.2024")
+
+    def test_payment_plan_is_instance_and_subclass_of_entity(self):
+        """
+        Test that PaymentPlan is instance and subclass of Entity
+
+        """
+        for parent in [PaymentPlan, Entity]:
+            assert isinstance(self.payment_plan, parent)
+            assert issubclass(self.payment_plan.__class__, parent)
+
+    @pt.mark.parametrize("values", [[0], [1, 12, 123], [1234, 12345678], [-1234, -5]])
+    def test_money_method_equals_money_value_object(self, values):
+        """
+        Test that the money() presentation step formats like the Money value object
+
+        """
+        assert PaymentPlan.money(values) == [Money(str(value)).value() for value in values]
+
+    @pt.mark.parametrize("amortization", ["fixed_amortization", "serial_amortization"])
+    def test_amortization_pays_down_whole_amount(self, amortization):
+        """
+        Test that the numeric mortgage plans pay down the whole amount with consistent totals
+
+        """
+        plan = getattr(self.payment_plan, amortization)()
+        assert len(plan) == 25 * 12 + 1
+        assert plan["Restgjeld"].iloc[-1] == 0
+        assert plan["Avdrag.total"].iloc[-1] == 3000000
+        assert (plan["T.beløp"] == plan["Renter"] + plan["Avdrag"]).all()
+        assert plan["T.beløp.total"].iloc[-1] == plan["T.beløp"].sum()
+
+    def test_fixed_amortization_has_constant_payment(self):
+        """
+        Test that the fixed mortgage plan has a constant payment except for the last period
+
+        """
+        plan = self.payment_plan.fixed_amortization()
+        assert plan["T.beløp"].iloc[1:-1].nunique() == 1
+
+    @pt.mark.parametrize("interval", ["Ukentlig", "Annenhver uke", "Semi-månedlig"])
+    def test_mortgage_plans_with_short_intervals(self, interval):
+        """
+        Test the fixed and serial mortgage plans with intervals shorter than a month
+
+        """
+        payment_plan = PaymentPlan("4.5 %", interval, "2 år", "500 000 kr", "15.03.2024")
+        fixed_plan = payment_plan.fixed_mortgage_plan()
+        serial_plan = payment_plan.serial_mortgage_plan()
+
+        assert fixed_plan["laan_annuitet"] == "500 000 kr"
+        assert serial_plan["laan_serie"] == "500 000 kr"
+        assert fixed_plan["start_dato_annuitet"] == "15.03.2024"
+        assert list(fixed_plan["nedbetalingsplan_annuitet_overview"]["År"].values()) == [0, 1, 2]
@@ -63,3 +63,63 @@ class TestAssertor:
         """
         with pt.raises(ValueError):
             Assertor.assert_non_negative(negative_values)
+
+    @staticmethod
+    @pt.mark.parametrize('dtype, msg', [(str, "expected type 'str', got 'int' instead"),
+                                        ((str, list), "expected type 'Union[str, list]', got "
+                                                      "'int' instead")])
+    def test_assert_data_types_message(dtype, msg):
+        """
+        Test that assert_data_types() names the expected and the actual type
+
+        """
+        with pt.raises(TypeError, match=msg.replace("[", r"\[").replace("]", r"\]")):
+            Assertor.assert_data_types(["valid", 90210], [str, dtype])
+
+    @staticmethod
+    @pt.mark.parametrize('level, checked, boundary_checked', [('strict', True, True),
+                                                              ('boundary', False, True),
+                                                              ('off', False, False)])
+    def test_validation_levels(level, checked, boundary_checked):
+        """
+        Test that the validation level decides which type checks are run
+
+        """
+        type_check = Assertor.type_check(str)
+        boundary_type_check = Assertor.type_check(str, boundary=True)
+        with Assertor.validation(level):
+            for check, raises in [(lambda: Assertor.assert_data_types([90210], [str]), checked),
+                                  (lambda: type_check(90210), checked),
+                                  (lambda: Assertor.assert_data_types([90210], [str],
+                                                                      boundary=True),
+                                   boundary_checked),
+                                  (lambda: boundary_type_check(90210), boundary_checked)]:
+                if raises:
+                    with pt.raises(TypeError):
+                        check()
+                else:
+                    check()
+        assert Assertor.level == 'strict'
+
+    @staticmethod
+    def test_set_level_raises_value_error():
+        """
+        Test that set_level() raises ValueError for an unknown validation level
+
+        """
+        with pt.raises(ValueError):
+            Assertor.set_level('lenient')
+
+    @staticmethod
+    def test_type_check_is_shared():
+        """
+        Test that type_check() returns one precompiled check per types, which checks the
+        arguments like assert_data_types()
+
+        """
+        type_check = Assertor.type_check((int, float), str)
+        assert type_check is Assertor.type_check((int, float), str)
+        assert type_check is not Assertor.type_check((int, float), str, boundary=True)
+        type_check(1.0, "valid")
+        with pt.raises(TypeError, match=r"expected type 'Union\[int, float\]'"):
+            type_check("1.0", "valid")
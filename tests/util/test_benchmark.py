@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the Benchmark class
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import pytest as pt
+
+from source.util import Benchmark, BenchmarkRegressionError
+
+
+class TestBenchmark:
+    """
+    Test case for the Benchmark class
+
+    """
+
+    @staticmethod
+    @pt.mark.parametrize("percent, expected", [(0, 1), (50, 3), (95, 4.8), (100, 5)])
+    def test_percentile(percent, expected):
+        """
+        Test that percentile() interpolates between the closest ranks
+
+        """
+        assert Benchmark.percentile([5, 1, 4, 2, 3], percent) == pt.approx(expected)
+
+    @staticmethod
+    @pt.mark.parametrize("values, percent", [([], 50), ([1], 101), ([1], -1)])
+    def test_percentile_raises_value_error(values, percent):
+        """
+        Test that percentile() raises ValueError for no values or a percent outside [0, 100]
+
+        """
+        with pt.raises(ValueError):
+            Benchmark.percentile(values, percent)
+
+    @staticmethod
+    @pt.mark.parametrize("name, func, iterations, warmup",
+                         [(1, list, 1, 0), ("name", None, 1, 0), ("name", list, 0, 0),
+                          ("name", list, 1, -1)])
+    def test_invalid_args_raise_errors(name, func, iterations, warmup):
+        """
+        Test that Benchmark raises TypeError or ValueError for invalid arguments
+
+        """
+        with pt.raises((TypeError, ValueError)):
+            Benchmark(name, func, iterations, warmup)
+
+    @staticmethod
+    def test_run():
+        """
+        Test that run() calls before and func before every run, and reports the percentiles,
+        allocations and peak memory
+
+        """
+        calls = []
+        result = Benchmark("sum", lambda: calls.append(sum(range(1000))), 5, 2).run(
+            lambda: calls.append("before"))
+
+        assert calls.count("before") == calls.count(499500) == 2 + 5 + 1
+        assert result["iterations"] == 5
+        assert 0 <= result["p50"] <= result["p95"] <= result["p99"]
+        assert result["allocated_kib"] >= 0
+        assert result["peak_rss_mib"] > 0
+
+    @staticmethod
+    def test_baseline_round_trip(tmp_path):
+        """
+        Test that save_baseline() stores results loaded by load_baseline(), and that a missing
+        baseline is empty
+
+        """
+        path = str(tmp_path / "baseline" / "benchmarks.json")
+        assert Benchmark.load_baseline(path) == {}
+
+        results = {"process": {"p50": 1.0, "p95": 2.0, "p99": 3.0}}
+        Benchmark.save_baseline(results, path)
+        assert Benchmark.load_baseline(path) == results
+
+    @staticmethod
+    def test_regressions():
+        """
+        Test that regressions() reports the percentiles beyond the threshold of the baseline,
+        and ignores benchmarks without baseline
+
+        """
+        baseline = {"process": {"p50": 10.0, "p95": 20.0, "p99": 30.0}}
+        results = {"process": {"p50": 11.0, "p95": 25.0, "p99": 30.0},
+                   "new": {"p50": 100.0, "p95": 200.0, "p99": 300.0}}
+
+        regressions = Benchmark.regressions(results, baseline, 0.2)
+        assert len(regressions) == 1
+        assert "'process' p95" in regressions[0]
+
+    @staticmethod
+    def test_assert_no_regressions():
+        """
+        Test that assert_no_regressions() raises BenchmarkRegressionError for a regression
+
+        """
+        baseline = {"process": {"p50": 10.0, "p95": 20.0, "p99": 30.0}}
+        Benchmark.assert_no_regressions(baseline, baseline)
+        with pt.raises(BenchmarkRegressionError):
+            Benchmark.assert_no_regressions(
+                {"process": {"p50": 20.0, "p95": 20.0, "p99": 30.0}}, baseline)
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the MetricsRegistry class
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import json
+from threading import Thread
+
+import pytest as pt
+
+from source.util import MetricsRegistry, Histogram
+
+
+class TestMetricsRegistry:
+    """
+    Test cases for the MetricsRegistry class
+
+    """
+
+    def setup_method(self):
+        """
+        Executed before all tests
+
+        """
+        self.metrics = MetricsRegistry()
+
+    def test_series_are_created_once(self):
+        """
+        Test that the same name and labels give the same series, regardless of label order
+
+        """
+        counter = self.metrics.counter("runs_total", "runs", process="A", kind="b")
+        assert self.metrics.counter("runs_total", process="A", kind="b") is counter
+        assert self.metrics.counter("runs_total", kind="b", process="A") is counter
+        assert self.metrics.counter("runs_total", process="B", kind="b") is not counter
+
+    def test_metric_type_mismatch_raises_value_error(self):
+        """
+        Test that a metric name can only have one type
+
+        """
+        self.metrics.counter("runs_total")
+        with pt.raises(ValueError):
+            self.metrics.gauge("runs_total")
+        with pt.raises(ValueError):
+            self.metrics.histogram("runs_total", process="A")
+
+    def test_counter_sums_threads(self):
+        """
+        Test that a counter sums the increments of all threads
+
+        """
+        counter = self.metrics.counter("runs_total")
+        threads = [Thread(target=lambda: [counter.inc() for _ in range(1000)]) for _ in
+                   range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc(2)
+        assert counter.value == 4002
+        with pt.raises(ValueError):
+            counter.inc(-1)
+
+    def test_gauge(self):
+        """
+        Test that a gauge is set, increased and decreased
+
+        """
+        gauge = self.metrics.gauge("running")
+        gauge.inc(3)
+        gauge.dec()
+        assert gauge.value == 2
+        gauge.set(10)
+        gauge.dec()
+        assert gauge.value == 9
+
+    @staticmethod
+    @pt.mark.parametrize("units", [0, 1, 127, 128, 129, 255, 256, 1000, 123456, 10 ** 9])
+    def test_histogram_buckets(units):
+        """
+        Test that the bucket of a value contains the value, with a relative width of at most
+        2 ** (1 - bits)
+
+        """
+        lower, upper = Histogram.bounds(Histogram.index(units))
+        assert lower <= units <= upper
+        assert upper - lower <= max(lower, 1) * 2 ** (1 - Histogram.bits)
+
+    def test_histogram_percentiles(self):
+        """
+        Test that the percentiles of a histogram are within the precision of the buckets
+
+        """
+        histogram = self.metrics.histogram("latency_seconds")
+        assert histogram.percentiles((50,)) == {50: None}
+        for millisecond in range(1, 1001):
+            histogram.observe(millisecond / 1000)
+
+        percentiles = histogram.percentiles((50, 99, 100))
+        assert percentiles[50] == pt.approx(0.5, rel=0.02)
+        assert percentiles[99] == pt.approx(0.99, rel=0.02)
+        assert percentiles[100] == 1.0
+        count, total, minimum, maximum, _ = histogram.snapshot()
+        assert (count, minimum, maximum) == (1000, 0.001, 1.0)
+        assert total == pt.approx(500.5)
+
+    def test_prometheus(self):
+        """
+        Test the export of the metrics in Prometheus text format
+
+        """
+        self.metrics.counter("runs_total", "Runs of the processes", process='Mort"gage').inc()
+        histogram = self.metrics.histogram("latency_seconds", process="A")
+        histogram.observe(0.003)
+        histogram.observe(2.0)
+
+        lines = self.metrics.prometheus().splitlines()
+        assert "# TYPE latency_seconds histogram" in lines
+        assert 'latency_seconds_bucket{process="A",le="0.0025"} 0' in lines
+        assert 'latency_seconds_bucket{process="A",le="0.005"} 1' in lines
+        assert 'latency_seconds_bucket{process="A",le="2.5"} 2' in lines
+        assert 'latency_seconds_bucket{process="A",le="+Inf"} 2' in lines
+        assert 'latency_seconds_count{process="A"} 2' in lines
+        assert "# HELP runs_total Runs of the processes" in lines
+        assert 'runs_total{process="Mort\\"gage"} 1' in lines
+
+    def test_json_lines(self):
+        """
+        Test the export of the metrics as JSON lines
+
+        """
+        self.metrics.gauge("running", process="A").set(2)
+        self.metrics.histogram("latency_seconds").observe(0.5)
+
+        records = [json.loads(line) for line in self.metrics.json_lines(1.0).splitlines()]
+        assert records[0]["name"] == "latency_seconds"
+        assert records[0]["count"] == 1
+        assert records[0]["p99"] == pt.approx(0.5, rel=0.02)
+        assert records[1] == {"timestamp": 1.0, "name": "running", "type": "gauge",
+                              "labels": {"process": "A"}, "value": 2}
+
+    def test_table(self):
+        """
+        Test that the metrics are rendered as a table
+
+        """
+        self.metrics.counter("runs_total", process="A").inc()
+        self.metrics.histogram("latency_seconds", process="A").observe(0.25)
+        table = str(self.metrics.table())
+        assert "runs_total" in table
+        assert "latency_seconds" in table
+        assert "ms" in table
+
+    def test_export(self, tmp_path):
+        """
+        Test that export() replaces the Prometheus file and appends the JSON lines
+
+        """
+        self.metrics.counter("runs_total").inc()
+        self.metrics.export(str(tmp_path))
+        self.metrics.export(str(tmp_path))
+
+        assert (tmp_path / "metrics.prom").read_text(encoding="utf-8") == \
+            self.metrics.prometheus()
+        assert len((tmp_path / "metrics.jsonl").read_text(encoding="utf-8").splitlines()) == 2
+
+    def test_start_export(self, tmp_path):
+        """
+        Test the periodic export, and the last export when stopped
+
+        """
+        self.metrics.counter("runs_total").inc()
+        with pt.raises(ValueError):
+            self.metrics.start_export(str(tmp_path), 0)
+        self.metrics.start_export(str(tmp_path), 60)
+        self.metrics.stop_export(str(tmp_path))
+        assert (tmp_path / "metrics.prom").exists()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the RunContext class
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+from threading import Thread
+
+from source.util import RunContext
+
+
+class TestRunContext:
+    """
+    Test cases for the RunContext class
+
+    """
+
+    @staticmethod
+    def test_active_contexts_are_nested():
+        """
+        Test that the innermost active context is the current one, and that the previous one
+        is restored when it ends
+
+        """
+        assert RunContext.current() is None
+        with RunContext.active("outer"):
+            with RunContext.active("inner") as context:
+                assert context == "inner"
+                assert RunContext.current() == "inner"
+            assert RunContext.current() == "outer"
+        assert RunContext.current() is None
+
+    @staticmethod
+    def test_active_context_is_local_to_thread():
+        """
+        Test that the context active in one thread is not the current one of another thread
+
+        """
+        current = []
+        with RunContext.active("run"):
+            thread = Thread(target=lambda: current.append(RunContext.current()))
+            thread.start()
+            thread.join()
+        assert current == [None]
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test module for the Tracking and Debugger decorators
+
+"""
+
+__author__ = 'Samir Adrik'
+__email__ = 'samir.adrik@gmail.com'
+
+import pytest as pt
+
+from source.util import Tracking, Debugger, TrackingError
+
+
+class Tracked:
+    """
+    Class with decorated methods
+
+    """
+
+    @Tracking
+    def __init__(self, value):
+        """
+        decorated constructor
+
+        """
+        self.value = 1 / value
+
+    @Tracking
+    def divide(self, value):
+        """
+        decorated method
+
+        """
+        return self.value / value
+
+    @Debugger
+    def debug(self, value):
+        """
+        method decorated by Debugger
+
+        """
+        return self.value / value
+
+
+class TestTracking:
+    """
+    Test cases for the Tracking and Debugger decorators
+
+    """
+
+    @staticmethod
+    def test_tracking_returns_result():
+        """
+        Test that a method decorated with Tracking returns the result of the method, and keeps
+        its name and docstring
+
+        """
+        assert Tracked(2).divide(0.25) == 2
+        assert Tracked.divide.__name__ == "divide"
+        assert Tracked.divide.__doc__.strip() == "decorated method"
+
+    @staticmethod
+    def test_tracking_raises_tracking_error():
+        """
+        Test that Tracking raises TrackingError prefixed with the class and the method
+
+        """
+        with pt.raises(TrackingError, match=r"^\[Tracked\] -> division by zero$"):
+            Tracked(0)
+        with pt.raises(TrackingError,
+                       match=r"^\[Tracked.divide\] -> float division by zero$") as error:
+            Tracked(1).divide(0)
+        assert isinstance(error.value.__context__, ZeroDivisionError)
+
+    @staticmethod
+    def test_tracking_names_subclass():
+        """
+        Test that the message of TrackingError names the class of the instance
+
+        """
+
+        class SubTracked(Tracked):
+            """
+            Subclass of the class with decorated methods
+
+            """
+
+        with pt.raises(TrackingError, match=r"^\[SubTracked.divide\]"):
+            SubTracked(1).divide(0)
+
+    @staticmethod
+    def test_tracking_binds_once():
+        """
+        Test that the wrapper is created once per method and not per attribute access
+
+        """
+        tracked = Tracked(1)
+        assert Tracked.divide is Tracked.divide
+        assert tracked.divide.__func__ is Tracked.__dict__["divide"]
+
+    @staticmethod
+    def test_debugger_returns_none():
+        """
+        Test that a method decorated with Debugger returns None on exceptions
+
+        """
+        assert Tracked(1).debug(0.5) == 2
+        assert Tracked(1).debug(0) is None
+
+    @staticmethod
+    def test_disabled_tracking_leaves_methods_undecorated(monkeypatch):
+        """
+        Test that disabled Tracking returns the method itself, while Debugger is always
+        enabled
+
+        """
+        monkeypatch.setattr(Tracking, "enabled", False)
+
+        def method(self):
+            """
+            method raising an exception
+
+            """
+            raise ZeroDivisionError(self)
+
+        assert Tracking(method) is method
+        assert Debugger(method) is not method
+        with pt.raises(ZeroDivisionError):
+            Tracking(method)(None)
+        assert Debugger(method)(None) is None